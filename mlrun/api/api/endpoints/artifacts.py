@@ -14,7 +14,7 @@ from mlrun.api.api.utils import log_and_raise
 from mlrun.api.schemas.artifact import ArtifactsFormat
 from mlrun.api.utils.singletons.db import get_db
 from mlrun.config import config
-from mlrun.utils import is_legacy_artifact, logger
+from mlrun.utils import is_legacy_artifact, logger, select_fields
 
 router = APIRouter()
 
@@ -65,6 +65,53 @@ async def store_artifact(
     return {}
 
 
+@router.post("/projects/{project}/artifacts")
+async def store_artifacts(
+    request: Request,
+    project: str,
+    auth_info: mlrun.api.schemas.AuthInfo = Depends(deps.authenticate_request),
+    db_session: Session = Depends(deps.get_db_session),
+):
+    """
+    store a batch of artifacts in a single transaction, the body holds the artifacts and their store params:
+    {"artifacts": [{"key": <key>, "uid": <uid/tree>, "iter": <iteration>, "tag": <tag>, "artifact": <artifact>}]}
+    """
+    data = None
+    try:
+        data = await request.json()
+    except ValueError:
+        log_and_raise(HTTPStatus.BAD_REQUEST.value, reason="bad JSON body")
+    artifacts = data.get("artifacts") if isinstance(data, dict) else None
+    if not isinstance(artifacts, list):
+        log_and_raise(
+            HTTPStatus.BAD_REQUEST.value, reason="expected a list of artifacts"
+        )
+
+    await run_in_threadpool(
+        mlrun.api.utils.singletons.project_member.get_project_member().ensure_project,
+        db_session,
+        project,
+        auth_info=auth_info,
+    )
+    await run_in_threadpool(
+        mlrun.api.utils.auth.verifier.AuthVerifier().query_project_resources_permissions,
+        mlrun.api.schemas.AuthorizationResourceTypes.artifact,
+        artifacts,
+        lambda item: (project, item.get("key")),
+        mlrun.api.schemas.AuthorizationAction.store,
+        auth_info,
+    )
+
+    logger.debug("Storing artifacts", project=project, artifacts_count=len(artifacts))
+    await run_in_threadpool(
+        mlrun.api.crud.Artifacts().store_artifacts,
+        db_session,
+        artifacts,
+        project,
+    )
+    return {}
+
+
 @router.get("/projects/{project}/artifact-tags")
 def list_artifact_tags(
     project: str,
@@ -154,6 +201,9 @@ def list_artifacts(
     iter: int = Query(None, ge=0),
     best_iteration: bool = Query(False, alias="best-iteration"),
     format_: ArtifactsFormat = Query(ArtifactsFormat.legacy, alias="format"),
+    page_size: int = Query(None, alias="page-size", gt=0),
+    page_token: str = Query(None, alias="page-token"),
+    fields: List[str] = Query([], alias="field"),
     auth_info: mlrun.api.schemas.AuthInfo = Depends(deps.authenticate_request),
     db_session: Session = Depends(deps.get_db_session),
 ):
@@ -165,7 +215,7 @@ def list_artifacts(
         auth_info,
     )
 
-    artifacts = mlrun.api.crud.Artifacts().list_artifacts(
+    artifacts_page = mlrun.api.crud.Artifacts().list_artifacts(
         db_session,
         project,
         name,
@@ -176,16 +226,21 @@ def list_artifacts(
         iter=iter,
         best_iteration=best_iteration,
         format_=format_,
+        page_size=page_size,
+        page_token=page_token,
     )
 
     artifacts = mlrun.api.utils.auth.verifier.AuthVerifier().filter_project_resources_by_permissions(
         mlrun.api.schemas.AuthorizationResourceTypes.artifact,
-        artifacts,
+        artifacts_page,
         _artifact_project_and_resource_name_extractor,
         auth_info,
     )
+    if fields:
+        artifacts = [select_fields(artifact, fields) for artifact in artifacts]
     return {
         "artifacts": artifacts,
+        "next_page_token": artifacts_page.next_page_token,
     }
 
 
@@ -12,11 +12,16 @@ import mlrun.feature_store
 from mlrun import v3io_cred
 from mlrun.api import schemas
 from mlrun.api.api import deps
-from mlrun.api.api.utils import log_and_raise, parse_reference
+from mlrun.api.api.utils import (
+    conditional_json_response,
+    log_and_raise,
+    parse_reference,
+)
 from mlrun.data_types import InferOptions
 from mlrun.datastore.targets import get_default_prefix_for_target
 from mlrun.feature_store.api import RunConfig, ingest
 from mlrun.model import DataSource, DataTargetBase
+from mlrun.utils import parse_versioned_object_uri
 
 router = APIRouter()
 
@@ -137,6 +142,7 @@ def get_feature_set(
     project: str,
     name: str,
     reference: str,
+    if_none_match: str = Header(None),
     auth_info: mlrun.api.schemas.AuthInfo = Depends(deps.authenticate_request),
     db_session: Session = Depends(deps.get_db_session),
 ):
@@ -151,7 +157,50 @@ def get_feature_set(
         mlrun.api.schemas.AuthorizationAction.read,
         auth_info,
     )
-    return feature_set
+    return conditional_json_response(feature_set, if_none_match)
+
+
+@router.get(
+    "/projects/{project}/feature-sets/batch",
+    response_model=schemas.FeatureSetsOutput,
+)
+def get_feature_sets(
+    project: str,
+    names: List[str] = Query(..., alias="name"),
+    tag: str = None,
+    if_none_match: str = Header(None),
+    auth_info: mlrun.api.schemas.AuthInfo = Depends(deps.authenticate_request),
+    db_session: Session = Depends(deps.get_db_session),
+):
+    """
+    Get multiple feature sets (in the given order) in a single request. Every name may hold its own reference
+    (name:tag or name@uid), otherwise the given tag (default to latest) is used.
+    """
+    feature_sets = []
+    for name in names:
+        _, name, name_tag, uid = parse_versioned_object_uri(name)
+        feature_sets.append(
+            mlrun.api.crud.FeatureStore().get_feature_set(
+                db_session,
+                project,
+                name,
+                None if uid else name_tag or tag or "latest",
+                uid or None,
+            )
+        )
+    mlrun.api.utils.auth.verifier.AuthVerifier().query_project_resources_permissions(
+        mlrun.api.schemas.AuthorizationResourceTypes.feature_set,
+        feature_sets,
+        lambda feature_set: (
+            feature_set.metadata.project,
+            feature_set.metadata.name,
+        ),
+        mlrun.api.schemas.AuthorizationAction.read,
+        auth_info,
+    )
+    return conditional_json_response(
+        mlrun.api.schemas.FeatureSetsOutput(feature_sets=feature_sets), if_none_match
+    )
 
 
 @router.delete("/projects/{project}/feature-sets/{name}")
@@ -503,6 +552,7 @@ def get_feature_vector(
     project: str,
     name: str,
     reference: str,
+    if_none_match: str = Header(None),
     auth_info: mlrun.api.schemas.AuthInfo = Depends(deps.authenticate_request),
     db_session: Session = Depends(deps.get_db_session),
 ):
@@ -520,7 +570,7 @@ def get_feature_vector(
     _verify_feature_vector_features_permissions(
         auth_info, project, feature_vector.dict()
     )
-    return feature_vector
+    return conditional_json_response(feature_vector, if_none_match)
 
 
 @router.get(
@@ -25,7 +25,12 @@ import mlrun.api.utils.auth.verifier
 import mlrun.api.utils.background_tasks
 import mlrun.api.utils.singletons.project_member
 from mlrun.api.api import deps
-from mlrun.api.api.utils import get_run_db_instance, log_and_raise, log_path
+from mlrun.api.api.utils import (
+    conditional_json_response,
+    get_run_db_instance,
+    log_and_raise,
+    log_path,
+)
 from mlrun.api.crud.secrets import Secrets, SecretsClientType
 from mlrun.api.schemas import SecretProviderName, SecretsData
 from mlrun.api.utils.singletons.k8s import get_k8s
@@ -93,6 +98,7 @@ def get_function(
     name: str,
     tag: str = "",
     hash_key="",
+    if_none_match: str = Header(None),
     auth_info: mlrun.api.schemas.AuthInfo = Depends(deps.authenticate_request),
     db_session: Session = Depends(deps.get_db_session),
 ):
@@ -106,9 +112,12 @@ def get_function(
         mlrun.api.schemas.AuthorizationAction.read,
         auth_info,
     )
-    return {
-        "func": func,
-    }
+    return conditional_json_response(
+        {
+            "func": func,
+        },
+        if_none_match,
+    )
 
 
 @router.delete(
@@ -1,5 +1,6 @@
 import fastapi
 import fastapi.concurrency
+import fastapi.responses
 import sqlalchemy.orm
 
 import mlrun.api.api.deps
@@ -70,3 +71,36 @@ def get_log(
         "pod_status": run_state,
     }
     return fastapi.Response(content=log, media_type="text/plain", headers=headers)
+
+
+@router.get("/log/{project}/{uid}/stream")
+async def stream_log(
+    project: str,
+    uid: str,
+    offset: int = 0,
+    auth_info: mlrun.api.schemas.AuthInfo = fastapi.Depends(
+        mlrun.api.api.deps.authenticate_request
+    ),
+):
+    """
+    Stream the log from the given offset (chunked) and follow it while the run is in a non terminal state. The
+    x-mlrun-run-state header holds the run state when the stream started, once the stream ended the client should
+    get the run state (using the get log endpoint), and reconnect from its updated offset if the run didn't end.
+    """
+    await fastapi.concurrency.run_in_threadpool(
+        mlrun.api.utils.auth.verifier.AuthVerifier().query_project_resource_permissions,
+        mlrun.api.schemas.AuthorizationResourceTypes.log,
+        project,
+        uid,
+        mlrun.api.schemas.AuthorizationAction.read,
+        auth_info,
+    )
+    # no db session dependency - it would be held (with its pooled connection) until the stream ends
+    run_state = await fastapi.concurrency.run_in_threadpool(
+        mlrun.api.crud.Logs().read_run_state, project, uid
+    )
+    return fastapi.responses.StreamingResponse(
+        mlrun.api.crud.Logs().stream_logs(project, uid, offset),
+        media_type="text/plain",
+        headers={"x-mlrun-run-state": run_state},
+    )
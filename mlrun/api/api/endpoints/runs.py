@@ -13,7 +13,7 @@ import mlrun.api.utils.singletons.project_member
 from mlrun.api.api import deps
 from mlrun.api.api.utils import log_and_raise
 from mlrun.utils import logger
-from mlrun.utils.helpers import datetime_from_iso
+from mlrun.utils.helpers import datetime_from_iso, select_fields
 
 router = APIRouter()
 
@@ -59,6 +59,48 @@ async def store_run(
     return {}
 
 
+@router.post("/projects/{project}/runs")
+async def store_runs(
+    request: Request,
+    project: str,
+    auth_info: mlrun.api.schemas.AuthInfo = Depends(deps.authenticate_request),
+    db_session: Session = Depends(deps.get_db_session),
+):
+    """store a batch of runs (e.g. the iterations of a hyper-param run) in a single transaction"""
+    data = None
+    try:
+        data = await request.json()
+    except ValueError:
+        log_and_raise(HTTPStatus.BAD_REQUEST.value, reason="bad JSON body")
+    runs = data.get("runs") if isinstance(data, dict) else None
+    if not isinstance(runs, list):
+        log_and_raise(HTTPStatus.BAD_REQUEST.value, reason="expected a list of runs")
+
+    await run_in_threadpool(
+        mlrun.api.utils.singletons.project_member.get_project_member().ensure_project,
+        db_session,
+        project,
+        auth_info=auth_info,
+    )
+    await run_in_threadpool(
+        mlrun.api.utils.auth.verifier.AuthVerifier().query_project_resources_permissions,
+        mlrun.api.schemas.AuthorizationResourceTypes.run,
+        runs,
+        lambda run: (project, run.get("metadata", {}).get("uid")),
+        mlrun.api.schemas.AuthorizationAction.store,
+        auth_info,
+    )
+
+    logger.info("Storing runs", project=project, runs_count=len(runs))
+    await run_in_threadpool(
+        mlrun.api.crud.Runs().store_runs,
+        db_session,
+        runs,
+        project,
+    )
+    return {}
+
+
 @router.patch("/run/{project}/{uid}")
 async def update_run(
     request: Request,
@@ -163,6 +205,9 @@ def list_runs(
         mlrun.api.schemas.OrderType.desc, alias="partition-order"
     ),
     max_partitions: int = Query(0, alias="max-partitions", ge=0),
+    page_size: int = Query(None, alias="page-size", gt=0),
+    page_token: str = Query(None, alias="page-token"),
+    fields: List[str] = Query([], alias="field"),
     auth_info: mlrun.api.schemas.AuthInfo = Depends(deps.authenticate_request),
     db_session: Session = Depends(deps.get_db_session),
 ):
@@ -191,6 +236,8 @@ def list_runs(
         partition_sort_by,
         partition_order,
         max_partitions,
+        page_size,
+        page_token,
     )
     filtered_runs = mlrun.api.utils.auth.verifier.AuthVerifier().filter_project_resources_by_permissions(
         mlrun.api.schemas.AuthorizationResourceTypes.run,
@@ -201,8 +248,11 @@ def list_runs(
         ),
         auth_info,
     )
+    if fields:
+        filtered_runs = [select_fields(run, fields) for run in filtered_runs]
     return {
         "runs": filtered_runs,
+        "next_page_token": runs.next_page_token,
     }
 
 
@@ -107,6 +107,13 @@ def list_schedules(
     return schedules
 
 
+@router.get("/schedules/metrics", response_model=schemas.SchedulerMetrics)
+def get_scheduler_metrics(
+    auth_info: mlrun.api.schemas.AuthInfo = Depends(deps.authenticate_request),
+):
+    return get_scheduler().get_metrics()
+
+
 @router.get(
     "/projects/{project}/schedules/{name}", response_model=schemas.ScheduleOutput
 )
@@ -1,4 +1,5 @@
 import collections
+import json
 import re
 import traceback
 import typing
@@ -7,8 +8,9 @@ from http import HTTPStatus
 from os import environ
 from pathlib import Path
 
+import fastapi.encoders
 import kubernetes.client
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
@@ -549,3 +551,18 @@ def parse_reference(reference: str):
     else:
         uid = regex_match.string
     return tag, uid
+
+
+def conditional_json_response(body, if_none_match: str = None) -> Response:
+    """
+    JSON response with an ETag (the hash of the response content), or an empty 304 (not modified) response when the
+    given If-None-Match header holds the same ETag, so clients can validate their cached metadata objects
+    """
+    content = json.dumps(
+        fastapi.encoders.jsonable_encoder(body), sort_keys=True, separators=(",", ":")
+    )
+    etag = f'"{sha1(content.encode()).hexdigest()}"'
+    headers = {"ETag": etag}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=HTTPStatus.NOT_MODIFIED.value, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
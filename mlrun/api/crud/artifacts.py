@@ -8,6 +8,7 @@ import mlrun.api.utils.singletons.db
 import mlrun.api.utils.singletons.project_member
 import mlrun.config
 import mlrun.errors
+import mlrun.lists
 import mlrun.utils.singleton
 from mlrun.api.schemas.artifact import ArtifactsFormat
 
@@ -26,15 +27,7 @@ class Artifacts(
         project: str = mlrun.mlconf.default_project,
     ):
         project = project or mlrun.mlconf.default_project
-        # In case project is an empty string the setdefault won't catch it
-        if not data.setdefault("project", project):
-            data["project"] = project
-
-        if data["project"] != project:
-            raise mlrun.errors.MLRunInvalidArgumentError(
-                f"Artifact with conflicting project name - {data['project']} while request project : {project}."
-                f"key={key}, uid={uid}, data={data}"
-            )
+        self._ensure_artifact_project(data, project, key, uid)
         mlrun.api.utils.singletons.db.get_db().store_artifact(
             db_session,
             key,
@@ -45,6 +38,45 @@ class Artifacts(
             project,
         )
 
+    def store_artifacts(
+        self,
+        db_session: sqlalchemy.orm.Session,
+        artifacts: typing.List[dict],
+        project: str = mlrun.mlconf.default_project,
+    ):
+        """
+        :param artifacts: the artifacts to store, each item holds the artifact and its store params:
+            {"key": <key>, "uid": <uid/tree>, "iter": <iteration>, "tag": <tag>, "artifact": <artifact dict>}
+        """
+        project = project or mlrun.mlconf.default_project
+        for item in artifacts:
+            if not isinstance(item, dict) or "artifact" not in item:
+                raise mlrun.errors.MLRunInvalidArgumentError(
+                    f"Artifact item must be a dict with the artifact and its key and uid, got {item}"
+                )
+            if not item.get("key") or not item.get("uid"):
+                raise mlrun.errors.MLRunInvalidArgumentError(
+                    f"Artifact key and uid must be given, key={item.get('key')}, uid={item.get('uid')}"
+                )
+            self._ensure_artifact_project(
+                item["artifact"], project, item["key"], item["uid"]
+            )
+        mlrun.api.utils.singletons.db.get_db().store_artifacts(
+            db_session, artifacts, project
+        )
+
+    @staticmethod
+    def _ensure_artifact_project(data: dict, project: str, key: str, uid: str):
+        # In case project is an empty string the setdefault won't catch it
+        if not data.setdefault("project", project):
+            data["project"] = project
+
+        if data["project"] != project:
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                f"Artifact with conflicting project name - {data['project']} while request project : {project}."
+                f"key={key}, uid={uid}, data={data}"
+            )
+
     def get_artifact(
         self,
         db_session: sqlalchemy.orm.Session,
@@ -80,7 +112,9 @@ class Artifacts(
         iter: typing.Optional[int] = None,
         best_iteration: bool = False,
         format_: ArtifactsFormat = ArtifactsFormat.legacy,
-    ) -> typing.List:
+        page_size: typing.Optional[int] = None,
+        page_token: typing.Optional[str] = None,
+    ) -> mlrun.lists.ArtifactList:
         project = project or mlrun.mlconf.default_project
         if labels is None:
             labels = []
@@ -96,13 +130,17 @@ class Artifacts(
             category,
             iter,
             best_iteration,
+            page_size=page_size,
+            page_token=page_token,
         )
         if format_ != ArtifactsFormat.legacy:
             return artifacts
-        return [
+        legacy_artifacts = mlrun.lists.ArtifactList(
             _transform_artifact_struct_to_legacy_format(artifact)
             for artifact in artifacts
-        ]
+        )
+        legacy_artifacts.next_page_token = artifacts.next_page_token
+        return legacy_artifacts
 
     def delete_artifact(
         self,
@@ -1,17 +1,22 @@
+import asyncio
+import math
 import os
 import shutil
+import time
 import typing
-from http import HTTPStatus
 
+import fastapi.concurrency
+import urllib3.exceptions
 from sqlalchemy.orm import Session
 
 import mlrun.api.schemas
 import mlrun.utils.singleton
-from mlrun.api.api.utils import log_and_raise, log_path, project_logs_path
+from mlrun.api.api.utils import log_path, project_logs_path
 from mlrun.api.constants import LogSources
+from mlrun.api.db.session import close_session, create_session
 from mlrun.api.utils.singletons.db import get_db
 from mlrun.api.utils.singletons.k8s import get_k8s
-from mlrun.runtimes.constants import PodPhases
+from mlrun.runtimes.constants import PodPhases, RunStates
 
 
 class Logs(
@@ -57,10 +62,8 @@ class Logs(
         project = project or mlrun.mlconf.default_project
         out = b""
         log_file = log_path(project, uid)
-        data = get_db().read_run(db_session, uid, project)
-        if not data:
-            log_and_raise(HTTPStatus.NOT_FOUND.value, project=project, uid=uid)
-        run_state = data.get("status", {}).get("state", "")
+        # only the state is needed (not the whole run body)
+        run_state = get_db().read_run_state(db_session, uid, project)
         if log_file.exists() and source in [LogSources.AUTO, LogSources.PERSISTENCY]:
             with log_file.open("rb") as fp:
                 fp.seek(offset)
@@ -76,6 +79,166 @@ class Logs(
                             out = resp.encode()[offset:]
         return run_state, out
 
+    async def stream_logs(
+        self,
+        project: str,
+        uid: str,
+        offset: int = 0,
+    ) -> typing.AsyncIterator[bytes]:
+        """
+        Stream the log from the given offset, and follow it (the persisted log file or the pod log) while the run
+        is in a non terminal state. The stream ends when the run reached a terminal state (and all of its log was
+        streamed) or after the logs stream_timeout, then the client should reconnect with its updated offset.
+        """
+        project = project or mlrun.mlconf.default_project
+        deadline = time.monotonic() + float(mlrun.mlconf.httpdb.logs.stream_timeout)
+        follow_interval = float(mlrun.mlconf.httpdb.logs.follow_interval)
+        log_file = log_path(project, uid)
+        while True:
+            if log_file.exists():
+                async for chunk in self._follow_log_file(
+                    project, uid, log_file, offset, deadline
+                ):
+                    yield chunk
+                return
+
+            pod = await fastapi.concurrency.run_in_threadpool(
+                self._get_running_logger_pod, project, uid
+            )
+            if pod:
+                async for chunk in self._follow_pod_log(pod, offset, deadline):
+                    yield chunk
+                return
+
+            # there is no log yet, wait for it
+            run_state = await fastapi.concurrency.run_in_threadpool(
+                self.read_run_state, project, uid
+            )
+            if run_state in RunStates.terminal_states() or time.monotonic() > deadline:
+                return
+            await asyncio.sleep(follow_interval)
+
+    async def _follow_log_file(
+        self,
+        project: str,
+        uid: str,
+        log_file,
+        offset: int,
+        deadline: float,
+        chunk_size: int = 64 * 1024,
+    ) -> typing.AsyncIterator[bytes]:
+        follow_interval = float(mlrun.mlconf.httpdb.logs.follow_interval)
+        with log_file.open("rb") as fp:
+            fp.seek(offset)
+            while True:
+                chunk = fp.read(chunk_size)
+                if chunk:
+                    yield chunk
+                    continue
+
+                # reached the end of the log, the state is read only now (and not per chunk)
+                run_state = await fastapi.concurrency.run_in_threadpool(
+                    self.read_run_state, project, uid
+                )
+                if run_state in RunStates.terminal_states():
+                    # the log may be written after the state was updated
+                    chunk = fp.read()
+                    if chunk:
+                        yield chunk
+                    return
+                if time.monotonic() > deadline:
+                    return
+                await asyncio.sleep(follow_interval)
+
+    async def _follow_pod_log(
+        self, pod: str, offset: int, deadline: float, chunk_size: int = 64 * 1024
+    ) -> typing.AsyncIterator[bytes]:
+        read_timeout = float(mlrun.mlconf.httpdb.logs.pod_read_timeout)
+        # the pod log can't be read from an offset, so the already streamed bytes are skipped (once). the lines are
+        # read with their timestamps, so a stream which is reopened (after a read timeout) is resumed from the
+        # last streamed line instead of the start of the log
+        skip = offset
+        last_timestamp, last_timestamp_lines, last_read = None, 0, None
+        while time.monotonic() <= deadline:
+            since_seconds = None
+            if last_timestamp is not None:
+                # since_seconds is relative to the time the last line was read, with a margin for the latency (the
+                # lines streamed before are dropped by their timestamps)
+                since_seconds = math.ceil(time.monotonic() - last_read + read_timeout)
+            # every read is bounded by the read timeout, so a quiet pod doesn't hold a threadpool thread beyond the
+            # deadline (or after the client disconnected)
+            response = await fastapi.concurrency.run_in_threadpool(
+                get_k8s().stream_logs,
+                pod,
+                read_timeout=read_timeout,
+                since_seconds=since_seconds,
+                timestamps=True,
+            )
+            chunks = response.stream(chunk_size, decode_content=False)
+            # the lines of this stream with the last streamed timestamp (the first ones were already streamed)
+            timestamp_lines = 0
+            partial_line = b""
+            try:
+                while time.monotonic() <= deadline:
+                    try:
+                        chunk = await fastapi.concurrency.run_in_threadpool(
+                            next, chunks, None
+                        )
+                    except urllib3.exceptions.ReadTimeoutError:
+                        # no new log lines, reopen the stream (if the deadline didn't pass)
+                        break
+                    last_read = time.monotonic()
+                    lines = (partial_line + (chunk or b"")).split(b"\n")
+                    partial_line = lines.pop()
+                    lines = [line + b"\n" for line in lines]
+                    if chunk is None and partial_line:
+                        # the log ended without a new line
+                        lines.append(partial_line)
+                    out = []
+                    for line in lines:
+                        # the timestamps have a fixed width (nanoseconds), so they are ordered as strings
+                        timestamp, _, line = line.partition(b" ")
+                        if last_timestamp is not None and timestamp < last_timestamp:
+                            continue
+                        if timestamp == last_timestamp:
+                            timestamp_lines += 1
+                            if timestamp_lines <= last_timestamp_lines:
+                                continue
+                            last_timestamp_lines = timestamp_lines
+                        else:
+                            last_timestamp, last_timestamp_lines = timestamp, 1
+                            timestamp_lines = 1
+                        if skip:
+                            skipped = min(skip, len(line))
+                            line, skip = line[skipped:], skip - skipped
+                        out.append(line)
+                    out = b"".join(out)
+                    if out:
+                        yield out
+                    if chunk is None:
+                        return
+            finally:
+                response.close()
+
+    def _get_running_logger_pod(self, project: str, uid: str) -> typing.Optional[str]:
+        if not get_k8s() or not get_k8s().is_running_inside_kubernetes_cluster():
+            return None
+        pods = get_k8s().get_logger_pods(project, uid)
+        if pods:
+            pod, pod_phase = list(pods.items())[0]
+            if pod_phase != PodPhases.pending:
+                return pod
+        return None
+
+    @staticmethod
+    def read_run_state(project: str, uid: str) -> str:
+        """read the run state using a short lived db session (a session isn't held while a log is streamed)"""
+        db_session = create_session()
+        try:
+            return get_db().read_run_state(db_session, uid, project)
+        finally:
+            close_session(db_session)
+
     def get_log_mtime(self, project: str, uid: str) -> int:
         log_file = log_path(project, uid)
         if not log_file.exists():
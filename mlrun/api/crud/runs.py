@@ -36,6 +36,16 @@ class Runs(
             iter=iter,
         )
 
+    def store_runs(
+        self,
+        db_session: sqlalchemy.orm.Session,
+        runs: typing.List[dict],
+        project: str = mlrun.mlconf.default_project,
+    ):
+        project = project or mlrun.mlconf.default_project
+        logger.info("Storing runs", project=project, runs_count=len(runs))
+        mlrun.api.utils.singletons.db.get_db().store_runs(db_session, runs, project)
+
     def update_run(
         self,
         db_session: sqlalchemy.orm.Session,
@@ -91,6 +101,18 @@ class Runs(
             db_session, uid, project, iter
         )
 
+    def count_runs(
+        self,
+        db_session: sqlalchemy.orm.Session,
+        project: str = mlrun.mlconf.default_project,
+        labels=None,
+        states: typing.Optional[typing.List[str]] = None,
+    ) -> int:
+        project = project or mlrun.mlconf.default_project
+        return mlrun.api.utils.singletons.db.get_db().count_runs(
+            db_session, project, labels, states
+        )
+
     def list_runs(
         self,
         db_session: sqlalchemy.orm.Session,
@@ -111,7 +133,9 @@ class Runs(
         partition_sort_by: mlrun.api.schemas.SortField = None,
         partition_order: mlrun.api.schemas.OrderType = mlrun.api.schemas.OrderType.desc,
         max_partitions: int = 0,
-    ):
+        page_size: typing.Optional[int] = None,
+        page_token: typing.Optional[str] = None,
+    ) -> mlrun.lists.RunList:
         project = project or mlrun.mlconf.default_project
         return mlrun.api.utils.singletons.db.get_db().list_runs(
             db_session,
@@ -132,6 +156,8 @@ class Runs(
             partition_sort_by,
             partition_order,
             max_partitions,
+            page_size=page_size,
+            page_token=page_token,
         )
 
     def delete_run(
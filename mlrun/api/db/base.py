@@ -54,6 +54,16 @@ class DBInterface(ABC):
     ):
         pass
 
+    def store_runs(self, session, runs: List[dict], project=""):
+        for run in runs:
+            self.store_run(
+                session,
+                run,
+                run["metadata"]["uid"],
+                project,
+                run["metadata"].get("iteration") or 0,
+            )
+
     @abstractmethod
     def update_run(self, session, updates: dict, uid, project="", iter=0):
         pass
@@ -62,6 +72,14 @@ class DBInterface(ABC):
     def read_run(self, session, uid, project="", iter=0):
         pass
 
+    def read_run_state(self, session, uid, project="", iter=0) -> str:
+        """read only the state of the run, DB implementations should override it to avoid loading the run body"""
+        return (
+            self.read_run(session, uid, project, iter)
+            .get("status", {})
+            .get("state", "")
+        )
+
     @abstractmethod
     def list_runs(
         self,
@@ -83,9 +101,22 @@ class DBInterface(ABC):
         partition_sort_by: schemas.SortField = None,
         partition_order: schemas.OrderType = schemas.OrderType.desc,
         max_partitions: int = 0,
+        page_size: int = None,
+        page_token: str = None,
     ):
         pass
 
+    @abstractmethod
+    def count_runs(
+        self,
+        session,
+        project: str = "",
+        labels=None,
+        states: List[str] = None,
+        iter: bool = False,
+    ) -> int:
+        pass
+
     @abstractmethod
     def del_run(self, session, uid, project="", iter=0):
         pass
@@ -107,6 +138,18 @@ class DBInterface(ABC):
     ):
         pass
 
+    def store_artifacts(self, session, artifacts: List[dict], project=""):
+        for item in artifacts:
+            self.store_artifact(
+                session,
+                item["key"],
+                item["artifact"],
+                item["uid"],
+                item.get("iter"),
+                item.get("tag", ""),
+                project,
+            )
+
     @abstractmethod
     def read_artifact(self, session, key, tag="", iter=None, project=""):
         pass
@@ -125,6 +168,8 @@ class DBInterface(ABC):
         category: schemas.ArtifactCategories = None,
         iter: int = None,
         best_iteration: bool = False,
+        page_size: int = None,
+        page_token: str = None,
     ):
         pass
 
@@ -68,7 +68,10 @@ class FileDB(DBInterface):
         partition_sort_by: schemas.SortField = None,
         partition_order: schemas.OrderType = schemas.OrderType.desc,
         max_partitions: int = 0,
+        page_size: int = None,
+        page_token: str = None,
     ):
+        # pagination is not supported, all the runs are returned in a single page
         return self._transform_run_db_error(
             self.db.list_runs,
             name,
@@ -90,6 +93,20 @@ class FileDB(DBInterface):
             max_partitions,
         )
 
+    def count_runs(
+        self,
+        session,
+        project: str = "",
+        labels=None,
+        states: List[str] = None,
+        iter: bool = False,
+    ) -> int:
+        return len(
+            self.list_runs(
+                session, project=project, labels=labels, states=states, iter=iter
+            )
+        )
+
     def del_run(self, session, uid, project="", iter=0):
         return self._transform_run_db_error(self.db.del_run, uid, project, iter)
 
@@ -130,7 +147,10 @@ class FileDB(DBInterface):
         category: schemas.ArtifactCategories = None,
         iter: int = None,
         best_iteration: bool = False,
+        page_size: int = None,
+        page_token: str = None,
     ):
+        # pagination is not supported, all the artifacts are returned in a single page
         return self._transform_run_db_error(
             self.db.list_artifacts, name, project, tag, labels, since, until
         )
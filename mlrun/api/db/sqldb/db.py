@@ -1,12 +1,15 @@
 import asyncio
 import collections
+import functools
 import re
+import threading
 import typing
 from copy import deepcopy
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Tuple
 
 import fastapi.concurrency
+import humanfriendly
 import mergedeep
 import pytz
 from sqlalchemy import and_, distinct, func, or_
@@ -20,11 +23,14 @@ import mlrun.errors
 from mlrun.api import schemas
 from mlrun.api.db.base import DBInterface
 from mlrun.api.db.sqldb.helpers import (
+    decode_page_token,
+    encode_page_token,
     generate_query_predicate_for_name,
     label_set,
     run_labels,
     run_start_time,
     run_state,
+    update_artifact_columns,
     update_labels,
 )
 from mlrun.api.db.sqldb.models import (
@@ -118,9 +124,17 @@ class SQLDB(DBInterface):
     def __init__(self, dsn):
         self.dsn = dsn
         self._cache = {
-            "project_resources_counters": {"value": None, "ttl": datetime.min}
+            "project_resources_counters": {
+                "value": None,
+                "ttl": datetime.min,
+                # projects which their resources were changed since their counters were calculated
+                "outdated_projects": set(),
+            }
         }
+        self._project_resources_counters_lock = threading.Lock()
         self._name_with_iter_regex = re.compile("^[0-9]+-.+$")
+        # the max number of values passed to a single "in" filter
+        self._max_query_parameters = 500
 
     def initialize(self, session):
         pass
@@ -163,7 +177,58 @@ class SQLDB(DBInterface):
             "Storing run to db", project=project, uid=uid, iter=iter, run=run_data
         )
         run = self._get_run(session, uid, project, iter)
+        run = self._update_run_record(run, run_data, uid, project, iter)
+        self._upsert(session, [run], ignore=True)
+        self._mark_project_resources_counters_outdated(project)
+
+    @retry_on_conflict
+    def store_runs(self, session, runs: List[dict], project=""):
+        """
+        store several runs in a single transaction, the uid and iteration of each run are taken from its metadata
+        """
+        project = project or config.default_project
+        logger.debug("Storing runs to db", project=project, runs_count=len(runs))
+        runs_by_identifier = {}
+        for run_data in runs:
+            metadata = run_data.get("metadata", {})
+            if not metadata.get("uid"):
+                raise mlrun.errors.MLRunInvalidArgumentError(
+                    f"Run uid is missing from the run metadata: {metadata}"
+                )
+            # when the same run is given more than once, the last one wins
+            runs_by_identifier[
+                (metadata["uid"], int(metadata.get("iteration") or 0))
+            ] = run_data
+
+        uids = list({uid for uid, _ in runs_by_identifier})
+        existing_runs = {}
+        for index in range(0, len(uids), self._max_query_parameters):
+            query = self._query(session, Run, project=project).filter(
+                Run.uid.in_(uids[index : index + self._max_query_parameters])
+            )
+            for run in query:
+                existing_runs[(run.uid, run.iteration)] = run
+
         now = datetime.now(timezone.utc)
+        run_records = [
+            self._update_run_record(
+                existing_runs.get((uid, iter)), run_data, uid, project, iter, now
+            )
+            for (uid, iter), run_data in runs_by_identifier.items()
+        ]
+        self._upsert(session, run_records, ignore=True)
+        self._mark_project_resources_counters_outdated(project)
+
+    def _update_run_record(
+        self,
+        run: typing.Optional[Run],
+        run_data: dict,
+        uid: str,
+        project: str,
+        iter: int,
+        now: typing.Optional[datetime] = None,
+    ) -> Run:
+        now = now or datetime.now(timezone.utc)
         if not run:
             run = Run(
                 name=run_data["metadata"]["name"],
@@ -186,7 +251,7 @@ class SQLDB(DBInterface):
         run.start_time = start_time
         self._update_run_updated_time(run, run_data, now=now)
         run.struct = run_data
-        self._upsert(session, [run], ignore=True)
+        return run
 
     def update_run(self, session, updates: dict, uid, project="", iter=0):
         project = project or config.default_project
@@ -207,6 +272,7 @@ class SQLDB(DBInterface):
         run.struct = struct
         self._upsert(session, [run])
         self._delete_empty_labels(session, Run.Label)
+        self._mark_project_resources_counters_outdated(project)
 
     def read_run(self, session, uid, project=None, iter=0):
         project = project or config.default_project
@@ -215,6 +281,17 @@ class SQLDB(DBInterface):
             raise mlrun.errors.MLRunNotFoundError(f"Run {uid}:{project} not found")
         return run.struct
 
+    def read_run_state(self, session, uid, project=None, iter=0) -> str:
+        project = project or config.default_project
+        run_state = (
+            session.query(Run.state)
+            .filter_by(uid=uid, project=project, iteration=iter)
+            .one_or_none()
+        )
+        if not run_state:
+            raise mlrun.errors.MLRunNotFoundError(f"Run {uid}:{project} not found")
+        return run_state[0] or ""
+
     def list_runs(
         self,
         session,
@@ -235,8 +312,14 @@ class SQLDB(DBInterface):
         partition_sort_by: schemas.SortField = None,
         partition_order: schemas.OrderType = schemas.OrderType.desc,
         max_partitions: int = 0,
+        page_size: int = None,
+        page_token: str = None,
     ):
         project = project or config.default_project
+        if (page_size or page_token) and (last or partition_by):
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                "Pagination can not be used together with last or partition_by"
+            )
         query = self._find_runs(session, uid, project, labels)
         if name is not None:
             query = self._add_run_name_query(query, name)
@@ -250,6 +333,10 @@ class SQLDB(DBInterface):
             query = query.filter(Run.updated >= last_update_time_from)
         if last_update_time_to is not None:
             query = query.filter(Run.updated <= last_update_time_to)
+        if not iter:
+            query = query.filter(Run.iteration == 0)
+        if page_size or page_token:
+            return self._list_runs_page(session, query, sort, page_size, page_token)
         if sort:
             query = query.order_by(Run.start_time.desc())
         if last:
@@ -258,8 +345,6 @@ class SQLDB(DBInterface):
                     "Limiting the number of returned records without sorting will provide non-deterministic results"
                 )
             query = query.limit(last)
-        if not iter:
-            query = query.filter(Run.iteration == 0)
 
         if partition_by:
             self._assert_partition_by_parameters(
@@ -282,10 +367,69 @@ class SQLDB(DBInterface):
 
         return runs
 
+    def _list_runs_page(self, session, query, sort, page_size, page_token):
+        """
+        keyset pagination - the page token holds the sort key of the last run of the previous page, so each page is
+        queried directly (unlike offset pagination which scans all the previous pages)
+        """
+        page_size = self._resolve_page_size(page_size)
+        position = decode_page_token(page_token) if page_token else None
+        if sort:
+            if position and position.get("start_time"):
+                start_time = datetime.fromisoformat(position["start_time"])
+                query = query.filter(
+                    or_(
+                        Run.start_time < start_time,
+                        and_(Run.start_time == start_time, Run.id < position["id"]),
+                        Run.start_time.is_(None),
+                    )
+                )
+            elif position:
+                # runs without start time are sorted last
+                query = query.filter(
+                    and_(Run.start_time.is_(None), Run.id < position["id"])
+                )
+            query = query.order_by(Run.start_time.desc(), Run.id.desc())
+        else:
+            if position:
+                query = query.filter(Run.id > position["id"])
+            query = query.order_by(Run.id)
+
+        # query one more run, to know whether there's a next page
+        run_records = query.limit(page_size + 1).all()
+        runs = RunList(run.struct for run in run_records[:page_size])
+        if len(run_records) > page_size:
+            last_run = run_records[page_size - 1]
+            start_time = (
+                last_run.start_time.isoformat() if last_run.start_time else None
+            )
+            runs.next_page_token = encode_page_token(
+                {"id": last_run.id, "start_time": start_time}
+            )
+        return runs
+
+    def count_runs(
+        self,
+        session,
+        project: str = None,
+        labels=None,
+        states: typing.List[str] = None,
+        iter: bool = False,
+    ) -> int:
+        """count the runs without loading them (e.g. for the schedules concurrency limit)"""
+        project = project or config.default_project
+        query = self._find_runs(session, None, project, labels)
+        if states is not None:
+            query = query.filter(Run.state.in_(states))
+        if not iter:
+            query = query.filter(Run.iteration == 0)
+        return query.with_entities(func.count(Run.id)).scalar()
+
     def del_run(self, session, uid, project=None, iter=0):
         project = project or config.default_project
         # We currently delete *all* iterations
         self._delete(session, Run, uid=uid, project=project)
+        self._mark_project_resources_counters_outdated(project)
 
     def del_runs(
         self, session, name=None, project=None, labels=None, state=None, days_ago=0
@@ -302,6 +446,7 @@ class SQLDB(DBInterface):
         for run in query:  # Can not use query.delete with join
             session.delete(run)
         session.commit()
+        self._mark_project_resources_counters_outdated(project)
 
     def _add_run_name_query(self, query, name):
         exact_name = self._escape_characters_for_like_query(name)
@@ -409,6 +554,88 @@ class SQLDB(DBInterface):
         tag_artifact=True,
     ):
         project = project or config.default_project
+        artifact, key, updated, labels = self._process_artifact_to_store(
+            artifact, key, iter
+        )
+        art = self._get_artifact(session, uid, project, key)
+        art = self._update_artifact_record(
+            art, artifact, key, uid, iter, project, updated, labels
+        )
+        self._upsert(session, [art])
+        if tag_artifact:
+            tag = tag or "latest"
+            self.tag_artifacts(session, [art], project, tag)
+        self._mark_project_resources_counters_outdated(project)
+
+    @retry_on_conflict
+    def store_artifacts(self, session, artifacts: List[dict], project=""):
+        """
+        store (and tag) several artifacts in a single transaction, each item holds the artifact and its store params:
+        {"key": <key>, "uid": <uid/tree>, "iter": <iteration>, "tag": <tag>, "artifact": <artifact dict>}
+        """
+        project = project or config.default_project
+        logger.debug(
+            "Storing artifacts to db", project=project, artifacts_count=len(artifacts)
+        )
+        artifacts_by_identifier = {}
+        for item in artifacts:
+            iter = item.get("iter")
+            artifact, key, updated, labels = self._process_artifact_to_store(
+                item["artifact"], item["key"], iter
+            )
+            # when the same artifact is given more than once, the last one wins
+            artifacts_by_identifier[(key, item["uid"])] = (
+                artifact,
+                iter,
+                item.get("tag") or "latest",
+                updated,
+                labels,
+            )
+
+        keys = list({key for key, _ in artifacts_by_identifier})
+        existing_artifacts = {}
+        for index in range(0, len(keys), self._max_query_parameters):
+            query = self._query(session, Artifact, project=project).filter(
+                Artifact.key.in_(keys[index : index + self._max_query_parameters])
+            )
+            for artifact_record in query:
+                existing_artifacts[
+                    (artifact_record.key, artifact_record.uid)
+                ] = artifact_record
+
+        artifact_records = []
+        artifacts_by_tag = collections.defaultdict(list)
+        for (key, uid), (
+            artifact,
+            iter,
+            tag,
+            updated,
+            labels,
+        ) in artifacts_by_identifier.items():
+            artifact_record = self._update_artifact_record(
+                existing_artifacts.get((key, uid)),
+                artifact,
+                key,
+                uid,
+                iter,
+                project,
+                updated,
+                labels,
+            )
+            artifact_records.append(artifact_record)
+            artifacts_by_tag[tag].append(artifact_record)
+
+        # flush to get the ids of the new artifacts (for their tags), all the changes are committed together
+        session.add_all(artifact_records)
+        session.flush()
+        for tag, tagged_artifacts in artifacts_by_tag.items():
+            session.add_all(
+                self._generate_artifact_tags(session, tagged_artifacts, project, tag)
+            )
+        self._commit(session, artifact_records)
+        self._mark_project_resources_counters_outdated(project)
+
+    def _process_artifact_to_store(self, artifact, key, iter=None):
         artifact = deepcopy(artifact)
         if is_legacy_artifact(artifact):
             updated, key, labels = self._process_legacy_artifact_dict_to_store(
@@ -418,17 +645,54 @@ class SQLDB(DBInterface):
             updated, key, labels = self._process_artifact_dict_to_store(
                 artifact, key, iter
             )
+        return artifact, key, updated, labels
 
-        art = self._get_artifact(session, uid, project, key)
-        if not art:
-            art = Artifact(key=key, uid=uid, updated=updated, project=project)
-        update_labels(art, labels)
+    @staticmethod
+    def _update_artifact_record(
+        artifact_record: typing.Optional[Artifact],
+        artifact: dict,
+        key: str,
+        uid: str,
+        iter: typing.Optional[int],
+        project: str,
+        updated,
+        labels: dict,
+    ) -> Artifact:
+        if not artifact_record:
+            artifact_record = Artifact(
+                key=key, uid=uid, updated=updated, project=project
+            )
+        update_labels(artifact_record, labels)
+        artifact_record.struct = artifact
+        update_artifact_columns(artifact_record, artifact, iter or 0)
+        return artifact_record
+
+    def _generate_artifact_tags(
+        self, session, artifacts: List[Artifact], project: str, name: str
+    ) -> list:
+        """the tag records (existing ones are updated) for tagging the given artifacts with the given tag name"""
+        existing_tags = {}
+        keys = list({artifact.key for artifact in artifacts})
+        for index in range(0, len(keys), self._max_query_parameters):
+            query = (
+                self._query(session, Artifact.Tag, project=project, name=name)
+                .join(Artifact)
+                .filter(
+                    Artifact.key.in_(keys[index : index + self._max_query_parameters])
+                )
+                .with_entities(Artifact.Tag, Artifact.key)
+            )
+            for tag, key in query:
+                existing_tags[key] = tag
 
-        art.struct = artifact
-        self._upsert(session, [art])
-        if tag_artifact:
-            tag = tag or "latest"
-            self.tag_artifacts(session, [art], project, tag)
+        tags = {}
+        for artifact in artifacts:
+            tag = tags.get(artifact.key) or existing_tags.get(artifact.key)
+            if not tag:
+                tag = Artifact.Tag(project=project, name=name)
+            tag.obj_id = artifact.id
+            tags[artifact.key] = tag
+        return list(tags.values())
 
     @staticmethod
     def _set_tag_in_artifact_struct(artifact, tag):
@@ -506,6 +770,8 @@ class SQLDB(DBInterface):
         category: schemas.ArtifactCategories = None,
         iter: int = None,
         best_iteration: bool = False,
+        page_size: int = None,
+        page_token: str = None,
     ):
         project = project or config.default_project
 
@@ -526,38 +792,34 @@ class SQLDB(DBInterface):
                 ids = self._resolve_tag(session, Artifact, project, tag)
 
         artifacts = ArtifactList()
-        artifact_records = self._find_artifacts(
+        query = self._find_artifacts_query(
             session, project, ids, labels, since, until, name, kind, category, iter
         )
-        indexed_artifacts = {artifact.key: artifact for artifact in artifact_records}
-        for artifact in artifact_records:
-            has_iteration = self._name_with_iter_regex.match(artifact.key)
+        records_query = query
+        # We need special handling for the case where iter==0, since in that case no iter prefix will exist.
+        # The best iterations are resolved from the artifacts which don't belong to an iteration as well
+        if best_iteration or iter == 0:
+            records_query = query.filter(Artifact.iteration == 0)
 
-            # Handle case of looking for best iteration. In that case if there's a linked iteration, we look
-            # for it in the results and return the linked artifact if exists. If original iter is not 0 then
-            # we skip this item.
-            if best_iteration:
-                if has_iteration:
-                    continue
-                if is_legacy_artifact(artifact.struct):
-                    link_iteration = artifact.struct.get("link_iteration")
-                else:
-                    link_iteration = artifact.struct["spec"].get("link_iteration")
-
-                if link_iteration:
-                    linked_key = f"{link_iteration}-{artifact.key}"
-                    linked_artifact = indexed_artifacts.get(linked_key)
-                    if linked_artifact:
-                        artifact = linked_artifact
-                    else:
-                        continue
+        paginated = page_size or page_token
+        if paginated:
+            artifact_records, artifacts.next_page_token = self._get_artifacts_page(
+                records_query, page_size, page_token
+            )
+        else:
+            artifact_records = records_query.all()
 
-            # We need special handling for the case where iter==0, since in that case no iter prefix will exist.
-            # Regex support is db-specific, and SQLAlchemy actually implements Python regex for SQLite anyway,
-            # and even that only in SA 1.4. So doing this here rather than in the query.
-            if iter == 0 and has_iteration:
-                continue
+        if best_iteration:
+            artifact_records = self._resolve_best_iteration_artifacts(
+                query, artifact_records
+            )
+        elif category:
+            # when paginated, the linked artifacts may be in other pages
+            artifact_records = self._filter_out_extra_link_artifacts(
+                artifact_records, query if paginated else None
+            )
 
+        for artifact in artifact_records:
             artifact_struct = artifact.struct
             if ids != "latest":
                 artifacts_with_tag = self._add_tags_to_artifact_struct(
@@ -585,6 +847,7 @@ class SQLDB(DBInterface):
             kw["tag"] = tag
 
         self._delete(session, Artifact, **kw)
+        self._mark_project_resources_counters_outdated(project)
 
     def _delete_artifact_tags(
         self, session, project, artifact_key, tag_name="", commit=True
@@ -849,6 +1112,7 @@ class SQLDB(DBInterface):
             concurrency_limit=concurrency_limit,
         )
         self._upsert(session, [schedule])
+        self._mark_project_resources_counters_outdated(project)
 
     def update_schedule(
         self,
@@ -935,6 +1199,7 @@ class SQLDB(DBInterface):
             session, Schedule, project=project, name=name, commit=False
         )
         self._delete(session, Schedule, project=project, name=name)
+        self._mark_project_resources_counters_outdated(project)
 
     def delete_schedules(self, session: Session, project: str):
         logger.debug("Removing schedules from db", project=project)
@@ -1107,28 +1372,85 @@ class SQLDB(DBInterface):
         Dict[str, int],
         Dict[str, int],
         Dict[str, int],
+    ]:
+        """
+        The counters are kept in a summary which is recalculated only for the projects which their resources were
+        stored/deleted since the last call, so reading it doesn't scan the whole resources tables.
+        The whole summary is recalculated every httpdb.projects.counters_refresh_interval, to catch up with changes
+        which were made by other API replicas and with the time window of the recent failed runs counter
+        """
+        cache = self._cache["project_resources_counters"]
+        with self._project_resources_counters_lock:
+            # None means all the projects
+            outdated_projects = None
+            if cache["value"] is not None and cache["ttl"] >= datetime.now():
+                outdated_projects = cache["outdated_projects"]
+            cache["outdated_projects"] = set()
+
+        try:
+            if outdated_projects is None:
+                ttl = datetime.now() + timedelta(
+                    seconds=humanfriendly.parse_timespan(
+                        config.httpdb.projects.counters_refresh_interval
+                    )
+                )
+                cache["value"] = await self._calculate_project_resources_counters()
+                cache["ttl"] = ttl
+            elif outdated_projects:
+                logger.debug(
+                    "Recalculating outdated project resources counters",
+                    projects=outdated_projects,
+                )
+                counters = await self._calculate_project_resources_counters(
+                    list(outdated_projects)
+                )
+                cache["value"] = tuple(
+                    {
+                        **project_to_count,
+                        **{
+                            project: outdated_project_to_count.get(project, 0)
+                            for project in outdated_projects
+                        },
+                    }
+                    for project_to_count, outdated_project_to_count in zip(
+                        cache["value"], counters
+                    )
+                )
+        except Exception:
+            if outdated_projects:
+                with self._project_resources_counters_lock:
+                    cache["outdated_projects"].update(outdated_projects)
+            raise
+        return cache["value"]
+
+    def _mark_project_resources_counters_outdated(self, project: str):
+        with self._project_resources_counters_lock:
+            self._cache["project_resources_counters"]["outdated_projects"].add(project)
+
+    async def _calculate_project_resources_counters(
+        self, projects: List[str] = None
+    ) -> Tuple[
+        Dict[str, int],
+        Dict[str, int],
+        Dict[str, int],
+        Dict[str, int],
+        Dict[str, int],
+        Dict[str, int],
     ]:
         results = await asyncio.gather(
-            fastapi.concurrency.run_in_threadpool(
-                mlrun.api.db.session.run_function_with_new_db_session,
-                self._calculate_files_counters,
-            ),
-            fastapi.concurrency.run_in_threadpool(
-                mlrun.api.db.session.run_function_with_new_db_session,
-                self._calculate_schedules_counters,
-            ),
-            fastapi.concurrency.run_in_threadpool(
-                mlrun.api.db.session.run_function_with_new_db_session,
-                self._calculate_feature_sets_counters,
-            ),
-            fastapi.concurrency.run_in_threadpool(
-                mlrun.api.db.session.run_function_with_new_db_session,
-                self._calculate_models_counters,
-            ),
-            fastapi.concurrency.run_in_threadpool(
-                mlrun.api.db.session.run_function_with_new_db_session,
-                self._calculate_runs_counters,
-            ),
+            *[
+                fastapi.concurrency.run_in_threadpool(
+                    mlrun.api.db.session.run_function_with_new_db_session,
+                    functools.partial(calculate_counters, projects=projects),
+                )
+                for calculate_counters in [
+                    self._calculate_files_counters,
+                    self._calculate_schedules_counters,
+                    self._calculate_feature_sets_counters,
+                    self._calculate_models_counters,
+                    self._calculate_runs_counters,
+                ]
+            ]
         )
         (
             project_to_files_count,
@@ -1149,9 +1471,21 @@ class SQLDB(DBInterface):
             project_to_running_runs_count,
         )
 
-    def _calculate_functions_counters(self, session) -> Dict[str, int]:
+    @staticmethod
+    def _add_projects_filter(query, cls, projects: List[str] = None):
+        if projects is not None:
+            query = query.filter(cls.project.in_(projects))
+        return query
+
+    def _calculate_functions_counters(
+        self, session, projects: List[str] = None
+    ) -> Dict[str, int]:
         functions_count_per_project = (
-            session.query(Function.project, func.count(distinct(Function.name)))
+            self._add_projects_filter(
+                session.query(Function.project, func.count(distinct(Function.name))),
+                Function,
+                projects,
+            )
             .group_by(Function.project)
             .all()
         )
@@ -1160,9 +1494,15 @@ class SQLDB(DBInterface):
         }
         return project_to_function_count
 
-    def _calculate_schedules_counters(self, session) -> Dict[str, int]:
+    def _calculate_schedules_counters(
+        self, session, projects: List[str] = None
+    ) -> Dict[str, int]:
         schedules_count_per_project = (
-            session.query(Schedule.project, func.count(distinct(Schedule.name)))
+            self._add_projects_filter(
+                session.query(Schedule.project, func.count(distinct(Schedule.name))),
+                Schedule,
+                projects,
+            )
             .group_by(Schedule.project)
             .all()
         )
@@ -1171,9 +1511,17 @@ class SQLDB(DBInterface):
         }
         return project_to_schedule_count
 
-    def _calculate_feature_sets_counters(self, session) -> Dict[str, int]:
+    def _calculate_feature_sets_counters(
+        self, session, projects: List[str] = None
+    ) -> Dict[str, int]:
         feature_sets_count_per_project = (
-            session.query(FeatureSet.project, func.count(distinct(FeatureSet.name)))
+            self._add_projects_filter(
+                session.query(
+                    FeatureSet.project, func.count(distinct(FeatureSet.name))
+                ),
+                FeatureSet,
+                projects,
+            )
             .group_by(FeatureSet.project)
             .all()
         )
@@ -1182,41 +1530,77 @@ class SQLDB(DBInterface):
         }
         return project_to_feature_set_count
 
-    def _calculate_models_counters(self, session) -> Dict[str, int]:
+    def _calculate_models_counters(
+        self, session, projects: List[str] = None
+    ) -> Dict[str, int]:
         import mlrun.artifacts
 
-        # The kind filter is applied post the query to the DB (manually in python code), so counting should be that
-        # way as well, therefore we're doing it here, and can't do it with sql as the above
         # We're using the "latest" which gives us only one version of each artifact key, which is what we want to
         # count (artifact count, not artifact versions count)
-        model_artifacts = self._find_artifacts(
-            session, None, "latest", kind=mlrun.artifacts.model.ModelArtifact.kind
+        models_count_per_project = (
+            self._add_projects_filter(
+                self._find_artifacts_query(
+                    session,
+                    None,
+                    "latest",
+                    kind=mlrun.artifacts.model.ModelArtifact.kind,
+                ),
+                Artifact,
+                projects,
+            )
+            .with_entities(Artifact.project, func.count(Artifact.id))
+            .group_by(Artifact.project)
+            .all()
         )
         project_to_models_count = collections.defaultdict(int)
-        for model_artifact in model_artifacts:
-            project_to_models_count[model_artifact.project] += 1
+        for project, count in models_count_per_project:
+            project_to_models_count[project] = count
         return project_to_models_count
 
-    def _calculate_files_counters(self, session) -> Dict[str, int]:
+    def _calculate_files_counters(
+        self, session, projects: List[str] = None
+    ) -> Dict[str, int]:
         import mlrun.artifacts
 
-        # The category filter is applied post the query to the DB (manually in python code), so counting should be that
-        # way as well, therefore we're doing it here, and can't do it with sql as the above
+        # Link artifacts are counted only when the artifact they link to is a file, which is resolved from the queried
+        # columns (without loading the artifacts bodies), the same as the link artifacts filtering of list artifacts
         # We're using the "latest" which gives us only one version of each artifact key, which is what we want to
         # count (artifact count, not artifact versions count)
-        file_artifacts = self._find_artifacts(
-            session, None, "latest", category=mlrun.api.schemas.ArtifactCategories.other
+        query = self._add_projects_filter(
+            self._find_artifacts_query(
+                session,
+                None,
+                "latest",
+                category=mlrun.api.schemas.ArtifactCategories.other,
+            ),
+            Artifact,
+            projects,
+        ).with_entities(
+            Artifact.project, Artifact.key, Artifact.kind, Artifact.link_iteration
         )
         project_to_files_count = collections.defaultdict(int)
-        for file_artifact in file_artifacts:
-            project_to_files_count[file_artifact.project] += 1
+        file_keys = set()
+        linked_keys = []
+        for project, key, kind, link_iteration in query:
+            if kind != mlrun.artifacts.base.LinkArtifact.kind:
+                project_to_files_count[project] += 1
+                file_keys.add((project, key))
+            elif link_iteration:
+                linked_keys.append((project, f"{link_iteration}-{key}"))
+        for project, linked_key in linked_keys:
+            if (project, linked_key) in file_keys:
+                project_to_files_count[project] += 1
         return project_to_files_count
 
     def _calculate_runs_counters(
-        self, session
+        self, session, projects: List[str] = None
     ) -> Tuple[Dict[str, int], Dict[str, int]]:
         running_runs_count_per_project = (
-            session.query(Run.project, func.count(distinct(Run.name)))
+            self._add_projects_filter(
+                session.query(Run.project, func.count(distinct(Run.name))),
+                Run,
+                projects,
+            )
             .filter(
                 Run.state.in_(mlrun.runtimes.constants.RunStates.non_terminal_states())
             )
@@ -1229,7 +1613,11 @@ class SQLDB(DBInterface):
 
         one_day_ago = datetime.now() - timedelta(hours=24)
         recent_failed_runs_count_per_project = (
-            session.query(Run.project, func.count(distinct(Run.name)))
+            self._add_projects_filter(
+                session.query(Run.project, func.count(distinct(Run.name))),
+                Run,
+                projects,
+            )
             .filter(
                 Run.state.in_(
                     [
@@ -2015,6 +2403,7 @@ class SQLDB(DBInterface):
 
         self._upsert(session, [db_feature_set])
         self.tag_objects_v2(session, [db_feature_set], project, tag)
+        self._mark_project_resources_counters_outdated(project)
 
         return uid
 
@@ -2089,6 +2478,7 @@ class SQLDB(DBInterface):
 
     def delete_feature_set(self, session, project, name, tag=None, uid=None):
         self._delete_feature_store_object(session, FeatureSet, project, name, tag, uid)
+        self._mark_project_resources_counters_outdated(project)
 
     def create_feature_vector(
         self,
@@ -2541,6 +2931,28 @@ class SQLDB(DBInterface):
         kind=None,
         category: schemas.ArtifactCategories = None,
         iter=None,
+    ):
+        query = self._find_artifacts_query(
+            session, project, ids, labels, since, until, name, kind, category, iter
+        )
+        if category:
+            # TODO - this is a hack needed since link artifacts will be returned even for artifacts of
+            #        the wrong category. Remove this when we refactor this area.
+            return self._filter_out_extra_link_artifacts(query.all())
+        return query.all()
+
+    def _find_artifacts_query(
+        self,
+        session,
+        project,
+        ids,
+        labels=None,
+        since=None,
+        until=None,
+        name=None,
+        kind=None,
+        category: schemas.ArtifactCategories = None,
+        iter=None,
     ):
         """
         TODO: refactor this method
@@ -2575,75 +2987,110 @@ class SQLDB(DBInterface):
 
         query = self._add_artifact_name_and_iter_query(query, name, iter)
 
-        if kind:
-            return self._filter_artifacts_by_kinds(query, [kind])
+        # import here to avoid circular imports
+        import mlrun.artifacts
 
+        if kind:
+            query = query.filter(Artifact.kind == kind)
         elif category:
-            filtered_artifacts = self._filter_artifacts_by_category(query, category)
-            # TODO - this is a hack needed since link artifacts will be returned even for artifacts of
-            #        the wrong category. Remove this when we refactor this area.
-            return self._filter_out_extra_link_artifacts(filtered_artifacts)
-        else:
-            return query.all()
+            # link artifacts take the category of the artifact they link to, which is resolved after the query
+            query = query.filter(
+                or_(
+                    Artifact.category == category.value,
+                    Artifact.kind == mlrun.artifacts.base.LinkArtifact.kind,
+                )
+            )
+        return query
 
-    def _filter_artifacts_by_category(
-        self, artifacts, category: schemas.ArtifactCategories
-    ):
-        kinds, exclude = category.to_kinds_filter()
-        return self._filter_artifacts_by_kinds(artifacts, kinds, exclude)
+    def _get_artifacts_page(self, query, page_size, page_token):
+        """keyset pagination by the artifact id, returns the page records and the next page token"""
+        page_size = self._resolve_page_size(page_size)
+        if page_token:
+            query = query.filter(Artifact.id > decode_page_token(page_token)["id"])
 
-    def _filter_artifacts_by_kinds(
-        self, artifacts, kinds: List[str], exclude: bool = False
-    ):
+        # query one more artifact, to know whether there's a next page
+        artifact_records = query.order_by(Artifact.id).limit(page_size + 1).all()
+        next_page_token = None
+        if len(artifact_records) > page_size:
+            next_page_token = encode_page_token(
+                {"id": artifact_records[page_size - 1].id}
+            )
+        return artifact_records[:page_size], next_page_token
+
+    @staticmethod
+    def _resolve_page_size(page_size: int = None) -> int:
+        return min(
+            page_size or config.httpdb.pagination.default_page_size,
+            config.httpdb.pagination.max_page_size,
+        )
+
+    def _query_artifacts_by_keys(self, query, keys: List[str]) -> dict:
+        """return the artifacts of the query with the given keys, by key"""
+        artifacts = {}
+        # query in chunks, to keep the number of query parameters bounded
+        for index in range(0, len(keys), self._max_query_parameters):
+            keys_chunk = keys[index : index + self._max_query_parameters]
+            for artifact in query.filter(Artifact.key.in_(keys_chunk)):
+                artifacts[artifact.key] = artifact
+        return artifacts
+
+    def _resolve_best_iteration_artifacts(self, query, parent_artifacts):
         """
-        :param kinds - list of kinds to filter by
-        :param exclude - if true then the filter will be "all except" - get all artifacts excluding the ones who have
-         any of the given kinds
+        replace the (parent) artifacts which are linked to a best iteration by the artifact of that iteration, if it's
+        in the query results as well (otherwise the parent artifact is skipped)
         """
-        # see docstring of _post_query_runs_filter for why we're filtering it manually
-        filtered_artifacts = []
-        for artifact in artifacts:
-            artifact_json = artifact.struct
-            if (
-                artifact_json
-                and isinstance(artifact_json, dict)
-                and (
-                    (
-                        not exclude
-                        and any([kind == artifact_json.get("kind") for kind in kinds])
-                    )
-                    or (
-                        exclude
-                        and all([kind != artifact_json.get("kind") for kind in kinds])
-                    )
+        linked_keys = [
+            f"{artifact.link_iteration}-{artifact.key}"
+            for artifact in parent_artifacts
+            if artifact.link_iteration
+        ]
+        linked_artifacts = self._query_artifacts_by_keys(query, linked_keys)
+
+        artifacts = []
+        for artifact in parent_artifacts:
+            if artifact.link_iteration:
+                artifact = linked_artifacts.get(
+                    f"{artifact.link_iteration}-{artifact.key}"
                 )
-            ):
-                filtered_artifacts.append(artifact)
-        return filtered_artifacts
+                if not artifact:
+                    continue
+            artifacts.append(artifact)
+        return artifacts
 
     # TODO - this is a hack needed since link artifacts will be returned even for artifacts of
     #        the wrong category. Remove this when we refactor this area.
-    @staticmethod
-    def _filter_out_extra_link_artifacts(artifacts):
+    def _filter_out_extra_link_artifacts(self, artifacts, query=None):
+        """
+        :param query: when given, the linked artifacts which are not in the given artifacts are looked for in the
+            query results
+        """
+        # import here to avoid circular imports
+        import mlrun.artifacts
+
         # Only keep link artifacts that point at "real" artifacts that already exist in the results
         existing_keys = set()
         link_artifacts = []
         filtered_artifacts = []
         for artifact in artifacts:
-            if artifact.struct.get("kind") != "link":
+            if artifact.kind != mlrun.artifacts.base.LinkArtifact.kind:
                 existing_keys.add(artifact.key)
                 filtered_artifacts.append(artifact)
             else:
                 link_artifacts.append(artifact)
 
+        if query is not None:
+            missing_keys = [
+                f"{link_artifact.link_iteration}-{link_artifact.key}"
+                for link_artifact in link_artifacts
+                if link_artifact.link_iteration
+            ]
+            missing_keys = [key for key in missing_keys if key not in existing_keys]
+            existing_keys.update(self._query_artifacts_by_keys(query, missing_keys))
+
         for link_artifact in link_artifacts:
-            if "spec" in link_artifact.struct:
-                link_iteration = link_artifact.struct["spec"].get("link_iteration")
-            else:
-                link_iteration = link_artifact.struct.get("link_iteration")
-            if not link_iteration:
+            if not link_artifact.link_iteration:
                 continue
-            linked_key = f"{link_iteration}-{link_artifact.key}"
+            linked_key = f"{link_artifact.link_iteration}-{link_artifact.key}"
             if linked_key in existing_keys:
                 filtered_artifacts.append(link_artifact)
 
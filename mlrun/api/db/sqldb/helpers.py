@@ -1,7 +1,12 @@
+import base64
+import json
+
 from dateutil import parser
 
+import mlrun.errors
+from mlrun.api import schemas
 from mlrun.api.db.sqldb.models import Base, _table2cls
-from mlrun.utils import get_in
+from mlrun.utils import get_in, is_legacy_artifact
 
 
 def table2cls(name):
@@ -37,6 +42,45 @@ def run_state(run):
     return get_in(run, "status.state", mlrun.runtimes.constants.RunStates.created)
 
 
+def artifact_field(artifact: dict, field: str, default=None):
+    """get a field of an artifact body, from the spec (or from the top level for legacy artifacts)"""
+    if is_legacy_artifact(artifact):
+        return artifact.get(field, default)
+    return artifact.get("spec", {}).get(field, default)
+
+
+def update_artifact_columns(artifact_record, artifact: dict, iteration: int):
+    """update the artifact record columns which are promoted from the artifact body"""
+    kind = artifact.get("kind")
+    category = schemas.ArtifactCategories.from_kind(kind)
+    artifact_record.kind = kind
+    artifact_record.category = category.value if category else None
+    artifact_record.producer_uri = (artifact_field(artifact, "producer") or {}).get(
+        "uri"
+    )
+    artifact_record.iteration = iteration or 0
+    artifact_record.link_iteration = artifact_field(artifact, "link_iteration")
+
+
+def encode_page_token(position: dict) -> str:
+    """encode the position of the last returned record (the keyset to continue from) to an opaque page token"""
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_page_token(page_token: str) -> dict:
+    try:
+        position = json.loads(base64.urlsafe_b64decode(page_token.encode()))
+    except ValueError as exc:
+        raise mlrun.errors.MLRunInvalidArgumentError(
+            f"Invalid page token: {page_token}"
+        ) from exc
+    if not isinstance(position, dict) or "id" not in position:
+        raise mlrun.errors.MLRunInvalidArgumentError(
+            f"Invalid page token: {page_token}"
+        )
+    return position
+
+
 def update_labels(obj, labels: dict):
     old = {label.name: label for label in obj.labels}
     obj.labels.clear()
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import json
+import math
 import pickle
 import warnings
 from datetime import datetime, timezone
@@ -24,6 +25,7 @@ from sqlalchemy import (
     TIMESTAMP,
     Column,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
@@ -38,6 +40,8 @@ from mlrun.api.utils.db.sql_collation import SQLCollationUtil
 Base = declarative_base()
 NULL = None  # Avoid flake8 issuing warnings when comparing in filter
 run_time_fmt = "%Y-%m-%dT%H:%M:%S.%fZ"
+# pickled bodies start with the PROTO opcode, JSON bodies never do
+_pickle_prefix = pickle.PROTO
 
 
 class BaseModel:
@@ -74,6 +78,48 @@ class HasStruct(BaseModel):
         return super().to_dict(exclude)
 
 
+class HasJSONStruct(HasStruct):
+    """
+    The struct is stored as (binary) JSON, which is faster to load than pickle. Structs which JSON can't store
+    losslessly are pickled, and pickled structs (including the ones stored before the records were migrated) are
+    still loaded
+    """
+
+    @property
+    def struct(self):
+        if self.body[:1] == _pickle_prefix:
+            return pickle.loads(self.body)
+        return orjson.loads(self.body)
+
+    @struct.setter
+    def struct(self, value):
+        if self.is_json_safe(value):
+            self.body = orjson.dumps(value)
+        else:
+            self.body = pickle.dumps(value)
+
+    @staticmethod
+    def is_json_safe(value) -> bool:
+        """
+        whether the value is loaded back from JSON as is. Non finite floats, non string keys, tuples, datetimes,
+        numpy values, etc. would be converted (or lost), so they are pickled
+        """
+        value_type = type(value)
+        if value_type is dict:
+            return all(
+                type(key) is str and HasJSONStruct.is_json_safe(item)
+                for key, item in value.items()
+            )
+        if value_type is list:
+            return all(HasJSONStruct.is_json_safe(item) for item in value)
+        if value_type is float:
+            return math.isfinite(value)
+        if value_type is int:
+            # orjson supports 64 bit integers
+            return -(2**63) <= value < 2**64
+        return value is None or value_type in (str, bool)
+
+
 def make_label(table):
     class Label(Base, BaseModel):
         __tablename__ = f"{table}_labels"
@@ -129,10 +175,12 @@ def make_tag_v2(table):
 with warnings.catch_warnings():
     warnings.simplefilter("ignore")
 
-    class Artifact(Base, HasStruct):
+    class Artifact(Base, HasJSONStruct):
         __tablename__ = "artifacts"
         __table_args__ = (
             UniqueConstraint("uid", "project", "key", name="_artifacts_uc"),
+            Index("ix_artifacts_project_kind", "project", "kind"),
+            Index("ix_artifacts_project_category", "project", "category"),
         )
 
         Label = make_label(__tablename__)
@@ -143,8 +191,14 @@ with warnings.catch_warnings():
         project = Column(String(255, collation=SQLCollationUtil.collation()))
         uid = Column(String(255, collation=SQLCollationUtil.collation()))
         updated = Column(TIMESTAMP)
-        # TODO: change to JSON, see mlrun/api/schemas/function.py::FunctionState for reasoning
+        # JSON (or legacy pickled) struct, see HasJSONStruct
         body = Column(BLOB)
+        # promoted from the body, so the artifacts can be filtered without loading it
+        kind = Column(String(255, collation=SQLCollationUtil.collation()))
+        category = Column(String(255, collation=SQLCollationUtil.collation()))
+        producer_uri = Column(String(255, collation=SQLCollationUtil.collation()))
+        iteration = Column(Integer)
+        link_iteration = Column(Integer)
         labels = relationship(Label)
 
         def get_identifier_string(self) -> str:
@@ -183,7 +237,7 @@ with warnings.catch_warnings():
         def get_identifier_string(self) -> str:
             return f"{self.project}/{self.uid}"
 
-    class Run(Base, HasStruct):
+    class Run(Base, HasJSONStruct):
         __tablename__ = "runs"
         __table_args__ = (
             UniqueConstraint("uid", "project", "iteration", name="_runs_uc"),
@@ -200,7 +254,7 @@ with warnings.catch_warnings():
         )
         iteration = Column(Integer)
         state = Column(String(255, collation=SQLCollationUtil.collation()))
-        # TODO: change to JSON, see mlrun/api/schemas/function.py::FunctionState for reasoning
+        # JSON (or legacy pickled) struct, see HasJSONStruct
         body = Column(BLOB)
         start_time = Column(TIMESTAMP)
         updated = Column(TIMESTAMP, default=datetime.utcnow)
@@ -92,7 +92,7 @@ def init_data(
 # This is because data version 1 points to to a data migration which was added back in 0.6.0, and
 # upgrading from a version earlier than 0.6.0 to v>=0.8.0 is not supported.
 data_version_prior_to_table_addition = 1
-latest_data_version = 2
+latest_data_version = 3
 
 
 def _resolve_needed_operations(
@@ -197,6 +197,8 @@ def _perform_data_migrations(db_session: sqlalchemy.orm.Session):
                 _perform_version_1_data_migrations(db, db_session)
             if current_data_version < 2:
                 _perform_version_2_data_migrations(db, db_session)
+            if current_data_version < 3:
+                _perform_version_3_data_migrations(db, db_session)
             db.create_data_version(db_session, str(latest_data_version))
 
 
@@ -450,6 +452,76 @@ def _align_runs_table(
         db._upsert(db_session, [run], ignore=True)
 
 
+def _perform_version_3_data_migrations(
+    db: mlrun.api.db.sqldb.db.SQLDB, db_session: sqlalchemy.orm.Session
+):
+    _migrate_artifacts_to_queryable_columns(db, db_session)
+    _migrate_runs_bodies_to_json(db, db_session)
+
+
+def _migrate_artifacts_to_queryable_columns(
+    db: mlrun.api.db.sqldb.db.SQLDB, db_session: sqlalchemy.orm.Session
+):
+    logger.info("Migrating artifacts to queryable columns")
+
+    def _migrate_artifact(artifact):
+        artifact_dict = artifact.struct
+        iteration = 0
+        if db._name_with_iter_regex.match(artifact.key):
+            iteration = int(artifact.key.split("-", 1)[0])
+        mlrun.api.db.sqldb.helpers.update_artifact_columns(
+            artifact, artifact_dict, iteration
+        )
+        # re-store the struct, so it will be serialized as json (structs json can't store losslessly stay as is)
+        if artifact.is_json_safe(artifact_dict):
+            artifact.struct = artifact_dict
+
+    _migrate_records_in_batches(
+        db, db_session, mlrun.api.db.sqldb.models.Artifact, _migrate_artifact
+    )
+
+
+def _migrate_runs_bodies_to_json(
+    db: mlrun.api.db.sqldb.db.SQLDB, db_session: sqlalchemy.orm.Session
+):
+    logger.info("Migrating runs bodies to json")
+
+    def _migrate_run(run):
+        run_dict = run.struct
+        # structs json can't store losslessly (e.g. with NaN results) stay pickled
+        if run.is_json_safe(run_dict):
+            run.struct = run_dict
+
+    _migrate_records_in_batches(
+        db, db_session, mlrun.api.db.sqldb.models.Run, _migrate_run
+    )
+
+
+def _migrate_records_in_batches(
+    db: mlrun.api.db.sqldb.db.SQLDB,
+    db_session: sqlalchemy.orm.Session,
+    cls,
+    migrate_record: typing.Callable,
+    batch_size: int = 1000,
+):
+    # going over the records by id, so large tables won't be loaded (or held in one transaction) at once
+    last_id = 0
+    while True:
+        records = (
+            db_session.query(cls)
+            .filter(cls.id > last_id)
+            .order_by(cls.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not records:
+            break
+        for record in records:
+            migrate_record(record)
+        db._upsert(db_session, records, ignore=True)
+        last_id = records[-1].id
+
+
 def _perform_version_1_data_migrations(
     db: mlrun.api.db.sqldb.db.SQLDB, db_session: sqlalchemy.orm.Session
 ):
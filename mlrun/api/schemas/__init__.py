@@ -118,6 +118,7 @@ from .schedule import (
     ScheduleKinds,
     ScheduleOutput,
     ScheduleRecord,
+    SchedulerMetrics,
     SchedulesOutput,
     ScheduleUpdate,
 )
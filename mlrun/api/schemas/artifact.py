@@ -28,6 +28,21 @@ class ArtifactCategories(str, enum.Enum):
                 True,
             )
 
+    @classmethod
+    def from_kind(cls, kind: str) -> typing.Optional["ArtifactCategories"]:
+        """the category of an artifact kind, None for link artifacts (which take the category of the linked one)"""
+        # import here to prevent import cycle
+        import mlrun.artifacts.dataset
+        import mlrun.artifacts.model
+
+        if kind == mlrun.artifacts.base.LinkArtifact.kind:
+            return None
+        if kind == mlrun.artifacts.model.ModelArtifact.kind:
+            return cls.model
+        if kind == mlrun.artifacts.dataset.DatasetArtifact.kind:
+            return cls.dataset
+        return cls.other
+
 
 class ArtifactsFormat(str, enum.Enum):
     full = "full"
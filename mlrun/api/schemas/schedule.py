@@ -115,3 +115,15 @@ class ScheduleOutput(ScheduleRecord):
 
 class SchedulesOutput(BaseModel):
     schedules: List[ScheduleOutput]
+
+
+# the scheduler triggers metrics (since the API start), the trigger lag is the delay between the scheduled time of
+# a trigger and its actual submission
+class SchedulerMetrics(BaseModel):
+    triggered: int = 0
+    missed: int = 0
+    skipped_max_instances: int = 0
+    skipped_concurrency_limit: int = 0
+    last_trigger_lag_seconds: Optional[float]
+    max_trigger_lag_seconds: Optional[float]
+    mean_trigger_lag_seconds: Optional[float]
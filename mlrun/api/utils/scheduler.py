@@ -8,6 +8,12 @@ from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import fastapi.concurrency
 import humanfriendly
+from apscheduler.events import (
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_SUBMITTED,
+    JobSubmissionEvent,
+)
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger as APSchedulerCronTrigger
 from sqlalchemy.orm import Session
@@ -37,6 +43,12 @@ class Scheduler:
         # NOTE this cannot be less then one minute - see _validate_cron_trigger
         self._min_allowed_interval = config.httpdb.scheduling.min_allowed_interval
         self._secrets_provider = schemas.SecretProviderName.kubernetes
+        self._metrics = schemas.SchedulerMetrics()
+        self._trigger_lags_sum = 0.0
+        self._scheduler.add_listener(
+            self._on_job_event,
+            EVENT_JOB_SUBMITTED | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES,
+        )
 
     async def start(self, db_session: Session):
         logger.info("Starting scheduler")
@@ -51,6 +63,32 @@ class Scheduler:
         except Exception as exc:
             logger.warning("Failed reloading schedules", exc=exc)
 
+    def get_metrics(self) -> schemas.SchedulerMetrics:
+        return self._metrics.copy()
+
+    def _on_job_event(self, event: JobSubmissionEvent):
+        if event.code == EVENT_JOB_MISSED:
+            self._metrics.missed += 1
+            return
+        if event.code == EVENT_JOB_MAX_INSTANCES:
+            self._metrics.skipped_max_instances += 1
+            return
+
+        self._metrics.triggered += 1
+        now = datetime.now(self._scheduler.timezone)
+        lag = max(
+            (now - scheduled_run_time).total_seconds()
+            for scheduled_run_time in event.scheduled_run_times
+        )
+        self._trigger_lags_sum += lag
+        self._metrics.last_trigger_lag_seconds = lag
+        self._metrics.max_trigger_lag_seconds = max(
+            lag, self._metrics.max_trigger_lag_seconds or 0.0
+        )
+        self._metrics.mean_trigger_lag_seconds = (
+            self._trigger_lags_sum / self._metrics.triggered
+        )
+
     async def stop(self):
         logger.info("Stopping scheduler")
         self._scheduler.shutdown()
@@ -681,20 +719,23 @@ class Scheduler:
 
         db_session = create_session()
 
-        active_runs = mlrun.api.crud.Runs().list_runs(
+        # count the active runs in the DB instead of listing (and loading) them
+        active_runs = mlrun.api.crud.Runs().count_runs(
             db_session,
-            states=RunStates.non_terminal_states(),
             project=project_name,
             labels=f"{schemas.constants.LabelNames.schedule_name}={schedule_name}",
+            states=RunStates.non_terminal_states(),
         )
-        if len(active_runs) >= schedule_concurrency_limit:
+        if active_runs >= schedule_concurrency_limit:
             logger.warn(
                 "Schedule exceeded concurrency limit, skipping this run",
                 project=project_name,
                 schedule_name=schedule_name,
                 schedule_concurrency_limit=schedule_concurrency_limit,
-                active_runs=len(active_runs),
+                active_runs=active_runs,
             )
+            scheduler._metrics.skipped_concurrency_limit += 1
+            close_session(db_session)
             return
 
         # if credentials are needed but missing (will happen for schedules on upgrade from scheduler that didn't store
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import contextlib
 import pathlib
 from os.path import isdir
 
@@ -105,6 +107,7 @@ class ArtifactManager:
         self,
         db: RunDBInterface = None,
         calc_hash=True,
+        bulk_store=False,
     ):
         self.calc_hash = calc_hash
 
@@ -112,6 +115,11 @@ class ArtifactManager:
         self.input_artifacts = {}
         self.artifacts = {}
 
+        # when set, the artifacts are not stored in the db when logged, they're stored in bulk (in a single db call
+        # per project) by flush()
+        self.bulk_store = bulk_store
+        self._pending_artifacts = []
+
     def artifact_list(self, full=False):
         artifacts = []
         for artifact in self.artifacts.values():
@@ -214,7 +222,7 @@ class ArtifactManager:
             item.updated = None
             if sources:
                 item.sources = [{"name": k, "path": str(v)} for k, v in sources.items()]
-            self.artifact_db.store_artifact(
+            self._store_artifact(
                 key,
                 item.to_dict(),
                 item.tree,
@@ -248,7 +256,7 @@ class ArtifactManager:
             item.tree = tree
             item.iter = iter
             item.db_key = db_key or (name + "_" + key)
-            self.artifact_db.store_artifact(
+            self._store_artifact(
                 item.db_key,
                 item.to_dict(),
                 item.tree,
@@ -257,6 +265,52 @@ class ArtifactManager:
                 project=project,
             )
 
+    def _store_artifact(self, key, artifact, uid, iter=None, tag=None, project=""):
+        if not self.bulk_store:
+            self.artifact_db.store_artifact(
+                key, artifact, uid, iter=iter, tag=tag, project=project
+            )
+            return
+        self._pending_artifacts.append(
+            (
+                project,
+                {
+                    "key": key,
+                    "uid": uid,
+                    "iter": iter,
+                    "tag": tag,
+                    "artifact": artifact,
+                },
+            )
+        )
+
+    @contextlib.contextmanager
+    def bulk_store_context(self):
+        """the artifacts logged in the context are stored in bulk when it exits"""
+        bulk_store, self.bulk_store = self.bulk_store, True
+        try:
+            yield
+        finally:
+            self.bulk_store = bulk_store
+            if not bulk_store:
+                self.flush()
+
+    def pop_pending_artifacts(self) -> list:
+        """return (and clear) the artifacts which are pending for a bulk store, as (project, item) tuples"""
+        pending_artifacts, self._pending_artifacts = self._pending_artifacts, []
+        return pending_artifacts
+
+    def flush(self, pending_artifacts: list = None):
+        """store the pending artifacts (and the given pending artifacts of other managers) in bulk"""
+        pending_artifacts = self.pop_pending_artifacts() + (pending_artifacts or [])
+        if not pending_artifacts or not self.artifact_db:
+            return
+        artifacts_by_project = collections.defaultdict(list)
+        for project, item in pending_artifacts:
+            artifacts_by_project[project].append(item)
+        for project, artifacts in artifacts_by_project.items():
+            self.artifact_db.store_artifacts(artifacts, project=project)
+
 
 def extend_artifact_path(artifact_path: str, default_artifact_path: str):
     artifact_path = str(artifact_path or "")
@@ -162,6 +162,20 @@ default_config = {
         "password": "",
         "token": "",
         "logs_path": "./db/logs",
+        "logs": {
+            # max duration (seconds) of a log stream, the clients then reconnect from their current offset
+            "stream_timeout": 300,
+            # interval (seconds) of checking for new log lines and run state changes while following a log
+            "follow_interval": 1,
+            # timeout (seconds) of a single read of a followed pod log, the pod log stream is reopened after it
+            "pod_read_timeout": 10,
+        },
+        # client side cache of feature sets, feature vectors and functions. a cached object is used as is for ttl
+        # seconds, and then validated with the API (by its ETag). set max_entries to 0 to disable the cache
+        "metadata_cache": {
+            "ttl": 0,
+            "max_entries": 256,
+        },
         "data_volume": "",
         "real_path": "",
         "db_type": "sqldb",
@@ -238,12 +252,22 @@ default_config = {
             # it to None. the default for coalesce it True just adding it here to be explicit
             "scheduler_config": '{"job_defaults": {"misfire_grace_time": null, "coalesce": true}}',
         },
+        "pagination": {
+            # the page size of paginated list runs/artifacts requests which don't specify the page size
+            "default_page_size": 200,
+            "max_page_size": 1000,
+        },
+        # the max number of runs/artifacts sent in a single bulk store request
+        "bulk_store_batch_size": 500,
         "projects": {
             "leader": "mlrun",
             "followers": "",
             # This is used as the interval for the sync loop both when mlrun is leader and follower
             "periodic_sync_interval": "1 minute",
             "counters_cache_ttl": "2 minutes",
+            # the project resources counters are recalculated per project when its resources are changed, this is the
+            # interval for recalculating the counters of all the projects (to include changes made by other replicas)
+            "counters_refresh_interval": "10 minutes",
             # access key to be used when the leader is iguazio and polling is done from it
             "iguazio_access_key": "",
             "iguazio_list_projects_default_page_size": 200,
@@ -288,6 +312,14 @@ default_config = {
             "user_space": "v3io:///projects/{project}/model-endpoints/{kind}",
         },
         "batch_processing_function_branch": "master",
+        # the store of the stream and batch processing, v3io (KV, TSDB and streams) or local (a SQLite file, for
+        # running the model monitoring outside of the platform)
+        "store_kind": "v3io",
+        "local_store_path": "./model-monitoring/{project}.db",
+        # the user space prefix (of the endpoints parquet files) of a local store, used instead of a v3io user_space
+        "local_user_space": "./model-monitoring/{project}/{kind}",
+        # max number of model endpoints processed concurrently by the batch processing job
+        "batch_processing_max_workers": 8,
         "parquet_batching_max_events": 10000,
     },
     "secret_stores": {
@@ -325,6 +357,11 @@ default_config = {
         "default_targets": "parquet,nosql",
         "default_job_image": "mlrun/mlrun",
         "flush_interval": 300,
+        # max number of feature sets read concurrently when retrieving offline features with the local engine
+        "offline_read_workers": 8,
+        # number of processes which transform and write the source chunks in the sync (pandas) engine ingestion,
+        # 1 to ingest the chunks sequentially
+        "ingestion_processes": 1,
     },
     "ui": {
         "projects_prefix": "projects",  # The UI link prefix for projects
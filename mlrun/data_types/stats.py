@@ -0,0 +1,462 @@
+# Copyright 2018 Iguazio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import math
+
+import numpy as np
+import pandas as pd
+
+import mlrun.errors
+
+from .data_types import InferOptions
+from .infer import default_num_bins
+
+
+class StatsAccumulator:
+    """mergeable per column data stats, computed one dataframe chunk at a time
+
+    the result (see get_stats()) has the same format as get_df_stats() over the whole data:
+    count/mean/std/min/max (exact) and a fixed bins histogram (approximated) for numeric columns,
+    count/unique/top/freq for categorical columns, where unique is estimated (HyperLogLog sketch) and
+    top/freq are approximated once the column has more than max_top_values distinct values.
+    approximate percentiles (e.g. "25%") are added to the numeric/datetime columns when percentiles are set.
+
+    example::
+
+        stats = StatsAccumulator(InferOptions.default())
+        for chunk in pd.read_csv("data.csv", chunksize=100000):
+            stats.update(chunk)
+        featureset.status.stats = stats.get_stats()
+
+    accumulators of different chunks (e.g. computed in different processes) are combined with merge()
+
+    :param options:         infer options, histograms are calculated with InferOptions.Histogram and the
+                            named index is included with InferOptions.Index
+    :param num_bins:        number of histogram bins, defaults to 20
+    :param percentiles:     list of percentiles (0-1) to approximate for numeric and datetime columns
+    :param max_top_values:  max number of (most frequent) values counted per categorical column
+    """
+
+    def __init__(
+        self,
+        options: InferOptions = InferOptions.default(),
+        num_bins: int = None,
+        percentiles: list = None,
+        max_top_values: int = 10000,
+    ):
+        self.options = options
+        self.num_bins = num_bins or default_num_bins
+        self.percentiles = percentiles or []
+        self.max_top_values = max_top_values
+        self._columns = {}
+
+    def new(self):
+        """return a new (empty) accumulator with the same options"""
+        return StatsAccumulator(
+            self.options, self.num_bins, self.percentiles, self.max_top_values
+        )
+
+    def update(self, df: pd.DataFrame):
+        """add the stats of a dataframe chunk"""
+        if InferOptions.get_common_options(self.options, InferOptions.Index) and (
+            df.index.name
+        ):
+            df = df.reset_index()
+        for column, values in df.items():
+            values = values.dropna()
+            kind = _column_kind(values)
+            column_stats = self._columns.get(column)
+            if column_stats is None:
+                column_stats = self._columns[column] = _ColumnStats(self)
+            column_stats.update(values, kind)
+        return self
+
+    def merge(self, other: "StatsAccumulator"):
+        """add the stats accumulated by another accumulator (with the same options)"""
+        for column, other_stats in other._columns.items():
+            column_stats = self._columns.get(column)
+            if column_stats is None:
+                column_stats = self._columns[column] = _ColumnStats(self)
+            column_stats.merge(other_stats)
+        return self
+
+    def get_stats(self) -> dict:
+        """return the per column stats dict (in the get_df_stats() format)"""
+        return {
+            column: column_stats.get_stats()
+            for column, column_stats in self._columns.items()
+            if column_stats.count
+        }
+
+
+def _column_kind(values):
+    if values.empty:
+        return None
+    if pd.api.types.is_bool_dtype(values.dtype):
+        return "bool"
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return "datetime"
+    if pd.api.types.is_timedelta64_dtype(values.dtype):
+        return "timedelta"
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return "numeric"
+    return "categorical"
+
+
+class _ColumnStats:
+    """the stats of a single column, the moments are merged using the parallel (Chan et al.) algorithm"""
+
+    def __init__(self, accumulator: StatsAccumulator):
+        self._accumulator = accumulator
+        self.kind = None
+        self.tz = None
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        # datetime values are accumulated relative to the first value (to keep the float precision)
+        self.origin = 0
+        self.histogram = None
+        self.quantiles = None
+        self.value_counts = None
+        self.truncated = False
+        self.distinct = None
+
+    def _set_kind(self, kind, tz=None):
+        if self.kind is None:
+            self.kind = kind
+            self.tz = tz
+            accumulator = self._accumulator
+            if kind != "categorical" and InferOptions.get_common_options(
+                accumulator.options, InferOptions.Histogram
+            ):
+                if kind in ["numeric", "bool"]:
+                    self.histogram = _StreamingHistogram(32 * accumulator.num_bins)
+            if kind in ["numeric", "datetime", "timedelta"] and accumulator.percentiles:
+                self.quantiles = _QuantileSketch()
+            if kind in ["categorical", "bool"]:
+                self.value_counts = pd.Series(dtype="int64")
+                self.distinct = _DistinctCountSketch()
+        elif kind != self.kind:
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                f"can't accumulate stats of {kind} and {self.kind} values in the same column"
+            )
+
+    def update(self, values: pd.Series, kind):
+        if kind is None:
+            return
+        self._set_kind(kind, getattr(values.dtype, "tz", None))
+        if kind in ["categorical", "bool"]:
+            value_counts = values.value_counts(sort=False)
+            # unused categories are counted as 0
+            self._add_value_counts(value_counts[value_counts > 0])
+            self.distinct.update(values)
+        if kind == "categorical":
+            self.count += len(values)
+            return
+
+        if kind == "datetime":
+            numbers = pd.DatetimeIndex(values).asi8
+        elif kind == "timedelta":
+            numbers = pd.TimedeltaIndex(values).asi8
+        else:
+            numbers = values.to_numpy()
+        if kind != "bool" and not self.count:
+            self.origin = numbers.min() if kind != "numeric" else 0
+        floats = (numbers - self.origin).astype("float64")
+        chunk_mean = floats.mean()
+        self._add_moments(
+            len(floats), chunk_mean, float(((floats - chunk_mean) ** 2).sum())
+        )
+        self.min = numbers.min() if self.min is None else min(self.min, numbers.min())
+        self.max = numbers.max() if self.max is None else max(self.max, numbers.max())
+        if self.histogram is not None:
+            self.histogram.update(floats[np.isfinite(floats)])
+        if self.quantiles is not None:
+            self.quantiles.update(floats)
+
+    def _add_moments(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+
+    def _add_value_counts(self, value_counts):
+        self.value_counts = self.value_counts.add(value_counts, fill_value=0).astype(
+            "int64"
+        )
+        if len(self.value_counts) > self._accumulator.max_top_values:
+            # keep the most frequent values, their counts are lower bounds from now on
+            self.value_counts = self.value_counts.nlargest(
+                self._accumulator.max_top_values
+            )
+            self.truncated = True
+
+    def merge(self, other: "_ColumnStats"):
+        if other.kind is None:
+            return
+        self._set_kind(other.kind, other.tz)
+        if self.kind in ["categorical", "bool"]:
+            self._add_value_counts(other.value_counts)
+            self.truncated = self.truncated or other.truncated
+            self.distinct.merge(other.distinct)
+        if self.kind == "categorical":
+            self.count += other.count
+            return
+
+        if not self.count:
+            self.origin = other.origin
+        shift = float(other.origin - self.origin)
+        self._add_moments(other.count, other.mean + shift, other.m2)
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        if self.histogram is not None:
+            self.histogram.merge(other.histogram)
+        if self.quantiles is not None:
+            self.quantiles.merge(other.quantiles, shift)
+
+    def get_stats(self):
+        if self.kind in ["categorical", "bool"]:
+            stats = {
+                "count": int(self.count),
+                "unique": len(self.value_counts)
+                if not self.truncated
+                else self.distinct.estimate(),
+                "top": _to_python(self.value_counts.idxmax()),
+                "freq": int(self.value_counts.max()),
+            }
+        elif self.kind == "numeric":
+            stats = {
+                "count": float(self.count),
+                "mean": float(self.mean),
+                "std": self._std(),
+                "min": float(self.min),
+                "max": float(self.max),
+            }
+        else:
+            stats = {
+                "count": int(self.count),
+                "mean": self._to_time(self.origin + self.mean),
+                "min": self._to_time(self.min),
+                "max": self._to_time(self.max),
+            }
+            if self.kind == "timedelta":
+                stats["std"] = self._to_time(self._std())
+
+        for percentile, value in zip(
+            self._accumulator.percentiles,
+            self.quantiles.quantiles(self._accumulator.percentiles)
+            if self.quantiles is not None
+            else [],
+        ):
+            value = value + self.origin
+            stats[f"{percentile * 100:g}%"] = (
+                float(value) if self.kind == "numeric" else self._to_time(value)
+            )
+
+        if (
+            self.histogram is not None
+            and self.histogram.count
+            and np.isfinite([self.min, self.max]).all()
+        ):
+            stats["hist"] = self.histogram.to_hist(
+                self._accumulator.num_bins, float(self.min), float(self.max)
+            )
+        return {key: value for key, value in stats.items() if value is not None}
+
+    def _std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else None
+
+    def _to_time(self, value):
+        if value is None:
+            return None
+        if self.kind == "timedelta":
+            return str(pd.Timedelta(int(round(value)), unit="ns"))
+        return str(pd.Timestamp(int(round(value)), unit="ns", tz=self.tz))
+
+
+def _to_python(value):
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return float(value)
+    return str(value)
+
+
+class _StreamingHistogram:
+    """fixed (fine) bins histogram which doubles its bins width to cover new values outside its range"""
+
+    def __init__(self, bins: int):
+        self.bins = bins + bins % 2
+        self.start = None
+        self.width = None
+        self.counts = None
+
+    @property
+    def count(self):
+        return 0 if self.counts is None else int(self.counts.sum())
+
+    def update(self, values: np.ndarray):
+        if not len(values):
+            return
+        self._cover(values.min(), values.max())
+        self.counts += np.bincount(self._bin(values), minlength=self.bins)
+
+    def _bin(self, values):
+        bins = ((values - self.start) / self.width).astype("int64")
+        return np.clip(bins, 0, self.bins - 1)
+
+    def _cover(self, low, high):
+        if self.counts is None:
+            self.start = float(low)
+            self.width = (
+                (high - low) / self.bins * (1 + 1e-9)
+                if high > low
+                else max(abs(low), 1.0) * 2**-20
+            )
+            self.counts = np.zeros(self.bins, dtype="int64")
+        while low < self.start:
+            merged = self.counts.reshape(-1, 2).sum(axis=1)
+            self.counts = np.concatenate([np.zeros(self.bins // 2, "int64"), merged])
+            self.start -= self.bins * self.width
+            self.width *= 2
+        while high > self.start + self.bins * self.width:
+            merged = self.counts.reshape(-1, 2).sum(axis=1)
+            self.counts = np.concatenate([merged, np.zeros(self.bins // 2, "int64")])
+            self.width *= 2
+
+    def _centers(self):
+        bins = np.flatnonzero(self.counts)
+        return self.start + (bins + 0.5) * self.width, self.counts[bins]
+
+    def merge(self, other: "_StreamingHistogram", shift=0.0):
+        if not other.count:
+            return
+        centers, counts = other._centers()
+        centers = centers + shift
+        self._cover(centers.min(), centers.max())
+        self.counts += np.bincount(
+            self._bin(centers), weights=counts, minlength=self.bins
+        ).astype("int64")
+
+    def to_hist(self, num_bins, low, high):
+        """return [counts, edges] of num_bins bins between low and high (like np.histogram)
+
+        the counts of the fine bins are split between the overlapping result bins (assuming uniform values)
+        """
+        if low == high:
+            counts, edges = np.histogram([low], bins=num_bins)
+            return [(counts * self.count).tolist(), edges.tolist()]
+        edges = np.linspace(low, high, num_bins + 1)
+        fine_edges = self.start + np.arange(self.bins + 1) * self.width
+        cumulative = np.interp(
+            edges, fine_edges, np.concatenate([[0], np.cumsum(self.counts)])
+        )
+        cumulative[0], cumulative[-1] = 0, self.count
+        counts = np.diff(np.round(cumulative).astype("int64"))
+        return [counts.tolist(), edges.tolist()]
+
+
+class _QuantileSketch:
+    """mergeable quantiles sketch (KLL like), a hierarchy of compactors where the items of level i weigh 2**i"""
+
+    def __init__(self, capacity: int = 512):
+        self.capacity = capacity
+        self.levels = []
+        self._random = np.random.default_rng()
+
+    def update(self, values: np.ndarray, level=0):
+        while len(self.levels) <= level:
+            self.levels.append(np.empty(0))
+        self.levels[level] = np.concatenate([self.levels[level], values])
+        self._compact(level)
+
+    def _compact(self, level):
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) <= self.capacity:
+                break
+            items = np.sort(items)
+            # an odd item is kept in the level, every other item is promoted
+            self.levels[level] = items[len(items) - len(items) % 2 :]
+            promoted = items[self._random.integers(2) : len(items) - len(items) % 2 : 2]
+            if len(self.levels) == level + 1:
+                self.levels.append(np.empty(0))
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def merge(self, other: "_QuantileSketch", shift=0.0):
+        for level, items in enumerate(other.levels):
+            if len(items):
+                self.update(items + shift, level)
+
+    def quantiles(self, percentiles):
+        if len(self.levels) == 1:
+            return np.quantile(self.levels[0], percentiles).tolist()
+        values = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(len(items), 2**level) for level, items in enumerate(self.levels)]
+        )
+        order = np.argsort(values, kind="mergesort")
+        values, ranks = values[order], np.cumsum(weights[order])
+        positions = np.searchsorted(
+            ranks, np.asarray(percentiles) * (ranks[-1] - 1) + 1, side="left"
+        )
+        return values[np.minimum(positions, len(values) - 1)].tolist()
+
+
+class _DistinctCountSketch:
+    """HyperLogLog distinct values counter (2**precision registers)"""
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = np.zeros(2**precision, dtype="uint8")
+
+    def update(self, values: pd.Series):
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        precision = np.uint64(self.precision)
+        registers = (hashes >> np.uint64(64 - self.precision)).astype("int64")
+        # the rank is the position of the first set bit after the register bits
+        rest = (hashes << precision) | np.uint64(1 << (self.precision - 1))
+        ranks = np.uint64(64) - _bit_length(rest) + np.uint64(1)
+        np.maximum.at(self.registers, registers, ranks.astype("uint8"))
+
+    def merge(self, other: "_DistinctCountSketch"):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        size = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size**2 / np.sum(2.0 ** -self.registers.astype("float64"))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * size and zeros:
+            # small range correction (linear counting)
+            estimate = size * math.log(size / zeros)
+        return int(round(estimate))
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """vectorized int.bit_length() of uint64 values"""
+    lengths = np.zeros(len(values), dtype="uint64")
+    values = values.copy()
+    for shift in [32, 16, 8, 4, 2, 1]:
+        shift = np.uint64(shift)
+        high = values >> shift
+        mask = high > 0
+        lengths[mask] += shift
+        values[mask] = high[mask]
+    return lengths + (values > 0).astype("uint64")
@@ -28,6 +28,7 @@ __all__ = [
     "HttpSource",
     "StreamSource",
     "KafkaSource",
+    "SQLSource",
 ]
 
 from ..platforms.iguazio import KafkaOutputStream, OutputStream, parse_v3io_path
@@ -41,6 +42,7 @@ from .sources import (
     HttpSource,
     KafkaSource,
     ParquetSource,
+    SQLSource,
     StreamSource,
 )
 from .store_resources import (
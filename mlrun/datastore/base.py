@@ -179,7 +179,7 @@ class DataStore:
                         filters,
                         time_column,
                     )
-                    kwargs["filters"] = filters
+                    kwargs["filters"] = _and_filters(filters, kwargs.get("filters"))
 
                 return df_module.read_parquet(*args, **kwargs)
 
@@ -429,6 +429,19 @@ class DataItem:
         return f"'{self.url}'"
 
 
+def _and_filters(filters, extra_filters=None):
+    """combine two parquet filters (in disjunctive normal form) with a logical AND"""
+    if not extra_filters:
+        return filters
+    if isinstance(extra_filters[0], tuple):
+        extra_filters = [extra_filters]
+    return [
+        list(conjunction) + list(extra_conjunction)
+        for conjunction in filters
+        for extra_conjunction in extra_filters
+    ]
+
+
 def get_range(size, offset):
     byterange = f"bytes={offset}-"
     if size:
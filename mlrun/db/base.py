@@ -19,6 +19,7 @@ from typing import List, Optional, Union
 
 from mlrun.api import schemas
 from mlrun.api.schemas import ModelEndpoint
+from mlrun.utils import parse_versioned_object_uri
 
 
 class RunDBError(Exception):
@@ -44,6 +45,16 @@ class RunDBInterface(ABC):
     def store_run(self, struct, uid, project="", iter=0):
         pass
 
+    def store_runs(self, runs: List[dict], project=""):
+        """store several runs (their uid and iteration are taken from their metadata), in bulk when supported"""
+        for run in runs:
+            self.store_run(
+                run,
+                run["metadata"]["uid"],
+                project,
+                iter=run["metadata"].get("iteration") or 0,
+            )
+
     @abstractmethod
     def update_run(self, updates: dict, uid, project="", iter=0):
         pass
@@ -76,9 +87,16 @@ class RunDBInterface(ABC):
         partition_sort_by: Union[schemas.SortField, str] = None,
         partition_order: Union[schemas.OrderType, str] = schemas.OrderType.desc,
         max_partitions: int = 0,
+        fields: List[str] = None,
+        page_size: int = None,
+        page_token: str = None,
     ):
         pass
 
+    def iter_runs(self, page_size: int = None, **list_runs_kwargs):
+        """lazily iterate over the runs, the pages of the runs (see list_runs) are fetched on demand"""
+        return self._iter_pages(self.list_runs, page_size, **list_runs_kwargs)
+
     @abstractmethod
     def del_run(self, uid, project="", iter=0):
         pass
@@ -91,6 +109,21 @@ class RunDBInterface(ABC):
     def store_artifact(self, key, artifact, uid, iter=None, tag="", project=""):
         pass
 
+    def store_artifacts(self, artifacts: List[dict], project=""):
+        """
+        store several artifacts, in bulk when supported, each item holds the artifact and its store params:
+        {"key": <key>, "uid": <uid/tree>, "iter": <iteration>, "tag": <tag>, "artifact": <artifact dict>}
+        """
+        for item in artifacts:
+            self.store_artifact(
+                item["key"],
+                item["artifact"],
+                item["uid"],
+                iter=item.get("iter"),
+                tag=item.get("tag", ""),
+                project=project,
+            )
+
     @abstractmethod
     def read_artifact(self, key, tag="", iter=None, project=""):
         pass
@@ -108,9 +141,26 @@ class RunDBInterface(ABC):
         best_iteration: bool = False,
         kind: str = None,
         category: Union[str, schemas.ArtifactCategories] = None,
+        fields: List[str] = None,
+        page_size: int = None,
+        page_token: str = None,
     ):
         pass
 
+    def iter_artifacts(self, page_size: int = None, **list_artifacts_kwargs):
+        """lazily iterate over the artifacts, the pages of the artifacts (see list_artifacts) are fetched on demand"""
+        return self._iter_pages(self.list_artifacts, page_size, **list_artifacts_kwargs)
+
+    @staticmethod
+    def _iter_pages(list_function, page_size: int = None, **kwargs):
+        page_token = None
+        while True:
+            page = list_function(page_size=page_size, page_token=page_token, **kwargs)
+            yield from page
+            page_token = page.next_page_token
+            if not page_token:
+                return
+
     @abstractmethod
     def del_artifact(self, key, tag="", project=""):
         pass
@@ -204,6 +254,20 @@ class RunDBInterface(ABC):
     ) -> dict:
         pass
 
+    def get_feature_sets(
+        self, names: List[str], project: str = "", tag: str = None
+    ) -> list:
+        # every name may hold its own reference (name:tag or name@uid)
+        feature_sets = []
+        for name in names:
+            _, name, name_tag, uid = parse_versioned_object_uri(name)
+            feature_sets.append(
+                self.get_feature_set(
+                    name, project, None if uid else name_tag or tag, uid or None
+                )
+            )
+        return feature_sets
+
     @abstractmethod
     def list_features(
         self,
@@ -40,6 +40,7 @@ from ..utils import (
     match_times,
     match_value,
     match_value_options,
+    select_fields,
     update_in,
 )
 from .base import RunDBError, RunDBInterface
@@ -137,7 +138,11 @@ class FileRunDB(RunDBInterface):
         partition_sort_by: Union[schemas.SortField, str] = None,
         partition_order: Union[schemas.OrderType, str] = schemas.OrderType.desc,
         max_partitions: int = 0,
+        fields: List[str] = None,
+        page_size: int = None,
+        page_token: str = None,
     ):
+        # pagination is not supported, all the runs are returned in a single page
         if partition_by is not None:
             raise mlrun.errors.MLRunInvalidArgumentError(
                 "Runs partitioning not supported"
@@ -174,7 +179,9 @@ class FileRunDB(RunDBInterface):
                 key=lambda i: get_in(i, ["status", "start_time"], ""), reverse=True
             )
         if last and len(results) > last:
-            return RunList(results[:last])
+            results = RunList(results[:last])
+        if fields:
+            results = RunList(select_fields(run, fields) for run in results)
         return results
 
     def del_run(self, uid, project="", iter=0):
@@ -250,7 +257,11 @@ class FileRunDB(RunDBInterface):
         best_iteration: bool = False,
         kind: str = None,
         category: Union[str, schemas.ArtifactCategories] = None,
+        fields: List[str] = None,
+        page_size: int = None,
+        page_token: str = None,
     ):
+        # pagination is not supported, all the artifacts are returned in a single page
         if iter or kind or category:
             raise NotImplementedError(
                 "iter/kind/category parameters are not supported for filedb implementation"
@@ -281,7 +292,7 @@ class FileRunDB(RunDBInterface):
                     continue
                 if "artifacts/latest" in p:
                     artifact["tree"] = "latest"
-                results.append(artifact)
+                results.append(select_fields(artifact, fields) if fields else artifact)
 
         return results
 
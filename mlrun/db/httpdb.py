@@ -11,8 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import codecs
+import collections
 import enum
 import http
+import json
 import os
 import tempfile
 import time
@@ -116,6 +119,8 @@ class HTTPRunDB(RunDBInterface):
         self._wait_for_background_task_terminal_state_retry_interval = 3
         self._wait_for_project_deletion_interval = 3
         self.client_version = version.Version().get()["version"]
+        # (kind, project, key) -> (etag, content, fetch time) of cached metadata objects
+        self._metadata_cache = collections.OrderedDict()
 
     def __repr__(self):
         cls = self.__class__.__name__
@@ -151,6 +156,7 @@ class HTTPRunDB(RunDBInterface):
         headers=None,
         timeout=45,
         version=None,
+        stream=False,
     ):
         """Perform a direct REST API call on the :py:mod:`mlrun` API server.
 
@@ -167,6 +173,7 @@ class HTTPRunDB(RunDBInterface):
         :param timeout: API call timeout
         :param version: API version to use, None (the default) will mean to use the default value from config,
          for un-versioned api set an empty string.
+        :param stream: Don't download the response content immediately (iterate it with ``response.iter_content``)
 
         :return: Python HTTP response object
         """
@@ -218,7 +225,7 @@ class HTTPRunDB(RunDBInterface):
 
         try:
             response = self.session.request(
-                method, url, timeout=timeout, verify=False, **kw
+                method, url, timeout=timeout, verify=False, stream=stream, **kw
             )
         except requests.RequestException as exc:
             error = f"{str(exc)}: {error}" if error else str(exc)
@@ -416,7 +423,8 @@ class HTTPRunDB(RunDBInterface):
     def watch_log(self, uid, project="", watch=True, offset=0):
         """Retrieve logs of a running process, and watch the progress of the execution until it completes. This
         method will print out the logs and continue to periodically poll for, and print, new logs as long as the
-        state of the runtime which generates this log is either ``pending`` or ``running``.
+        state of the runtime which generates this log is either ``pending`` or ``running``. The new logs are streamed
+        by the API (falling back to polling when the API doesn't support streaming logs).
 
         :param uid: The uid of the log object to watch.
         :param project: Project that the log belongs to.
@@ -429,6 +437,12 @@ class HTTPRunDB(RunDBInterface):
         state, text = self.get_log(uid, project, offset=offset)
         if text:
             print(text.decode())
+        if watch and state in ["pending", "running"]:
+            try:
+                return self._watch_log_stream(uid, project, offset + len(text))
+            except mlrun.errors.MLRunNotFoundError:
+                # older API servers don't have the log stream endpoint, poll the log instead
+                logger.debug("Log stream is not supported, polling the log instead")
         if watch:
             nil_resp = 0
             while state in ["pending", "running"]:
@@ -446,6 +460,40 @@ class HTTPRunDB(RunDBInterface):
 
         return state
 
+    def _watch_log_stream(self, uid, project="", offset=0):
+        """print the streamed log until the run ends, reconnecting after the (server side) stream timeout"""
+        path = self._path_of("log", project, uid) + "/stream"
+        error = f"stream log {project}/{uid}"
+        # the read timeout is the max time without any streamed log bytes
+        timeout = float(config.httpdb.logs.stream_timeout) + 60
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            response = self.api_call(
+                "GET",
+                path,
+                error,
+                params={"offset": offset},
+                timeout=timeout,
+                stream=True,
+            )
+            try:
+                for chunk in response.iter_content(chunk_size=None):
+                    offset += len(chunk)
+                    print(decoder.decode(chunk), end="")
+            except requests.RequestException as exc:
+                logger.debug("Log stream was interrupted, reconnecting", exc=exc)
+            finally:
+                response.close()
+
+            # get the run state (and any log written since the stream ended)
+            state, text = self.get_log(uid, project, offset=offset)
+            if text:
+                offset += len(text)
+                print(decoder.decode(text), end="")
+            if state not in ["pending", "running"]:
+                print(decoder.decode(b"", final=True), end="")
+                return state
+
     def store_run(self, struct, uid, project="", iter=0):
         """Store run details in the DB. This method is usually called from within other :py:mod:`mlrun` flows
         and not called directly by the user."""
@@ -456,6 +504,18 @@ class HTTPRunDB(RunDBInterface):
         body = _as_json(struct)
         self.api_call("POST", path, error, params=params, body=body)
 
+    def store_runs(self, runs: List[dict], project=""):
+        """Store several runs (e.g. the iterations of a hyper-param run) in the DB, in bulk. The uid and iteration of
+        each run are taken from its metadata. Each batch of runs is stored in a single transaction."""
+
+        project = project or config.default_project
+        path = f"projects/{project}/runs"
+        error = f"store runs {project}"
+        batch_size = config.httpdb.bulk_store_batch_size
+        for index in range(0, len(runs), batch_size):
+            body = _as_json({"runs": runs[index : index + batch_size]})
+            self.api_call("POST", path, error, body=body)
+
     def update_run(self, updates: dict, uid, project="", iter=0):
         """Update the details of a stored run in the DB."""
 
@@ -522,6 +582,9 @@ class HTTPRunDB(RunDBInterface):
         partition_sort_by: Union[schemas.SortField, str] = None,
         partition_order: Union[schemas.OrderType, str] = schemas.OrderType.desc,
         max_partitions: int = 0,
+        fields: List[str] = None,
+        page_size: int = None,
+        page_token: str = None,
     ) -> RunList:
         """Retrieve a list of runs, filtered by various options.
         Example::
@@ -530,6 +593,14 @@ class HTTPRunDB(RunDBInterface):
             # If running in Jupyter, can use the .show() function to display the results
             db.list_runs(name='', project=project_name).show()
 
+            # get the runs page by page, with only their metadata and state
+            runs = db.list_runs(project='iris', fields=['metadata', 'status.state'], page_size=100)
+            next_runs = db.list_runs(project='iris', fields=['metadata', 'status.state'], page_size=100,
+                                     page_token=runs.next_page_token)
+            # or lazily iterate over all the runs (the pages are fetched on demand)
+            for run in db.iter_runs(project='iris', page_size=100):
+                ...
+
 
         :param name: Name of the run to retrieve.
         :param uid: Unique ID of the run.
@@ -555,6 +626,12 @@ class HTTPRunDB(RunDBInterface):
         :param partition_order: Order of sorting within partitions - `asc` or `desc`. Default is `desc`.
         :param max_partitions: Maximal number of partitions to include in the result. Default is `0` which means no
             limit.
+        :param fields: Return only these fields of the runs (e.g. ``["metadata", "status.state"]``), instead of the
+            whole run objects (which include the potentially large results and artifacts).
+        :param page_size: Return the runs page by page, with up to this number of runs per page. The token of the next
+            page is set in the ``next_page_token`` attribute of the returned list (``None`` for the last page).
+            Can't be used together with partitioning.
+        :param page_token: The token of the page to return, from the ``next_page_token`` of the previous page.
         """
 
         project = project or config.default_project
@@ -570,6 +647,9 @@ class HTTPRunDB(RunDBInterface):
             "start_time_to": datetime_to_iso(start_time_to),
             "last_update_time_from": datetime_to_iso(last_update_time_from),
             "last_update_time_to": datetime_to_iso(last_update_time_to),
+            "field": fields or [],
+            "page-size": page_size,
+            "page-token": page_token,
         }
 
         if partition_by:
@@ -585,7 +665,9 @@ class HTTPRunDB(RunDBInterface):
             )
         error = "list runs"
         resp = self.api_call("GET", "runs", error, params=params)
-        return RunList(resp.json()["runs"])
+        runs = RunList(resp.json()["runs"])
+        runs.next_page_token = resp.json().get("next_page_token")
+        return runs
 
     def del_runs(self, name=None, project=None, labels=None, state=None, days_ago=0):
         """Delete a group of runs identified by the parameters of the function.
@@ -636,6 +718,23 @@ class HTTPRunDB(RunDBInterface):
         body = _as_json(artifact)
         self.api_call("POST", path, error, params=params, body=body)
 
+    def store_artifacts(self, artifacts: List[dict], project=""):
+        """Store several artifacts in the DB, in bulk. Each batch of artifacts is stored in a single transaction.
+
+        :param artifacts: The artifacts to store, each item holds the artifact and its store params (see
+            :py:func:`~store_artifact`) - ``{"key": <key>, "uid": <uid>, "iter": <iteration>, "tag": <tag>,
+            "artifact": <artifact dict>}``.
+        :param project: Project that the artifacts belong to.
+        """
+
+        project = project or config.default_project
+        path = f"projects/{project}/artifacts"
+        error = f"store artifacts {project}"
+        batch_size = config.httpdb.bulk_store_batch_size
+        for index in range(0, len(artifacts), batch_size):
+            body = _as_json({"artifacts": artifacts[index : index + batch_size]})
+            self.api_call("POST", path, error, body=body)
+
     def read_artifact(self, key, tag=None, iter=None, project=""):
         """Read an artifact, identified by its key, tag and iteration."""
 
@@ -673,6 +772,9 @@ class HTTPRunDB(RunDBInterface):
         best_iteration: bool = False,
         kind: str = None,
         category: Union[str, schemas.ArtifactCategories] = None,
+        fields: List[str] = None,
+        page_size: int = None,
+        page_token: str = None,
     ) -> ArtifactList:
         """List artifacts filtered by various parameters.
 
@@ -697,6 +799,11 @@ class HTTPRunDB(RunDBInterface):
             from that iteration. If using ``best_iter``, the ``iter`` parameter must not be used.
         :param kind: Return artifacts of the requested kind.
         :param category: Return artifacts of the requested category.
+        :param fields: Return only these fields of the artifacts (e.g. ``["metadata", "spec.target_path"]``).
+        :param page_size: Return the artifacts page by page, with up to this number of artifacts per page. The token
+            of the next page is set in the ``next_page_token`` attribute of the returned list (``None`` for the last
+            page). See also :py:func:`~iter_artifacts`.
+        :param page_token: The token of the page to return, from the ``next_page_token`` of the previous page.
         """
 
         project = project or config.default_project
@@ -711,11 +818,15 @@ class HTTPRunDB(RunDBInterface):
             "kind": kind,
             "category": category,
             "format": schemas.ArtifactsFormat.full.value,
+            "field": fields or [],
+            "page-size": page_size,
+            "page-token": page_token,
         }
         error = "list artifacts"
         resp = self.api_call("GET", "artifacts", error, params=params)
         values = ArtifactList(resp.json()["artifacts"])
         values.tag = tag
+        values.next_page_token = resp.json().get("next_page_token")
         return values
 
     def del_artifacts(self, name=None, project=None, tag=None, labels=None, days_ago=0):
@@ -749,6 +860,42 @@ class HTTPRunDB(RunDBInterface):
         )
         return response.json()["tags"]
 
+    def _get_metadata_object(
+        self, kind, project, key, path, error, params=None
+    ) -> dict:
+        """get a metadata object (feature set, feature vector or function) through the client metadata cache.
+        a cached object is used as is for httpdb.metadata_cache.ttl seconds, and then validated by its ETag"""
+        cache_key = (kind, project, key)
+        cached = self._metadata_cache.get(cache_key)
+        if cached:
+            etag, content, fetch_time = cached
+            if time.monotonic() - fetch_time < float(config.httpdb.metadata_cache.ttl):
+                return json.loads(content)
+
+        headers = {"If-None-Match": cached[0]} if cached else None
+        response = self.api_call("GET", path, error, params=params, headers=headers)
+        if cached and response.status_code == http.HTTPStatus.NOT_MODIFIED.value:
+            content = cached[1]
+        else:
+            content = response.content
+
+        # older API servers don't send an ETag, their objects can't be validated so they aren't cached
+        etag = response.headers.get("ETag")
+        max_entries = int(config.httpdb.metadata_cache.max_entries)
+        if etag and max_entries > 0:
+            self._metadata_cache[cache_key] = (etag, content, time.monotonic())
+            self._metadata_cache.move_to_end(cache_key)
+            while len(self._metadata_cache) > max_entries:
+                self._metadata_cache.popitem(last=False)
+        return json.loads(content)
+
+    def _invalidate_metadata_cache(self, kind=None, project=None):
+        # a write may change any reference (e.g. the latest tag), drop all the cached objects of the kind
+        project = project or config.default_project
+        for cache_key in list(self._metadata_cache.keys()):
+            if cache_key[1] == project and kind in [None, cache_key[0]]:
+                del self._metadata_cache[cache_key]
+
     def store_function(self, function, name, project="", tag=None, versioned=False):
         """Store a function object. Function is identified by its name and tag, and can be versioned."""
 
@@ -757,6 +904,7 @@ class HTTPRunDB(RunDBInterface):
         path = self._path_of("func", project, name)
 
         error = f"store function {project}/{name}"
+        self._invalidate_metadata_cache("function", project)
         resp = self.api_call(
             "POST", path, error, params=params, body=dict_to_json(function)
         )
@@ -771,8 +919,9 @@ class HTTPRunDB(RunDBInterface):
         project = project or config.default_project
         path = self._path_of("func", project, name)
         error = f"get function {project}/{name}"
-        resp = self.api_call("GET", path, error, params=params)
-        return resp.json()["func"]
+        return self._get_metadata_object(
+            "function", project, (name, tag, hash_key), path, error, params=params
+        )["func"]
 
     def delete_function(self, name: str, project: str = ""):
         """Delete a function belonging to a specific project."""
@@ -780,6 +929,7 @@ class HTTPRunDB(RunDBInterface):
         project = project or config.default_project
         path = f"projects/{project}/functions/{name}"
         error_message = f"Failed deleting function {project}/{name}"
+        self._invalidate_metadata_cache("function", project)
         self.api_call("DELETE", path, error_message)
 
     def list_functions(self, name=None, project=None, tag=None, labels=None):
@@ -1515,6 +1665,7 @@ class HTTPRunDB(RunDBInterface):
 
         name = feature_set["metadata"]["name"]
         error_message = f"Failed creating feature-set {project}/{name}"
+        self._invalidate_metadata_cache("feature-set", project)
         resp = self.api_call(
             "POST",
             path,
@@ -1540,8 +1691,36 @@ class HTTPRunDB(RunDBInterface):
         reference = self._resolve_reference(tag, uid)
         path = f"projects/{project}/feature-sets/{name}/references/{reference}"
         error_message = f"Failed retrieving feature-set {project}/{name}"
-        resp = self.api_call("GET", path, error_message)
-        return FeatureSet.from_dict(resp.json())
+        return FeatureSet.from_dict(
+            self._get_metadata_object(
+                "feature-set", project, (name, reference), path, error_message
+            )
+        )
+
+    def get_feature_sets(
+        self, names: List[str], project: str = "", tag: str = None
+    ) -> List[FeatureSet]:
+        """Retrieve multiple :py:class:`~mlrun.feature_store.FeatureSet` objects (in the given order) in a single
+        request.
+
+        :param names: Names of the objects to retrieve, a name may hold its own reference (``name:tag`` or
+            ``name@uid``).
+        :param project: Project the FeatureSets belong to.
+        :param tag: Tag of the objects which don't hold their own reference, default to ``latest``.
+        """
+
+        project = project or config.default_project
+        path = f"projects/{project}/feature-sets/batch"
+        error_message = f"Failed retrieving feature-sets {project}/{names}"
+        feature_sets = self._get_metadata_object(
+            "feature-set",
+            project,
+            ("batch", tuple(names), tag),
+            path,
+            error_message,
+            params={"name": names, "tag": tag},
+        )["feature_sets"]
+        return [FeatureSet.from_dict(obj) for obj in feature_sets]
 
     def list_features(
         self,
@@ -1724,6 +1903,7 @@ class HTTPRunDB(RunDBInterface):
         )
         path = f"projects/{project}/feature-sets/{name}/references/{reference}"
         error_message = f"Failed storing feature-set {project}/{name}"
+        self._invalidate_metadata_cache("feature-set", project)
         resp = self.api_call(
             "PUT", path, error_message, params=params, body=dict_to_json(feature_set)
         )
@@ -1762,6 +1942,7 @@ class HTTPRunDB(RunDBInterface):
         headers = {schemas.HeaderNames.patch_mode: patch_mode}
         path = f"projects/{project}/feature-sets/{name}/references/{reference}"
         error_message = f"Failed updating feature-set {project}/{name}"
+        self._invalidate_metadata_cache("feature-set", project)
         self.api_call(
             "PATCH",
             path,
@@ -1784,6 +1965,7 @@ class HTTPRunDB(RunDBInterface):
             path = path + f"/references/{reference}"
 
         error_message = f"Failed deleting feature-set {name}"
+        self._invalidate_metadata_cache("feature-set", project)
         self.api_call("DELETE", path, error_message)
 
     def create_feature_vector(
@@ -1813,6 +1995,7 @@ class HTTPRunDB(RunDBInterface):
 
         name = feature_vector["metadata"]["name"]
         error_message = f"Failed creating feature-vector {project}/{name}"
+        self._invalidate_metadata_cache("feature-vector", project)
         resp = self.api_call(
             "POST",
             path,
@@ -1832,8 +2015,11 @@ class HTTPRunDB(RunDBInterface):
         reference = self._resolve_reference(tag, uid)
         path = f"projects/{project}/feature-vectors/{name}/references/{reference}"
         error_message = f"Failed retrieving feature-vector {project}/{name}"
-        resp = self.api_call("GET", path, error_message)
-        return FeatureVector.from_dict(resp.json())
+        return FeatureVector.from_dict(
+            self._get_metadata_object(
+                "feature-vector", project, (name, reference), path, error_message
+            )
+        )
 
     def list_feature_vectors(
         self,
@@ -1930,6 +2116,7 @@ class HTTPRunDB(RunDBInterface):
         )
         path = f"projects/{project}/feature-vectors/{name}/references/{reference}"
         error_message = f"Failed storing feature-vector {project}/{name}"
+        self._invalidate_metadata_cache("feature-vector", project)
         resp = self.api_call(
             "PUT", path, error_message, params=params, body=dict_to_json(feature_vector)
         )
@@ -1963,6 +2150,7 @@ class HTTPRunDB(RunDBInterface):
         headers = {schemas.HeaderNames.patch_mode: patch_mode}
         path = f"projects/{project}/feature-vectors/{name}/references/{reference}"
         error_message = f"Failed updating feature-vector {project}/{name}"
+        self._invalidate_metadata_cache("feature-vector", project)
         self.api_call(
             "PATCH",
             path,
@@ -1984,6 +2172,7 @@ class HTTPRunDB(RunDBInterface):
             path = path + f"/references/{reference}"
 
         error_message = f"Failed deleting feature-vector {name}"
+        self._invalidate_metadata_cache("feature-vector", project)
         self.api_call("DELETE", path, error_message)
 
     def list_projects(
@@ -2059,6 +2248,7 @@ class HTTPRunDB(RunDBInterface):
         path = f"projects/{name}"
         headers = {schemas.HeaderNames.deletion_strategy: deletion_strategy}
         error_message = f"Failed deleting project {name}"
+        self._invalidate_metadata_cache(project=name)
         response = self.api_call("DELETE", path, error_message, headers=headers)
         if response.status_code == http.HTTPStatus.ACCEPTED:
             return self._wait_for_project_to_be_deleted(name)
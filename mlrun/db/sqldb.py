@@ -84,6 +84,16 @@ class SQLDB(RunDBInterface):
             project,
         )
 
+    def store_runs(self, runs: List[dict], project=""):
+        import mlrun.api.crud
+
+        return self._transform_db_error(
+            mlrun.api.crud.Runs().store_runs,
+            self.session,
+            runs,
+            project,
+        )
+
     def update_run(self, updates: dict, uid, project="", iter=0):
         import mlrun.api.crud
 
@@ -129,10 +139,13 @@ class SQLDB(RunDBInterface):
         partition_sort_by: Union[schemas.SortField, str] = None,
         partition_order: Union[schemas.OrderType, str] = schemas.OrderType.desc,
         max_partitions: int = 0,
+        fields: List[str] = None,
+        page_size: int = None,
+        page_token: str = None,
     ):
         import mlrun.api.crud
 
-        return self._transform_db_error(
+        runs = self._transform_db_error(
             mlrun.api.crud.Runs().list_runs,
             self.session,
             name,
@@ -152,7 +165,10 @@ class SQLDB(RunDBInterface):
             partition_sort_by,
             partition_order,
             max_partitions,
+            page_size,
+            page_token,
         )
+        return self._select_fields(runs, fields)
 
     def del_run(self, uid, project=None, iter=None):
         import mlrun.api.crud
@@ -192,6 +208,16 @@ class SQLDB(RunDBInterface):
             project,
         )
 
+    def store_artifacts(self, artifacts: List[dict], project=""):
+        import mlrun.api.crud
+
+        return self._transform_db_error(
+            mlrun.api.crud.Artifacts().store_artifacts,
+            self.session,
+            artifacts,
+            project,
+        )
+
     def read_artifact(self, key, tag="", iter=None, project=""):
         import mlrun.api.crud
 
@@ -216,13 +242,16 @@ class SQLDB(RunDBInterface):
         best_iteration: bool = False,
         kind: str = None,
         category: Union[str, schemas.ArtifactCategories] = None,
+        fields: List[str] = None,
+        page_size: int = None,
+        page_token: str = None,
     ):
         import mlrun.api.crud
 
         if category and isinstance(category, str):
             category = schemas.ArtifactCategories(category)
 
-        return self._transform_db_error(
+        artifacts = self._transform_db_error(
             mlrun.api.crud.Artifacts().list_artifacts,
             self.session,
             project,
@@ -235,7 +264,10 @@ class SQLDB(RunDBInterface):
             best_iteration=best_iteration,
             kind=kind,
             category=category,
+            page_size=page_size,
+            page_token=page_token,
         )
+        return self._select_fields(artifacts, fields)
 
     def del_artifact(self, key, tag="", project=""):
         import mlrun.api.crud
@@ -367,6 +399,16 @@ class SQLDB(RunDBInterface):
         except DBError as exc:
             raise RunDBError(exc.args)
 
+    @staticmethod
+    def _select_fields(objects, fields):
+        if not fields:
+            return objects
+        selected = type(objects)(
+            mlrun.utils.helpers.select_fields(obj, fields) for obj in objects
+        )
+        selected.next_page_token = objects.next_page_token
+        return selected
+
     def create_feature_set(self, feature_set, project="", versioned=True):
         import mlrun.api.crud
 
@@ -175,13 +175,25 @@ class MLClientCtx(object):
         if not self._children:
             return
         if commit_children:
-            for child in self._children:
-                child.commit(completed=completed)
+            self._commit_children(completed)
         results = [child.to_dict() for child in self._children]
         summary, df = mlrun.runtimes.utils.results_to_iter(results, None, self)
         task = results[best_run - 1] if best_run else None
-        self.log_iteration_results(best_run, summary, task)
-        mlrun.runtimes.utils.log_iter_artifacts(self, df, summary[0])
+        with self._artifacts_manager.bulk_store_context():
+            self.log_iteration_results(best_run, summary, task)
+            mlrun.runtimes.utils.log_iter_artifacts(self, df, summary[0])
+
+    def _commit_children(self, completed=True):
+        """commit all the child runs to the db in bulk (the parent is committed by the caller)"""
+        for child in self._children:
+            if completed and child._state == "running":
+                child._state = "completed"
+            child._last_update = now_date()
+            child._commit = ""
+        if self._rundb:
+            self._rundb.store_runs(
+                [child.to_dict() for child in self._children], project=self.project
+            )
 
     def mark_as_best(self):
         """mark a child as the best iteration result, see .get_child_context()"""
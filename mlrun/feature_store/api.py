@@ -22,6 +22,7 @@ import mlrun
 import mlrun.errors
 
 from ..data_types import InferOptions, get_infer_interface
+from ..data_types.stats import StatsAccumulator
 from ..datastore.sources import BaseSourceDriver, StreamSource
 from ..datastore.store_resources import parse_store_uri
 from ..datastore.targets import (
@@ -99,6 +100,7 @@ def get_offline_features(
     update_stats: bool = False,
     engine: str = None,
     engine_args: dict = None,
+    incremental: bool = False,
 ) -> OfflineVectorResponse:
     """retrieve offline feature vector results
 
@@ -143,7 +145,15 @@ def get_offline_features(
     :param with_indexes:    return vector with index columns and timestamp_key from the feature sets (default False)
     :param update_stats:    update features statistics from the requested feature sets on the vector. Default is False.
     :param engine:          processing engine kind ("local", "dask", or "spark")
-    :param engine_args:     kwargs for the processing engine
+    :param engine_args:     kwargs for the processing engine, the local engine accepts `chunk_size` (number
+                            of entity rows) to generate the vector in chunks with bounded memory, each chunk is
+                            appended to the (parquet/csv) target. `chunk_by` sets how the entity rows are split,
+                            "time" (by entity_timestamp_column ranges, the default) or "key" (by the keys hash),
+                            `read_workers` sets the max number of feature sets read concurrently
+    :param incremental:     append to the target only the vector rows completed since the previous incremental
+                            run (local engine only). the rows up to the feature sets min last_written time
+                            (watermark) are generated, the watermarks are kept in the vector target status.
+                            requires a named vector and a (non partitioned) parquet/csv target
     """
     if isinstance(feature_vector, FeatureVector):
         update_stats = True
@@ -165,6 +175,7 @@ def get_offline_features(
             run_config=run_config,
             drop_columns=drop_columns,
             with_indexes=with_indexes,
+            incremental=incremental,
         )
 
     start_time = str_to_timestamp(start_time)
@@ -187,6 +198,7 @@ def get_offline_features(
         end_time=end_time,
         with_indexes=with_indexes,
         update_stats=update_stats,
+        incremental=incremental,
     )
 
 
@@ -196,6 +208,8 @@ def get_online_feature_service(
     fixed_window_type: FixedWindowType = FixedWindowType.LastClosedWindow,
     impute_policy: dict = None,
     update_stats: bool = False,
+    cache_size: int = None,
+    cache_ttl: Union[int, dict] = None,
 ) -> OnlineVectorService:
     """initialize and return online feature vector service api,
     returns :py:class:`~mlrun.feature_store.OnlineVectorService`
@@ -249,17 +263,26 @@ def get_online_feature_service(
                               values. "*" is used to specify the default for all features, example: `{"*": "$mean"}`
     :param fixed_window_type: determines how to query the fixed window values which were previously inserted by ingest
     :param update_stats:    update features statistics from the requested feature sets on the vector. Default is False.
+    :param cache_size:      enable a local (in-process) cache in front of the online targets, holding up to
+                            `cache_size` (feature set, entity key) entries with LRU eviction. Default is no cache.
+    :param cache_ttl:       cached entries time to live in seconds, a number for all the feature sets or a dict with
+                            the ttl per feature set name ("*" for the default), example: `{"*": 60, "stocks": 5}`.
+                            Default is no expiration (use `svc.invalidate_cache()` to invalidate entries).
     """
     if isinstance(feature_vector, FeatureVector):
         update_stats = True
     feature_vector = _features_to_vector_and_check_permissions(
         feature_vector, update_stats
     )
-    graph, index_columns = init_feature_vector_graph(
-        feature_vector, fixed_window_type, update_stats=update_stats
+    graph, index_columns, cache = init_feature_vector_graph(
+        feature_vector,
+        fixed_window_type,
+        update_stats=update_stats,
+        cache_size=cache_size,
+        cache_ttl=cache_ttl,
     )
     service = OnlineVectorService(
-        feature_vector, graph, index_columns, impute_policy=impute_policy
+        feature_vector, graph, index_columns, impute_policy=impute_policy, cache=cache
     )
     service.initialize()
 
@@ -525,22 +548,34 @@ def ingest(
     infer_stats = InferOptions.get_common_options(
         infer_options, InferOptions.all_stats()
     )
+    if not InferOptions.get_common_options(
+        infer_stats, InferOptions.Index
+    ) and InferOptions.get_common_options(infer_options, InferOptions.Index):
+        infer_stats += InferOptions.Index
     return_df = return_df or infer_stats != InferOptions.Null
     featureset.save()
 
+    # with the pandas engine the stats of a chunked source are accumulated chunk by chunk while ingesting
+    stats_accumulator = None
+    if (
+        featureset.spec.engine == "pandas"
+        and _is_chunked_source(source)
+        and InferOptions.get_common_options(infer_stats, InferOptions.Stats)
+    ):
+        stats_accumulator = StatsAccumulator(infer_stats)
+
     df = init_featureset_graph(
         source,
         featureset,
         namespace,
         targets=targets_to_ingest,
         return_df=return_df,
+        stats_accumulator=stats_accumulator,
     )
-    if not InferOptions.get_common_options(
-        infer_stats, InferOptions.Index
-    ) and InferOptions.get_common_options(infer_options, InferOptions.Index):
-        infer_stats += InferOptions.Index
 
-    _infer_from_static_df(df, featureset, options=infer_stats)
+    _infer_from_static_df(
+        df, featureset, options=infer_stats, stats_accumulator=stats_accumulator
+    )
 
     if isinstance(source, DataSource):
         for target in featureset.status.targets:
@@ -604,6 +639,7 @@ def preview(
     )
 
     namespace = namespace or get_caller_globals()
+    stats_accumulator = None
     if featureset.spec.require_processing():
         _, default_final_step, _ = featureset.graph.check_and_process_graph(
             allow_empty=True
@@ -621,9 +657,15 @@ def preview(
                 InferOptions.get_common_options(options, InferOptions.Entities),
             )
         # reduce the size of the ingestion if we do not infer stats
-        rows_limit = (
-            0 if InferOptions.get_common_options(options, InferOptions.Stats) else 1000
-        )
+        infer_stats = InferOptions.get_common_options(options, InferOptions.Stats)
+        rows_limit = 0 if infer_stats else 1000
+        if (
+            infer_stats
+            and not sample_size
+            and featureset.spec.engine == "pandas"
+            and _is_chunked_source(source)
+        ):
+            stats_accumulator = StatsAccumulator(options)
         source = init_featureset_graph(
             source,
             featureset,
@@ -631,10 +673,16 @@ def preview(
             return_df=True,
             verbose=verbose,
             rows_limit=rows_limit,
+            stats_accumulator=stats_accumulator,
         )
 
     df = _infer_from_static_df(
-        source, featureset, entity_columns, options, sample_size=sample_size
+        source,
+        featureset,
+        entity_columns,
+        options,
+        sample_size=sample_size,
+        stats_accumulator=stats_accumulator,
     )
     featureset.save()
     return df
@@ -878,18 +926,32 @@ def _post_ingestion(context, featureset, spark=None):
         context.log_result("featureset", featureset.uri)
 
 
+def _is_chunked_source(source):
+    return hasattr(source, "is_iterator") and source.is_iterator()
+
+
 def _infer_from_static_df(
     df,
     featureset,
     entity_columns=None,
     options: InferOptions = InferOptions.default(),
     sample_size=None,
+    stats_accumulator: StatsAccumulator = None,
 ):
-    """infer feature-set schema & stats from static dataframe (without pipeline)"""
+    """infer feature-set schema & stats from static dataframe (without pipeline)
+
+    the stats are taken from the stats_accumulator when specified (accumulated over the ingested chunks)
+    """
+    infer_stats = InferOptions.get_common_options(options, InferOptions.Stats)
     if hasattr(df, "to_dataframe"):
         if df.is_iterator():
-            # todo: describe over multiple chunks
-            df = next(df.to_dataframe())
+            chunks = df.to_dataframe()
+            df = next(chunks)
+            if infer_stats and stats_accumulator is None and not sample_size:
+                # describe all the chunks, the schema and preview are inferred from the first chunk
+                stats_accumulator = StatsAccumulator(options).update(df)
+                for chunk in chunks:
+                    stats_accumulator.update(chunk)
         else:
             df = df.to_dataframe()
     inferer = get_infer_interface(df)
@@ -902,7 +964,9 @@ def _infer_from_static_df(
             entity_columns,
             options=options,
         )
-    if InferOptions.get_common_options(options, InferOptions.Stats):
+    if infer_stats and stats_accumulator is not None:
+        featureset.status.stats = stats_accumulator.get_stats()
+    elif infer_stats:
         featureset.status.stats = inferer.get_stats(
             df, options, sample_size=sample_size
         )
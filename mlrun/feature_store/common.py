@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import collections
 import typing
 from copy import copy
 
@@ -99,6 +100,26 @@ def get_feature_set_by_uri(uri, project=None):
     return db.get_feature_set(name, project, tag, uid)
 
 
+def get_feature_sets_by_uris(uris: typing.List[str], project=None) -> list:
+    """get feature set objects from db by uris (in the given order), with a single db request per project"""
+    db = mlrun.get_run_db()
+    references_by_project = collections.defaultdict(list)
+    for index, uri in enumerate(uris):
+        uri_project, name, tag, uid = parse_feature_set_uri(uri, project)
+        reference = f"{name}@{uid}" if uid else f"{name}:{tag}" if tag else name
+        references_by_project[uri_project].append((index, reference))
+
+    # the read permission of every feature set is verified by the db when getting it
+    feature_sets = [None] * len(uris)
+    for uri_project, references in references_by_project.items():
+        project_feature_sets = db.get_feature_sets(
+            [reference for _, reference in references], uri_project
+        )
+        for (index, _), feature_set in zip(references, project_feature_sets):
+            feature_sets[index] = feature_set
+    return feature_sets
+
+
 def get_feature_vector_by_uri(uri, project=None, update=True):
     """get feature vector object from db by uri"""
     db = mlrun.get_run_db()
@@ -25,7 +25,7 @@ from ..config import config as mlconf
 from ..datastore import get_store_uri
 from ..datastore.targets import get_offline_target
 from ..feature_store.common import (
-    get_feature_set_by_uri,
+    get_feature_sets_by_uris,
     parse_feature_string,
     parse_project_name_from_feature_string,
 )
@@ -327,14 +327,28 @@ class FeatureVector(ModelObj):
             processed_features[alias or name] = (feature_set_object, feature)
             feature_set_fields[feature_set_full_name].append((name, alias))
 
+        # get all the used feature sets at once (a single db request per project)
+        parsed_features = []
+        feature_set_uris = {}
         for feature in features:
             project_name, feature = parse_project_name_from_feature_string(feature)
             feature_set, feature_name, alias = parse_feature_string(feature)
-            if feature_set not in feature_set_objects.keys():
-                feature_set_objects[feature_set] = get_feature_set_by_uri(
-                    feature_set,
-                    project_name if project_name is not None else self.metadata.project,
+            parsed_features.append((feature, feature_set, feature_name, alias))
+            if feature_set not in feature_set_uris:
+                project_name = (
+                    project_name if project_name is not None else self.metadata.project
                 )
+                feature_set_uris[feature_set] = (
+                    f"{project_name}/{feature_set}" if project_name else feature_set
+                )
+        feature_set_objects = dict(
+            zip(
+                feature_set_uris.keys(),
+                get_feature_sets_by_uris(list(feature_set_uris.values())),
+            )
+        )
+
+        for feature, feature_set, feature_name, alias in parsed_features:
             feature_set_object = feature_set_objects[feature_set]
 
             feature_fields = feature_set_object.spec.features.keys()
@@ -379,13 +393,16 @@ class FeatureVector(ModelObj):
 class OnlineVectorService:
     """get_online_feature_service response object"""
 
-    def __init__(self, vector, graph, index_columns, impute_policy: dict = None):
+    def __init__(
+        self, vector, graph, index_columns, impute_policy: dict = None, cache=None
+    ):
         self.vector = vector
         self.impute_policy = impute_policy or {}
 
         self._controller = graph.controller
         self._index_columns = index_columns
         self._impute_values = {}
+        self._cache = cache
 
     def __enter__(self):
         return self
@@ -457,40 +474,9 @@ class OnlineVectorService:
         :param as_list:      return a list of list (list input is required by many ML frameworks)
         """
         results = []
-        futures = []
-        if isinstance(entity_rows, dict):
-            entity_rows = [entity_rows]
-
-        # validate we have valid input struct
-        if (
-            not entity_rows
-            or not isinstance(entity_rows, list)
-            or not isinstance(entity_rows[0], (list, dict))
-        ):
-            raise mlrun.errors.MLRunInvalidArgumentError(
-                f"input data is of type {type(entity_rows)}. must be a list of lists or list of dicts"
-            )
-
-        # if list of list, convert to dicts (with the index columns as the dict keys)
-        if isinstance(entity_rows[0], list):
-            if not self._index_columns or len(entity_rows[0]) != len(
-                self._index_columns
-            ):
-                raise mlrun.errors.MLRunInvalidArgumentError(
-                    "input list must be in the same size of the index_keys list"
-                )
-            index_range = range(len(self._index_columns))
-            entity_rows = [
-                {self._index_columns[i]: item[i] for i in index_range}
-                for item in entity_rows
-            ]
+        entity_rows = self._normalize_entity_rows(entity_rows)
 
-        for row in entity_rows:
-            futures.append(self._controller.emit(row, return_awaitable_result=True))
-
-        for future in futures:
-            result = future.await_result()
-            data = result.body
+        for data in self._query(entity_rows):
             for key in self._index_columns:
                 if data and key in data:
                     del data[key]
@@ -525,6 +511,160 @@ class OnlineVectorService:
 
         return results
 
+    def get_batch(
+        self, entity_rows: Union[List[Union[dict, list]], pd.DataFrame], as_list=False
+    ):
+        """get feature vectors for a batch of entities as a columnar result
+
+        same as :py:meth:`get`, but optimized for large batches: every distinct entity is looked up once
+        (all the lookups are pipelined through the feature set query steps), and the column backfill, imputing
+        and ordering are applied as vectorized operations over the whole batch instead of per row.
+
+        the result is a dataframe with one row per input row (in the same order), entities which were not found
+        have NaN values in all the feature columns (and are not imputed).
+
+        example::
+
+            svc = fs.get_online_feature_service(vector)
+            df = svc.get_batch([{"name": "joe"}, {"name": "mike"}])
+
+            # accept a dataframe with the entity columns, return a numpy array (ordered by the vector features)
+            arr = svc.get_batch(entities_df, as_list=True)
+
+        :param entity_rows:  list of list/dict with input entity data/rows, or a dataframe with the entity columns
+        :param as_list:      return a 2D numpy array with the feature values (ordered by the vector features)
+        """
+        if isinstance(entity_rows, pd.DataFrame):
+            entity_df = entity_rows.reset_index(drop=True)
+        else:
+            entity_df = pd.DataFrame(self._normalize_entity_rows(entity_rows))
+        if entity_df.empty:
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                "input data is empty, must have at least one entity row"
+            )
+
+        # look up every distinct entity once and map the results back to the input rows
+        group_codes = entity_df.groupby(
+            list(entity_df.columns), sort=False, dropna=False
+        ).ngroup()
+        unique_rows = entity_df.drop_duplicates().to_dict(orient="records")
+        bodies = self._query(unique_rows)
+
+        index_columns = set(self._index_columns)
+        records = [
+            {key: value for key, value in body.items() if key not in index_columns}
+            if body
+            else {}
+            for body in bodies
+        ]
+        found = np.array([bool(record) for record in records], dtype=bool)
+
+        feature_columns = self._get_feature_columns()
+        unique_df = pd.DataFrame.from_records(records, index=range(len(records)))
+        extra_columns = [
+            column for column in unique_df.columns if column not in feature_columns
+        ]
+        unique_df = unique_df.reindex(columns=feature_columns + extra_columns)
+
+        impute_columns = [
+            column for column in self._impute_values.keys() if column in feature_columns
+        ]
+        if impute_columns and found.any():
+            values = unique_df.loc[found, impute_columns]
+            values = values.replace([np.inf, -np.inf], np.nan).fillna(
+                {column: self._impute_values[column] for column in impute_columns}
+            )
+            unique_df.loc[found, impute_columns] = values
+
+        result = unique_df.iloc[group_codes.to_numpy()].reset_index(drop=True)
+        if as_list:
+            return result[feature_columns].to_numpy()
+        return result
+
+    def get_cache_stats(self):
+        """return the online cache statistics (size, evictions and hits/misses per feature set)"""
+        if not self._cache:
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                "online feature cache is not enabled, set cache_size to enable it"
+            )
+        return self._cache.stats()
+
+    def invalidate_cache(self, feature_set: str = None, key=None):
+        """invalidate online cache entries
+
+        example::
+
+            # invalidate a specific entity in a specific feature set
+            svc.invalidate_cache("stocks", "GOOG")
+
+            # invalidate all the cached entries
+            svc.invalidate_cache()
+
+        :param feature_set:  feature set name, invalidate all the feature sets if not specified
+        :param key:          entity key value (or list of values for multiple entities),
+                             invalidate all the keys if not specified
+        """
+        if self._cache:
+            self._cache.invalidate(feature_set, key)
+
+    def _query(self, entity_rows: List[dict]):
+        """return the graph result body per entity row, hot entities are served from the cache (if enabled)"""
+        results = [None] * len(entity_rows)
+        futures = []
+        for index, row in enumerate(entity_rows):
+            data = self._cache.get(row) if self._cache else None
+            if data is None:
+                future = self._controller.emit(row, return_awaitable_result=True)
+                futures.append((index, row, future))
+            else:
+                results[index] = data
+
+        for index, row, future in futures:
+            data = future.await_result().body
+            if self._cache and data:
+                self._cache.update(row, data)
+            results[index] = data
+        return results
+
+    def _normalize_entity_rows(self, entity_rows):
+        if isinstance(entity_rows, dict):
+            entity_rows = [entity_rows]
+
+        # validate we have valid input struct
+        if (
+            not entity_rows
+            or not isinstance(entity_rows, list)
+            or not isinstance(entity_rows[0], (list, dict))
+        ):
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                f"input data is of type {type(entity_rows)}. must be a list of lists or list of dicts"
+            )
+
+        # if list of list, convert to dicts (with the index columns as the dict keys)
+        if isinstance(entity_rows[0], list):
+            if not self._index_columns or len(entity_rows[0]) != len(
+                self._index_columns
+            ):
+                raise mlrun.errors.MLRunInvalidArgumentError(
+                    "input list must be in the same size of the index_keys list"
+                )
+            index_range = range(len(self._index_columns))
+            entity_rows = [
+                {self._index_columns[i]: item[i] for i in index_range}
+                for item in entity_rows
+            ]
+        return entity_rows
+
+    def _get_feature_columns(self):
+        """ordered list of the vector feature (output) columns, without the label column"""
+        columns = list(self.vector.status.features.keys())
+        for alias in self.vector.get_feature_aliases().values():
+            if alias not in columns:
+                columns.append(alias)
+        return [
+            column for column in columns if column != self.vector.status.label_column
+        ]
+
     def close(self):
         """terminate the async loop"""
         self._controller.terminate()
@@ -542,6 +682,12 @@ class OfflineVectorResponse:
         """vector prep job status (ready, running, error)"""
         return self._merger.get_status()
 
+    @property
+    def read_timings(self) -> dict:
+        """time (in seconds) spent reading each feature set, by feature set name
+        (an empty dict when not reported by the engine)"""
+        return self._merger.get_read_timings()
+
     def to_dataframe(self, to_pandas=True):
         """return result as dataframe"""
         if self.status != "completed":
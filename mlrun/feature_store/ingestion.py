@@ -12,11 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import concurrent.futures
+import multiprocessing
 import uuid
 
 import mlrun
 from mlrun.datastore.sources import get_source_from_dict, get_source_step
 from mlrun.datastore.targets import (
+    TargetTypes,
     add_target_steps,
     get_target_driver,
     validate_target_list,
@@ -39,8 +43,18 @@ def init_featureset_graph(
     return_df=True,
     verbose=False,
     rows_limit=None,
+    processes=None,
+    stats_accumulator=None,
 ):
-    """create storey ingestion graph/DAG from feature set object"""
+    """create storey ingestion graph/DAG from feature set object
+
+    with the sync (pandas) engine and a chunked source (e.g. CSVSource with chunksize), the chunks can be
+    transformed and written (to per chunk target files) on a pool of processes, the number of processes
+    defaults to mlrun.mlconf.feature_store.ingestion_processes (1 = sequential)
+
+    with the sync engine, the stats of every ingested chunk are added to the stats_accumulator
+    (StatsAccumulator) when specified, so the stats cover all the chunks (not only the returned first chunk)
+    """
 
     cache = ResourceCache()
     graph = featureset.spec.graph.copy()
@@ -82,30 +96,48 @@ def init_featureset_graph(
     entity_columns = list(featureset.spec.entities.keys())
     key_fields = entity_columns if entity_columns else None
 
-    sizes = [0] * len(targets)
-    data_result = None
-    total_rows = 0
     targets = [get_target_driver(target, featureset) for target in targets]
-    for chunk in chunks:
-        event = MockEvent(body=chunk)
-        data = server.run(event, get_body=True)
-        if data is not None:
-            for i, target in enumerate(targets):
-                size = target.write_dataframe(
-                    data,
-                    key_column=key_fields,
-                    timestamp_key=featureset.spec.timestamp_key,
-                    chunk_id=chunk_id,
-                )
-                if size:
-                    sizes[i] += size
-        chunk_id += 1
-        if data_result is None:
-            # in case of multiple chunks only return the first chunk (last may be too small)
-            data_result = data
-        total_rows += data.shape[0]
-        if rows_limit and total_rows >= rows_limit:
-            break
+    if processes is None:
+        processes = int(mlrun.mlconf.feature_store.ingestion_processes or 1)
+    # with rows_limit the chunks are processed in order, until the limit is reached
+    parallel = processes > 1 and chunk_id and not rows_limit
+    if parallel and not _supports_parallel_chunks(
+        targets, featureset.spec.timestamp_key
+    ):
+        logger.warn(
+            "the targets don't support parallel chunk writes, ingesting the chunks sequentially",
+            targets=[target.kind for target in targets],
+        )
+        parallel = False
+
+    if parallel:
+        data_result, sizes = _ingest_chunks_in_processes(
+            server,
+            key_fields,
+            featureset,
+            targets,
+            chunks,
+            processes,
+            stats_accumulator,
+        )
+    else:
+        sizes = [0] * len(targets)
+        data_result = None
+        total_rows = 0
+        for chunk in chunks:
+            data, chunk_sizes = _ingest_chunk(
+                server, key_fields, featureset, targets, chunk, chunk_id
+            )
+            sizes = [size + chunk_size for size, chunk_size in zip(sizes, chunk_sizes)]
+            chunk_id += 1
+            if stats_accumulator is not None and data is not None:
+                stats_accumulator.update(data)
+            if data_result is None:
+                # in case of multiple chunks only return the first chunk (last may be too small)
+                data_result = data
+            total_rows += data.shape[0]
+            if rows_limit and total_rows >= rows_limit:
+                break
 
     # todo: fire termination event if iterator
 
@@ -117,6 +149,103 @@ def init_featureset_graph(
     return data_result
 
 
+def _ingest_chunk(server, key_fields, featureset, targets, chunk, chunk_id):
+    """run the graph over a source chunk and write the results to the targets, return the data and sizes"""
+    event = MockEvent(body=chunk)
+    data = server.run(event, get_body=True)
+    sizes = [0] * len(targets)
+    if data is not None:
+        for i, target in enumerate(targets):
+            size = target.write_dataframe(
+                data,
+                key_column=key_fields,
+                timestamp_key=featureset.spec.timestamp_key,
+                chunk_id=chunk_id,
+            )
+            if size:
+                sizes[i] = size
+    return data, sizes
+
+
+def _supports_parallel_chunks(targets, timestamp_key):
+    # every chunk must be written to a separate file (or to new files in the parquet time partitions)
+    for target in targets:
+        partitioned = target.partitioned or target.time_partitioning_granularity
+        if target.kind not in [TargetTypes.parquet, TargetTypes.csv] or (
+            partitioned and (target.kind != TargetTypes.parquet or not timestamp_key)
+        ):
+            return False
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+# the graph server and targets used by the chunk ingestion processes (inherited by the forked processes)
+_chunk_ingestion_context = None
+
+
+def _ingest_chunk_in_process(chunk, chunk_id, return_data):
+    *ingestion_context, stats_accumulator = _chunk_ingestion_context
+    data, sizes = _ingest_chunk(*ingestion_context, chunk, chunk_id)
+    rows = 0 if data is None else data.shape[0]
+    # only the chunk stats (not the chunk data) are sent back to be merged
+    stats = None
+    if stats_accumulator is not None and data is not None:
+        stats = stats_accumulator.new().update(data)
+    return data if return_data else None, sizes, rows, stats
+
+
+def _ingest_chunks_in_processes(
+    server, key_fields, featureset, targets, chunks, processes, stats_accumulator=None
+):
+    """transform and write the source chunks on a process pool, return the first chunk data and target sizes
+
+    the graph state is not shared between the processes, so the graph steps must be stateless per chunk
+    """
+    global _chunk_ingestion_context
+    _chunk_ingestion_context = (
+        server,
+        key_fields,
+        featureset,
+        targets,
+        stats_accumulator,
+    )
+    sizes = [0] * len(targets)
+    data_result = None
+    total_rows = 0
+
+    def collect(future):
+        nonlocal sizes, data_result, total_rows
+        data, chunk_sizes, rows, stats = future.result()
+        sizes = [size + chunk_size for size, chunk_size in zip(sizes, chunk_sizes)]
+        data_result = data if data is not None else data_result
+        total_rows += rows
+        if stats is not None:
+            stats_accumulator.merge(stats)
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("fork")
+        ) as pool:
+            pending = collections.deque()
+            for chunk_id, chunk in enumerate(chunks, start=1):
+                pending.append(
+                    pool.submit(
+                        _ingest_chunk_in_process, chunk, chunk_id, chunk_id == 1
+                    )
+                )
+                # limit the number of chunks read ahead (held in memory)
+                if len(pending) >= 2 * processes:
+                    collect(pending.popleft())
+            while pending:
+                collect(pending.popleft())
+    finally:
+        _chunk_ingestion_context = None
+
+    logger.info(
+        "ingested the source chunks in parallel", processes=processes, rows=total_rows
+    )
+    return data_result, sizes
+
+
 def featureset_initializer(server):
     """graph server hook to initialize feature set ingestion graph/DAG"""
 
@@ -9,6 +9,9 @@ from ...utils import logger
 class BaseMerger(abc.ABC):
     """abstract feature merger class"""
 
+    # the merger can append only the new vector rows to the target (see start(incremental=True))
+    support_incremental = False
+
     def __init__(self, vector, **engine_args):
         self.vector = vector
 
@@ -17,6 +20,8 @@ class BaseMerger(abc.ABC):
         self._index_columns = []
         self._drop_indexes = True
         self._target = None
+        self._incremental = False
+        self._read_timings = {}
 
     def _append_drop_column(self, key):
         if key and key not in self._drop_columns:
@@ -39,8 +44,14 @@ class BaseMerger(abc.ABC):
         end_time=None,
         with_indexes=None,
         update_stats=None,
+        incremental=None,
     ):
         self._target = target
+        if incremental and not self.support_incremental:
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                f"incremental vector generation is not supported by {type(self).__name__}"
+            )
+        self._incremental = bool(incremental)
 
         # calculate the index columns and columns we need to drop
         self._drop_columns = drop_columns or self._drop_columns
@@ -80,17 +91,26 @@ class BaseMerger(abc.ABC):
 
     def _write_to_target(self):
         if self._target:
-            is_persistent_vector = self.vector.metadata.name is not None
-            if not self._target.path and not is_persistent_vector:
-                raise mlrun.errors.MLRunInvalidArgumentError(
-                    "target path was not specified"
-                )
-            self._target.set_resource(self.vector)
-            size = self._target.write_dataframe(self._result_df)
-            if is_persistent_vector:
-                target_status = self._target.update_resource_status("ready", size=size)
-                logger.info(f"wrote target: {target_status}")
-                self.vector.save()
+            size = self._write_dataframe_to_target(self._result_df)
+            self._update_target_status(size)
+
+    def _write_dataframe_to_target(self, df, chunk_id=0):
+        """write a dataframe (or a chunk of the result, when chunk_id > 0) to the target, return its size"""
+        is_persistent_vector = self.vector.metadata.name is not None
+        if not self._target.path and not is_persistent_vector:
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                "target path was not specified"
+            )
+        self._target.set_resource(self.vector)
+        return self._target.write_dataframe(df, chunk_id=chunk_id)
+
+    def _update_target_status(self, size, **status_fields):
+        if self.vector.metadata.name is not None:
+            target_status = self._target.update_resource_status("ready", size=size)
+            for key, value in status_fields.items():
+                setattr(target_status, key, value)
+            logger.info(f"wrote target: {target_status}")
+            self.vector.save()
 
     def _set_indexes(self, df):
         if self._index_columns and not self._drop_indexes:
@@ -182,6 +202,10 @@ class BaseMerger(abc.ABC):
         """return the result as a dataframe (pandas by default)"""
         return self._result_df
 
+    def get_read_timings(self):
+        """return the time (in seconds) spent reading each feature set, by feature set name"""
+        return dict(self._read_timings)
+
     def to_parquet(self, target_path, **kw):
         """return results as parquet file"""
         size = ParquetTarget(path=target_path).write_dataframe(self._result_df, **kw)
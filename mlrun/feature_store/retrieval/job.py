@@ -16,6 +16,7 @@ def run_merge_job(
     run_config=None,
     drop_columns=None,
     with_indexes=None,
+    incremental=None,
 ):
     name = vector.metadata.name
     if not target or not hasattr(target, "to_dict"):
@@ -43,6 +44,7 @@ def run_merge_job(
             "timestamp_column": timestamp_column,
             "drop_columns": drop_columns,
             "with_indexes": with_indexes,
+            "incremental": incremental,
         },
         inputs={"entity_rows": entity_rows},
     )
@@ -102,7 +104,7 @@ import mlrun
 from mlrun.feature_store.retrieval import LocalFeatureMerger
 from mlrun.datastore.targets import get_target_driver
 def merge_handler(context, vector_uri, target, entity_rows=None, 
-                  timestamp_column=None, drop_columns=None, with_indexes=None):
+                  timestamp_column=None, drop_columns=None, with_indexes=None, incremental=None):
     vector = context.get_store_resource(vector_uri)
     store_target = get_target_driver(target, vector)
     entity_timestamp_column = timestamp_column or vector.spec.timestamp_field
@@ -111,7 +113,8 @@ def merge_handler(context, vector_uri, target, entity_rows=None,
 
     context.logger.info(f"starting vector merge task to {vector.uri}")
     merger = LocalFeatureMerger(vector)
-    resp = merger.start(entity_rows, entity_timestamp_column, store_target, drop_columns, with_indexes=with_indexes)
+    resp = merger.start(entity_rows, entity_timestamp_column, store_target, drop_columns, with_indexes=with_indexes,
+                        incremental=incremental)
     target = vector.status.targets[store_target.name].to_dict()
     context.log_result('feature_vector', vector.uri)
     context.log_result('target', target)
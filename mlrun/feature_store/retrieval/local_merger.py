@@ -12,15 +12,44 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
+import functools
+import math
+import os
+import time
+from datetime import datetime
+
+import numpy as np
 import pandas as pd
 
+import mlrun
+from mlrun.datastore.targets import (
+    CSVTarget,
+    ParquetTarget,
+    TargetTypes,
+    generate_path_with_chunk,
+    get_offline_target,
+)
+
+from ...utils import logger
 from ..feature_vector import OfflineVectorResponse
 from .base import BaseMerger
 
 
 class LocalFeatureMerger(BaseMerger):
+    support_incremental = True
+
     def __init__(self, vector, **engine_args):
         super().__init__(vector, **engine_args)
+        self._chunk_size = engine_args.get("chunk_size")
+        self._chunk_by = engine_args.get("chunk_by") or "time"
+        self._chunk_paths = None
+        # feature sets which can't be read by time range (non parquet targets) are read once and sliced in memory
+        self._full_reads = {}
+        self._read_workers = int(
+            engine_args.get("read_workers")
+            or mlrun.mlconf.feature_store.offline_read_workers
+        )
 
     def _generate_vector(
         self,
@@ -31,52 +60,744 @@ class LocalFeatureMerger(BaseMerger):
         start_time=None,
         end_time=None,
     ):
+        if self._incremental:
+            return self._generate_vector_incrementally(
+                entity_rows,
+                entity_timestamp_column,
+                feature_set_objects,
+                feature_set_fields,
+                start_time=start_time,
+                end_time=end_time,
+            )
+        if self._chunk_size:
+            return self._generate_vector_in_chunks(
+                entity_rows,
+                entity_timestamp_column,
+                feature_set_objects,
+                feature_set_fields,
+                start_time=start_time,
+                end_time=end_time,
+            )
+
+        dfs = self._read_feature_sets(
+            {
+                name: functools.partial(
+                    self._read_feature_set,
+                    feature_set_objects[name],
+                    columns,
+                    entity_timestamp_column,
+                    start_time,
+                    end_time,
+                )
+                for name, columns in feature_set_fields.items()
+            }
+        )
+        feature_sets = [feature_set_objects[name] for name in feature_set_fields]
+        self.merge(
+            entity_rows,
+            entity_timestamp_column,
+            feature_sets,
+            [dfs[name] for name in feature_set_fields],
+        )
+        self._result_df = self._prepare_result(self._result_df)
+        self._write_to_target()
+
+        # check if need to set indices
+        self._result_df = self._set_indexes(self._result_df)
+        return OfflineVectorResponse(self)
+
+    def _generate_vector_in_chunks(
+        self,
+        entity_rows,
+        entity_timestamp_column,
+        feature_set_objects,
+        feature_set_fields,
+        start_time=None,
+        end_time=None,
+    ):
+        """generate the vector chunk by chunk, and append every merged chunk to the target
+
+        the entity rows are split by time range (chunk_by="time") or by the hash of their keys
+        (chunk_by="key"), each chunk reads only the matching slice of the feature sets. with time chunks the
+        latest row per entity (before the chunk) is carried to the next chunk, so the as-of join result is the
+        same as in a single merge
+        """
+        self._validate_chunking(entity_rows, entity_timestamp_column)
+        self._chunk_paths = []
+        total_size, _ = self._merge_in_chunks(
+            self._entity_chunks(entity_rows, entity_timestamp_column),
+            entity_timestamp_column,
+            feature_set_objects,
+            feature_set_fields,
+            start_time,
+            end_time,
+        )
+        self._full_reads = {}
+        logger.info(
+            f"wrote the feature vector in {len(self._chunk_paths)} chunks",
+            target=self._target.get_target_path(),
+        )
+        self._update_target_status(total_size)
+        return OfflineVectorResponse(self)
+
+    def _merge_in_chunks(
+        self,
+        entity_chunks,
+        entity_timestamp_column,
+        feature_set_objects,
+        feature_set_fields,
+        start_time=None,
+        end_time=None,
+        previous_end=None,
+        latest_rows=None,
+        first_chunk_id=1,
+    ):
+        """merge the entity chunks and write them to the target (as chunk files, starting from first_chunk_id)
+
+        latest_rows holds the latest feature set rows per entity (up to previous_end), and is updated in place
+        with time chunks. returns the total size written and the end time of the last chunk
+        """
+        by_time = self._chunk_by == "time"
+        feature_sets = [feature_set_objects[name] for name in feature_set_fields]
+        latest_rows = {} if latest_rows is None else latest_rows
+        slice_by = None
+        # feature sets which can't be sliced per chunk are read once
+        full_dfs = {}
+        total_size = 0
+        for entity_chunk in entity_chunks:
+            if slice_by is None:
+                slice_by = {}
+                for name, feature_set in zip(feature_set_fields, feature_sets):
+                    if by_time and feature_set.spec.timestamp_key:
+                        slice_by[name] = "time"
+                    elif not by_time and _can_filter_by_keys(feature_set, entity_chunk):
+                        slice_by[name] = "key"
+            chunk_end = (
+                entity_chunk[entity_timestamp_column].iloc[-1] if by_time else None
+            )
+            reads = {}
+            for name, columns in feature_set_fields.items():
+                feature_set = feature_set_objects[name]
+                if slice_by.get(name) == "time":
+                    reads[name] = functools.partial(
+                        self._read_time_slice,
+                        feature_set,
+                        columns,
+                        entity_timestamp_column,
+                        previous_end,
+                        chunk_end,
+                        start_time,
+                        end_time,
+                    )
+                elif slice_by.get(name) == "key" or name not in full_dfs:
+                    filters = None
+                    if slice_by.get(name) == "key":
+                        filters = [
+                            (key, "in", entity_chunk[key].unique().tolist())
+                            for key in feature_set.spec.entities.keys()
+                        ]
+                    reads[name] = functools.partial(
+                        self._read_feature_set,
+                        feature_set,
+                        columns,
+                        entity_timestamp_column,
+                        start_time,
+                        end_time,
+                        filters=filters,
+                    )
+            read_dfs = self._read_feature_sets(reads)
+            previous_end = chunk_end
+
+            dfs = []
+            for name in feature_set_fields.keys():
+                df = read_dfs.get(name)
+                if slice_by.get(name) == "time":
+                    if name in latest_rows:
+                        df = pd.concat([latest_rows[name], df], ignore_index=True)
+                    latest_rows[name] = _latest_rows(df, feature_set_objects[name])
+                elif not slice_by.get(name):
+                    df = full_dfs.setdefault(name, df)
+                dfs.append(df)
+
+            self.merge(entity_chunk, entity_timestamp_column, feature_sets, dfs)
+            chunk_df = self._prepare_result(self._result_df)
+            self._result_df = None
+            if chunk_df.empty:
+                continue
+            chunk_id = first_chunk_id + len(self._chunk_paths)
+            total_size += (
+                self._write_dataframe_to_target(chunk_df, chunk_id=chunk_id) or 0
+            )
+            self._chunk_paths.append(generate_path_with_chunk(self._target, chunk_id))
+        return total_size, previous_end
+
+    def _generate_vector_incrementally(
+        self,
+        entity_rows,
+        entity_timestamp_column,
+        feature_set_objects,
+        feature_set_fields,
+        start_time=None,
+        end_time=None,
+    ):
+        """append to the target only the vector rows which were completed since the previous incremental run
+
+        the vector watermark is the min of the feature sets watermarks (their offline target last_written),
+        the entity rows with timestamp in (previous watermark, watermark] are merged and appended as new chunk
+        files. the latest row per entity of every feature set is kept next to the target (in _state/), so only
+        the feature set rows newer than the previous watermark are read. a target which was written by a
+        non-incremental run (has no watermarks) is rewritten
+        """
+        self._validate_incremental(
+            entity_rows,
+            entity_timestamp_column,
+            feature_set_objects,
+            feature_set_fields,
+        )
+        target_status = None
+        if self._target.name in self.vector.status.targets.keys():
+            target_status = self.vector.status.targets[self._target.name]
+        if target_status and not target_status.watermarks:
+            # the last_written of a non-incremental run is not a data watermark, and its (single file) output
+            # can't be appended with chunks
+            logger.warning(
+                "the target was not written incrementally, rewriting it",
+                target=self._target.get_target_path(),
+            )
+            self._purge_target()
+            target_status = None
+        previous_watermarks = (target_status and target_status.watermarks) or {}
+
+        # the feature sets without a timestamp_key have no watermark (kept as None)
+        watermarks = {
+            name: _feature_set_watermark(feature_set_objects[name])
+            if feature_set_objects[name].spec.timestamp_key
+            else None
+            for name in feature_set_fields.keys()
+        }
+        watermark = min(
+            [value for value in watermarks.values() if value is not None]
+            + ([pd.Timestamp(end_time)] if end_time else []),
+            default=pd.Timestamp.utcnow().tz_localize(None),
+        )
+        previous_watermark = None
+        if target_status and target_status.last_written:
+            previous_watermark = pd.Timestamp(target_status.last_written)
+        elif start_time:
+            previous_watermark = pd.Timestamp(start_time)
+
+        if previous_watermark is not None and watermark <= previous_watermark:
+            logger.info(
+                "no new feature set data since the previous run",
+                watermark=str(previous_watermark),
+            )
+            self._chunk_paths = []
+            return OfflineVectorResponse(self)
+
+        feature_set_fields = dict(feature_set_fields)
+        if entity_rows is None:
+            # the first feature set rows are the entity rows (are not joined with previous rows)
+            name, columns = next(iter(feature_set_fields.items()))
+            del feature_set_fields[name]
+            feature_set = feature_set_objects[name]
+            entity_timestamp_column = feature_set.spec.timestamp_key
+            entity_rows = self._read_time_slice(
+                feature_set,
+                columns,
+                entity_timestamp_column,
+                previous_watermark,
+                watermark,
+            )
+        else:
+            times = pd.to_datetime(entity_rows[entity_timestamp_column])
+            mask = times <= watermark
+            if previous_watermark is not None:
+                mask &= times > previous_watermark
+            entity_rows = entity_rows[mask.to_numpy()]
 
-        feature_sets = []
-        dfs = []
+        latest_rows = {}
+        state_path = self._state_path()
+        if previous_watermark is not None:
+            for name, columns in feature_set_fields.items():
+                feature_set = feature_set_objects[name]
+                if not feature_set.spec.timestamp_key:
+                    continue
+                if name in previous_watermarks:
+                    latest_rows[name] = mlrun.get_dataitem(
+                        f"{state_path}/{name}.parquet"
+                    ).as_df(format="parquet")
+                else:
+                    # a feature set which was added to the vector, its history is read once
+                    latest_rows[name] = _latest_rows(
+                        self._read_time_slice(
+                            feature_set,
+                            columns,
+                            entity_timestamp_column,
+                            None,
+                            previous_watermark,
+                            start_time,
+                            end_time,
+                        ),
+                        feature_set,
+                    )
+
+        self._chunk_paths = []
+        total_size, last_end = self._merge_in_chunks(
+            self._entity_chunks(entity_rows, entity_timestamp_column),
+            entity_timestamp_column,
+            feature_set_objects,
+            feature_set_fields,
+            start_time,
+            end_time,
+            previous_end=previous_watermark,
+            latest_rows=latest_rows,
+            first_chunk_id=self._next_chunk_id(),
+        )
+        # carry the feature set rows up to the watermark (after the last entity row) to the next run
         for name, columns in feature_set_fields.items():
             feature_set = feature_set_objects[name]
-            feature_sets.append(feature_set)
-            column_names = [name for name, alias in columns]
-            # handling case where there are multiple feature sets and user creates vector where entity_timestamp_
-            # column is from a specific feature set (can't be entity timestamp)
-            if (
-                entity_timestamp_column in column_names
-                or feature_set.spec.timestamp_key == entity_timestamp_column
-            ):
-                df = feature_set.to_dataframe(
-                    columns=column_names,
-                    start_time=start_time,
-                    end_time=end_time,
-                    time_column=entity_timestamp_column,
+            if not feature_set.spec.timestamp_key:
+                continue
+            df = self._read_time_slice(
+                feature_set,
+                columns,
+                entity_timestamp_column,
+                last_end if last_end is not None else previous_watermark,
+                watermark,
+                start_time,
+                end_time,
+            )
+            if name in latest_rows:
+                df = pd.concat([latest_rows[name], df], ignore_index=True)
+            ParquetTarget(path=f"{state_path}/{name}.parquet").write_dataframe(
+                _latest_rows(df, feature_set)
+            )
+        self._full_reads = {}
+
+        logger.info(
+            f"appended {len(self._chunk_paths)} chunks to the feature vector",
+            target=self._target.get_target_path(),
+            watermark=str(watermark),
+        )
+        previous_size = (target_status and target_status.size) or 0
+        self._update_target_status(
+            previous_size + total_size,
+            last_written=watermark.isoformat(),
+            watermarks={
+                name: value.isoformat() if value is not None else None
+                for name, value in watermarks.items()
+            },
+        )
+        return OfflineVectorResponse(self)
+
+    def _purge_target(self):
+        """delete the target output (a single file or the chunk files) and the incremental state"""
+        target_path = self._target.get_target_path()
+        prefix, _ = os.path.splitext(target_path)
+        store = self._target._get_store()
+        for path in {target_path, prefix.rstrip("/")}:
+            try:
+                store.rm(path, recursive=True)
+            except FileNotFoundError:
+                pass
+
+    def _state_path(self):
+        prefix, _ = os.path.splitext(self._target.get_target_path())
+        return f"{prefix.rstrip('/')}/_state"
+
+    def _next_chunk_id(self):
+        prefix, suffix = os.path.splitext(self._target.get_target_path())
+        try:
+            names = mlrun.get_dataitem(prefix).listdir()
+        except (FileNotFoundError, ValueError):
+            return 1
+        chunk_ids = [
+            int(name[: -len(suffix)] if suffix else name)
+            for name in names
+            if (name[: -len(suffix)] if suffix else name).isdigit()
+            and name.endswith(suffix)
+        ]
+        return max(chunk_ids, default=0) + 1
+
+    def _validate_incremental(
+        self,
+        entity_rows,
+        entity_timestamp_column,
+        feature_set_objects,
+        feature_set_fields,
+    ):
+        if not self.vector.metadata.name:
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                "incremental vector generation requires a named (persistent) feature vector"
+            )
+        if self._chunk_by != "time":
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                "incremental vector generation supports only time chunks"
+            )
+        if entity_rows is None:
+            first_feature_set = feature_set_objects[next(iter(feature_set_fields))]
+            if not first_feature_set.spec.timestamp_key:
+                raise mlrun.errors.MLRunInvalidArgumentError(
+                    "the first feature set must have a timestamp_key for incremental vector generation"
                 )
-            else:
+        elif (
+            not entity_timestamp_column
+            or entity_timestamp_column not in entity_rows.columns
+        ):
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                "entity_timestamp_column (in the entity rows) must be provided for incremental vector generation"
+            )
+        self._validate_chunked_target()
+
+    def _validate_chunking(self, entity_rows, entity_timestamp_column):
+        if self._chunk_by not in ["time", "key"]:
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                f"chunk_by must be 'time' or 'key', not {self._chunk_by}"
+            )
+        if entity_rows is None:
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                "entity_rows must be provided when generating the vector in chunks"
+            )
+        if self._chunk_by == "time" and (
+            not entity_timestamp_column
+            or entity_timestamp_column not in entity_rows.columns
+        ):
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                "entity_timestamp_column (in the entity rows) must be provided when chunking by time"
+            )
+        if self._chunk_by == "key" and not any(
+            key in entity_rows.columns for key in self._index_columns
+        ):
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                f"the entity rows must contain one of the entity columns {self._index_columns} "
+                "when chunking by key"
+            )
+        self._validate_chunked_target()
+
+    def _validate_chunked_target(self):
+        if (
+            not self._target
+            or self._target.kind not in [TargetTypes.parquet, TargetTypes.csv]
+            or self._target.partitioned
+            or self._target.time_partitioning_granularity
+        ):
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                "generating the vector in chunks requires a (non partitioned) parquet or csv target"
+            )
+
+    def _entity_chunks(self, entity_rows, entity_timestamp_column):
+        if self._chunk_by == "time":
+            entity_rows = entity_rows.assign(
+                **{
+                    entity_timestamp_column: pd.to_datetime(
+                        entity_rows[entity_timestamp_column]
+                    )
+                }
+            ).sort_values(by=entity_timestamp_column, kind="mergesort")
+            # incremental runs without a chunk size merge all the new entity rows at once
+            chunk_size = self._chunk_size or max(len(entity_rows), 1)
+            for start in range(0, len(entity_rows), chunk_size):
+                yield entity_rows.iloc[start : start + chunk_size]
+        else:
+            keys = [key for key in self._index_columns if key in entity_rows.columns]
+            chunks = max(math.ceil(len(entity_rows) / self._chunk_size), 1)
+            buckets = (
+                pd.util.hash_pandas_object(entity_rows[keys], index=False) % chunks
+            ).to_numpy()
+            for bucket in range(chunks):
+                entity_chunk = entity_rows[buckets == bucket]
+                if not entity_chunk.empty:
+                    yield entity_chunk
+
+    def _read_feature_sets(self, reads):
+        """run the feature set reads (dict of name -> read function) concurrently on a thread pool
+
+        the reads are I/O bound, the time spent reading each feature set is added to the read timings,
+        returns the read dataframes by feature set name
+        """
+
+        def timed_read(read):
+            start = time.monotonic()
+            df = read()
+            return df, time.monotonic() - start
+
+        if self._read_workers > 1 and len(reads) > 1:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(self._read_workers, len(reads))
+            ) as pool:
+                futures = {
+                    name: pool.submit(timed_read, read) for name, read in reads.items()
+                }
+                results = {name: future.result() for name, future in futures.items()}
+        else:
+            results = {name: timed_read(read) for name, read in reads.items()}
+
+        dfs = {}
+        for name, (df, elapsed) in results.items():
+            self._read_timings[name] = self._read_timings.get(name, 0.0) + elapsed
+            logger.debug(
+                "read feature set", name=name, rows=len(df), seconds=round(elapsed, 3)
+            )
+            dfs[name] = df
+        return dfs
+
+    def _read_feature_set(
+        self,
+        feature_set,
+        columns,
+        entity_timestamp_column,
+        start_time=None,
+        end_time=None,
+        filters=None,
+    ):
+        column_names = [name for name, alias in columns]
+        kwargs = {"filters": filters} if filters else {}
+        # handling case where there are multiple feature sets and user creates vector where entity_timestamp_
+        # column is from a specific feature set (can't be entity timestamp)
+        if _filter_by_time(feature_set, column_names, entity_timestamp_column):
+            df = feature_set.to_dataframe(
+                columns=column_names,
+                start_time=start_time,
+                end_time=end_time,
+                time_column=entity_timestamp_column,
+                **kwargs,
+            )
+        else:
+            df = feature_set.to_dataframe(
+                columns=column_names,
+                time_column=entity_timestamp_column,
+                **kwargs,
+            )
+        # rename columns with aliases
+        df.rename(
+            columns={name: alias for name, alias in columns if alias}, inplace=True
+        )
+        return df
+
+    def _read_time_slice(
+        self,
+        feature_set,
+        columns,
+        entity_timestamp_column,
+        after,
+        until,
+        start_time=None,
+        end_time=None,
+    ):
+        """read the feature set rows with timestamp_key in (after, until], and in (start_time, end_time]
+        when the time range filter applies to the feature set"""
+        column_names = [name for name, alias in columns]
+        timestamp_key = feature_set.spec.timestamp_key
+        filter_by_time = (start_time or end_time) and _filter_by_time(
+            feature_set, column_names, entity_timestamp_column
+        )
+        if filter_by_time and timestamp_key == entity_timestamp_column:
+            if start_time and (after is None or start_time > after):
+                after = start_time
+            if end_time and end_time < until:
+                until = end_time
+        if get_offline_target(feature_set).kind == TargetTypes.parquet:
+            # the start/end filters are pushed down to parquet targets (with partition pruning)
+            df = feature_set.to_dataframe(
+                columns=column_names,
+                start_time=pd.Timestamp.min if after is None else after,
+                end_time=until,
+                time_column=timestamp_key,
+            )
+            df = _reset_unnamed_index(df)
+            df[timestamp_key] = pd.to_datetime(df[timestamp_key])
+        else:
+            # other targets are read in full, so they are read once (and not per chunk)
+            key = (feature_set.metadata.name, tuple(column_names))
+            if key not in self._full_reads:
                 df = feature_set.to_dataframe(
-                    columns=column_names,
-                    time_column=entity_timestamp_column,
+                    columns=column_names, time_column=timestamp_key
                 )
-            # rename columns with aliases
-            df.rename(
-                columns={name: alias for name, alias in columns if alias}, inplace=True
+                df = _reset_unnamed_index(df)
+                df[timestamp_key] = pd.to_datetime(df[timestamp_key])
+                self._full_reads[key] = df
+            df = self._full_reads[key]
+        mask = df[timestamp_key] <= until
+        if after is not None:
+            mask &= df[timestamp_key] > after
+        if filter_by_time and timestamp_key != entity_timestamp_column:
+            times = pd.to_datetime(df[entity_timestamp_column])
+            if start_time:
+                mask &= times > start_time
+            if end_time:
+                mask &= times <= end_time
+        df = df[mask.to_numpy()].reset_index(drop=True)
+        df.rename(
+            columns={name: alias for name, alias in columns if alias}, inplace=True
+        )
+        return df
+
+    def _prepare_result(self, df):
+        df.drop(columns=self._drop_columns, inplace=True, errors="ignore")
+
+        if self.vector.status.label_column:
+            df = df.dropna(subset=[self.vector.status.label_column])
+
+        if self._drop_indexes:
+            df.reset_index(drop=True, inplace=True)
+        return df
+
+    def get_status(self):
+        if self._chunk_paths is not None:
+            return "completed"
+        return super().get_status()
+
+    def get_df(self, to_pandas=True):
+        """return the result as a dataframe (the chunks written to the target are read back when chunked)"""
+        if self._chunk_paths is None:
+            return super().get_df(to_pandas)
+        read_args = {"index_col": 0} if self._target.kind == TargetTypes.csv else {}
+        dfs = [
+            mlrun.get_dataitem(path).as_df(format=self._target.kind, **read_args)
+            for path in self._chunk_paths
+        ]
+        df = pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
+        return self._set_indexes(df)
+
+    def to_parquet(self, target_path, **kw):
+        """return results as parquet file"""
+        return ParquetTarget(path=target_path).write_dataframe(self.get_df(), **kw)
+
+    def to_csv(self, target_path, **kw):
+        """return results as csv file"""
+        return CSVTarget(path=target_path).write_dataframe(self.get_df(), **kw)
+
+    def merge(
+        self,
+        entity_df,
+        entity_timestamp_column: str,
+        featuresets: list,
+        featureset_dfs: list,
+    ):
+        """join the entities and feature set features into a result dataframe
+
+        when all the feature sets have a timestamp key, the entity timeline is converted and sorted once and
+        reused for all the feature sets (see `_single_pass_asof_merge`), otherwise the feature sets are
+        joined one after the other
+        """
+        left_df = entity_df
+        left_timestamp_column = entity_timestamp_column
+        right_featuresets = list(featuresets)
+        right_dfs = list(featureset_dfs)
+        if entity_df is None and right_dfs:
+            left_df = right_dfs.pop(0)
+            featureset = right_featuresets.pop(0)
+            left_timestamp_column = (
+                entity_timestamp_column or featureset.spec.timestamp_key
             )
-            dfs.append(df)
 
-        self.merge(entity_rows, entity_timestamp_column, feature_sets, dfs)
+        merged_df = None
+        if right_dfs:
+            merged_df = self._single_pass_asof_merge(
+                left_df, left_timestamp_column, right_featuresets, right_dfs
+            )
+        if merged_df is None:
+            return super().merge(
+                entity_df, entity_timestamp_column, featuresets, featureset_dfs
+            )
+        self._result_df = merged_df
 
-        self._result_df.drop(columns=self._drop_columns, inplace=True, errors="ignore")
+    def _single_pass_asof_merge(
+        self,
+        entity_df: pd.DataFrame,
+        entity_timestamp_column: str,
+        featuresets: list,
+        featureset_dfs: list,
+    ):
+        """as-of join all the feature sets into the entity dataframe in a single pass
 
-        if self.vector.status.label_column:
-            self._result_df = self._result_df.dropna(
-                subset=[self.vector.status.label_column]
+        the entity timeline is converted and sorted once, each feature set is as-of joined over its key columns
+        only, and the matched rows of its feature columns are gathered straight into the result columns.
+        the result is identical to chaining `_asof_join` per feature set, returns None for the cases which
+        are not supported by the single pass merge (and must use the chained merge)
+        """
+        if not all(featureset.spec.timestamp_key for featureset in featuresets):
+            return None
+        for df in [entity_df] + featureset_dfs:
+            if "index" in df.columns:
+                return None
+        for featureset in featuresets:
+            if "index" in featureset.spec.entities.keys():
+                return None
+        # the chained merge resets the (non range) index of the merged dataframe before every join after the
+        # first one, so a feature set with an unnamed index would end up with suffixed "index" columns
+        if any(_has_unnamed_index(df) for df in featureset_dfs[1:]) or (
+            _has_unnamed_index(entity_df) and _has_unnamed_index(featureset_dfs[0])
+        ):
+            return None
+
+        entity_df = _reset_unnamed_index(entity_df)
+        if entity_timestamp_column not in entity_df.columns:
+            return None
+        result_columns = list(entity_df.columns)
+        joins = []
+        for featureset, featureset_df in zip(featuresets, featureset_dfs):
+            featureset_df = _reset_unnamed_index(featureset_df)
+            indexes = list(featureset.spec.entities.keys())
+            timestamp_key = featureset.spec.timestamp_key
+            columns = [
+                column
+                for column in featureset_df.columns
+                if column not in indexes
+                and not (column == timestamp_key and column == entity_timestamp_column)
+            ]
+            if (
+                timestamp_key not in featureset_df.columns
+                or any(index not in featureset_df.columns for index in indexes)
+                or any(index not in result_columns for index in indexes)
+                or any(column in result_columns for column in columns)
+            ):
+                return None
+            result_columns.extend(columns)
+            joins.append((featureset_df, indexes, timestamp_key, columns))
+
+        entity_df = entity_df.assign(
+            **{
+                entity_timestamp_column: pd.to_datetime(
+                    entity_df[entity_timestamp_column]
+                )
+            }
+        )
+        entity_df = entity_df.sort_values(by=entity_timestamp_column).reset_index(
+            drop=True
+        )
+        entity_times = entity_df[entity_timestamp_column].to_numpy()
+        result = {column: entity_df[column] for column in entity_df.columns}
+
+        for featureset_df, indexes, timestamp_key, columns in joins:
+            featureset_times = pd.to_datetime(featureset_df[timestamp_key])
+            order = np.argsort(featureset_times.to_numpy(), kind="mergesort")
+            left_keys = pd.DataFrame(
+                {column: result[column].to_numpy() for column in indexes}
+            )
+            left_keys["_merge_time"] = entity_times
+            right_keys = pd.DataFrame(
+                {column: featureset_df[column].to_numpy()[order] for column in indexes}
             )
+            right_keys["_merge_time"] = featureset_times.to_numpy()[order]
+            right_keys["_merge_position"] = order
+            positions = pd.merge_asof(
+                left_keys, right_keys, on="_merge_time", by=indexes
+            )["_merge_position"]
+            positions = positions.fillna(-1).to_numpy(dtype=np.int64)
 
-        if self._drop_indexes:
-            self._result_df.reset_index(drop=True, inplace=True)
-        self._write_to_target()
+            for column in columns:
+                values = (
+                    featureset_times
+                    if column == timestamp_key
+                    else featureset_df[column]
+                )
+                result[column] = pd.Series(
+                    pd.api.extensions.take(values.array, positions, allow_fill=True),
+                    name=column,
+                )
 
-        # check if need to set indices
-        self._result_df = self._set_indexes(self._result_df)
-        return OfflineVectorResponse(self)
+        return pd.DataFrame(result, columns=result_columns)
 
     def _asof_join(
         self,
@@ -132,3 +853,55 @@ class LocalFeatureMerger(BaseMerger):
         indexes = list(featureset.spec.entities.keys())
         merged_df = pd.merge(entity_df, featureset_df, on=indexes)
         return merged_df
+
+
+def _has_unnamed_index(df):
+    return type(df.index) != pd.RangeIndex and df.index.names == [None]
+
+
+def _reset_unnamed_index(df):
+    # same as the reset of a non range index in _asof_join (where the unnamed "index" column is dropped later)
+    if type(df.index) == pd.RangeIndex:
+        return df
+    return df.reset_index(drop=_has_unnamed_index(df))
+
+
+def _filter_by_time(feature_set, column_names, entity_timestamp_column):
+    return (
+        entity_timestamp_column in column_names
+        or feature_set.spec.timestamp_key == entity_timestamp_column
+    )
+
+
+def _can_filter_by_keys(feature_set, entity_df):
+    # the key filters are pushed down to parquet targets only
+    entities = list(feature_set.spec.entities.keys())
+    return (
+        entities
+        and all(entity in entity_df.columns for entity in entities)
+        and get_offline_target(feature_set).kind == TargetTypes.parquet
+    )
+
+
+def _latest_rows(df, feature_set):
+    """return the latest row per entity (the only rows the next time chunks may be joined with)"""
+    times = pd.to_datetime(df[feature_set.spec.timestamp_key]).to_numpy()
+    order = np.argsort(times, kind="mergesort")
+    return df.iloc[order].drop_duplicates(
+        subset=list(feature_set.spec.entities.keys()), keep="last"
+    )
+
+
+def _feature_set_watermark(feature_set):
+    """return the last time written to the feature set offline target (None if unknown)"""
+    driver = get_offline_target(feature_set)
+    if not driver or driver.name not in feature_set.status.targets.keys():
+        return None
+    last_written = feature_set.status.targets[driver.name].last_written
+    if not last_written or last_written == datetime.min:
+        return None
+    last_written = pd.Timestamp(last_written)
+    if last_written.tzinfo:
+        # the feature set timestamps are compared as naive (utc) timestamps
+        last_written = last_written.tz_convert(None)
+    return last_written
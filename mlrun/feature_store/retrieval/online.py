@@ -11,7 +11,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-
+import threading
+import time
+from collections import OrderedDict
 
 import mlrun
 from mlrun.datastore.store_resources import ResourceCache
@@ -60,12 +62,19 @@ def _build_feature_vector_graph(
     return graph
 
 
-def init_feature_vector_graph(vector, query_options, update_stats=False):
+def init_feature_vector_graph(
+    vector, query_options, update_stats=False, cache_size=None, cache_ttl=None
+):
     try:
         from storey import SyncEmitSource
     except ImportError as exc:
         raise ImportError(f"storey not installed, use pip install storey, {exc}")
 
+    if cache_size and vector.spec.graph and vector.spec.graph.steps:
+        raise mlrun.errors.MLRunInvalidArgumentError(
+            "online feature cache is not supported for feature vectors with a custom graph"
+        )
+
     feature_set_objects, feature_set_fields = vector.parse_features(
         offline=False, update_stats=update_stats
     )
@@ -75,7 +84,7 @@ def init_feature_vector_graph(vector, query_options, update_stats=False):
     graph.set_flow_source(SyncEmitSource())
     server = create_graph_server(graph=graph, parameters={})
 
-    cache = ResourceCache()
+    resource_cache = ResourceCache()
     index_columns = []
     for featureset in feature_set_objects.values():
         driver = get_online_target(featureset)
@@ -83,10 +92,137 @@ def init_feature_vector_graph(vector, query_options, update_stats=False):
             raise mlrun.errors.MLRunInvalidArgumentError(
                 f"resource {featureset.uri} does not have an online data target"
             )
-        cache.cache_table(featureset.uri, driver.get_table_object())
+        resource_cache.cache_table(featureset.uri, driver.get_table_object())
         for key in featureset.spec.entities.keys():
             if not vector.spec.with_indexes and key not in index_columns:
                 index_columns.append(key)
-    server.init_states(context=None, namespace=None, resource_cache=cache)
+    server.init_states(context=None, namespace=None, resource_cache=resource_cache)
     server.init_object(None)
-    return graph, index_columns
+
+    cache = None
+    if cache_size:
+        cache = OnlineFeatureCache(
+            feature_set_objects, feature_set_fields, cache_size, ttl=cache_ttl
+        )
+    return graph, index_columns, cache
+
+
+class OnlineFeatureCache:
+    """in-process read-through cache for the online feature service
+
+    the cache is keyed by (feature set, entity key) and holds the features read from each feature set, so hot
+    entities are served without a round trip to the online target. entries are evicted by LRU order once the
+    cache reaches `max_size`, and expire after the (per feature set) ttl.
+
+    :param feature_set_objects:  dict of feature set name -> feature set object
+    :param feature_set_fields:   dict of feature set name -> list of (column, alias) tuples
+    :param max_size:             max number of cached (feature set, entity key) entries
+    :param ttl:                  entry time to live in seconds, a number for all the feature sets or a dict of
+                                 feature set name -> seconds ("*" for the default), None for no expiration
+    """
+
+    def __init__(self, feature_set_objects, feature_set_fields, max_size, ttl=None):
+        if max_size <= 0:
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                "online feature cache size must be a positive number"
+            )
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # (feature set name, entity key tuple) -> (expiration time, feature values)
+        self._entries = OrderedDict()
+        self._feature_sets = {}
+        self._stats = {}
+        self._evictions = 0
+
+        default_ttl = ttl.get("*") if isinstance(ttl, dict) else ttl
+        for name, fields in feature_set_fields.items():
+            entities = list(feature_set_objects[name].spec.entities.keys())
+            columns = [alias or column for column, alias in fields]
+            fset_ttl = ttl.get(name, default_ttl) if isinstance(ttl, dict) else ttl
+            self._feature_sets[name] = (entities, columns, fset_ttl)
+            self._stats[name] = {"hits": 0, "misses": 0}
+
+    def get(self, row: dict):
+        """return the cached result for the entity row, or None if any of the feature sets missed
+
+        the row is a hit only when all the feature sets are cached, otherwise the misses are counted (and the
+        cached feature sets are not touched, the row is read from the online target)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entries = {}
+            missed = []
+            for name, (entities, _, _) in self._feature_sets.items():
+                entry_key = (name, self._entity_key(row, entities))
+                entry = self._entries.get(entry_key)
+                if entry is not None and entry[0] is not None and entry[0] <= now:
+                    del self._entries[entry_key]
+                    entry = None
+                if entry is None:
+                    missed.append(name)
+                else:
+                    entries[entry_key] = entry
+            if missed:
+                for name in missed:
+                    self._stats[name]["misses"] += 1
+                return None
+
+            data = dict(row)
+            for entry_key, (_, values) in entries.items():
+                self._stats[entry_key[0]]["hits"] += 1
+                self._entries.move_to_end(entry_key)
+                data.update(values)
+        return data
+
+    def update(self, row: dict, data: dict):
+        """store the per feature set results of a graph query for the entity row"""
+        now = time.monotonic()
+        with self._lock:
+            for name, (entities, columns, ttl) in self._feature_sets.items():
+                key = self._entity_key(row, entities)
+                if None in key:
+                    continue
+                values = {column: data[column] for column in columns if column in data}
+                if all(value is None for value in values.values()):
+                    # the entity was not found in the feature set (may be ingested later), don't cache the miss
+                    continue
+                expiration = now + ttl if ttl else None
+                self._entries[(name, key)] = (expiration, values)
+                self._entries.move_to_end((name, key))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, feature_set: str = None, key=None):
+        """remove entries from the cache
+
+        :param feature_set:  feature set name, invalidate all the feature sets if not specified
+        :param key:          entity key value (or list of values for multiple entities),
+                             invalidate all the keys if not specified
+        """
+        if key is not None and not isinstance(key, (list, tuple)):
+            key = [key]
+        with self._lock:
+            for entry_key in list(self._entries.keys()):
+                name, entity_key = entry_key
+                if feature_set and name != feature_set:
+                    continue
+                if key is not None and entity_key != tuple(key):
+                    continue
+                del self._entries[entry_key]
+
+    def stats(self):
+        """cache statistics: size, evictions and the hits/misses per feature set"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "evictions": self._evictions,
+                "feature_sets": {
+                    name: dict(counters) for name, counters in self._stats.items()
+                },
+            }
+
+    @staticmethod
+    def _entity_key(row, entities):
+        return tuple(row.get(entity) for entity in entities)
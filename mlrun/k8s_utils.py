@@ -168,6 +168,35 @@ class K8sHelper:
 
         return resp
 
+    def stream_logs(
+        self,
+        name,
+        namespace=None,
+        read_timeout=None,
+        since_seconds=None,
+        timestamps=False,
+    ):
+        """
+        follow the pod logs, returns a (urllib3) response which streams the log bytes as they are written. a read
+        which gets no bytes for read_timeout seconds raises urllib3.exceptions.ReadTimeoutError. since_seconds
+        starts the log from the lines of the last since_seconds, timestamps prefixes every line with its
+        (RFC3339 nanoseconds) timestamp and a space
+        """
+        kwargs = {"since_seconds": since_seconds} if since_seconds else {}
+        try:
+            return self.v1api.read_namespaced_pod_log(
+                name=name,
+                namespace=self.resolve_namespace(namespace),
+                follow=True,
+                timestamps=timestamps,
+                _preload_content=False,
+                _request_timeout=(read_timeout, read_timeout) if read_timeout else None,
+                **kwargs,
+            )
+        except ApiException as exc:
+            logger.error(f"failed to stream pod logs: {exc}")
+            raise exc
+
     def run_job(self, pod, timeout=600):
         pod_name, namespace = self.create_pod(pod)
         if not pod_name:
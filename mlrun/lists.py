@@ -47,6 +47,11 @@ results_index = list_header.index("results")
 
 
 class RunList(list):
+    def __init__(self, *args):
+        super().__init__(*args)
+        # set when the list is a page of the results, use it to get the next page
+        self.next_page_token = None
+
     def to_rows(self, extend_iterations=False):
         """return the run list as flattened rows"""
         rows = []
@@ -162,6 +167,8 @@ class ArtifactList(list):
     def __init__(self, *args):
         super().__init__(*args)
         self.tag = ""
+        # set when the list is a page of the results, use it to get the next page
+        self.next_page_token = None
 
     def to_rows(self):
         """return the artifact list as flattened rows"""
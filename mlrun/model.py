@@ -30,6 +30,50 @@ from .utils import dict_to_json, dict_to_yaml, get_artifact_target, is_legacy_ar
 RUN_ID_PLACE_HOLDER = "{run_id}"  # IMPORTANT: shouldn't be changed.
 
 
+# values of these (exact) types are serialized and copied as is
+_immutable_types = {str, int, float, bool, type(None), bytes, datetime}
+
+
+def _get_init_fields(cls) -> List[str]:
+    """the fields of a class without _dict_fields (its __init__ params), computed once per class"""
+    # the cache is kept in the class __dict__ (and not inherited), subclasses have their own __init__
+    fields = cls.__dict__.get("_init_fields")
+    if fields is None:
+        fields = list(inspect.signature(cls.__init__).parameters.keys())[1:]
+        cls._init_fields = fields
+    return fields
+
+
+def _copy_value(value, memo: dict):
+    """deep copy, with a fast path for the nested ModelObj/dict/list structures"""
+    if type(value) in _immutable_types:
+        return value
+    value_id = id(value)
+    if value_id in memo:
+        return memo[value_id]
+    value_type = type(value)
+    if value_type is dict:
+        new_value = memo[value_id] = {}
+        for key, item in value.items():
+            new_value[key] = _copy_value(item, memo)
+        return new_value
+    if value_type is list:
+        new_value = memo[value_id] = []
+        new_value.extend(_copy_value(item, memo) for item in value)
+        return new_value
+    return deepcopy(value, memo)
+
+
+def _structural_deepcopy(obj, memo: dict):
+    # same as the default deepcopy of an object (a new instance with a copied __dict__), without the generic
+    # __reduce_ex__ protocol per object and with the fast path for the object attributes
+    new_obj = obj.__class__.__new__(obj.__class__)
+    memo[id(obj)] = new_obj
+    for key, value in obj.__dict__.items():
+        new_obj.__dict__[key] = _copy_value(value, memo)
+    return new_obj
+
+
 class ModelObj:
     _dict_fields = []
 
@@ -53,19 +97,22 @@ class ModelObj:
     def to_dict(self, fields=None, exclude=None):
         """convert the object to a python dictionary"""
         struct = {}
-        fields = fields or self._dict_fields
-        if not fields:
-            fields = list(inspect.signature(self.__init__).parameters.keys())
+        fields = fields or self._dict_fields or _get_init_fields(self.__class__)
         for t in fields:
             if not exclude or t not in exclude:
                 val = getattr(self, t, None)
-                if val is not None and not (isinstance(val, dict) and not val):
-                    if hasattr(val, "to_dict"):
-                        val = val.to_dict()
-                        if val:
-                            struct[t] = val
-                    else:
+                if val is None or (isinstance(val, dict) and not val):
+                    continue
+                if type(val) in _immutable_types:
+                    struct[t] = val
+                elif isinstance(val, (ModelObj, ObjectList, ObjectDict)) or hasattr(
+                    val, "to_dict"
+                ):
+                    val = val.to_dict()
+                    if val:
                         struct[t] = val
+                else:
+                    struct[t] = val
         return struct
 
     @classmethod
@@ -73,9 +120,7 @@ class ModelObj:
         """create an object from a python dictionary"""
         struct = {} if struct is None else struct
         deprecated_fields = deprecated_fields or {}
-        fields = fields or cls._dict_fields
-        if not fields:
-            fields = list(inspect.signature(cls.__init__).parameters.keys())
+        fields = fields or cls._dict_fields or _get_init_fields(cls)
         new_obj = cls()
         if struct:
             # we are looping over the fields to save the same order and behavior in which the class
@@ -113,6 +158,9 @@ class ModelObj:
         """create a copy of the object"""
         return deepcopy(self)
 
+    def __deepcopy__(self, memo):
+        return _structural_deepcopy(self, memo)
+
 
 # model class for building ModelObj dictionaries
 class ObjectDict:
@@ -196,6 +244,9 @@ class ObjectDict:
     def copy(self):
         return deepcopy(self)
 
+    def __deepcopy__(self, memo):
+        return _structural_deepcopy(self, memo)
+
 
 class ObjectList:
     def __init__(self, child_class):
@@ -262,6 +313,9 @@ class ObjectList:
         self._children[child_obj.name] = child_obj
         return child_obj
 
+    def __deepcopy__(self, memo):
+        return _structural_deepcopy(self, memo)
+
 
 class Credentials(ModelObj):
     generate_access_key = "$generate"
@@ -378,6 +432,7 @@ class HyperParamStrategies:
     grid = "grid"
     list = "list"
     random = "random"
+    halving = "halving"
     custom = "custom"
 
     @staticmethod
@@ -386,23 +441,45 @@ class HyperParamStrategies:
             HyperParamStrategies.grid,
             HyperParamStrategies.list,
             HyperParamStrategies.random,
+            HyperParamStrategies.halving,
             HyperParamStrategies.custom,
         ]
 
 
+class HyperParamParallelModes:
+    process = "process"
+    thread = "thread"
+    dask = "dask"
+
+    @staticmethod
+    def all():
+        return [
+            HyperParamParallelModes.process,
+            HyperParamParallelModes.thread,
+            HyperParamParallelModes.dask,
+        ]
+
+
 class HyperParamOptions(ModelObj):
     """Hyper Parameter Options
 
     Parameters:
         param_file (str):       hyper params input file path/url, instead of inline
-        strategy (str):         hyper param strategy - grid, list or random
+        strategy (str):         hyper param strategy - grid, list, random or halving (successive halving)
         selector (str):         selection criteria for best result ([min|max.]<result>), e.g. max.accuracy
         stop_condition (str):   early stop condition e.g. "accuracy > 0.9"
-        parallel_runs (int):    number of param combinations to run in parallel (over Dask)
+        parallel_runs (int):    number of param combinations to run in parallel
         dask_cluster_uri (str): db uri for a deployed dask cluster function, e.g. db://myproject/dask
         max_iterations (int):   max number of runs (in random strategy)
         max_errors (int):       max number of child runs errors for the overall job to fail
         teardown_dask (bool):   kill the dask cluster pods after the runs
+        parallel_mode (str):    how local/handler runtimes run the parallel runs (when no dask_cluster_uri is set) -
+                                process (pool, default), thread (pool) or dask (local cluster)
+        resource_param (str):   the budget param (e.g. epochs) passed to the runs (in halving strategy)
+        min_resource:           the budget of the first rung of runs (in halving strategy)
+        max_resource:           the max budget, the last rung runs with it (in halving strategy)
+        reduction_factor (int): the best 1/reduction_factor runs of each rung are promoted to a reduction_factor
+                                times larger budget (in halving strategy, default 3)
     """
 
     def __init__(
@@ -416,6 +493,11 @@ class HyperParamOptions(ModelObj):
         max_iterations=None,
         max_errors=None,
         teardown_dask=None,
+        parallel_mode=None,
+        resource_param=None,
+        min_resource=None,
+        max_resource=None,
+        reduction_factor=None,
     ):
         self.param_file = param_file
         self.strategy = strategy
@@ -426,6 +508,11 @@ class HyperParamOptions(ModelObj):
         self.parallel_runs = parallel_runs
         self.dask_cluster_uri = dask_cluster_uri
         self.teardown_dask = teardown_dask
+        self.parallel_mode = parallel_mode
+        self.resource_param = resource_param
+        self.min_resource = min_resource
+        self.max_resource = max_resource
+        self.reduction_factor = reduction_factor
 
     def validate(self):
         if self.strategy and self.strategy not in HyperParamStrategies.all():
@@ -436,6 +523,30 @@ class HyperParamOptions(ModelObj):
             raise mlrun.errors.MLRunInvalidArgumentError(
                 "max_iterations is only valid in random strategy"
             )
+        if (
+            self.parallel_mode
+            and self.parallel_mode not in HyperParamParallelModes.all()
+        ):
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                f"illegal parallel mode, use {','.join(HyperParamParallelModes.all())}"
+            )
+        if self.strategy == HyperParamStrategies.halving:
+            if (
+                not self.resource_param
+                or not self.min_resource
+                or not self.max_resource
+            ):
+                raise mlrun.errors.MLRunInvalidArgumentError(
+                    "halving strategy requires resource_param, min_resource and max_resource"
+                )
+            if self.min_resource > self.max_resource:
+                raise mlrun.errors.MLRunInvalidArgumentError(
+                    "min_resource must not be larger than max_resource"
+                )
+            if self.reduction_factor is not None and self.reduction_factor < 2:
+                raise mlrun.errors.MLRunInvalidArgumentError(
+                    "reduction_factor must be at least 2"
+                )
 
 
 class RunSpec(ModelObj):
@@ -1233,6 +1344,7 @@ class DataTarget(DataTargetBase):
         "updated",
         "size",
         "last_written",
+        "watermarks",
         "run_id",
     ]
 
@@ -1251,6 +1363,8 @@ class DataTarget(DataTargetBase):
         self.max_age = None
         self.start_time = None
         self.last_written = None
+        # per feature set last_written, of feature vectors generated incrementally
+        self.watermarks = None
         self._producer = None
         self.producer = {}
 
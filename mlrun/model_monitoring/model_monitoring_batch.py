@@ -1,20 +1,21 @@
 import collections
+import concurrent.futures
 import dataclasses
 import json
 import os
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
-import v3io
 
 import mlrun
 import mlrun.api.schemas
 import mlrun.data_types.infer
+import mlrun.errors
+import mlrun.model_monitoring.stores
 import mlrun.run
 import mlrun.utils
 import mlrun.utils.model_monitoring
-import mlrun.utils.v3io_clients
 from mlrun.utils import logger
 
 _TIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f%z"
@@ -27,6 +28,9 @@ class TotalVarianceDistance:
     Z - vector of random variables
     Pt - Probability distribution over time span t
 
+    The distributions can also be 2D arrays of stacked histograms (a distribution per column), the distance is then
+    computed for all the columns at once.
+
     :args distrib_t: array of distribution t (usually the latest dataset distribution)
     :args distrib_u: array of distribution u (usually the sample dataset distribution)
     """
@@ -34,13 +38,13 @@ class TotalVarianceDistance:
     distrib_t: np.ndarray
     distrib_u: np.ndarray
 
-    def compute(self) -> float:
+    def compute(self) -> Union[float, np.ndarray]:
         """
         Calculate Total Variance distance.
 
-        :returns:  Total Variance Distance.
+        :returns:  Total Variance Distance (per column for 2D distributions).
         """
-        return np.sum(np.abs(self.distrib_t - self.distrib_u)) / 2
+        return np.sum(np.abs(self.distrib_t - self.distrib_u), axis=0) / 2
 
 
 @dataclasses.dataclass
@@ -50,6 +54,7 @@ class HellingerDistance:
     It used to quantify the difference between two probability distributions.
     However, unlike KL Divergence the Hellinger divergence is symmetric and bounded over a probability space.
     The output range of Hellinger distance is [0,1]. The closer to 0, the more similar the two distributions.
+    The distributions can also be 2D arrays of stacked histograms (a distribution per column).
 
     :args distrib_t: array of distribution t (usually the latest dataset distribution)
     :args distrib_u: array of distribution u (usually the sample dataset distribution)
@@ -58,14 +63,14 @@ class HellingerDistance:
     distrib_t: np.ndarray
     distrib_u: np.ndarray
 
-    def compute(self) -> float:
+    def compute(self) -> Union[float, np.ndarray]:
         """
         Calculate Hellinger Distance
 
-        :returns: Hellinger Distance
+        :returns: Hellinger Distance (per column for 2D distributions)
         """
         return np.sqrt(
-            0.5 * ((np.sqrt(self.distrib_u) - np.sqrt(self.distrib_t)) ** 2).sum()
+            0.5 * ((np.sqrt(self.distrib_u) - np.sqrt(self.distrib_t)) ** 2).sum(axis=0)
         )
 
 
@@ -75,6 +80,7 @@ class KullbackLeiblerDivergence:
     KL Divergence (or relative entropy) is a measure of how one probability distribution differs from another.
     It is an asymmetric measure (thus it's not a metric) and it doesn't satisfy the triangle inequality.
     KL Divergence of 0, indicates two identical distributions.
+    The distributions can also be 2D arrays of stacked histograms (a distribution per column).
 
     :args distrib_t: array of distribution t (usually the latest dataset distribution)
     :args distrib_u: array of distribution u (usually the sample dataset distribution)
@@ -83,40 +89,46 @@ class KullbackLeiblerDivergence:
     distrib_t: np.ndarray
     distrib_u: np.ndarray
 
-    def compute(self, capping: float = None, kld_scaling: float = 1e-4) -> float:
+    def compute(
+        self, capping: float = None, kld_scaling: float = 1e-4
+    ) -> Union[float, np.ndarray]:
         """
         :param capping:              A bounded value for the KL Divergence. For infinite distance, the result
                                      is replaced with the capping value which indicates a huge differences between
                                      the distributions.
         :param kld_scaling:          Will be used to replace 0 values for executing the logarithmic operation.
 
-        :returns: KL Divergence
+        :returns: KL Divergence (per column for 2D distributions)
         """
-        t_u = np.sum(
-            np.where(
-                self.distrib_t != 0,
-                (self.distrib_t)
-                * np.log(
-                    self.distrib_t
-                    / np.where(self.distrib_u != 0, self.distrib_u, kld_scaling)
+        # the log of the zero entries is masked out by np.where
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t_u = np.sum(
+                np.where(
+                    self.distrib_t != 0,
+                    (self.distrib_t)
+                    * np.log(
+                        self.distrib_t
+                        / np.where(self.distrib_u != 0, self.distrib_u, kld_scaling)
+                    ),
+                    0,
                 ),
-                0,
+                axis=0,
             )
-        )
-        u_t = np.sum(
-            np.where(
-                self.distrib_u != 0,
-                (self.distrib_u)
-                * np.log(
-                    self.distrib_u
-                    / np.where(self.distrib_t != 0, self.distrib_t, kld_scaling)
+            u_t = np.sum(
+                np.where(
+                    self.distrib_u != 0,
+                    (self.distrib_u)
+                    * np.log(
+                        self.distrib_u
+                        / np.where(self.distrib_t != 0, self.distrib_t, kld_scaling)
+                    ),
+                    0,
                 ),
-                0,
+                axis=0,
             )
-        )
         result = t_u + u_t
         if capping:
-            return capping if result == float("inf") else result
+            return np.where(result == float("inf"), capping, result)[()]
         return result
 
 
@@ -203,15 +215,14 @@ class VirtualDrift:
 
         """
 
-        # compute the different metrics for each feature distribution and store the results in dictionary
+        # the metrics are computed for all the features at once, over the stacked histograms (a column per feature)
+        features = list(base_histogram.columns)
+        base_distributions = base_histogram.to_numpy(dtype=float)
+        latest_distributions = latest_histogram.loc[:, features].to_numpy(dtype=float)
         drift_measures = {}
         for metric_name, metric in self.metrics.items():
-            drift_measures[metric_name] = {
-                feature: metric(
-                    base_histogram.loc[:, feature], latest_histogram.loc[:, feature]
-                ).compute()
-                for feature in base_histogram
-            }
+            values = metric(base_distributions, latest_distributions).compute()
+            drift_measures[metric_name] = dict(zip(features, values.tolist()))
 
         return drift_measures
 
@@ -291,20 +302,20 @@ class VirtualDrift:
         # compute the drift metric over the labels
         if self.label_col:
             label_drift_measures = self.compute_metrics_over_df(
-                base_histogram.loc[:, self.label_col],
-                latest_histogram.loc[:, self.label_col],
+                base_histogram.loc[:, [self.label_col]],
+                latest_histogram.loc[:, [self.label_col]],
             )
             for metric, values in label_drift_measures.items():
-                drift_result[self.label_col][metric] = values[metric]
+                drift_result[self.label_col][metric] = values[self.label_col]
 
         # compute the drift metric over the predictions
         if self.prediction_col:
             prediction_drift_measures = self.compute_metrics_over_df(
-                base_histogram.loc[:, self.prediction_col],
-                latest_histogram.loc[:, self.prediction_col],
+                base_histogram.loc[:, [self.prediction_col]],
+                latest_histogram.loc[:, [self.prediction_col]],
             )
             for metric, values in prediction_drift_measures.items():
-                drift_result[self.prediction_col][metric] = values[metric]
+                drift_result[self.prediction_col][metric] = values[self.prediction_col]
 
         return drift_result
 
@@ -344,30 +355,13 @@ class BatchProcessor:
         # initialize virtual drift object
         self.virtual_drift = VirtualDrift(inf_capping=10)
 
-        # define the required paths for the project objects.
-        # note that the kv table, tsdb, and the input stream paths are located at the default location
-        # while the parquet path is located at the user-space location
-        template = mlrun.utils.config.model_endpoint_monitoring.store_prefixes.default
-        kv_path = template.format(project=self.project, kind="endpoints")
-        (
-            _,
-            self.kv_container,
-            self.kv_path,
-        ) = mlrun.utils.model_monitoring.parse_model_endpoint_store_prefix(kv_path)
-        tsdb_path = template.format(project=project, kind="events")
-        (
-            _,
-            self.tsdb_container,
-            self.tsdb_path,
-        ) = mlrun.utils.model_monitoring.parse_model_endpoint_store_prefix(tsdb_path)
-        stream_path = template.format(project=self.project, kind="log_stream")
-        (
-            _,
-            self.stream_container,
-            self.stream_path,
-        ) = mlrun.utils.model_monitoring.parse_model_endpoint_store_prefix(stream_path)
-        self.parquet_path = mlrun.utils.config.model_endpoint_monitoring.store_prefixes.user_space.format(
-            project=project, kind="parquet"
+        # the kv table, tsdb, and the input stream are kept in the model monitoring store (v3io by default) while
+        # the parquet path is located at the user-space location
+        self.store = mlrun.model_monitoring.stores.get_model_monitoring_store(
+            project, access_key=self.v3io_access_key
+        )
+        self.parquet_path = mlrun.utils.model_monitoring.get_parquet_path(
+            project, self.store.kind
         )
 
         logger.info(
@@ -376,12 +370,7 @@ class BatchProcessor:
             model_monitoring_access_key_initalized=bool(model_monitoring_access_key),
             v3io_access_key_initialized=bool(v3io_access_key),
             parquet_path=self.parquet_path,
-            kv_container=self.kv_container,
-            kv_path=self.kv_path,
-            tsdb_container=self.tsdb_container,
-            tsdb_path=self.tsdb_path,
-            stream_container=self.stream_container,
-            stream_path=self.stream_path,
+            store_kind=self.store.kind,
         )
 
         # get drift thresholds from the model monitoring configuration
@@ -395,47 +384,27 @@ class BatchProcessor:
         # get a runtime database
         self.db = mlrun.get_run_db()
 
-        # get the frames clients based on the v3io configuration
-        # it will be used later for writing the results into the tsdb
-        self.v3io = mlrun.utils.v3io_clients.get_v3io_client(
-            access_key=self.v3io_access_key
-        )
-        self.frames = mlrun.utils.v3io_clients.get_frames_client(
-            address=mlrun.utils.config.v3io_framesd,
-            container=self.tsdb_container,
-            token=self.v3io_access_key,
-        )
-
         # if an error occurs, it will be raised using the following argument
         self.exception = None
 
     def post_init(self):
         """pre-process of the batch processing"""
 
-        # create v3io stream based on the input stream
-        response = self.v3io.create_stream(
-            container=self.stream_container,
-            path=self.stream_path,
-            shard_count=1,
-            raise_for_status=v3io.dataplane.RaiseForStatus.never,
-            access_key=self.v3io_access_key,
-        )
-
-        if not (response.status_code == 400 and "ResourceInUse" in str(response.body)):
-            response.raise_for_status([409, 204, 403])
+        # create the drift notifications stream
+        self.store.create_stream()
 
     def run(self):
         """Main method for manage the drift analysis and write the results into tsdb and KV table"""
 
         # get model endpoints (each deployed project has at least 1 serving model)
         try:
-            endpoints = self.db.list_model_endpoints(self.project)
+            endpoints = self._list_endpoints()
         except Exception as e:
             logger.error("Failed to list endpoints", exc=e)
             return
 
         active_endpoints = set()
-        for endpoint in endpoints.endpoints:
+        for endpoint in endpoints:
             if endpoint.spec.active:
                 active_endpoints.add(endpoint.metadata.uid)
 
@@ -447,127 +416,243 @@ class BatchProcessor:
             logger.warn(f"{sub} does not exist")
             return
 
-        for endpoint_dir in fs.ls(sub):
+        endpoint_dirs = {}
+        for endpoint_dir in fs.ls(sub, detail=True):
             endpoint_id = endpoint_dir["name"].split("=")[-1]
-            if endpoint_id not in active_endpoints:
-                continue
+            if endpoint_id in active_endpoints:
+                endpoint_dirs[endpoint_id] = endpoint_dir
+
+        # perform drift analysis for the model endpoints concurrently, the tsdb drift measures of all the
+        # endpoints are written together at the end
+        tsdb_drift_measures = []
+        max_workers = (
+            mlrun.utils.config.model_endpoint_monitoring.batch_processing_max_workers
+        )
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self._process_endpoint, endpoint_id, endpoint_dir, fs, prefix
+                ): endpoint_id
+                for endpoint_id, endpoint_dir in endpoint_dirs.items()
+            }
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    drift_measures = future.result()
+                    if drift_measures:
+                        tsdb_drift_measures.append(drift_measures)
+                except Exception as e:
+                    logger.error(f"Exception for endpoint {futures[future]}")
+                    self.exception = e
+
+        if tsdb_drift_measures:
+            self.store.write_tsdb(tsdb_drift_measures)
+
+    def _process_endpoint(
+        self, endpoint_id: str, endpoint_dir: dict, fs, prefix: str
+    ) -> Optional[dict]:
+        """
+        Compute the drift of an endpoint over its latest hour, update the results in the KV table (and the input
+        stream if a drift was detected). The current stats are merged from the histogram states of the stream
+        processing, the latest parquet hour is read only when there are no histogram states.
 
-        # perform drift analysis for each model endpoint
-        for endpoint_id in active_endpoints:
-            try:
-                last_year = self.get_last_created_dir(fs, endpoint_dir)
-                last_month = self.get_last_created_dir(fs, last_year)
-                last_day = self.get_last_created_dir(fs, last_month)
-                last_hour = self.get_last_created_dir(fs, last_day)
+        :returns: The drift measures to write to the tsdb, None if the endpoint was skipped.
+        """
+        # get model endpoint object
+        endpoint = self._get_endpoint(endpoint_id)
+
+        # skip router endpoint
+        if (
+            endpoint.status.endpoint_type
+            == mlrun.utils.model_monitoring.EndpointType.ROUTER
+        ):
+            # endpoint.status.feature_stats is None
+            logger.info(f"{endpoint_id} is router skipping")
+            return None
+
+        current_stats, timestamp = self.get_streamed_stats(endpoint_id)
+        if current_stats is None:
+            current_stats, timestamp = self.get_parquet_stats(endpoint_dir, fs, prefix)
+
+        # compute the drift based on the histogram of the current stats and the histogram of
+        # the original feature stats that can be found in the model endpoint object
+        drift_result = self.virtual_drift.compute_drift_from_histograms(
+            feature_stats=endpoint.status.feature_stats,
+            current_stats=current_stats,
+        )
+        logger.info("Drift result", drift_result=drift_result)
 
-                full_path = f"{prefix}{last_hour['name']}"
+        # check for possible drift based on the results of the statistical metrics defined above
+        drift_status, drift_measure = self.check_for_drift(
+            drift_result=drift_result, endpoint=endpoint
+        )
 
-                logger.info(f"Now processing {full_path}")
+        logger.info(
+            "Drift status",
+            endpoint_id=endpoint_id,
+            drift_status=drift_status,
+            drift_measure=drift_measure,
+        )
 
-                # get model endpoint object
-                endpoint = self.db.get_model_endpoint(
-                    project=self.project, endpoint_id=endpoint_id
-                )
+        # if drift was detected, add the results to the input stream
+        if drift_status == "POSSIBLE_DRIFT" or drift_status == "DRIFT_DETECTED":
+            self.store.put_stream_records(
+                [
+                    {
+                        "endpoint_id": endpoint_id,
+                        "drift_status": drift_status,
+                        "drift_measure": drift_measure,
+                        "drift_per_feature": {**drift_result},
+                    }
+                ]
+            )
 
-                # skip router endpoint
-                if (
-                    endpoint.status.endpoint_type
-                    == mlrun.utils.model_monitoring.EndpointType.ROUTER
-                ):
-                    # endpoint.status.feature_stats is None
-                    logger.info(f"{endpoint_id} is router skipping")
-                    continue
-
-                df = pd.read_parquet(full_path)
-
-                # get the timestamp of the latest request
-                timestamp = df["timestamp"].iloc[-1]
-
-                # create DataFrame based on the input features
-                named_features_df = list(df["named_features"])
-                named_features_df = pd.DataFrame(named_features_df)
-
-                # get the current stats that are represented by histogram of each feature within the dataset.
-                # in the following dictionary, each key is a feature with dictionary of stats
-                # (including histogram distribution) as a value
-                current_stats = mlrun.data_types.infer.DFDataInfer.get_stats(
-                    df=named_features_df,
-                    options=mlrun.data_types.infer.InferOptions.Histogram,
-                )
+        # update the results in the KV table
+        self.store.update_endpoint_record(
+            endpoint_id,
+            {
+                "current_stats": json.dumps(current_stats),
+                "drift_measures": json.dumps(drift_result),
+                "drift_status": drift_status,
+            },
+        )
 
-                # compute the drift based on the histogram of the current stats and the histogram of
-                # the original feature stats that can be found in the model endpoint object
-                drift_result = self.virtual_drift.compute_drift_from_histograms(
-                    feature_stats=endpoint.status.feature_stats,
-                    current_stats=current_stats,
-                )
-                logger.info("Drift result", drift_result=drift_result)
+        return {
+            "endpoint_id": endpoint_id,
+            "timestamp": pd.to_datetime(timestamp, format=_TIME_FORMAT),
+            "record_type": "drift_measures",
+            "tvd_mean": drift_result["tvd_mean"],
+            "kld_mean": drift_result["kld_mean"],
+            "hellinger_mean": drift_result["hellinger_mean"],
+        }
 
-                # check for possible drift based on the results of the statistical metrics defined above
-                drift_status, drift_measure = self.check_for_drift(
-                    drift_result=drift_result, endpoint=endpoint
+    def _list_endpoints(self) -> List[mlrun.api.schemas.ModelEndpoint]:
+        """
+        List the model endpoints of the project, the endpoint records of a local store are read from the store (the
+        API reads the endpoints from the v3io KV)
+        """
+        if (
+            self.store.kind
+            == mlrun.model_monitoring.stores.ModelMonitoringStoreKinds.local
+        ):
+            return [
+                self._endpoint_from_record(endpoint_id, record)
+                for endpoint_id, record in self.store.list_endpoint_records().items()
+            ]
+        return self.db.list_model_endpoints(self.project).endpoints
+
+    def _get_endpoint(self, endpoint_id: str) -> mlrun.api.schemas.ModelEndpoint:
+        if (
+            self.store.kind
+            == mlrun.model_monitoring.stores.ModelMonitoringStoreKinds.local
+        ):
+            record = self.store.get_endpoint_record(endpoint_id)
+            if record is None:
+                raise mlrun.errors.MLRunNotFoundError(
+                    f"Endpoint {endpoint_id} not found"
                 )
-
-                logger.info(
-                    "Drift status",
-                    endpoint_id=endpoint_id,
-                    drift_status=drift_status,
-                    drift_measure=drift_measure,
+            return self._endpoint_from_record(endpoint_id, record)
+        return self.db.get_model_endpoint(project=self.project, endpoint_id=endpoint_id)
+
+    def _endpoint_from_record(
+        self, endpoint_id: str, record: dict
+    ) -> mlrun.api.schemas.ModelEndpoint:
+        """the model endpoint fields used by the batch processing, from an endpoint record (like the API KV record)"""
+
+        def _json_loads(value):
+            return json.loads(value) if isinstance(value, str) and value else value
+
+        return mlrun.api.schemas.ModelEndpoint(
+            metadata={"project": self.project, "uid": endpoint_id},
+            spec={
+                "active": bool(record.get("active")),
+                "monitor_configuration": _json_loads(
+                    record.get("monitor_configuration")
                 )
+                or None,
+            },
+            status={
+                "feature_stats": _json_loads(record.get("feature_stats")) or None,
+                "endpoint_type": _json_loads(record.get("endpoint_type")) or None,
+            },
+        )
 
-                # if drift was detected, add the results to the input stream
-                if drift_status == "POSSIBLE_DRIFT" or drift_status == "DRIFT_DETECTED":
-                    self.v3io.stream.put_records(
-                        container=self.stream_container,
-                        stream_path=self.stream_path,
-                        records=[
-                            {
-                                "data": json.dumps(
-                                    {
-                                        "endpoint_id": endpoint_id,
-                                        "drift_status": drift_status,
-                                        "drift_measure": drift_measure,
-                                        "drift_per_feature": {**drift_result},
-                                    }
-                                )
-                            }
-                        ],
-                    )
+    def get_streamed_stats(
+        self, endpoint_id: str
+    ) -> Tuple[Optional[Dict[str, Dict[str, Any]]], Optional[str]]:
+        """
+        Merge the latest hour histogram states, written by the stream processing workers to the endpoint KV record.
+        The states of the previous hours (including the states of workers which no longer exist) are deleted.
 
-                # update the results in the KV table
-                self.v3io.kv.update(
-                    container=self.kv_container,
-                    table_path=self.kv_path,
-                    key=endpoint_id,
-                    attributes={
-                        "current_stats": json.dumps(current_stats),
-                        "drift_measures": json.dumps(drift_result),
-                        "drift_status": drift_status,
-                    },
+        :returns: Tuple with the merged stats dictionary and the timestamp of the latest request, (None, None) if
+                  there are no histogram states.
+        """
+        endpoint_record = self.store.get_endpoint_record(endpoint_id) or {}
+        states = {
+            key: json.loads(value)
+            for key, value in endpoint_record.items()
+            if key.startswith(mlrun.utils.model_monitoring.HISTOGRAMS_KV_PREFIX)
+        }
+        if not states:
+            return None, None
+
+        latest_hour = max(state["hour"] for state in states.values())
+        stale_states = [
+            key for key, state in states.items() if state["hour"] != latest_hour
+        ]
+        if stale_states:
+            self.store.delete_endpoint_attributes(endpoint_id, stale_states)
+        states = [state for state in states.values() if state["hour"] == latest_hour]
+        histograms = mlrun.utils.model_monitoring.HistogramState({})
+        try:
+            for state in states:
+                histograms.merge(
+                    mlrun.utils.model_monitoring.HistogramState.from_stats(
+                        state["stats"]
+                    )
                 )
+        except mlrun.errors.MLRunInvalidArgumentError as exc:
+            logger.warn(
+                "Failed to merge the histogram states, reading the parquet files",
+                endpoint_id=endpoint_id,
+                exc=str(exc),
+            )
+            return None, None
+        return histograms.to_stats(), max(state["timestamp"] for state in states)
 
-                # update the results in tsdb
-                tsdb_drift_measures = {
-                    "endpoint_id": endpoint_id,
-                    "timestamp": pd.to_datetime(timestamp, format=_TIME_FORMAT),
-                    "record_type": "drift_measures",
-                    "tvd_mean": drift_result["tvd_mean"],
-                    "kld_mean": drift_result["kld_mean"],
-                    "hellinger_mean": drift_result["hellinger_mean"],
-                }
-
-                self.frames.write(
-                    backend="tsdb",
-                    table=self.tsdb_path,
-                    dfs=pd.DataFrame.from_dict([tsdb_drift_measures]),
-                    index_cols=["timestamp", "endpoint_id", "record_type"],
-                )
+    def get_parquet_stats(
+        self, endpoint_dir: dict, fs, prefix: str
+    ) -> Tuple[Dict[str, Dict[str, Any]], str]:
+        """
+        Compute the stats of the latest parquet hour of the endpoint
+
+        :returns: Tuple with the stats dictionary and the timestamp of the latest request.
+        """
+        last_year = self.get_last_created_dir(fs, endpoint_dir)
+        last_month = self.get_last_created_dir(fs, last_year)
+        last_day = self.get_last_created_dir(fs, last_month)
+        last_hour = self.get_last_created_dir(fs, last_day)
 
-                # logger.info(f"Done updating drift measures {full_path}")
+        full_path = f"{prefix}{last_hour['name']}"
 
-            except Exception as e:
-                logger.error(f"Exception for endpoint {endpoint_id}")
-                self.exception = e
+        logger.info(f"Now processing {full_path}")
+
+        df = pd.read_parquet(full_path)
+
+        # get the timestamp of the latest request
+        timestamp = df["timestamp"].iloc[-1]
+
+        # create DataFrame based on the input features
+        named_features_df = list(df["named_features"])
+        named_features_df = pd.DataFrame(named_features_df)
+
+        # get the current stats that are represented by histogram of each feature within the dataset.
+        # in the following dictionary, each key is a feature with dictionary of stats
+        # (including histogram distribution) as a value
+        current_stats = mlrun.data_types.infer.DFDataInfer.get_stats(
+            df=named_features_df,
+            options=mlrun.data_types.infer.InferOptions.Histogram,
+        )
+        return current_stats, timestamp
 
     def check_for_drift(
         self,
@@ -613,7 +698,7 @@ class BatchProcessor:
 
     @staticmethod
     def get_last_created_dir(fs, endpoint_dir):
-        dirs = fs.ls(endpoint_dir["name"])
+        dirs = fs.ls(endpoint_dir["name"], detail=True)
         last_dir = sorted(dirs, key=lambda k: k["name"].split("=")[-1])[-1]
         return last_dir
 
@@ -0,0 +1,376 @@
+import contextlib
+import json
+import os
+import pathlib
+import sqlite3
+import typing
+from abc import ABC, abstractmethod
+
+import pandas as pd
+import v3io.dataplane
+
+import mlrun
+import mlrun.errors
+import mlrun.utils.model_monitoring
+import mlrun.utils.v3io_clients
+from mlrun.utils import logger
+
+TSDB_INDEX_COLUMNS = ["timestamp", "endpoint_id", "record_type"]
+
+
+class ModelMonitoringStoreKinds:
+    v3io = "v3io"
+    local = "local"
+
+    @staticmethod
+    def all():
+        return [ModelMonitoringStoreKinds.v3io, ModelMonitoringStoreKinds.local]
+
+
+class ModelMonitoringStore(ABC):
+    """
+    The storage of the model monitoring stream and batch processing: the endpoints KV records, the time series of
+    the endpoints metrics and the drift notifications stream.
+    """
+
+    kind = None
+
+    @abstractmethod
+    def get_endpoint_record(self, endpoint_id: str) -> typing.Optional[dict]:
+        """the attributes of the endpoint record, None if the endpoint record does not exist"""
+        pass
+
+    @abstractmethod
+    def update_endpoint_record(self, endpoint_id: str, attributes: dict):
+        """update (or add) the given attributes of the endpoint record, creating the record if needed"""
+        pass
+
+    @abstractmethod
+    def delete_endpoint_attributes(
+        self, endpoint_id: str, attributes: typing.List[str]
+    ):
+        """delete the given attributes from the endpoint record"""
+        pass
+
+    @abstractmethod
+    def write_tsdb(self, records: typing.List[dict]):
+        """
+        write time series records, every record has the TSDB_INDEX_COLUMNS (timestamp, endpoint_id and
+        record_type) and the metric values
+        """
+        pass
+
+    @abstractmethod
+    def create_stream(self):
+        """create the drift notifications stream (if it doesn't exist)"""
+        pass
+
+    @abstractmethod
+    def put_stream_records(self, records: typing.List[dict]):
+        """put records (json serializable dicts) in the drift notifications stream"""
+        pass
+
+    def infer_schema(self):
+        """update the endpoints table schema after new attributes were added (if the store has a schema)"""
+        pass
+
+
+class V3IOModelMonitoringStore(ModelMonitoringStore):
+    """model monitoring store over v3io KV, v3io frames TSDB and v3io streams"""
+
+    kind = ModelMonitoringStoreKinds.v3io
+
+    def __init__(
+        self,
+        project: str,
+        access_key: str = None,
+        v3io_framesd: str = None,
+    ):
+        self.project = project
+        self.access_key = access_key or os.environ.get("V3IO_ACCESS_KEY")
+        self.v3io_framesd = v3io_framesd or mlrun.mlconf.v3io_framesd
+
+        template = mlrun.mlconf.model_endpoint_monitoring.store_prefixes.default
+        (
+            self.kv_container,
+            self.kv_path,
+        ) = self._parse_store_prefix(template.format(project=project, kind="endpoints"))
+        (
+            self.tsdb_container,
+            self.tsdb_path,
+        ) = self._parse_store_prefix(template.format(project=project, kind="events"))
+        (self.stream_container, self.stream_path,) = self._parse_store_prefix(
+            template.format(project=project, kind="log_stream")
+        )
+
+    @staticmethod
+    def _parse_store_prefix(store_prefix: str) -> typing.Tuple[str, str]:
+        (
+            _,
+            container,
+            path,
+        ) = mlrun.utils.model_monitoring.parse_model_endpoint_store_prefix(store_prefix)
+        return container, path
+
+    @property
+    def _v3io(self):
+        return mlrun.utils.v3io_clients.get_v3io_client(access_key=self.access_key)
+
+    def _frames(self, container: str):
+        return mlrun.utils.v3io_clients.get_frames_client(
+            token=self.access_key,
+            container=container,
+            address=self.v3io_framesd,
+        )
+
+    def get_endpoint_record(self, endpoint_id: str) -> typing.Optional[dict]:
+        logger.info(
+            "Grabbing endpoint data",
+            container=self.kv_container,
+            table_path=self.kv_path,
+            key=endpoint_id,
+        )
+        try:
+            return self._v3io.kv.get(
+                container=self.kv_container,
+                table_path=self.kv_path,
+                key=endpoint_id,
+                access_key=self.access_key,
+                raise_for_status=v3io.dataplane.RaiseForStatus.always,
+            ).output.item
+        except Exception:
+            return None
+
+    def update_endpoint_record(self, endpoint_id: str, attributes: dict):
+        self._v3io.kv.update(
+            container=self.kv_container,
+            table_path=self.kv_path,
+            access_key=self.access_key,
+            key=endpoint_id,
+            attributes=attributes,
+            raise_for_status=v3io.dataplane.RaiseForStatus.always,
+        )
+
+    def delete_endpoint_attributes(
+        self, endpoint_id: str, attributes: typing.List[str]
+    ):
+        if not attributes:
+            return
+        self._v3io.kv.update(
+            container=self.kv_container,
+            table_path=self.kv_path,
+            access_key=self.access_key,
+            key=endpoint_id,
+            expression="; ".join(f"REMOVE {attribute}" for attribute in attributes),
+            raise_for_status=v3io.dataplane.RaiseForStatus.always,
+        )
+
+    def write_tsdb(self, records: typing.List[dict]):
+        self._frames(self.tsdb_container).write(
+            backend="tsdb",
+            table=self.tsdb_path,
+            dfs=pd.DataFrame.from_records(records),
+            index_cols=TSDB_INDEX_COLUMNS,
+        )
+
+    def create_stream(self):
+        response = self._v3io.create_stream(
+            container=self.stream_container,
+            path=self.stream_path,
+            shard_count=1,
+            raise_for_status=v3io.dataplane.RaiseForStatus.never,
+            access_key=self.access_key,
+        )
+
+        if not (response.status_code == 400 and "ResourceInUse" in str(response.body)):
+            response.raise_for_status([409, 204, 403])
+
+    def put_stream_records(self, records: typing.List[dict]):
+        self._v3io.stream.put_records(
+            container=self.stream_container,
+            stream_path=self.stream_path,
+            records=[{"data": json.dumps(record)} for record in records],
+        )
+
+    def infer_schema(self):
+        self._frames(self.kv_container).execute(
+            backend="kv", table=self.kv_path, command="infer_schema"
+        )
+
+
+class LocalModelMonitoringStore(ModelMonitoringStore):
+    """
+    model monitoring store over a local SQLite file, holding the endpoints records, the time series records and the
+    stream records tables. Used to run (and measure) the model monitoring outside of the platform.
+    """
+
+    kind = ModelMonitoringStoreKinds.local
+
+    def __init__(self, project: str, path: str = None):
+        self.project = project
+        self.path = (
+            path
+            or mlrun.mlconf.model_endpoint_monitoring.local_store_path.format(
+                project=project
+            )
+        )
+        pathlib.Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect(write=True) as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS endpoints "
+                "(endpoint_id TEXT PRIMARY KEY, attributes TEXT NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS tsdb (timestamp TEXT NOT NULL, endpoint_id TEXT NOT NULL, "
+                "record_type TEXT NOT NULL, metrics TEXT NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS stream "
+                "(id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL)"
+            )
+
+    @contextlib.contextmanager
+    def _connect(self, write: bool = False) -> typing.Iterator[sqlite3.Connection]:
+        # a connection per operation, the store is used concurrently by the batch processing threads. the writes
+        # (including the reads of read-modify-write updates) are done in a single (locking) transaction
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            if write:
+                connection.execute("BEGIN IMMEDIATE")
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get_endpoint_record(self, endpoint_id: str) -> typing.Optional[dict]:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT attributes FROM endpoints WHERE endpoint_id = ?",
+                (endpoint_id,),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_endpoint_records(self) -> typing.Dict[str, dict]:
+        """the attributes of all the endpoint records, by endpoint id"""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT endpoint_id, attributes FROM endpoints"
+            ).fetchall()
+        return {endpoint_id: json.loads(attributes) for endpoint_id, attributes in rows}
+
+    def update_endpoint_record(self, endpoint_id: str, attributes: dict):
+        with self._connect(write=True) as connection:
+            row = connection.execute(
+                "SELECT attributes FROM endpoints WHERE endpoint_id = ?",
+                (endpoint_id,),
+            ).fetchone()
+            record = json.loads(row[0]) if row else {}
+            record.update(attributes)
+            connection.execute(
+                "INSERT OR REPLACE INTO endpoints (endpoint_id, attributes) VALUES (?, ?)",
+                (endpoint_id, json.dumps(record, default=str)),
+            )
+
+    def delete_endpoint_attributes(
+        self, endpoint_id: str, attributes: typing.List[str]
+    ):
+        with self._connect(write=True) as connection:
+            row = connection.execute(
+                "SELECT attributes FROM endpoints WHERE endpoint_id = ?",
+                (endpoint_id,),
+            ).fetchone()
+            if not row:
+                return
+            record = json.loads(row[0])
+            for attribute in attributes:
+                record.pop(attribute, None)
+            connection.execute(
+                "UPDATE endpoints SET attributes = ? WHERE endpoint_id = ?",
+                (json.dumps(record, default=str), endpoint_id),
+            )
+
+    def write_tsdb(self, records: typing.List[dict]):
+        rows = []
+        for record in records:
+            metrics = {
+                key: value
+                for key, value in record.items()
+                if key not in TSDB_INDEX_COLUMNS
+            }
+            rows.append(
+                (
+                    str(record["timestamp"]),
+                    record["endpoint_id"],
+                    record["record_type"],
+                    json.dumps(metrics, default=str),
+                )
+            )
+        with self._connect(write=True) as connection:
+            connection.executemany(
+                "INSERT INTO tsdb (timestamp, endpoint_id, record_type, metrics) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def read_tsdb(
+        self, endpoint_id: str = None, record_type: str = None
+    ) -> pd.DataFrame:
+        """read the time series records (ordered by time) as a DataFrame, with a column per metric"""
+        query, params = "SELECT * FROM tsdb WHERE 1 = 1", []
+        if endpoint_id:
+            query += " AND endpoint_id = ?"
+            params.append(endpoint_id)
+        if record_type:
+            query += " AND record_type = ?"
+            params.append(record_type)
+        with self._connect() as connection:
+            rows = connection.execute(query + " ORDER BY timestamp", params).fetchall()
+        return pd.DataFrame.from_records(
+            [
+                {
+                    "timestamp": pd.to_datetime(timestamp),
+                    "endpoint_id": row_endpoint_id,
+                    "record_type": row_record_type,
+                    **json.loads(metrics),
+                }
+                for timestamp, row_endpoint_id, row_record_type, metrics in rows
+            ]
+        )
+
+    def create_stream(self):
+        # the stream table is created with the store
+        pass
+
+    def put_stream_records(self, records: typing.List[dict]):
+        with self._connect(write=True) as connection:
+            connection.executemany(
+                "INSERT INTO stream (data) VALUES (?)",
+                [(json.dumps(record, default=str),) for record in records],
+            )
+
+    def read_stream_records(self, start_id: int = 0) -> typing.List[dict]:
+        """read the stream records which were put after the record with the given id"""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT data FROM stream WHERE id > ? ORDER BY id", (start_id,)
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+
+def get_model_monitoring_store(
+    project: str, access_key: str = None, kind: str = None
+) -> ModelMonitoringStore:
+    """
+    Get the model monitoring store of the project
+
+    :param project:    project name.
+    :param access_key: access key for the v3io store (default to the V3IO_ACCESS_KEY environment variable).
+    :param kind:       store kind, v3io or local (default to mlrun.mlconf.model_endpoint_monitoring.store_kind).
+    """
+    kind = kind or mlrun.mlconf.model_endpoint_monitoring.store_kind
+    if kind == ModelMonitoringStoreKinds.v3io:
+        return V3IOModelMonitoringStore(project, access_key=access_key)
+    if kind == ModelMonitoringStoreKinds.local:
+        return LocalModelMonitoringStore(project)
+    raise mlrun.errors.MLRunInvalidArgumentError(
+        f"Model monitoring store kind must be one of {ModelMonitoringStoreKinds.all()}, got {kind}"
+    )
@@ -1,22 +1,22 @@
 import collections
 import json
 import os
+import time
 import typing
+import uuid
 
 import pandas as pd
 
 # Constants
 import storey
-import v3io
-import v3io.dataplane
 
 import mlrun.config
 import mlrun.datastore.targets
 import mlrun.feature_store as fs
 import mlrun.feature_store.steps
+import mlrun.model_monitoring.stores
 import mlrun.utils
 import mlrun.utils.model_monitoring
-import mlrun.utils.v3io_clients
 from mlrun.utils import logger
 
 ISO_8061_UTC = "%Y-%m-%d %H:%M:%S.%f%z"
@@ -53,6 +53,7 @@ CUSTOM_METRICS = "custom_metrics"
 ENDPOINT_FEATURES = "endpoint_features"
 METRICS = "metrics"
 BATCH_TIMESTAMP = "batch_timestamp"
+FEATURE_STATS = "feature_stats"
 TIME_FORMAT: str = "%Y-%m-%d %H:%M:%S.%f"  # ISO 8061
 
 
@@ -74,8 +75,13 @@ class EventStreamProcessor:
         v3io_framesd: typing.Optional[str] = None,
         v3io_api: typing.Optional[str] = None,
         model_monitoring_access_key: str = None,
+        histograms_flush_after_events: int = 100,
+        store_kind: str = None,
     ):
         self.project = project
+        self.store_kind = (
+            store_kind or mlrun.mlconf.model_endpoint_monitoring.store_kind
+        )
         self.sample_window = sample_window
         self.tsdb_batching_max_events = tsdb_batching_max_events
         self.tsdb_batching_timeout_secs = tsdb_batching_timeout_secs
@@ -85,6 +91,7 @@ class EventStreamProcessor:
         self.aggregate_count_period = aggregate_count_period
         self.aggregate_avg_windows = aggregate_avg_windows or ["5m", "1h"]
         self.aggregate_avg_period = aggregate_avg_period
+        self.histograms_flush_after_events = histograms_flush_after_events
 
         self.v3io_framesd = v3io_framesd or mlrun.mlconf.v3io_framesd
         self.v3io_api = v3io_api or mlrun.mlconf.v3io_api
@@ -113,10 +120,8 @@ class EventStreamProcessor:
         ) = mlrun.utils.model_monitoring.parse_model_endpoint_store_prefix(tsdb_path)
         self.tsdb_path = f"{self.tsdb_container}/{self.tsdb_path}"
 
-        self.parquet_path = (
-            mlrun.mlconf.model_endpoint_monitoring.store_prefixes.user_space.format(
-                project=project, kind="parquet"
-            )
+        self.parquet_path = mlrun.utils.model_monitoring.get_parquet_path(
+            project, self.store_kind
         )
 
         logger.info(
@@ -133,8 +138,49 @@ class EventStreamProcessor:
             tsdb_container=self.tsdb_container,
             tsdb_path=self.tsdb_path,
             parquet_path=self.parquet_path,
+            store_kind=self.store_kind,
+        )
+
+    def _store_args(self) -> dict:
+        return dict(
+            project=self.project,
+            access_key=self.v3io_access_key,
+            store_kind=self.store_kind,
         )
 
+    def _add_tsdb_target(self, feature_set: fs.FeatureSet, name: str, after: str):
+        if (
+            self.store_kind
+            == mlrun.model_monitoring.stores.ModelMonitoringStoreKinds.v3io
+        ):
+            feature_set.graph.add_step(
+                "storey.TSDBTarget",
+                name=name,
+                after=after,
+                path=self.tsdb_path,
+                rate="10/m",
+                time_col=TIMESTAMP,
+                container=self.tsdb_container,
+                access_key=self.v3io_access_key,
+                v3io_frames=self.v3io_framesd,
+                index_cols=[ENDPOINT_ID, RECORD_TYPE],
+                max_events=self.tsdb_batching_max_events,
+                timeout_secs=self.tsdb_batching_timeout_secs,
+                key=ENDPOINT_ID,
+            )
+        else:
+            # batched like the TSDBTarget, every batch is written in a single transaction
+            feature_set.graph.add_step(
+                "storey.Batch",
+                name=f"{name}_batch",
+                after=after,
+                max_events=self.tsdb_batching_max_events,
+                flush_after_seconds=self.tsdb_batching_timeout_secs,
+            )
+            feature_set.graph.add_step(
+                "WriteToTSDB", name=name, after=f"{name}_batch", **self._store_args()
+            )
+
     def create_feature_set(self):
         feature_set = fs.FeatureSet(
             "monitoring", entities=[ENDPOINT_ID], timestamp_key=TIMESTAMP
@@ -142,19 +188,23 @@ class EventStreamProcessor:
         feature_set.metadata.project = self.project
         feature_set.graph.to(
             "ProcessEndpointEvent",
-            kv_container=self.kv_container,
-            kv_path=self.kv_path,
-            v3io_access_key=self.v3io_access_key,
             full_event=True,
+            **self._store_args(),
         ).to("storey.Filter", "filter_none", _fn="(event is not None)").to(
             "storey.FlatMap", "flatten_events", _fn="(event)"
         ).to(
             "MapFeatureNames",
             name="MapFeatureNames",
-            kv_container=self.kv_container,
-            kv_path=self.kv_path,
-            access_key=self.v3io_access_key,
             infer_columns_from_data=True,
+            **self._store_args(),
+        )
+        # features histograms branch, the batch job merges the histogram states instead of reading the parquet files
+        feature_set.graph.add_step(
+            "UpdateHistograms",
+            name="UpdateHistograms",
+            after="MapFeatureNames",
+            flush_after_events=self.histograms_flush_after_events,
+            **self._store_args(),
         )
         # kv and tsdb branch
         feature_set.add_aggregation(
@@ -187,17 +237,13 @@ class EventStreamProcessor:
             "WriteToKV",
             name="WriteToKV",
             after="ProcessBeforeKV",
-            container=self.kv_container,
-            table=self.kv_path,
+            **self._store_args(),
         )
         feature_set.graph.add_step(
             "InferSchema",
             name="InferSchema",
             after="WriteToKV",
-            v3io_access_key=self.v3io_access_key,
-            v3io_framesd=self.v3io_framesd,
-            container=self.kv_container,
-            table=self.kv_path,
+            **self._store_args(),
         )
         # tsdb
         feature_set.graph.add_step(
@@ -209,42 +255,14 @@ class EventStreamProcessor:
             after="ProcessBeforeTSDB",
             keys=[BASE_METRICS],
         )
-        feature_set.graph.add_step(
-            "storey.TSDBTarget",
-            name="tsdb1",
-            after="FilterAndUnpackKeys1",
-            path=self.tsdb_path,
-            rate="10/m",
-            time_col=TIMESTAMP,
-            container=self.tsdb_container,
-            access_key=self.v3io_access_key,
-            v3io_frames=self.v3io_framesd,
-            index_cols=[ENDPOINT_ID, RECORD_TYPE],
-            max_events=self.tsdb_batching_max_events,
-            timeout_secs=self.tsdb_batching_timeout_secs,
-            key=ENDPOINT_ID,
-        )
+        self._add_tsdb_target(feature_set, name="tsdb1", after="FilterAndUnpackKeys1")
         feature_set.graph.add_step(
             "FilterAndUnpackKeys",
             name="FilterAndUnpackKeys2",
             after="ProcessBeforeTSDB",
             keys=[ENDPOINT_FEATURES],
         )
-        feature_set.graph.add_step(
-            "storey.TSDBTarget",
-            name="tsdb2",
-            after="FilterAndUnpackKeys2",
-            path=self.tsdb_path,
-            rate="10/m",
-            time_col=TIMESTAMP,
-            container=self.tsdb_container,
-            access_key=self.v3io_access_key,
-            v3io_frames=self.v3io_framesd,
-            index_cols=[ENDPOINT_ID, RECORD_TYPE],
-            max_events=self.tsdb_batching_max_events,
-            timeout_secs=self.tsdb_batching_timeout_secs,
-            key=ENDPOINT_ID,
-        )
+        self._add_tsdb_target(feature_set, name="tsdb2", after="FilterAndUnpackKeys2")
         feature_set.graph.add_step(
             "FilterAndUnpackKeys",
             name="FilterAndUnpackKeys3",
@@ -257,21 +275,7 @@ class EventStreamProcessor:
             after="FilterAndUnpackKeys3",
             _fn="(event is not None)",
         )
-        feature_set.graph.add_step(
-            "storey.TSDBTarget",
-            name="tsdb3",
-            after="FilterNotNone",
-            path=self.tsdb_path,
-            rate="10/m",
-            time_col=TIMESTAMP,
-            container=self.tsdb_container,
-            access_key=self.v3io_access_key,
-            v3io_frames=self.v3io_framesd,
-            index_cols=[ENDPOINT_ID, RECORD_TYPE],
-            max_events=self.tsdb_batching_max_events,
-            timeout_secs=self.tsdb_batching_timeout_secs,
-            key=ENDPOINT_ID,
-        )
+        self._add_tsdb_target(feature_set, name="tsdb3", after="FilterNotNone")
 
         # parquet branch
         feature_set.graph.add_step(
@@ -400,11 +404,17 @@ class ProcessBeforeParquet(mlrun.feature_store.steps.MapClass):
 
 
 class ProcessEndpointEvent(mlrun.feature_store.steps.MapClass):
-    def __init__(self, kv_container: str, kv_path: str, v3io_access_key: str, **kwargs):
+    def __init__(
+        self,
+        project: str,
+        access_key: str = None,
+        store_kind: str = None,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
-        self.kv_container: str = kv_container
-        self.kv_path: str = kv_path
-        self.v3io_access_key: str = v3io_access_key
+        self.store = mlrun.model_monitoring.stores.get_model_monitoring_store(
+            project, access_key=access_key, kind=store_kind
+        )
         self.first_request: typing.Dict[str, str] = dict()
         self.last_request: typing.Dict[str, str] = dict()
         self.error_count: typing.Dict[str, int] = collections.defaultdict(int)
@@ -550,12 +560,7 @@ class ProcessEndpointEvent(mlrun.feature_store.steps.MapClass):
         # left them
         if endpoint_id not in self.endpoints:
             logger.info("Trying to resume state", endpoint_id=endpoint_id)
-            endpoint_record = get_endpoint_record(
-                kv_container=self.kv_container,
-                kv_path=self.kv_path,
-                endpoint_id=endpoint_id,
-                access_key=self.v3io_access_key,
-            )
+            endpoint_record = self.store.get_endpoint_record(endpoint_id)
             if endpoint_record:
                 first_request = endpoint_record.get(FIRST_REQUEST)
                 if first_request:
@@ -642,16 +647,16 @@ class FilterAndUnpackKeys(mlrun.feature_store.steps.MapClass):
 class MapFeatureNames(mlrun.feature_store.steps.MapClass):
     def __init__(
         self,
-        kv_container: str,
-        kv_path: str,
-        access_key: str,
+        project: str,
+        access_key: str = None,
+        store_kind: str = None,
         infer_columns_from_data: bool = False,
         **kwargs,
     ):
         super().__init__(**kwargs)
-        self.kv_container = kv_container
-        self.kv_path = kv_path
-        self.access_key = access_key
+        self.store = mlrun.model_monitoring.stores.get_model_monitoring_store(
+            project, access_key=access_key, kind=store_kind
+        )
         self._infer_columns_from_data = infer_columns_from_data
         self.feature_names = {}
         self.label_columns = {}
@@ -672,12 +677,7 @@ class MapFeatureNames(mlrun.feature_store.steps.MapClass):
         endpoint_id = event[ENDPOINT_ID]
 
         if endpoint_id not in self.feature_names:
-            endpoint_record = get_endpoint_record(
-                kv_container=self.kv_container,
-                kv_path=self.kv_path,
-                endpoint_id=endpoint_id,
-                access_key=self.access_key,
-            )
+            endpoint_record = self.store.get_endpoint_record(endpoint_id) or {}
             feature_names = endpoint_record.get(FEATURE_NAMES)
             feature_names = json.loads(feature_names) if feature_names else None
 
@@ -693,13 +693,8 @@ class MapFeatureNames(mlrun.feature_store.steps.MapClass):
                     endpoint_id=endpoint_id,
                 )
                 feature_names = [f"f{i}" for i, _ in enumerate(event[FEATURES])]
-                mlrun.utils.v3io_clients.get_v3io_client().kv.update(
-                    container=self.kv_container,
-                    table_path=self.kv_path,
-                    access_key=self.access_key,
-                    key=event[ENDPOINT_ID],
-                    attributes={FEATURE_NAMES: json.dumps(feature_names)},
-                    raise_for_status=v3io.dataplane.RaiseForStatus.always,
+                self.store.update_endpoint_record(
+                    event[ENDPOINT_ID], {FEATURE_NAMES: json.dumps(feature_names)}
                 )
 
             if not label_columns and self._infer_columns_from_data:
@@ -711,13 +706,8 @@ class MapFeatureNames(mlrun.feature_store.steps.MapClass):
                     endpoint_id=endpoint_id,
                 )
                 label_columns = [f"p{i}" for i, _ in enumerate(event[PREDICTION])]
-                mlrun.utils.v3io_clients.get_v3io_client().kv.update(
-                    container=self.kv_container,
-                    table_path=self.kv_path,
-                    access_key=self.access_key,
-                    key=event[ENDPOINT_ID],
-                    attributes={LABEL_COLUMNS: json.dumps(label_columns)},
-                    raise_for_status=v3io.dataplane.RaiseForStatus.always,
+                self.store.update_endpoint_record(
+                    event[ENDPOINT_ID], {LABEL_COLUMNS: json.dumps(label_columns)}
                 )
 
             self.label_columns[endpoint_id] = label_columns
@@ -745,74 +735,142 @@ class MapFeatureNames(mlrun.feature_store.steps.MapClass):
         return event
 
 
+class UpdateHistograms(mlrun.feature_store.steps.MapClass):
+    def __init__(
+        self,
+        project: str,
+        access_key: str = None,
+        store_kind: str = None,
+        flush_after_events: int = 100,
+        feature_stats_retry_seconds: int = 60,
+        **kwargs,
+    ):
+        """
+        Count the named features of the events into per endpoint histograms, over the bins of the endpoint
+        feature_stats. The histograms of the current hour are written to the endpoint KV record every
+        `flush_after_events` events (and when the hour ends), under an attribute per worker so the states of all the
+        workers can be merged by the batch job (which deletes the states of the previous hours).
+        The events of endpoints without feature_stats are skipped, their KV record is read again (to check whether
+        the feature_stats were written since) at most once per `feature_stats_retry_seconds`.
+        """
+        super().__init__(**kwargs)
+        self.store = mlrun.model_monitoring.stores.get_model_monitoring_store(
+            project, access_key=access_key, kind=store_kind
+        )
+        self.flush_after_events = flush_after_events
+        self.feature_stats_retry_seconds = feature_stats_retry_seconds
+        self.state_attribute = (
+            f"{mlrun.utils.model_monitoring.HISTOGRAMS_KV_PREFIX}{uuid.uuid4().hex[:8]}"
+        )
+        self.feature_stats: typing.Dict[str, dict] = {}
+        # the (monotonic) time of the last feature_stats miss per endpoint
+        self.feature_stats_misses: typing.Dict[str, float] = {}
+        self.histograms: typing.Dict[
+            str, mlrun.utils.model_monitoring.HistogramState
+        ] = {}
+        self.hours: typing.Dict[str, str] = {}
+        self.last_timestamps: typing.Dict[str, str] = {}
+        self.pending_events: typing.Dict[str, int] = collections.defaultdict(int)
+
+    def do(self, event: typing.Dict):
+        endpoint_id = event[ENDPOINT_ID]
+
+        if endpoint_id not in self.feature_stats:
+            now = time.monotonic()
+            last_miss = self.feature_stats_misses.get(endpoint_id)
+            if (
+                last_miss is not None
+                and now - last_miss < self.feature_stats_retry_seconds
+            ):
+                return event
+            endpoint_record = self.store.get_endpoint_record(endpoint_id) or {}
+            feature_stats = endpoint_record.get(FEATURE_STATS)
+            if not feature_stats:
+                # the feature stats may be written later (or the record read failed), the record is read again
+                # once the retry interval passes
+                self.feature_stats_misses[endpoint_id] = now
+                return event
+            self.feature_stats_misses.pop(endpoint_id, None)
+            self.feature_stats[endpoint_id] = json.loads(feature_stats)
+
+        # the histograms are kept per hour (the time window of the batch job), the timestamps are iso formatted
+        timestamp = str(event[TIMESTAMP])
+        hour = timestamp[:13]
+        if self.hours.get(endpoint_id) != hour:
+            if self.pending_events[endpoint_id]:
+                self.flush(endpoint_id)
+            self.histograms[
+                endpoint_id
+            ] = mlrun.utils.model_monitoring.HistogramState.from_stats(
+                self.feature_stats[endpoint_id], with_counts=False
+            )
+            self.hours[endpoint_id] = hour
+
+        self.histograms[endpoint_id].update(event[NAMED_FEATURES])
+        self.last_timestamps[endpoint_id] = timestamp
+        self.pending_events[endpoint_id] += 1
+        if self.pending_events[endpoint_id] >= self.flush_after_events:
+            self.flush(endpoint_id)
+        return event
+
+    def flush(self, endpoint_id: str):
+        state = {
+            "hour": self.hours[endpoint_id],
+            TIMESTAMP: self.last_timestamps[endpoint_id],
+            "stats": self.histograms[endpoint_id].to_stats(),
+        }
+        self.store.update_endpoint_record(
+            endpoint_id, {self.state_attribute: json.dumps(state)}
+        )
+        self.pending_events[endpoint_id] = 0
+
+
 class WriteToKV(mlrun.feature_store.steps.MapClass):
-    def __init__(self, container: str, table: str, **kwargs):
+    def __init__(
+        self, project: str, access_key: str = None, store_kind: str = None, **kwargs
+    ):
         super().__init__(**kwargs)
-        self.container = container
-        self.table = table
+        self.store = mlrun.model_monitoring.stores.get_model_monitoring_store(
+            project, access_key=access_key, kind=store_kind
+        )
 
     def do(self, event: typing.Dict):
-        mlrun.utils.v3io_clients.get_v3io_client().kv.update(
-            container=self.container,
-            table_path=self.table,
-            key=event[ENDPOINT_ID],
-            attributes=event,
+        self.store.update_endpoint_record(event[ENDPOINT_ID], event)
+        return event
+
+
+class WriteToTSDB(mlrun.feature_store.steps.MapClass):
+    def __init__(
+        self, project: str, access_key: str = None, store_kind: str = None, **kwargs
+    ):
+        """
+        write batches of events (lists, emitted by a storey.Batch step) to the time series store (used instead of
+        storey.TSDBTarget by non v3io stores)
+        """
+        super().__init__(**kwargs)
+        self.store = mlrun.model_monitoring.stores.get_model_monitoring_store(
+            project, access_key=access_key, kind=store_kind
         )
+
+    def do(self, event: typing.List[typing.Dict]):
+        self.store.write_tsdb(event)
         return event
 
 
 class InferSchema(mlrun.feature_store.steps.MapClass):
     def __init__(
-        self,
-        v3io_access_key: str,
-        v3io_framesd: str,
-        container: str,
-        table: str,
-        **kwargs,
+        self, project: str, access_key: str = None, store_kind: str = None, **kwargs
     ):
         super().__init__(**kwargs)
-        self.container = container
-        self.v3io_access_key = v3io_access_key
-        self.v3io_framesd = v3io_framesd
-        self.table = table
+        self.store = mlrun.model_monitoring.stores.get_model_monitoring_store(
+            project, access_key=access_key, kind=store_kind
+        )
         self.keys = set()
 
     def do(self, event: typing.Dict):
         key_set = set(event.keys())
         if not key_set.issubset(self.keys):
             self.keys.update(key_set)
-            mlrun.utils.v3io_clients.get_frames_client(
-                token=self.v3io_access_key,
-                container=self.container,
-                address=self.v3io_framesd,
-            ).execute(backend="kv", table=self.table, command="infer_schema")
-            logger.info(
-                "Found new keys, inferred schema", table=self.table, event=event
-            )
+            self.store.infer_schema()
+            logger.info("Found new keys, inferred schema", event=event)
         return event
-
-
-def get_endpoint_record(
-    kv_container: str, kv_path: str, endpoint_id: str, access_key: str
-) -> typing.Optional[dict]:
-    logger.info(
-        "Grabbing endpoint data",
-        container=kv_container,
-        table_path=kv_path,
-        key=endpoint_id,
-    )
-    try:
-        endpoint_record = (
-            mlrun.utils.v3io_clients.get_v3io_client()
-            .kv.get(
-                container=kv_container,
-                table_path=kv_path,
-                key=endpoint_id,
-                access_key=access_key,
-                raise_for_status=v3io.dataplane.RaiseForStatus.always,
-            )
-            .output.item
-        )
-        return endpoint_record
-    except Exception:
-        return None
@@ -764,34 +764,88 @@ class BaseRuntime(ModelObj):
     def _run_many(self, generator, execution, runobj: RunObject) -> RunList:
         results = RunList()
         num_errors = 0
+        project = runobj.metadata.project
+        # the iterations are stored in bulk (a single db call per batch), the initial records of the next batch of
+        # tasks together with the state updates of the previous tasks
+        pending_runs = []
         tasks = generator.generate(runobj)
-        for task in tasks:
-            try:
-                self.store_run(task)
-                resp = self._run(task, execution)
-                resp = self._update_run_state(resp, task=task)
-                run_results = resp["status"].get("results", {})
-                if generator.eval_stop_condition(run_results):
-                    logger.info(
-                        f"reached early stop condition ({generator.options.stop_condition}), stopping iterations!"
+        batch = []
+        running_task = None
+        try:
+            while True:
+                if not batch:
+                    batch = self._next_tasks_batch(tasks)
+                    if not batch:
+                        break
+                    pending_runs.extend(
+                        task.to_dict() for task in batch if task is not None
                     )
-                    results.append(resp)
-                    break
-
-            except RunError as err:
-                task.status.state = "error"
-                task.status.error = str(err)
-                resp = self._update_run_state(task=task, err=err)
-                num_errors += 1
-                if num_errors > generator.max_errors:
-                    logger.error("too many errors, stopping iterations!")
-                    results.append(resp)
-                    break
-
-            results.append(resp)
+                    self._store_runs(pending_runs, project)
+                    pending_runs = []
 
+                task = batch.pop(0)
+                if task is None:
+                    # the tasks are executed one by one, all the previous results were already reported
+                    continue
+                running_task = task
+                try:
+                    resp = self._run(task, execution)
+                    resp = self._update_run_state(
+                        resp, task=task, pending_runs=pending_runs
+                    )
+                    running_task = None
+                    generator.report_result(resp)
+                    run_results = resp["status"].get("results", {})
+                    if generator.eval_stop_condition(run_results):
+                        logger.info(
+                            f"reached early stop condition ({generator.options.stop_condition}), stopping iterations!"
+                        )
+                        results.append(resp)
+                        break
+
+                except RunError as err:
+                    task.status.state = "error"
+                    task.status.error = str(err)
+                    resp = self._update_run_state(
+                        task=task, err=err, pending_runs=pending_runs
+                    )
+                    running_task = None
+                    generator.report_result(resp)
+                    num_errors += 1
+                    if num_errors > generator.max_errors:
+                        logger.error("too many errors, stopping iterations!")
+                        results.append(resp)
+                        break
+
+                results.append(resp)
+        finally:
+            # the state updates are flushed also when the iterations failed or were interrupted, and the tasks which
+            # were stored but didn't run (or were interrupted) are marked as aborted (so they don't stay running)
+            for task in batch:
+                if task is not None:
+                    task.status.state = RunStates.aborted
+                    pending_runs.append(task.to_dict())
+            self._store_runs(pending_runs, project)
+            if running_task and self._get_db():
+                self._get_db().update_run(
+                    {"status.state": RunStates.aborted},
+                    running_task.metadata.uid,
+                    project,
+                    iter=running_task.metadata.iteration,
+                )
         return results
 
+    @staticmethod
+    def _next_tasks_batch(tasks) -> list:
+        """the next tasks (up to the bulk store batch size), a batch ends after a None task (the generator may
+        generate the following tasks only after the previous results were reported)"""
+        batch = []
+        for task in tasks:
+            batch.append(task)
+            if task is None or len(batch) >= config.httpdb.bulk_store_batch_size:
+                break
+        return batch
+
     def store_run(self, runobj: RunObject):
         if self._get_db() and runobj:
             project = runobj.metadata.project
@@ -799,6 +853,10 @@ class BaseRuntime(ModelObj):
             iter = runobj.metadata.iteration
             self._get_db().store_run(runobj.to_dict(), uid, project, iter=iter)
 
+    def _store_runs(self, runs: list, project: str):
+        if self._get_db() and runs:
+            self._get_db().store_runs(runs, project=project)
+
     def _store_run_dict(self, rundict: dict):
         if self._get_db() and rundict:
             project = get_in(rundict, "metadata.project", "")
@@ -811,8 +869,13 @@ class BaseRuntime(ModelObj):
         resp: dict = None,
         task: RunObject = None,
         err=None,
+        pending_runs: list = None,
     ) -> dict:
-        """update the task state in the DB"""
+        """update the task state in the DB
+
+        :param pending_runs:  when specified, the updated run is appended to it (to be stored in bulk) instead of
+                              being updated in the DB
+        """
         was_none = False
         if resp is None and task:
             was_none = True
@@ -847,7 +910,9 @@ class BaseRuntime(ModelObj):
             updates["status.state"] = "completed"
             update_in(resp, "status.state", "completed")
 
-        if self._get_db() and updates:
+        if updates and pending_runs is not None:
+            pending_runs.append(resp)
+        elif self._get_db() and updates:
             project = get_in(resp, "metadata.project")
             uid = get_in(resp, "metadata.uid")
             iter = get_in(resp, "metadata.iteration", 0)
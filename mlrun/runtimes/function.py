@@ -912,18 +912,8 @@ class RemoteRuntime(KubeResource):
         parallel_runs = generator.options.parallel_runs or 1
         semaphore = asyncio.Semaphore(parallel_runs)
 
-        async with ClientSession() as session:
-            for task in tasks:
-                # TODO: store run using async calls to improve performance
-                self.store_run(task)
-                task.spec.secret_sources = secrets or []
-                resp = submit(session, url, task, semaphore, headers=headers)
-                runs.append(
-                    asyncio.ensure_future(
-                        resp,
-                    )
-                )
-
+        async def process_results(runs) -> bool:
+            nonlocal num_errors
             for result in asyncio.as_completed(runs):
                 status, resp, logs, task = await result
 
@@ -938,7 +928,9 @@ class RemoteRuntime(KubeResource):
                         silent=True,
                     )
                     # TODO: update run using async calls to improve performance
-                    results.append(self._update_run_state(task=task, err=err_message))
+                    resp = self._update_run_state(task=task, err=err_message)
+                    results.append(resp)
+                    generator.report_result(resp)
                     num_errors += 1
                 else:
                     if logs:
@@ -948,19 +940,41 @@ class RemoteRuntime(KubeResource):
                     if state == "error":
                         num_errors += 1
                     results.append(resp)
+                    generator.report_result(resp)
 
                     run_results = get_in(resp, "status.results", {})
-                    stop = generator.eval_stop_condition(run_results)
-                    if stop:
+                    if generator.eval_stop_condition(run_results):
                         logger.info(
                             f"reached early stop condition ({generator.options.stop_condition}), stopping iterations!"
                         )
-                        break
+                        return True
 
                 if num_errors > generator.max_errors:
                     logger.error("max errors reached, stopping iterations!")
-                    stop = True
-                    break
+                    return True
+            return False
+
+        async with ClientSession() as session:
+            for task in tasks:
+                if task is None:
+                    # wait for all the submitted runs (the generator uses their results for the next tasks)
+                    stop = await process_results(runs)
+                    if stop:
+                        break
+                    runs = []
+                    continue
+                # TODO: store run using async calls to improve performance
+                self.store_run(task)
+                task.spec.secret_sources = secrets or []
+                resp = submit(session, url, task, semaphore, headers=headers)
+                runs.append(
+                    asyncio.ensure_future(
+                        resp,
+                    )
+                )
+
+            if not stop:
+                stop = await process_results(runs)
 
         if stop:
             for task in runs:
@@ -18,12 +18,15 @@ from copy import deepcopy
 
 import pandas as pd
 
+import mlrun.errors
+
 from ..model import HyperParamOptions, RunObject, RunSpec
-from ..utils import get_in
+from ..utils import get_in, logger
 
-hyper_types = ["list", "grid", "random"]
+hyper_types = ["list", "grid", "random", "halving"]
 default_max_iterations = 10
 default_max_errors = 3
+default_reduction_factor = 3
 
 
 def get_generator(spec: RunSpec, execution):
@@ -43,13 +46,17 @@ def get_generator(spec: RunSpec, execution):
     options.selector = options.selector or spec.selector
     if options.selector:
         parse_selector(options.selector)
+    elif strategy == "halving":
+        raise mlrun.errors.MLRunInvalidArgumentError(
+            "halving strategy requires a selector, to promote the best runs"
+        )
 
     obj = None
     if param_file:
         obj = execution.get_dataitem(param_file)
         if not strategy and obj.suffix == ".csv":
             strategy = "list"
-        if not strategy or strategy in ["grid", "random"]:
+        if not strategy or strategy in ["grid", "random", "halving"]:
             hyperparams = json.loads(obj.get())
 
     if not strategy or strategy == "grid":
@@ -58,6 +65,9 @@ def get_generator(spec: RunSpec, execution):
     if strategy == "random":
         return RandomGenerator(hyperparams, options)
 
+    if strategy == "halving":
+        return HalvingGenerator(hyperparams, options)
+
     if obj:
         df = obj.as_df()
     else:
@@ -66,6 +76,9 @@ def get_generator(spec: RunSpec, execution):
 
 
 class TaskGenerator:
+    """generates the child run tasks, a None task tells the runner to wait for the results of all the tasks
+    which were generated so far (before generating the next tasks)"""
+
     def __init__(self, options: HyperParamOptions):
         self.options = options
 
@@ -83,6 +96,10 @@ class TaskGenerator:
     def generate(self, run: RunObject):
         pass
 
+    def report_result(self, result: dict):
+        """called by the runner with the (updated) run dict of each completed task"""
+        pass
+
     def eval_stop_condition(self, results) -> bool:
         if not self.options.stop_condition:
             return False
@@ -162,6 +179,68 @@ class ListGenerator(TaskGenerator):
             yield newrun
 
 
+class HalvingGenerator(TaskGenerator):
+    """successive halving, runs all the hyper param combinations (grid) with the min budget (resource param), then
+    promotes the best 1/reduction_factor of them (by the selector) to a reduction_factor times larger budget, and so
+    on until the max budget"""
+
+    def __init__(self, hyperparams: dict, options=None):
+        super().__init__(options)
+        self.hyperparams = hyperparams
+        self._results = {}
+
+    @property
+    def reduction_factor(self):
+        return self.options.reduction_factor or default_reduction_factor
+
+    def report_result(self, result: dict):
+        self._results[get_in(result, ["metadata", "iteration"])] = result
+
+    def generate(self, run: RunObject):
+        params = GridGenerator(self.hyperparams, self.options).grid_to_list()
+        candidates = [
+            {key: values[i] for key, values in params.items()}
+            for i in range(len(next(iter(params.values()))))
+        ]
+        resource = self.options.min_resource
+        iteration = 0
+        while candidates:
+            rung = []
+            for candidate in candidates:
+                iteration += 1
+                newrun = get_run_copy(run)
+                param_dict = newrun.spec.parameters or {}
+                param_dict.update(candidate)
+                param_dict[self.options.resource_param] = resource
+                newrun.spec.parameters = param_dict
+                newrun.metadata.iteration = iteration
+                rung.append((iteration, candidate))
+                yield newrun
+
+            if resource >= self.options.max_resource:
+                return
+            # wait for the rung results before promoting its best candidates
+            yield None
+            candidates = self._promote(rung)
+            resource = min(resource * self.reduction_factor, self.options.max_resource)
+            logger.info(
+                f"promoting {len(candidates)} of {len(rung)} runs to "
+                f"{self.options.resource_param}={resource}"
+            )
+
+    def _promote(self, rung: list) -> list:
+        op, field = parse_selector(self.options.selector)
+        scored = []
+        for iteration, candidate in rung:
+            result = self._results.get(iteration)
+            value = get_result_value(result, field) if result else None
+            if value is not None and get_in(result, ["status", "state"]) != "error":
+                scored.append((value, candidate))
+        scored.sort(key=lambda item: item[0], reverse=op == "max")
+        promoted = max(1, len(rung) // self.reduction_factor)
+        return [candidate for _, candidate in scored[:promoted]]
+
+
 def get_run_copy(run):
     newrun = deepcopy(run)
     newrun.spec.hyperparams = None
@@ -202,15 +281,20 @@ def selector(results: list, criteria):
     for task in results:
         state = get_in(task, ["status", "state"])
         id = get_in(task, ["metadata", "iteration"])
-        val = get_in(task, ["status", "results", criteria])
-        if isinstance(val, str):
-            try:
-                val = float(val)
-            except Exception:
-                val = None
+        val = get_result_value(task, criteria)
         if state != "error" and val is not None:
             if (op == "max" and val > best_val) or (op == "min" and val < best_val):
                 best_id, best_item, best_val = id, i, val
         i += 1
 
     return best_item, best_id
+
+
+def get_result_value(task: dict, name):
+    val = get_in(task, ["status", "results", name])
+    if isinstance(val, str):
+        try:
+            val = float(val)
+        except Exception:
+            val = None
+    return val
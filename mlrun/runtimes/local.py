@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
+import functools
 import importlib.util as imputil
 import inspect
 import json
@@ -20,7 +22,7 @@ import socket
 import sys
 import tempfile
 import traceback
-from contextlib import redirect_stdout
+from contextlib import nullcontext, redirect_stdout
 from copy import copy
 from io import StringIO
 from os import environ, remove
@@ -28,6 +30,7 @@ from pathlib import Path
 from subprocess import PIPE, Popen
 from sys import executable
 
+import cloudpickle
 from distributed import Client, as_completed
 from nuclio import Event
 
@@ -35,7 +38,7 @@ import mlrun
 from mlrun.lists import RunList
 
 from ..execution import MLClientCtx
-from ..model import RunObject
+from ..model import HyperParamOptions, HyperParamParallelModes, RunObject
 from ..utils import get_handler_extended, get_in, logger, set_paths
 from ..utils.clones import extract_source
 from .base import BaseRuntime, FunctionSpec, spec_fields
@@ -69,10 +72,6 @@ class ParallelRunner:
         self._force_handler(handler)
         set_paths(self.spec.pythonpath)
         handler = self._get_handler(handler, execution)
-
-        client, function_name = self._get_dask_client(generator.options)
-        parallel_runs = generator.options.parallel_runs or 4
-        queued_runs = 0
         num_errors = 0
 
         def process_result(future):
@@ -86,6 +85,7 @@ class ParallelRunner:
                 resp = self._update_run_state(resp, err=str(err))
                 num_errors += 1
             results.append(resp)
+            generator.report_result(resp)
             if num_errors > generator.max_errors:
                 logger.error("max errors reached, stopping iterations!")
                 return True
@@ -97,8 +97,34 @@ class ParallelRunner:
                 )
             return stop
 
+        options = generator.options
+        if (
+            options.dask_cluster_uri
+            or options.parallel_mode == HyperParamParallelModes.dask
+        ):
+            self._dask_run_many(tasks, handler, options, process_result)
+        else:
+            self._pool_run_many(tasks, handler, options, process_result)
+        return results
+
+    def _dask_run_many(
+        self, tasks, handler, options: HyperParamOptions, process_result
+    ):
+        client, function_name = self._get_dask_client(options)
+        parallel_runs = options.parallel_runs or 4
+        queued_runs = 0
         completed_iter = as_completed([])
         for task in tasks:
+            if task is None:
+                # wait for all the submitted runs (the generator uses their results for the next tasks)
+                early_stop = [
+                    future for future in completed_iter if process_result(future)
+                ]
+                completed_iter = as_completed([])
+                queued_runs = 0
+                if early_stop:
+                    break
+                continue
             task_struct = task.to_dict()
             project = get_in(task_struct, "metadata.project")
             uid = get_in(task_struct, "metadata.uid")
@@ -122,16 +148,70 @@ class ParallelRunner:
             process_result(future)
 
         client.close()
-        if function_name and generator.options.teardown_dask:
+        if function_name and options.teardown_dask:
             logger.info("tearing down the dask cluster..")
             mlrun.get_run_db().delete_runtime_resources(
                 kind="dask", object_id=function_name, force=True
             )
 
-        return results
+    def _pool_run_many(
+        self, tasks, handler, options: HyperParamOptions, process_result
+    ):
+        """run the tasks over a local process (or thread) pool, the results are processed as they complete"""
+        parallel_runs = options.parallel_runs or 4
+        workdir = None
+        if options.parallel_mode == HyperParamParallelModes.thread:
+            # the stdout redirection and the working dir are process wide, so the handlers output is not captured
+            # and the working dir is set once for all the threads
+            executor = concurrent.futures.ThreadPoolExecutor(parallel_runs)
+            submit = functools.partial(
+                executor.submit,
+                remote_handler_wrapper,
+                handler=handler,
+                capture_output=False,
+            )
+            workdir = self.spec.workdir
+        else:
+            # the handler is pickled by value when needed (e.g. when defined in a notebook or loaded from a file)
+            executor = concurrent.futures.ProcessPoolExecutor(parallel_runs)
+            submit = functools.partial(
+                executor.submit,
+                pool_handler_wrapper,
+                handler=cloudpickle.dumps(handler),
+                workdir=self.spec.workdir,
+                dbpath=mlrun.mlconf.dbpath,
+            )
+
+        old_dir = os.getcwd()
+        if workdir:
+            os.chdir(workdir)
+        futures = set()
+        try:
+            for task in tasks:
+                if task is None:
+                    # wait for all the submitted runs (the generator uses their results for the next tasks)
+                    done, futures = futures, set()
+                else:
+                    self.store_run(task)
+                    futures.add(submit(task.to_json()))
+                    if len(futures) < parallel_runs:
+                        continue
+                    done, futures = concurrent.futures.wait(
+                        futures, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                # all the completed runs are processed, even when one of them stops the iterations
+                completed = concurrent.futures.as_completed(done)
+                if [future for future in completed if process_result(future)]:
+                    break
 
+            for future in concurrent.futures.as_completed(futures):
+                process_result(future)
+        finally:
+            executor.shutdown()
+            os.chdir(old_dir)
 
-def remote_handler_wrapper(task, handler, workdir=None):
+
+def remote_handler_wrapper(task, handler, workdir=None, capture_output=True):
     if task and not isinstance(task, dict):
         task = json.loads(task)
 
@@ -142,10 +222,17 @@ def remote_handler_wrapper(task, handler, workdir=None):
     )
     runobj = RunObject.from_dict(task)
 
-    sout, serr = exec_from_params(handler, runobj, context, workdir)
+    sout, serr = exec_from_params(handler, runobj, context, workdir, capture_output)
     return context.to_dict(), sout, serr
 
 
+def pool_handler_wrapper(task, handler, workdir=None, dbpath=None):
+    """run a task in a process pool worker, the handler is cloudpickled"""
+    if dbpath:
+        mlrun.mlconf.dbpath = dbpath
+    return remote_handler_wrapper(task, cloudpickle.loads(handler), workdir)
+
+
 class HandlerRuntime(BaseRuntime, ParallelRunner):
     kind = "handler"
 
@@ -408,7 +495,9 @@ class _DupStdout(object):
         self.terminal.flush()
 
 
-def exec_from_params(handler, runobj: RunObject, context: MLClientCtx, cwd=None):
+def exec_from_params(
+    handler, runobj: RunObject, context: MLClientCtx, cwd=None, capture_output=True
+):
     old_level = logger.level
     if runobj.spec.verbose:
         logger.set_logger_level("DEBUG")
@@ -418,8 +507,9 @@ def exec_from_params(handler, runobj: RunObject, context: MLClientCtx, cwd=None)
     err = ""
     val = None
     old_dir = os.getcwd()
-    with redirect_stdout(stdout):
-        context.set_logger_stream(stdout)
+    with redirect_stdout(stdout) if capture_output else nullcontext():
+        if capture_output:
+            context.set_logger_stream(stdout)
         try:
             if cwd:
                 os.chdir(cwd)
@@ -434,7 +524,8 @@ def exec_from_params(handler, runobj: RunObject, context: MLClientCtx, cwd=None)
     stdout.flush()
     if cwd:
         os.chdir(old_dir)
-    context.set_logger_stream(sys.stdout)
+    if capture_output:
+        context.set_logger_stream(sys.stdout)
     if val:
         context.log_result("return", val)
     context.commit()
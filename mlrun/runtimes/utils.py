@@ -279,9 +279,9 @@ def results_to_iter(results, runspec, execution):
     if id:
         logger.info(f"best iteration={id}, used criteria {criteria}")
     task = results[item] if id and results else None
-    execution.log_iteration_results(id, summary, task)
-
-    log_iter_artifacts(execution, df, header)
+    with execution._artifacts_manager.bulk_store_context():
+        execution.log_iteration_results(id, summary, task)
+        log_iter_artifacts(execution, df, header)
 
     if failed:
         execution.set_state(
@@ -443,3 +443,24 @@ class BatchHttpRequests(_ConcurrentJobExecution):
         ) and isinstance(data, (str, bytes)):
             data = json.loads(data)
         return data
+
+
+class _ConcurrentMap(_ConcurrentJobExecution):
+    """run an async event handler on up to max_in_flight events concurrently
+
+    used for graph steps which gather concurrent events (e.g. micro-batching model servers),
+    the handler results are emitted downstream in the events order
+    """
+
+    def __init__(self, fn, max_in_flight=None, **kwargs):
+        super().__init__(max_in_flight=max_in_flight, **kwargs)
+        self._fn = fn
+
+    async def _process_event(self, event):
+        return await self._fn(self._get_event_or_body(event))
+
+    async def _process_event_with_retries(self, event):
+        return await self._process_event(event)
+
+    async def _handle_completed(self, event, response):
+        await self._do_downstream(self._user_fn_output_to_event(event, response))
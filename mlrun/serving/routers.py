@@ -12,12 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import concurrent
+import asyncio
+import concurrent.futures
 import copy
 import json
+import time
 import traceback
 from enum import Enum
 from io import BytesIO
+from typing import Union
 
 import numpy
 from numpy.core.fromnumeric import mean
@@ -149,9 +152,33 @@ class BaseModelRouter(RouterToDict):
         event.body = _update_result_body(self._result_path, original_body, event.body)
         return event
 
+    async def do_event_async(self, event, *args, **kwargs):
+        """handle incoming events in async flows, the routes with an async event handler are awaited"""
+
+        original_body = event.body
+        event.body = _extract_input_data(self._input_path, event.body)
+        event = self.preprocess(event)
+        event = self._pre_handle_event(event)
+        if not (hasattr(event, "terminated") and event.terminated):
+            event = self.postprocess(await self._handle_event_async(event))
+        event.body = _update_result_body(self._result_path, original_body, event.body)
+        return event
+
+    @property
+    def max_in_flight(self):
+        """max events to handle concurrently in async flows, set when routes gather concurrent events"""
+        values = [
+            getattr(route._object, "max_in_flight", None)
+            for route in (self.routes or {}).values()
+        ]
+        return max([value for value in values if value], default=None)
+
     def _handle_event(self, event):
         return event
 
+    async def _handle_event_async(self, event):
+        return self._handle_event(event)
+
     def preprocess(self, event):
         """run tasks before processing the event"""
         return event
@@ -207,12 +234,24 @@ class ModelRouter(BaseModelRouter):
         event.body = response.body if response else None
         return event
 
+    async def _handle_event_async(self, event):
+        name, route, subpath = self._resolve_route(event.body, event.path)
+        if not route:
+            return self._handle_event(event)
+
+        self.context.logger.debug(f"router run model {name}, op={subpath}")
+        event.path = subpath
+        response = await route.run_async(event)
+        event.body = response.body if response else None
+        return event
+
 
 class ParallelRunnerModes(str, Enum):
     """Supported parallel running modes for VotingEnsemble"""
 
     array = "array"
     thread = "thread"
+    asyncio = "asyncio"
 
 
 class VotingTypes(str, Enum):
@@ -242,6 +281,8 @@ class VotingEnsemble(BaseModelRouter):
         vote_type=None,
         executor_type=None,
         prediction_col_name=None,
+        model_timeout: Union[float, dict] = None,
+        quorum: int = None,
         **kwargs,
     ):
         """Voting Ensemble
@@ -316,12 +357,21 @@ class VotingEnsemble(BaseModelRouter):
                               by default will try to self-deduct upon the first event:
                                 - float prediction type: regression
                                 - int prediction type: classification
-        :param executor_type: Parallelism mechanism, out of `ParallelRunnerModes`, by default `threads`
+        :param executor_type: Parallelism mechanism, out of `ParallelRunnerModes`, by default `thread`:
+                                - thread: the models run on a (persistent) thread pool
+                                - asyncio: in async flows, the models run on the thread pool and are awaited
+                                  without blocking the event loop (same as thread in sync flows)
+                                - array: the models run one after the other
         :param prediction_col_name: The dict key for the predictions column in the model's responses output.
                               Example: If the model returns
                                        {id: <id>, model_name: <name>, outputs: {..., prediction: [<predictions>], ...}}
                                        the prediction_col_name should be `prediction`.
                               by default, `prediction`
+        :param model_timeout: max time (in seconds) to wait for a model response, a number for all the models
+                              or a dict of model name to timeout, the responses which are not received in time
+                              are left out of the vote. by default, wait for all the models
+        :param quorum:        min number of model responses needed for voting (models can fail or time out),
+                              by default 1
         :param kwargs:        extra arguments
         """
         super().__init__(
@@ -331,6 +381,12 @@ class VotingEnsemble(BaseModelRouter):
         self.vote_type = vote_type
         self.vote_flag = True if self.vote_type is not None else False
         self.executor_type = executor_type
+        self._executor_type = ParallelRunnerModes(
+            executor_type or ParallelRunnerModes.thread
+        )
+        self.model_timeout = model_timeout
+        self.quorum = quorum
+        self._pool = None
         self._model_logger = (
             _ModelLogPusher(self, context)
             if context and context.stream.enabled
@@ -343,6 +399,7 @@ class VotingEnsemble(BaseModelRouter):
         self.model_endpoint_uid = None
 
     def post_init(self, mode="sync"):
+        self._init_pool()
         server = getattr(self.context, "_server", None) or getattr(
             self.context, "server", None
         )
@@ -353,6 +410,13 @@ class VotingEnsemble(BaseModelRouter):
         if not self.context.is_mock or self.context.server.track_models:
             self.model_endpoint_uid = _init_endpoint_record(server, self)
 
+    def _init_pool(self):
+        if self._pool is None and self._executor_type != ParallelRunnerModes.array:
+            # models which time out keep running, keep spare workers for the following requests
+            self._pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=2 * len(self.routes), thread_name_prefix=self.name
+            )
+
     def _resolve_route(self, body, urlpath):
         """Resolves the appropriate model to send the event to.
         Supports:
@@ -537,7 +601,57 @@ class VotingEnsemble(BaseModelRouter):
             Event response after running the requested logic
         """
         start = now_date()
+        original_body = event.body
+        event, name, route = self._route_event(event)
+        if name is None:
+            return event
 
+        # Verify we use the V2 protocol
+        request = self.validate(event.body)
+
+        # If this is a Router Operation
+        metrics = None
+        if name == self.name:
+            predictions, metrics = self._parallel_run(event)
+            response = self._vote(event, predictions)
+        # A specific model event
+        else:
+            response = route.run(event)
+        return self._complete_event(
+            event, start, original_body, request, response, metrics
+        )
+
+    async def do_event_async(self, event, *args, **kwargs):
+        """Handles incoming requests in async flows (see do_event()).
+
+        with the `asyncio` executor type the models run on the thread pool and are awaited
+        (with their timeouts), so the event loop is not blocked while waiting for the models
+        """
+        if self._executor_type != ParallelRunnerModes.asyncio:
+            return self.do_event(event, *args, **kwargs)
+
+        start = now_date()
+        original_body = event.body
+        event, name, route = self._route_event(event)
+        if name is None:
+            return event
+
+        request = self.validate(event.body)
+        metrics = None
+        if name == self.name:
+            predictions, metrics = await self._async_parallel_run(event)
+            response = self._vote(event, predictions)
+        else:
+            response = route.run(event)
+        return self._complete_event(
+            event, start, original_body, request, response, metrics
+        )
+
+    def _route_event(self, event):
+        """preprocess and resolve the event route, return the event, model name and route
+
+        the returned model name is None when the event was already handled (e.g. health check)
+        """
         # Handle and verify the request
         original_body = event.body
         event.body = _extract_input_data(self._input_path, event.body)
@@ -549,14 +663,13 @@ class VotingEnsemble(BaseModelRouter):
             event.body = _update_result_body(
                 self._result_path, original_body, event.body
             )
-            return event
+            return event, None, None
 
         # Extract route information
         name, route, subpath = self._resolve_route(event.body, event.path)
         self.context.logger.debug(f"router run model {name}, op={subpath}")
         event.path = subpath
 
-        # Return the correct response
         # If no model name was given and no operation
         if not name and route is None:
             # Return model list
@@ -565,38 +678,36 @@ class VotingEnsemble(BaseModelRouter):
             event.body = _update_result_body(
                 self._result_path, original_body, event.body
             )
-            return event
-        else:
-            # Verify we use the V2 protocol
-            request = self.validate(event.body)
-
-            # If this is a Router Operation
-            if name == self.name:
-                predictions = self._parallel_run(event)
-                votes = self._apply_logic(predictions)
-                # Format the prediction response like the regular
-                # model's responses
-                if self.format_response_with_col_name_flag:
-                    votes = {self.prediction_col_name: votes}
-                response = copy.copy(event)
-                response_body = {
-                    "id": event.id,
-                    "model_name": self.name,
-                    "outputs": votes,
-                }
-                if self.version:
-                    response_body["model_version"] = self.version
-                response.body = response_body
-            # A specific model event
-            else:
-                response = route.run(event)
-
+            return event, None, None
+        return event, name, route
+
+    def _vote(self, event, predictions):
+        """apply the voting logic to the models predictions, return the ensemble response"""
+        votes = self._apply_logic(predictions)
+        # Format the prediction response like the regular
+        # model's responses
+        if self.format_response_with_col_name_flag:
+            votes = {self.prediction_col_name: votes}
+        response = copy.copy(event)
+        response_body = {
+            "id": event.id,
+            "model_name": self.name,
+            "outputs": votes,
+        }
+        if self.version:
+            response_body["model_version"] = self.version
+        response.body = response_body
+        return response
+
+    def _complete_event(
+        self, event, start, original_body, request, response, metrics=None
+    ):
         response = self.postprocess(response)
 
         if self._model_logger and self.log_router:
             if "id" not in request:
                 request["id"] = response.body["id"]
-            self._model_logger.push(start, request, response.body)
+            self._model_logger.push(start, request, response.body, metrics=metrics)
         event.body = _update_result_body(
             self._result_path, original_body, response.body if response else None
         )
@@ -628,45 +739,107 @@ class VotingEnsemble(BaseModelRouter):
                 f"in the model's response ({response.keys()})"
             )
 
-    def _parallel_run(self, event, mode: str = ParallelRunnerModes.thread):
+    def _parallel_run(self, event, mode: str = None):
         """Executes the processing logic in parallel
 
         Args:
             event (nuclio.Event): Incoming event after router preprocessing
-            mode (str, optional): Parallel processing method. Defaults to "thread".
+            mode (str, optional): Parallel processing method. Defaults to the executor type ("thread").
 
         Returns:
-            dict[str, nuclio.Event]: {model_name: model_response} for selected all models the registry
+            tuple: the predictions of the models which responded (in time), by the routes order, and the request
+                metrics (the models latency)
         """
+        mode = ParallelRunnerModes(mode or self._executor_type)
+        outcomes = {}
         if mode == ParallelRunnerModes.array:
-            results = {
-                model_name: model.run(copy.copy(event))
+            for model_name, model in self.routes.items():
+                try:
+                    outcomes[model_name] = self._run_model(model, copy.copy(event))
+                except Exception as exc:
+                    outcomes[model_name] = exc
+        else:
+            self._init_pool()
+            # the child routes change the event (body), each one gets a shallow copy
+            futures = {
+                model_name: self._pool.submit(self._run_model, model, copy.copy(event))
                 for model_name, model in self.routes.items()
             }
-        elif mode == ParallelRunnerModes.thread:
-            pool = concurrent.futures.ThreadPoolExecutor(max_workers=len(self.routes))
-            with pool as executor:
-                results = []
-                futures = [
-                    executor.submit(self.routes[model].run, copy.copy(event))
-                    for model in self.routes.keys()
-                ]
-                for future in concurrent.futures.as_completed(futures):
-                    try:
-                        results.append(future.result())
-                    except Exception as exc:
-                        print(f"child route generated an exception: {exc}")
-                results = [
-                    self.extract_results_from_response(event.body["outputs"])
-                    for event in results
-                ]
-                self.context.logger.debug(f"Collected results from models: {results}")
-        else:
-            raise ValueError(
-                f"{mode} is not a supported parallel run mode, please select from "
-                f"{[mode.value for mode in list(ParallelRunnerModes)]}"
+            start = time.monotonic()
+            for model_name, future in futures.items():
+                timeout = self._get_model_timeout(model_name)
+                if timeout is not None:
+                    timeout = max(timeout - (time.monotonic() - start), 0)
+                try:
+                    outcomes[model_name] = future.result(timeout=timeout)
+                except Exception as exc:
+                    future.cancel()
+                    outcomes[model_name] = exc
+        return self._collect_results(outcomes)
+
+    async def _async_parallel_run(self, event):
+        """Executes the processing logic on the thread pool, awaiting the models (with their timeouts)"""
+        self._init_pool()
+        loop = asyncio.get_running_loop()
+        awaitables = [
+            asyncio.wait_for(
+                loop.run_in_executor(
+                    self._pool, self._run_model, model, copy.copy(event)
+                ),
+                self._get_model_timeout(model_name),
+            )
+            for model_name, model in self.routes.items()
+        ]
+        responses = await asyncio.gather(*awaitables, return_exceptions=True)
+        return self._collect_results(dict(zip(self.routes.keys(), responses)))
+
+    @staticmethod
+    def _run_model(model, event):
+        start = time.monotonic()
+        response = model.run(event)
+        return response, int((time.monotonic() - start) * 1000000)
+
+    def _get_model_timeout(self, model_name):
+        if isinstance(self.model_timeout, dict):
+            return self.model_timeout.get(model_name)
+        return self.model_timeout
+
+    def _collect_results(self, outcomes: dict):
+        """
+        extract the predictions of the models which responded and verify the quorum, return the predictions and the
+        models latencies (kept per request, the requests may run concurrently)
+        """
+        results = []
+        metrics = {}
+        for model_name, outcome in outcomes.items():
+            if isinstance(
+                outcome, (concurrent.futures.TimeoutError, asyncio.TimeoutError)
+            ):
+                self.context.logger.warn(
+                    f"child route {model_name} timed out "
+                    f"({self._get_model_timeout(model_name)} sec), leaving it out of the vote"
+                )
+            elif isinstance(outcome, Exception):
+                self.context.logger.warn(
+                    f"child route {model_name} generated an exception: {outcome}"
+                )
+            else:
+                response, microsec = outcome
+                metrics[f"{model_name}_microsec"] = microsec
+                results.append(
+                    self.extract_results_from_response(response.body["outputs"])
+                )
+
+        quorum = self.quorum or 1
+        if len(results) < quorum:
+            raise RuntimeError(
+                f"only {len(results)} out of {len(outcomes)} models responded, "
+                f"at least {quorum} responses are needed for voting"
             )
-        return results
+        self.context.logger.debug(
+            f"Collected results from models: {results}, latency: {metrics}"
+        )
+        return results, metrics
 
     def validate(self, request):
         """Validate the event body (after preprocessing)
@@ -779,6 +952,8 @@ class EnrichmentModelRouter(ModelRouter):
         health_prefix: str = None,
         feature_vector_uri: str = "",
         impute_policy: dict = {},
+        cache_size: int = None,
+        cache_ttl: Union[int, dict] = None,
         **kwargs,
     ):
         """Model router with feature enrichment (from the feature store)
@@ -797,6 +972,9 @@ class EnrichmentModelRouter(ModelRouter):
                               constants or $mean, $max, $min, $std, $count for statistical values.
                               “*” is used to specify the default for all features, example:
                               impute_policy={"*": "$mean", "age": 33}
+        :param cache_size:    enable a local cache of (feature set, entity key) entries in front of the online
+                              feature store, with up to `cache_size` entries (LRU eviction). Default is no cache.
+        :param cache_ttl:     cached entries time to live in seconds, a number or a dict per feature set name
         :param context:       for internal use (passed in init)
         :param name:          step name
         :param routes:        for internal use (routes passed in init)
@@ -824,6 +1002,8 @@ class EnrichmentModelRouter(ModelRouter):
 
         self.feature_vector_uri = feature_vector_uri
         self.impute_policy = impute_policy
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
 
         self._feature_service = None
 
@@ -832,6 +1012,8 @@ class EnrichmentModelRouter(ModelRouter):
         self._feature_service = mlrun.feature_store.get_online_feature_service(
             feature_vector=self.feature_vector_uri,
             impute_policy=self.impute_policy,
+            cache_size=self.cache_size,
+            cache_ttl=self.cache_ttl,
         )
 
     def preprocess(self, event):
@@ -860,6 +1042,10 @@ class EnrichmentVotingEnsemble(VotingEnsemble):
         prediction_col_name=None,
         feature_vector_uri: str = "",
         impute_policy: dict = {},
+        cache_size: int = None,
+        cache_ttl: Union[int, dict] = None,
+        model_timeout: Union[float, dict] = None,
+        quorum: int = None,
         **kwargs,
     ):
         """Voting Ensemble with feature enrichment (from the feature store)
@@ -933,6 +1119,9 @@ class EnrichmentVotingEnsemble(VotingEnsemble):
                               the replaced value can be fixed number for constants or $mean, $max, $min, $std, $count
                               for statistical values. “*” is used to specify the default for all features, example:
                               impute_policy={"*": "$mean", "age": 33}
+        :param cache_size:    enable a local cache of (feature set, entity key) entries in front of the online
+                              feature store, with up to `cache_size` entries (LRU eviction). Default is no cache.
+        :param cache_ttl:     cached entries time to live in seconds, a number or a dict per feature set name
         :param input_path:    when specified selects the key/path in the event to use as body
                               this require that the event body will behave like a dict, example:
                               event: {"data": {"a": 5, "b": 7}}, input_path="data.b" means request body will be 7
@@ -944,12 +1133,17 @@ class EnrichmentVotingEnsemble(VotingEnsemble):
                               by default will try to self-deduct upon the first event:
                                 - float prediction type: regression
                                 - int prediction type: classification
-        :param executor_type: Parallelism mechanism, out of `ParallelRunnerModes`, by default `threads`
+        :param executor_type: Parallelism mechanism, out of `ParallelRunnerModes`, by default `thread`
         :param prediction_col_name: The dict key for the predictions column in the model's responses output.
                               Example: If the model returns
                                        {id: <id>, model_name: <name>, outputs: {..., prediction: [<predictions>], ...}}
                                        the prediction_col_name should be `prediction`.
                               by default, `prediction`
+        :param model_timeout: max time (in seconds) to wait for a model response, a number for all the models
+                              or a dict of model name to timeout, the responses which are not received in time
+                              are left out of the vote. by default, wait for all the models
+        :param quorum:        min number of model responses needed for voting (models can fail or time out),
+                              by default 1
         :param kwargs:        extra arguments
         """
         super().__init__(
@@ -962,11 +1156,15 @@ class EnrichmentVotingEnsemble(VotingEnsemble):
             vote_type,
             executor_type,
             prediction_col_name,
+            model_timeout=model_timeout,
+            quorum=quorum,
             **kwargs,
         )
 
         self.feature_vector_uri = feature_vector_uri
         self.impute_policy = impute_policy
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
 
         self._feature_service = None
 
@@ -975,6 +1173,8 @@ class EnrichmentVotingEnsemble(VotingEnsemble):
         self._feature_service = mlrun.feature_store.get_online_feature_service(
             feature_vector=self.feature_vector_uri,
             impute_policy=self.impute_policy,
+            cache_size=self.cache_size,
+            cache_ttl=self.cache_ttl,
         )
 
     def preprocess(self, event):
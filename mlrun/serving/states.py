@@ -474,6 +474,26 @@ class TaskStep(BaseStep):
             event.terminated = True
         return event
 
+    async def run_async(self, event, *args, **kwargs):
+        """run this step in async flows, a class with a native async event handler (do_event_async) is awaited"""
+        handler = getattr(self._object, "do_event_async", None)
+        if (
+            not handler
+            or not self._call_with_event
+            or not self._is_local_function(self.context)
+        ):
+            return self.run(event, *args, **kwargs)
+
+        try:
+            return await handler(event, *args, **kwargs)
+        except Exception as exc:
+            self._log_error(event, exc)
+            handled = self._call_error_handler(event, exc)
+            if not handled:
+                raise exc
+            event.terminated = True
+        return event
+
 
 class RouterStep(TaskStep):
     """router step, implement routing logic for running child routes"""
@@ -1446,14 +1466,28 @@ def _init_async_objects(context, steps):
 
             elif not step.async_object or not hasattr(step.async_object, "_outlets"):
                 # if regular class, wrap with storey Map
-                step._async_object = storey.Map(
-                    step._handler,
+                handler = step._handler
+                max_in_flight = None
+                if step._call_with_event and hasattr(step._object, "do_event_async"):
+                    # the class has a native async (coroutine) event handler
+                    handler = step._object.do_event_async
+                    # classes which gather concurrent events (e.g. micro-batching) run on multiple events
+                    max_in_flight = getattr(step._object, "max_in_flight", None)
+                step_args = dict(
                     full_event=step.full_event or step._call_with_event,
                     input_path=step.input_path,
                     result_path=step.result_path,
                     name=step.name,
                     context=context,
                 )
+                if max_in_flight:
+                    from mlrun.serving.remote import _ConcurrentMap
+
+                    step._async_object = _ConcurrentMap(
+                        handler, max_in_flight=max_in_flight, **step_args
+                    )
+                else:
+                    step._async_object = storey.Map(handler, **step_args)
             if not step.next and hasattr(step, "responder") and step.responder:
                 # if responder step (return result), add Complete()
                 step.async_object.to(storey.Complete(full_event=True))
@@ -11,10 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
 import threading
 import time
 import traceback
-from typing import Dict
+from typing import Dict, List
 
 import mlrun
 from mlrun.api.schemas import (
@@ -43,6 +44,8 @@ class V2ModelServer(StepToDict):
         protocol=None,
         input_path: str = None,
         result_path: str = None,
+        max_batch_size: int = None,
+        max_wait_ms: float = None,
         **kwargs,
     ):
         """base model serving class (v2), using similar API to KFServing v2 and Triton
@@ -95,6 +98,10 @@ class V2ModelServer(StepToDict):
                               this require that the event body will behave like a dict, example:
                               event: {"x": 5} , result_path="resp" means the returned response will be written
                               to event["y"] resulting in {"x": 5, "resp": <result>}
+        :param max_batch_size: enable micro-batching in async flows, the predict requests of concurrent events
+                              are gathered into batches of up to max_batch_size requests, and their inputs are
+                              predicted at once (see predict_batch()). default is no batching
+        :param max_wait_ms:   max time (in milliseconds) to wait for a batch to fill before predicting it (default 5)
         :param kwargs:     extra arguments (can be accessed using self.get_param(key))
         """
         self.name = name
@@ -124,6 +131,16 @@ class V2ModelServer(StepToDict):
             self.ready = True
         self.model_endpoint_uid = None
 
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        # max events handled concurrently in async flows, the requests which arrive while a batch is predicted
+        # form the next batch
+        self.max_in_flight = None
+        self._batcher = None
+        if max_batch_size and max_batch_size > 1:
+            self._batcher = _MicroBatcher(self, max_batch_size, max_wait_ms)
+            self.max_in_flight = 2 * max_batch_size
+
     def _load_and_update_state(self):
         try:
             self.load()
@@ -224,10 +241,8 @@ class V2ModelServer(StepToDict):
         request = self.preprocess(event_body, op)
         return self.validate(request, op)
 
-    def do_event(self, event, *args, **kwargs):
-        """main model event handler method"""
-        start = now_date()
-        original_body = event.body
+    def _parse_event(self, event):
+        """return the event body (at the input path), the event id and the model operation"""
         event_body = _extract_input_data(self._input_path, event.body)
         event_id = event.id
         op = event.path.strip("/")
@@ -236,6 +251,13 @@ class V2ModelServer(StepToDict):
             event_id = event_body.get("id", event_id)
         if not op and event.method != "GET":
             op = "infer"
+        return event_body, event_id, op
+
+    def do_event(self, event, *args, **kwargs):
+        """main model event handler method"""
+        start = now_date()
+        original_body = event.body
+        event_body, event_id, op = self._parse_event(event)
 
         if op == "predict" or op == "infer":
             # predict operation
@@ -312,6 +334,45 @@ class V2ModelServer(StepToDict):
         else:
             raise ValueError(f"illegal model operation {op}, method={event.method}")
 
+        return self._complete_event(
+            event, start, original_body, event_id, op, request, response
+        )
+
+    async def do_event_async(self, event, *args, **kwargs):
+        """model event handler in async flows, see do_event()
+
+        when max_batch_size is set the predict requests of concurrent events are micro-batched, the other
+        operations are handled by do_event()
+        """
+        start = now_date()
+        original_body = event.body
+        event_body, event_id, op = self._parse_event(event)
+        if not self._batcher or op not in ["predict", "infer"]:
+            return self.do_event(event, *args, **kwargs)
+
+        request = self._pre_event_processing_actions(event, event_body, op)
+        try:
+            outputs = await self._batcher.predict(request)
+        except Exception as exc:
+            request["id"] = event_id
+            if self._model_logger:
+                self._model_logger.push(start, request, op=op, error=exc)
+            raise exc
+
+        response = {
+            "id": event_id,
+            "model_name": self.name,
+            "outputs": outputs,
+        }
+        if self.version:
+            response["model_version"] = self.version
+        return self._complete_event(
+            event, start, original_body, event_id, op, request, response
+        )
+
+    def _complete_event(
+        self, event, start, original_body, event_id, op, request, response
+    ):
         response = self.postprocess(response)
         if self._model_logger:
             inputs, outputs = self.logged_results(request, response, op)
@@ -365,11 +426,131 @@ class V2ModelServer(StepToDict):
         """model prediction operation"""
         raise NotImplementedError()
 
+    def predict_batch(self, request: Dict) -> List:
+        """model prediction over a micro-batch of requests (used when max_batch_size is set)
+
+        the request["inputs"] holds the concatenated inputs of the batched requests, the method must
+        return a list with an output per input, the outputs are split back between the requests.
+        by default calls predict(), override it when predict() returns a different structure
+        """
+        return self.predict(request)
+
     def explain(self, request: Dict) -> Dict:
         """model explain operation"""
         raise NotImplementedError()
 
 
+class _MicroBatcher:
+    """gather the predict requests of concurrent (async flow) events into batches, predicted at once
+
+    the batches are predicted one at a time in a worker thread (so the event loop is not blocked),
+    the requests which arrive while a batch is predicted form the next batch
+    """
+
+    # requests with other fields can't be merged with other requests (predicted alone)
+    batch_fields = ["inputs", "id", "model", "operation"]
+
+    def __init__(self, model: V2ModelServer, max_batch_size: int, max_wait_ms=None):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = (5 if max_wait_ms is None else max_wait_ms) / 1000
+        self._pending = []
+        self._filled = None
+        self._worker = None
+
+    async def predict(self, request: dict):
+        """predict the request in a batch, return its outputs (or raise its error)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((request, future))
+        if self._worker is None or self._worker.done():
+            self._filled = asyncio.Event()
+            self._worker = loop.create_task(self._run())
+        if len(self._pending) >= self.max_batch_size:
+            self._filled.set()
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            if len(self._pending) < self.max_batch_size:
+                try:
+                    await asyncio.wait_for(self._filled.wait(), self.max_wait)
+                except asyncio.TimeoutError:
+                    pass
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            if len(self._pending) < self.max_batch_size:
+                self._filled.clear()
+
+            try:
+                results = await loop.run_in_executor(None, self._predict, batch)
+            except Exception as exc:
+                results = [(None, exc)] * len(batch)
+            for (_, future), (outputs, error) in zip(batch, results):
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(outputs)
+
+    def _predict(self, batch: list):
+        """predict the batch requests, return an (outputs, error) tuple per request"""
+        requests = [request for request, _ in batch]
+        merged = [
+            index
+            for index, request in enumerate(requests)
+            if not set(request.keys()) - set(self.batch_fields)
+        ]
+        results = [None] * len(requests)
+        if len(merged) > 1:
+            try:
+                outputs = self._predict_merged([requests[index] for index in merged])
+            except Exception as exc:
+                # isolate the failing request(s) by predicting the requests one by one
+                self.model.context.logger.warn(
+                    f"batch prediction of {len(merged)} requests failed ({exc}), "
+                    f"predicting the requests separately"
+                )
+            else:
+                for index, output in zip(merged, outputs):
+                    results[index] = (output, None)
+
+        for index, request in enumerate(requests):
+            if results[index] is None:
+                try:
+                    results[index] = (self.model.predict(request), None)
+                except Exception as exc:
+                    results[index] = (None, exc)
+        return results
+
+    def _predict_merged(self, requests: list):
+        """predict the concatenated inputs of the requests, return the outputs per request"""
+        inputs = []
+        for request in requests:
+            inputs.extend(request["inputs"])
+        outputs = self.model.predict_batch({"inputs": inputs})
+        if not hasattr(outputs, "__len__") or len(outputs) != len(inputs):
+            raise ValueError(
+                f"predict_batch() must return an output per input ({len(inputs)}), "
+                f"got {type(outputs).__name__}"
+            )
+
+        results = []
+        start = 0
+        for request in requests:
+            end = start + len(request["inputs"])
+            outputs_slice = outputs[start:end]
+            results.append(
+                outputs_slice.tolist()
+                if hasattr(outputs_slice, "tolist")
+                else list(outputs_slice)
+            )
+            start = end
+        return results
+
+
 class _ModelLogPusher:
     def __init__(self, model, context, output_stream=None):
         self.model = model
@@ -398,7 +579,7 @@ class _ModelLogPusher:
             base_data["labels"] = self.model.labels
         return base_data
 
-    def push(self, start, request, resp=None, op=None, error=None):
+    def push(self, start, request, resp=None, op=None, error=None, metrics=None):
         if error:
             data = self.base_data()
             data["request"] = request
@@ -414,13 +595,13 @@ class _ModelLogPusher:
         self._sample_iter = (self._sample_iter + 1) % self.stream_sample
         if self.output_stream and self._sample_iter == 0:
             microsec = (now_date() - start).microseconds
+            if metrics is None:
+                metrics = getattr(self.model, "metrics", None)
 
             if self.stream_batch > 1:
                 if self._batch_iter == 0:
                     self._batch = []
-                self._batch.append(
-                    [request, op, resp, str(start), microsec, self.model.metrics]
-                )
+                self._batch.append([request, op, resp, str(start), microsec, metrics])
                 self._batch_iter = (self._batch_iter + 1) % self.stream_batch
 
                 if self._batch_iter == 0:
@@ -442,8 +623,8 @@ class _ModelLogPusher:
                 data["resp"] = resp
                 data["when"] = str(start)
                 data["microsec"] = microsec
-                if getattr(self.model, "metrics", None):
-                    data["metrics"] = self.model.metrics
+                if metrics:
+                    data["metrics"] = metrics
                 self.output_stream.push([data])
 
 
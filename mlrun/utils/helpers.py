@@ -310,6 +310,21 @@ def update_in(obj, key, value, append=False, replace=True):
             obj[last_key] = value
 
 
+def select_fields(obj: dict, fields: typing.List[str]) -> dict:
+    """
+    return a dict with only the given fields of the object (missing fields are skipped)
+
+    >>> select_fields({'a': {'b': 1, 'c': 2}, 'd': 3}, ['a.b', 'e'])
+    {'a': {'b': 1}}
+    """
+    selected = {}
+    for field in fields:
+        value = get_in(obj, field, missing)
+        if value is not missing:
+            update_in(selected, field, value)
+    return selected
+
+
 def match_labels(labels, conditions):
     match = True
 
@@ -1,9 +1,13 @@
 import hashlib
+import math
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import Optional
+from typing import Any, Dict, Optional
+
+import numpy as np
 
 import mlrun
+import mlrun.errors
 from mlrun.config import config
 from mlrun.platforms.iguazio import parse_v3io_path
 from mlrun.utils import parse_versioned_object_uri
@@ -91,6 +95,26 @@ def parse_model_endpoint_project_prefix(path: str, project_name: str):
     return path.split(project_name, 1)[0] + project_name
 
 
+def get_parquet_path(project: str, store_kind: str = None) -> str:
+    """
+    Get the path of the endpoints parquet files (written by the stream processing and read by the batch job), a
+    local store uses the local_user_space prefix when the user_space prefix is a v3io path
+
+    :param project:    project name.
+    :param store_kind: model monitoring store kind (default to mlrun.mlconf.model_endpoint_monitoring.store_kind).
+    """
+    import mlrun.model_monitoring.stores
+
+    store_kind = store_kind or config.model_endpoint_monitoring.store_kind
+    prefix = config.model_endpoint_monitoring.store_prefixes.user_space
+    if (
+        store_kind == mlrun.model_monitoring.stores.ModelMonitoringStoreKinds.local
+        and prefix.startswith("v3io")
+    ):
+        prefix = config.model_endpoint_monitoring.local_user_space
+    return prefix.format(project=project, kind="parquet")
+
+
 def parse_model_endpoint_store_prefix(store_prefix: str):
     endpoint, parsed_url = parse_v3io_path(store_prefix)
     container, path = parsed_url.split("/", 1)
@@ -118,3 +142,162 @@ class EndpointType(IntEnum):
     NODE_EP = 1  # end point that is not a child of a router
     ROUTER = 2  # endpoint that is router
     LEAF_EP = 3  # end point that is a child of a router
+
+
+# prefix of the endpoint KV attributes holding the histogram states written by the stream processing workers
+HISTOGRAMS_KV_PREFIX = "histograms_"
+
+
+class HistogramState:
+    """
+    Per feature histograms over fixed bin edges (the bins of the training set feature_stats), which can be updated
+    incrementally (event by event) and merged with the histograms of other processes by adding their counts.
+    The bins are the same as the numpy histogram bins (the last bin includes its right edge), values outside of
+    the bin edges are counted in the first/last bin.
+    The count/sum/sum of squares/min/max of the (exact) values are kept along the histograms, so the state stats
+    have the same count/mean/std/min/max entries as the feature_stats.
+    """
+
+    def __init__(
+        self,
+        edges: Dict[str, list],
+        counts: Optional[Dict[str, list]] = None,
+        moments: Optional[Dict[str, list]] = None,
+    ):
+        counts = counts or {}
+        moments = moments or {}
+        self.edges = {
+            feature: np.asarray(feature_edges, dtype=float)
+            for feature, feature_edges in edges.items()
+        }
+        self.counts = {
+            feature: np.asarray(counts[feature], dtype=np.int64)
+            if feature in counts
+            else np.zeros(len(feature_edges) - 1, dtype=np.int64)
+            for feature, feature_edges in self.edges.items()
+        }
+        # [count, sum, sum of squares, min, max] per feature
+        self.moments = {
+            feature: list(moments[feature])
+            if feature in moments
+            else [0, 0.0, 0.0, np.inf, -np.inf]
+            for feature in self.edges
+        }
+
+    @classmethod
+    def from_stats(
+        cls, stats: Dict[str, Dict[str, Any]], with_counts: bool = True
+    ) -> "HistogramState":
+        """
+        Create a histogram state from a stats dictionary ({feature: {"count", "mean", "std", "min", "max",
+        "hist": [counts, edges]}}), features without a histogram are ignored. When the count/mean/min/max are
+        missing, they are approximated from the histogram (bin centers).
+
+        :param stats:       the stats dictionary, e.g. the feature_stats of the model endpoint.
+        :param with_counts: use the counts and the moments of the stats, otherwise start with empty histograms.
+        """
+        edges, counts, moments = {}, {}, {}
+        for feature, feature_stats in stats.items():
+            feature_stats = feature_stats or {}
+            hist = feature_stats.get("hist")
+            if not hist or len(hist[1]) < 2:
+                continue
+            edges[feature] = hist[1]
+            if with_counts:
+                counts[feature] = hist[0]
+                moments[feature] = cls._moments_from_stats(feature_stats)
+        return cls(edges, counts, moments)
+
+    @staticmethod
+    def _moments_from_stats(feature_stats: Dict[str, Any]) -> list:
+        if all(key in feature_stats for key in ["count", "mean", "min", "max"]):
+            count = int(feature_stats["count"])
+            mean = float(feature_stats["mean"])
+            std = float(feature_stats.get("std") or 0.0)
+            return [
+                count,
+                mean * count,
+                std**2 * max(count - 1, 0) + count * mean**2,
+                float(feature_stats["min"]),
+                float(feature_stats["max"]),
+            ]
+        counts, edges = (
+            np.asarray(values, dtype=float) for values in feature_stats["hist"]
+        )
+        centers = (edges[:-1] + edges[1:]) / 2
+        non_empty = np.flatnonzero(counts)
+        if not len(non_empty):
+            return [0, 0.0, 0.0, np.inf, -np.inf]
+        return [
+            int(counts.sum()),
+            float((counts * centers).sum()),
+            float((counts * centers**2).sum()),
+            float(edges[non_empty[0]]),
+            float(edges[non_empty[-1] + 1]),
+        ]
+
+    def update(self, named_features: Dict[str, Any]):
+        """count the values of a single event ({feature: value}), non numeric and NaN values are ignored"""
+        for feature, value in named_features.items():
+            edges = self.edges.get(feature)
+            if (
+                edges is None
+                or isinstance(value, bool)
+                or not isinstance(value, (int, float))
+                or value != value
+            ):
+                continue
+            index = np.searchsorted(edges, value, side="right") - 1
+            self.counts[feature][min(max(index, 0), len(edges) - 2)] += 1
+            moments = self.moments[feature]
+            moments[0] += 1
+            moments[1] += value
+            moments[2] += value * value
+            moments[3] = min(moments[3], value)
+            moments[4] = max(moments[4], value)
+
+    def merge(self, other: "HistogramState") -> "HistogramState":
+        """add the counts (and the moments) of another histogram state (with the same bin edges) to this state"""
+        for feature, edges in other.edges.items():
+            if feature not in self.edges:
+                self.edges[feature] = edges
+                self.counts[feature] = other.counts[feature].copy()
+                self.moments[feature] = list(other.moments[feature])
+                continue
+            if not np.array_equal(self.edges[feature], edges):
+                raise mlrun.errors.MLRunInvalidArgumentError(
+                    f"Can not merge histograms with different bin edges, feature={feature}"
+                )
+            self.counts[feature] += other.counts[feature]
+            count, total, squares, low, high = other.moments[feature]
+            moments = self.moments[feature]
+            moments[0] += count
+            moments[1] += total
+            moments[2] += squares
+            moments[3] = min(moments[3], low)
+            moments[4] = max(moments[4], high)
+        return self
+
+    def to_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        the state as a stats dictionary ({feature: {"count", "mean", "std", "min", "max", "hist": [counts, edges]}}),
+        features without values are omitted and the std is omitted when there is a single value (like in the
+        feature_stats)
+        """
+        stats = {}
+        for feature, edges in self.edges.items():
+            count, total, squares, low, high = self.moments[feature]
+            if not count:
+                continue
+            mean = total / count
+            feature_stats = {"count": float(count), "mean": float(mean)}
+            if count > 1:
+                # the sum of squares may be slightly smaller than count * mean ** 2 due to rounding
+                feature_stats["std"] = math.sqrt(
+                    max(squares - count * mean**2, 0.0) / (count - 1)
+                )
+            feature_stats["min"] = float(low)
+            feature_stats["max"] = float(high)
+            feature_stats["hist"] = [self.counts[feature].tolist(), edges.tolist()]
+            stats[feature] = feature_stats
+        return stats
@@ -306,6 +306,78 @@ def test_feature_set_get_by_reference(db: Session, client: TestClient) -> None:
     assert response.json()["metadata"]["name"] == name
 
 
+def test_feature_set_get_batch(db: Session, client: TestClient) -> None:
+    project_name = f"prj-{uuid4().hex}"
+    tests.api.api.utils.create_project(client, project_name)
+
+    uids = {}
+    for name in ["feature_set1", "feature_set2"]:
+        feature_set = _generate_feature_set(name)
+        added_feature_set = _feature_set_create_and_assert(
+            client, project_name, feature_set
+        )
+        uids[name] = added_feature_set["metadata"]["uid"]
+    feature_set = _generate_feature_set("feature_set1", "other_extra")
+    feature_set["metadata"]["tag"] = "v1"
+    _store_and_assert_feature_set(
+        client, project_name, "feature_set1", "v1", feature_set
+    )
+
+    response = client.get(
+        f"projects/{project_name}/feature-sets/batch",
+        params={
+            "name": [
+                "feature_set2",
+                "feature_set1:v1",
+                f"feature_set1@{uids['feature_set1']}",
+            ]
+        },
+    )
+    assert response.status_code == HTTPStatus.OK.value
+    feature_sets = response.json()["feature_sets"]
+    assert [feature_set["metadata"]["name"] for feature_set in feature_sets] == [
+        "feature_set2",
+        "feature_set1",
+        "feature_set1",
+    ]
+    assert feature_sets[0]["metadata"]["uid"] == uids["feature_set2"]
+    assert feature_sets[1]["spec"]["features"][-1]["name"] == "other_extra"
+    assert feature_sets[2]["metadata"]["uid"] == uids["feature_set1"]
+
+    response = client.get(
+        f"projects/{project_name}/feature-sets/batch",
+        params={"name": ["feature_set1", "not-found"]},
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND.value
+
+
+def test_feature_set_get_not_modified(db: Session, client: TestClient) -> None:
+    project_name = f"prj-{uuid4().hex}"
+    tests.api.api.utils.create_project(client, project_name)
+
+    name = "feature_set1"
+    _feature_set_create_and_assert(client, project_name, _generate_feature_set(name))
+    path = f"projects/{project_name}/feature-sets/{name}/references/latest"
+    response = client.get(path)
+    etag = response.headers["ETag"]
+
+    response = client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED.value
+    assert response.content == b""
+
+    _patch_object(
+        client,
+        project_name,
+        name,
+        {"metadata": {"labels": {"new-label": "value"}}},
+        "feature-sets",
+    )
+    response = client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.OK.value
+    assert response.headers["ETag"] != etag
+    assert response.json()["metadata"]["labels"]["new-label"] == "value"
+
+
 def test_feature_set_delete(db: Session, client: TestClient) -> None:
     project_name = f"prj-{uuid4().hex}"
     tests.api.api.utils.create_project(client, project_name)
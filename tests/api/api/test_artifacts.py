@@ -68,3 +68,26 @@ def test_delete_artifacts_after_storing_empty_dict(db: Session, client: TestClie
 
     resp = client.get(project_artifacts_path)
     assert len(resp.json()["artifacts"]) == 0
+
+
+def test_store_artifacts(db: Session, client: TestClient):
+    _create_project(client)
+    artifacts = [
+        {"key": f"{KEY}-{index}", "uid": UID, "tag": TAG, "artifact": {}}
+        for index in range(3)
+    ]
+
+    resp = client.post(
+        f"{API_PROJECTS_PATH}/{PROJECT}/{API_ARTIFACTS_PATH}",
+        json={"artifacts": artifacts},
+    )
+    assert resp.status_code == HTTPStatus.OK.value
+
+    resp = client.get(f"{API_ARTIFACTS_PATH}?project={PROJECT}&tag={TAG}")
+    assert len(resp.json()["artifacts"]) == 3
+
+    resp = client.post(
+        f"{API_PROJECTS_PATH}/{PROJECT}/{API_ARTIFACTS_PATH}",
+        json={"artifacts": [{"key": KEY}]},
+    )
+    assert resp.status_code == HTTPStatus.BAD_REQUEST.value
@@ -320,6 +320,50 @@ def test_list_and_get_project_summaries(
     )
 
 
+def test_project_summary_counters_recalculated_for_changed_projects(
+    db: Session, client: TestClient
+) -> None:
+    project_names = ["project-1", "project-2"]
+    for project_name in project_names:
+        project = mlrun.api.schemas.Project(
+            metadata=mlrun.api.schemas.ProjectMetadata(name=project_name),
+        )
+        response = client.post("projects", json=project.dict())
+        assert response.status_code == HTTPStatus.CREATED.value
+    _create_artifacts(client, "project-2", 2, mlrun.artifacts.model.ModelArtifact.kind)
+
+    def _get_project_summary(project_name):
+        response = client.get(f"project-summaries/{project_name}")
+        return mlrun.api.schemas.ProjectSummary(**response.json())
+
+    # the first summary calculates the counters of all the projects
+    _assert_project_summary(_get_project_summary("project-2"), 0, 0, 2, 0, 0, 0, 0)
+
+    sql_db = mlrun.api.utils.singletons.db.get_db()
+    calculate_counters = sql_db._calculate_project_resources_counters
+    with unittest.mock.patch.object(
+        sql_db,
+        "_calculate_project_resources_counters",
+        side_effect=calculate_counters,
+    ) as calculate_counters_mock:
+        # nothing changed, the counters are served from the cache
+        _assert_project_summary(_get_project_summary("project-2"), 0, 0, 2, 0, 0, 0, 0)
+        calculate_counters_mock.assert_not_called()
+
+        _create_artifacts(
+            client, "project-1", 3, mlrun.artifacts.model.ModelArtifact.kind
+        )
+        _create_runs(client, "project-1", 1, mlrun.runtimes.constants.RunStates.running)
+        _assert_project_summary(_get_project_summary("project-1"), 0, 0, 3, 0, 1, 0, 0)
+        _assert_project_summary(_get_project_summary("project-2"), 0, 0, 2, 0, 0, 0, 0)
+        # only the changed project counters were recalculated
+        calculate_counters_mock.assert_called_once_with(["project-1"])
+
+        sql_db.del_artifacts(db, project="project-2")
+        _assert_project_summary(_get_project_summary("project-2"), 0, 0, 0, 0, 0, 0, 0)
+        _assert_project_summary(_get_project_summary("project-1"), 0, 0, 3, 0, 1, 0, 0)
+
+
 def test_list_project_summaries_different_installation_modes(
     db: Session, client: TestClient, project_member_mode: str
 ) -> None:
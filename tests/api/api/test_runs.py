@@ -324,6 +324,70 @@ def test_list_runs_partition_by(db: Session, client: TestClient) -> None:
     assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY.value
 
 
+def test_list_runs_pagination_and_fields(db: Session, client: TestClient) -> None:
+    project = "some-project"
+    for index in range(5):
+        run = {
+            "metadata": {"name": "run-name", "uid": f"uid-{index}", "project": project},
+            "status": {"state": "completed", "results": {"accuracy": index}},
+        }
+        mlrun.api.crud.Runs().store_run(db, run, f"uid-{index}", project=project)
+
+    uids = []
+    params = {"project": project, "page-size": 2, "field": ["metadata", "status.state"]}
+    while True:
+        response = client.get("/api/runs", params=params)
+        assert response.status_code == HTTPStatus.OK.value, response.text
+        for run in response.json()["runs"]:
+            assert run == {
+                "metadata": run["metadata"],
+                "status": {"state": "completed"},
+            }
+            uids.append(run["metadata"]["uid"])
+        params["page-token"] = response.json()["next_page_token"]
+        if not params["page-token"]:
+            break
+    assert sorted(uids) == [f"uid-{index}" for index in range(5)]
+
+    # unpaginated listing returns a single page
+    response = client.get("/api/runs", params={"project": project})
+    assert len(response.json()["runs"]) == 5
+    assert response.json()["next_page_token"] is None
+
+    response = client.get(
+        "/api/runs", params={"project": project, "page-size": 2, "page-token": "bad"}
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST.value
+
+
+def test_store_runs(db: Session, client: TestClient) -> None:
+    project = "some-project"
+    project_schema = mlrun.api.schemas.Project(
+        metadata=mlrun.api.schemas.ProjectMetadata(name=project)
+    )
+    response = client.post("/api/projects", json=project_schema.dict())
+    assert response.status_code == HTTPStatus.CREATED.value
+    runs = [
+        {
+            "metadata": {"name": "run-name", "uid": "some-uid", "iteration": iteration},
+            "status": {"state": "completed"},
+        }
+        for iteration in range(1, 4)
+    ]
+    response = client.post(f"/api/projects/{project}/runs", json={"runs": runs})
+    assert response.status_code == HTTPStatus.OK.value, response.text
+
+    response = client.get("/api/runs", params={"project": project, "iter": True})
+    assert sorted(run["metadata"]["iteration"] for run in response.json()["runs"]) == [
+        1,
+        2,
+        3,
+    ]
+
+    response = client.post(f"/api/projects/{project}/runs", json={"runs": {}})
+    assert response.status_code == HTTPStatus.BAD_REQUEST.value
+
+
 def _list_and_assert_objects(client: TestClient, params, expected_number_of_runs: int):
     response = client.get("/api/runs", params=params)
     assert response.status_code == HTTPStatus.OK.value, response.text
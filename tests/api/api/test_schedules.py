@@ -57,6 +57,15 @@ def test_list_schedules(db: Session, client: TestClient) -> None:
     )
 
 
+def test_get_scheduler_metrics(db: Session, client: TestClient) -> None:
+    resp = client.get("schedules/metrics")
+    assert resp.status_code == HTTPStatus.OK.value
+    metrics = schemas.SchedulerMetrics(**resp.json())
+    assert metrics.triggered == 0
+    assert metrics.skipped_concurrency_limit == 0
+    assert metrics.max_trigger_lag_seconds is None
+
+
 def _get_and_assert_single_schedule(
     client: TestClient, get_params: dict, schedule_name: str
 ):
@@ -1,7 +1,15 @@
+import http
+import threading
+import time
+import unittest.mock
+
 import fastapi.testclient
 import sqlalchemy.orm
+import urllib3.exceptions
 
 import mlrun.api.crud
+import mlrun.api.db.session
+import mlrun.api.db.sqldb.session
 
 
 def test_log(db: sqlalchemy.orm.Session, client: fastapi.testclient.TestClient):
@@ -25,3 +33,139 @@ def test_log(db: sqlalchemy.orm.Session, client: fastapi.testclient.TestClient):
     mlrun.api.crud.Logs().store_log(data1, project, uid, append=False)
     _, log = mlrun.api.crud.Logs().get_logs(db, project, uid)
     assert data1 == log, "get log append=False"
+
+
+def test_stream_log(db: sqlalchemy.orm.Session, client: fastapi.testclient.TestClient):
+    project = "project-name"
+    uid = "m33"
+    mlrun.api.crud.Runs().store_run(
+        db,
+        {"metadata": {"name": "run-name"}, "status": {"state": "completed"}},
+        uid,
+        project=project,
+    )
+    mlrun.api.crud.Logs().store_log(b"some log", project, uid)
+    response = client.get(f"log/{project}/{uid}/stream", params={"offset": 5})
+    assert response.status_code == http.HTTPStatus.OK.value
+    assert response.headers["x-mlrun-run-state"] == "completed"
+    assert response.content == b"log"
+
+
+def test_stream_log_follow(
+    db: sqlalchemy.orm.Session, client: fastapi.testclient.TestClient
+):
+    mlrun.mlconf.httpdb.logs.follow_interval = 0.01
+    project = "project-name"
+    uid = "m33"
+    mlrun.api.crud.Runs().store_run(
+        db,
+        {"metadata": {"name": "run-name"}, "status": {"state": "running"}},
+        uid,
+        project=project,
+    )
+
+    def _run():
+        session = mlrun.api.db.sqldb.session.create_session()
+        try:
+            for index in range(3):
+                time.sleep(0.1)
+                mlrun.api.crud.Logs().store_log(
+                    f"line {index}\n".encode(), project, uid
+                )
+            mlrun.api.crud.Runs().update_run(
+                session, project, uid, 0, {"status.state": "completed"}
+            )
+            # the last log lines are written after the state was updated
+            mlrun.api.crud.Logs().store_log(b"done\n", project, uid)
+        finally:
+            mlrun.api.db.session.close_session(session)
+
+    thread = threading.Thread(target=_run)
+    thread.start()
+    response = client.get(f"log/{project}/{uid}/stream")
+    thread.join()
+    assert response.status_code == http.HTTPStatus.OK.value
+    assert response.headers["x-mlrun-run-state"] == "running"
+    assert response.content == b"line 0\nline 1\nline 2\ndone\n"
+
+
+def test_stream_log_timeout(
+    db: sqlalchemy.orm.Session, client: fastapi.testclient.TestClient
+):
+    mlrun.mlconf.httpdb.logs.follow_interval = 0.01
+    mlrun.mlconf.httpdb.logs.stream_timeout = 0.1
+    project = "project-name"
+    uid = "m33"
+    mlrun.api.crud.Runs().store_run(
+        db,
+        {"metadata": {"name": "run-name"}, "status": {"state": "running"}},
+        uid,
+        project=project,
+    )
+    mlrun.api.crud.Logs().store_log(b"some log", project, uid)
+
+    # the stream ends after the timeout although the run is still running, the client reconnects from its offset
+    response = client.get(f"log/{project}/{uid}/stream")
+    assert response.content == b"some log"
+    response = client.get(f"log/{project}/{uid}/stream", params={"offset": 8})
+    assert response.content == b""
+
+
+def test_stream_log_run_not_found(
+    db: sqlalchemy.orm.Session, client: fastapi.testclient.TestClient
+):
+    response = client.get("log/project-name/not-found/stream")
+    assert response.status_code == http.HTTPStatus.NOT_FOUND.value
+
+
+def test_stream_log_follow_pod(
+    db: sqlalchemy.orm.Session, client: fastapi.testclient.TestClient
+):
+    project = "project-name"
+    uid = "m33"
+    mlrun.api.crud.Runs().store_run(
+        db,
+        {"metadata": {"name": "run-name"}, "status": {"state": "running"}},
+        uid,
+        project=project,
+    )
+
+    first_timestamp = b"2021-01-01T10:00:00.000000000Z"
+    timestamp = b"2021-01-01T10:00:01.000000000Z"
+    last_timestamp = b"2021-01-01T10:00:02.000000000Z"
+
+    def _quiet_pod_stream(*args, **kwargs):
+        yield timestamp + b" line 0\n" + timestamp + b" line 1\n"
+        raise urllib3.exceptions.ReadTimeoutError(None, None, "read timed out")
+
+    # the first stream gets no new lines within the read timeout, so it is closed and the pod log is reopened from
+    # the last streamed line, the lines which were already streamed are dropped by their timestamps
+    responses = [unittest.mock.Mock(), unittest.mock.Mock()]
+    responses[0].stream.side_effect = _quiet_pod_stream
+    responses[1].stream.return_value = iter(
+        [
+            first_timestamp
+            + b" line -1\n"
+            + timestamp
+            + b" line 0\n"
+            + timestamp
+            + b" line 1\n"
+            + timestamp
+            + b" li",
+            b"ne 2\n" + last_timestamp + b" line 3",
+        ]
+    )
+    k8s = unittest.mock.Mock()
+    k8s.get_logger_pods.return_value = {"pod-name": "running"}
+    k8s.stream_logs.side_effect = responses
+    with unittest.mock.patch("mlrun.api.crud.logs.get_k8s", return_value=k8s):
+        response = client.get(f"log/{project}/{uid}/stream", params={"offset": 2})
+    assert response.content == b"ne 0\nline 1\nline 2\nline 3"
+    first_call, second_call = k8s.stream_logs.call_args_list
+    read_timeout = float(mlrun.mlconf.httpdb.logs.pod_read_timeout)
+    assert first_call.kwargs["read_timeout"] == read_timeout
+    assert first_call.kwargs["timestamps"]
+    assert first_call.kwargs["since_seconds"] is None
+    assert second_call.kwargs["since_seconds"] >= read_timeout
+    for pod_response in responses:
+        pod_response.close.assert_called_once()
@@ -1,3 +1,6 @@
+import datetime
+import pickle
+
 import deepdiff
 import numpy
 import pandas
@@ -6,6 +9,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.exc import MultipleResultsFound
 
+import mlrun.api.db.sqldb.models
 import mlrun.api.initial_data
 import mlrun.errors
 from mlrun.api import schemas
@@ -533,6 +537,109 @@ def test_list_artifacts_best_iter(db: DBInterface, db_session: Session):
         )
 
 
+# running only on sqldb cause filedb is not really a thing anymore, will be removed soon
+@pytest.mark.parametrize(
+    "db,db_session", [(dbs[0], dbs[0])], indirect=["db", "db_session"]
+)
+def test_list_artifacts_pagination(db: DBInterface, db_session: Session):
+    _generate_artifact_with_iterations(
+        db, db_session, "artifact-1", "uid-1", 3, 2, ArtifactCategories.model
+    )
+    _generate_artifact_with_iterations(
+        db, db_session, "artifact-2", "uid-2", 3, 1, ArtifactCategories.dataset
+    )
+    for index in range(3):
+        artifact_body = _generate_artifact(f"single-artifact-{index}", f"uid-{index}")
+        db.store_artifact(
+            db_session, f"single-artifact-{index}", artifact_body, f"uid-{index}"
+        )
+
+    def _list_pages(**list_artifacts_kwargs):
+        artifacts, pages = [], 0
+        page_token = None
+        while True:
+            page = db.list_artifacts(
+                db_session, page_size=2, page_token=page_token, **list_artifacts_kwargs
+            )
+            artifacts.extend(page)
+            pages += 1
+            page_token = page.next_page_token
+            if not page_token:
+                return artifacts, pages
+
+    def _keys(artifacts):
+        return sorted(
+            (artifact["metadata"]["name"], artifact["spec"].get("iter", 0))
+            for artifact in artifacts
+        )
+
+    for list_artifacts_kwargs in [
+        {},
+        {"best_iteration": True},
+        {"category": ArtifactCategories.model},
+        {"category": ArtifactCategories.dataset},
+        {"best_iteration": True, "category": ArtifactCategories.model},
+    ]:
+        expected = db.list_artifacts(db_session, **list_artifacts_kwargs)
+        artifacts, pages = _list_pages(**list_artifacts_kwargs)
+        assert _keys(artifacts) == _keys(expected)
+        assert pages == 1 if len(expected) <= 2 else pages > 1
+
+    with pytest.raises(mlrun.errors.MLRunInvalidArgumentError):
+        db.list_artifacts(db_session, page_size=2, page_token="invalid")
+
+
+# running only on sqldb cause filedb is not really a thing anymore, will be removed soon
+@pytest.mark.parametrize(
+    "db,db_session", [(dbs[0], dbs[0])], indirect=["db", "db_session"]
+)
+def test_store_artifacts(db: DBInterface, db_session: Session):
+    project = "artifact_project"
+    existing_artifact = _generate_artifact("artifact-1", "uid-1")
+    db.store_artifact(
+        db_session, "artifact-1", existing_artifact, "uid-1", tag="v1", project=project
+    )
+
+    artifacts = []
+    for iteration in range(3):
+        artifact = _generate_artifact("artifact-1", "uid-1")
+        artifact["spec"]["iter"] = iteration
+        artifact["spec"]["updated"] = "new"
+        artifacts.append(
+            {
+                "key": "artifact-1",
+                "uid": "uid-1",
+                "iter": iteration,
+                "tag": "v2",
+                "artifact": artifact,
+            }
+        )
+    artifacts.append(
+        {
+            "key": "artifact-2",
+            "uid": "uid-2",
+            "tag": "v1",
+            "artifact": _generate_artifact("artifact-2", "uid-2"),
+        }
+    )
+    db.store_artifacts(db_session, artifacts, project)
+
+    assert len(db.list_artifacts(db_session, project=project, tag="v2")) == 3
+    # the existing artifact was updated, and keeps its previous tag
+    assert len(db.list_artifacts(db_session, project=project, tag="v1")) == 2
+    for iteration in range(3):
+        artifact = db.read_artifact(
+            db_session, "artifact-1", tag="v2", iter=iteration, project=project
+        )
+        assert artifact["spec"]["updated"] == "new"
+    artifact = db.read_artifact(
+        db_session, "artifact-1", tag="v1", iter=0, project=project
+    )
+    assert artifact["spec"]["updated"] == "new"
+    artifact = db.read_artifact(db_session, "artifact-2", tag="v1", project=project)
+    assert artifact["metadata"]["name"] == "artifact-2"
+
+
 # running only on sqldb cause filedb is not really a thing anymore, will be removed soon
 @pytest.mark.parametrize(
     "data_migration_db,db_session",
@@ -893,6 +1000,85 @@ def test_data_migration_fix_datasets_large_previews(
     )
 
 
+# running only on sqldb cause filedb is not really a thing anymore, will be removed soon
+@pytest.mark.parametrize(
+    "data_migration_db,db_session",
+    [(dbs[0], dbs[0])],
+    indirect=["data_migration_db", "db_session"],
+)
+def test_data_migration_artifacts_queryable_columns(
+    data_migration_db: DBInterface,
+    db_session: Session,
+):
+    uid = "artifact-uid"
+    artifacts = {
+        "model": _generate_artifact("model", uid, kind=ModelArtifact.kind),
+        "1-model": _generate_artifact("model", uid, kind=ModelArtifact.kind),
+        "dataset": _generate_artifact("dataset", uid, kind="link"),
+        "2-dataset": _generate_artifact("dataset", uid, kind=DatasetArtifact.kind),
+        "3-dataset": _generate_artifact("dataset", uid, kind=DatasetArtifact.kind),
+        "plot": _generate_artifact("plot", uid, kind=PlotArtifact.kind),
+    }
+    artifacts["dataset"]["spec"]["link_iteration"] = 2
+    artifacts["model"]["spec"]["producer"] = {"kind": "run", "uri": "project/uid"}
+    # store the artifacts as they were stored before the migration (pickled, without the queryable columns)
+    for key, artifact in artifacts.items():
+        artifact_record = mlrun.api.db.sqldb.models.Artifact(
+            key=key, uid=uid, project="default", updated=datetime.datetime.utcnow()
+        )
+        artifact_record.body = pickle.dumps(artifact)
+        db_session.add(artifact_record)
+    db_session.commit()
+
+    # the legacy bodies are still readable
+    assert data_migration_db.read_artifact(db_session, "plot", uid) == artifacts["plot"]
+
+    mlrun.api.initial_data._perform_version_3_data_migrations(
+        data_migration_db, db_session
+    )
+
+    records = {
+        record.key: record
+        for record in db_session.query(mlrun.api.db.sqldb.models.Artifact)
+    }
+    assert all(record.body[:1] != pickle.PROTO for record in records.values())
+    assert {
+        key: (
+            record.kind,
+            record.category,
+            record.iteration,
+            record.link_iteration,
+            record.producer_uri,
+        )
+        for key, record in records.items()
+    } == {
+        "model": ("model", "model", 0, None, "project/uid"),
+        "1-model": ("model", "model", 1, None, None),
+        "dataset": ("link", None, 0, 2, None),
+        "2-dataset": ("dataset", "dataset", 2, None, None),
+        "3-dataset": ("dataset", "dataset", 3, None, None),
+        "plot": ("plot", "other", 0, None, None),
+    }
+
+    # the filters are resolved by the queryable columns
+    results = data_migration_db.list_artifacts(
+        db_session, category=ArtifactCategories.dataset
+    )
+    assert len(results) == 3
+    results = data_migration_db.list_artifacts(
+        db_session, category=ArtifactCategories.other
+    )
+    assert [artifact["metadata"]["name"] for artifact in results] == ["plot"]
+    results = data_migration_db.list_artifacts(db_session, best_iteration=True)
+    assert sorted(
+        (artifact["metadata"]["name"], artifact["kind"]) for artifact in results
+    ) == [("dataset", "dataset"), ("model", "model"), ("plot", "plot")]
+    results = data_migration_db.list_artifacts(
+        db_session, kind=ModelArtifact.kind, iter=0
+    )
+    assert len(results) == 1
+
+
 def _generate_artifact(name, uid=None, kind=None):
     artifact = {
         "metadata": {"name": name},
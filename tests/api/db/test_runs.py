@@ -1,3 +1,4 @@
+import pickle
 from datetime import datetime, timezone
 
 import pytest
@@ -83,6 +84,53 @@ def test_list_runs_state_filter(db: DBInterface, db_session: Session):
     assert runs[0]["metadata"]["uid"] == run_uid_completed
 
 
+# running only on sqldb cause filedb is not really a thing anymore, will be removed soon
+@pytest.mark.parametrize(
+    "db,db_session", [(dbs[0], dbs[0])], indirect=["db", "db_session"]
+)
+def test_count_runs(db: DBInterface, db_session: Session):
+    project = "project"
+    for uid, schedule_name, state, iteration in [
+        ("uid-1", "schedule-1", mlrun.runtimes.constants.RunStates.running, 0),
+        ("uid-2", "schedule-1", mlrun.runtimes.constants.RunStates.pending, 0),
+        ("uid-2", "schedule-1", mlrun.runtimes.constants.RunStates.running, 1),
+        ("uid-3", "schedule-1", mlrun.runtimes.constants.RunStates.completed, 0),
+        ("uid-4", "schedule-2", mlrun.runtimes.constants.RunStates.running, 0),
+    ]:
+        run = {
+            "metadata": {
+                "name": "run-name",
+                "uid": uid,
+                "iter": iteration,
+                "labels": {"mlrun/schedule-name": schedule_name},
+            },
+            "status": {"state": state},
+        }
+        db.store_run(db_session, run, uid, project, iter=iteration)
+
+    assert db.count_runs(db_session, project=project) == 4
+    assert db.count_runs(db_session, project=project, iter=True) == 5
+    assert db.count_runs(db_session, project="other-project") == 0
+    assert (
+        db.count_runs(
+            db_session,
+            project=project,
+            labels="mlrun/schedule-name=schedule-1",
+            states=mlrun.runtimes.constants.RunStates.non_terminal_states(),
+        )
+        == 2
+    )
+    assert (
+        db.count_runs(
+            db_session,
+            project=project,
+            labels="mlrun/schedule-name=schedule-2",
+            states=[mlrun.runtimes.constants.RunStates.completed],
+        )
+        == 0
+    )
+
+
 # running only on sqldb cause filedb is not really a thing anymore, will be removed soon
 @pytest.mark.parametrize(
     "db,db_session", [(dbs[0], dbs[0])], indirect=["db", "db_session"]
@@ -277,6 +325,148 @@ def test_list_runs_limited_unsorted_failure(db: DBInterface, db_session: Session
         )
 
 
+# running only on sqldb cause filedb is not really a thing anymore, will be removed soon
+@pytest.mark.parametrize(
+    "db,db_session", [(dbs[0], dbs[0])], indirect=["db", "db_session"]
+)
+@pytest.mark.parametrize("sort", [True, False])
+def test_list_runs_pagination(db: DBInterface, db_session: Session, sort: bool):
+    project = "project"
+    for index in range(7):
+        # some of the runs share the same start time
+        start_time = datetime(2021, 1, 1 + index // 2, tzinfo=timezone.utc)
+        run = {
+            "metadata": {"name": "run-name", "uid": f"uid-{index}", "iter": 0},
+            "status": {"start_time": start_time.isoformat()},
+        }
+        db.store_run(db_session, run, f"uid-{index}", project)
+    # iterations are filtered out of the pages as well
+    _create_new_run(db, db_session, project, uid="uid-0", iteration=1)
+
+    expected_uids = [
+        run["metadata"]["uid"] for run in db.list_runs(db_session, project=project)
+    ]
+    uids = []
+    start_times = []
+    page_token = None
+    pages = 0
+    while True:
+        runs = db.list_runs(
+            db_session, project=project, sort=sort, page_size=3, page_token=page_token
+        )
+        assert len(runs) <= 3
+        uids.extend(run["metadata"]["uid"] for run in runs)
+        start_times.extend(run["status"]["start_time"] for run in runs)
+        pages += 1
+        page_token = runs.next_page_token
+        if not page_token:
+            break
+    assert pages == 3
+    assert sorted(uids) == sorted(expected_uids)
+    if sort:
+        assert start_times == sorted(start_times, reverse=True)
+
+    with pytest.raises(mlrun.errors.MLRunInvalidArgumentError):
+        db.list_runs(db_session, project=project, page_size=3, page_token="invalid")
+    with pytest.raises(mlrun.errors.MLRunInvalidArgumentError):
+        db.list_runs(db_session, project=project, page_size=3, last=2)
+
+
+# running only on sqldb cause filedb is not really a thing anymore, will be removed soon
+@pytest.mark.parametrize(
+    "db,db_session", [(dbs[0], dbs[0])], indirect=["db", "db_session"]
+)
+def test_store_runs(db: DBInterface, db_session: Session):
+    project = "project"
+    uid = "run-uid"
+    _create_new_run(db, db_session, project, name="run-name", uid=uid, iteration=1)
+
+    def _generate_run(iteration, state):
+        return {
+            "metadata": {
+                "name": "run-name",
+                "uid": uid,
+                "iteration": iteration,
+                "labels": {"kind": "job"},
+            },
+            "status": {"state": state},
+        }
+
+    runs = [_generate_run(iteration, "completed") for iteration in range(1, 4)]
+    # the last occurrence of a run wins
+    runs.append(_generate_run(3, "error"))
+    db.store_runs(db_session, runs, project)
+
+    runs = db.list_runs(db_session, project=project, iter=True)
+    assert len(runs) == 3
+    states = {run["metadata"]["iteration"]: run["status"]["state"] for run in runs}
+    assert states == {1: "completed", 2: "completed", 3: "error"}
+    assert len(db.list_runs(db_session, project=project, labels="kind=job")) == 0
+    assert (
+        len(db.list_runs(db_session, project=project, labels="kind=job", iter=True))
+        == 3
+    )
+
+    with pytest.raises(mlrun.errors.MLRunInvalidArgumentError):
+        db.store_runs(db_session, [{"metadata": {"name": "no-uid"}}], project)
+
+
+# running only on sqldb cause filedb is not really a thing anymore, will be removed soon
+@pytest.mark.parametrize(
+    "db,db_session", [(dbs[0], dbs[0])], indirect=["db", "db_session"]
+)
+def test_data_migration_runs_bodies_to_json(db: DBInterface, db_session: Session):
+    project, name, uid, iteration, _ = _create_new_run(db, db_session)
+    run = db._get_run(db_session, uid, project, iteration)
+    assert run.body[:1] != pickle.PROTO
+    run_dict = run.struct
+
+    # change the body to be as it was before the migration
+    run.body = pickle.dumps(run_dict)
+    db._upsert(db_session, [run], ignore=True)
+    assert db.read_run(db_session, uid, project, iteration) == run_dict
+
+    mlrun.api.initial_data._migrate_runs_bodies_to_json(db, db_session)
+
+    run = db._get_run(db_session, uid, project, iteration)
+    assert run.body[:1] != pickle.PROTO
+    assert db.read_run(db_session, uid, project, iteration) == run_dict
+
+
+# running only on sqldb cause filedb is not really a thing anymore, will be removed soon
+@pytest.mark.parametrize(
+    "db,db_session", [(dbs[0], dbs[0])], indirect=["db", "db_session"]
+)
+def test_store_run_not_json_safe_body(db: DBInterface, db_session: Session):
+    project, name, uid, iteration, run_dict = _create_new_run(db, db_session)
+    for results in [
+        {"loss": float("nan"), "accuracy": float("inf")},
+        {"when": datetime(2021, 1, 1, tzinfo=timezone.utc)},
+        {"shape": (1, 2)},
+        {1: "non string key"},
+        {"large": 2**70},
+    ]:
+        run_dict["status"]["results"] = results
+        db.store_run(db_session, run_dict, uid, project, iter=iteration)
+        # stored pickled, so the results are loaded back as is
+        run = db._get_run(db_session, uid, project, iteration)
+        assert run.body[:1] == pickle.PROTO
+        loaded_results = db.read_run(db_session, uid, project, iteration)["status"][
+            "results"
+        ]
+        assert repr(loaded_results) == repr(results)
+
+        # the data migration doesn't re-encode it as json
+        mlrun.api.initial_data._migrate_runs_bodies_to_json(db, db_session)
+        run = db._get_run(db_session, uid, project, iteration)
+        assert run.body[:1] == pickle.PROTO
+
+    run_dict["status"]["results"] = {"loss": 0.5, "tags": ["a", None, True, 1]}
+    db.store_run(db_session, run_dict, uid, project, iter=iteration)
+    run = db._get_run(db_session, uid, project, iteration)
+    assert run.body[:1] != pickle.PROTO
+
+
 def _change_run_record_to_before_align_runs_migration(run, time_before_creation):
     run_dict = run.struct
 
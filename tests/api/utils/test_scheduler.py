@@ -1062,6 +1062,12 @@ async def test_schedule_job_concurrency_limit(
     else:
         assert call_counter == run_amount
 
+    # jobs are skipped by the active runs count, local functions by the scheduler max instances
+    metrics = scheduler.get_metrics()
+    assert metrics.triggered + metrics.skipped_max_instances == 4
+    assert metrics.triggered - metrics.skipped_concurrency_limit == run_amount
+    assert 0 <= metrics.mean_trigger_lag_seconds <= metrics.max_trigger_lag_seconds
+
 
 def _assert_schedule_get_and_list_credentials_enrichment(
     db: Session,
@@ -0,0 +1,78 @@
+# micro benchmarks of the ModelObj serialization and copy, over representative objects. the timings are logged (run
+# with -s to see them) to track regressions, the assertions only verify the benchmarked operations results
+import timeit
+
+import pytest
+
+import mlrun
+import mlrun.feature_store as fstore
+from mlrun.utils import logger
+
+iterations = 200
+
+
+def _run_object():
+    run = mlrun.new_task(
+        name="run-name",
+        project="project-name",
+        params={"p1": 1, "p2": [1, 2, 3], "p3": {"k": "v"}},
+        inputs={"in1": "s3://bucket/path1", "in2": "s3://bucket/path2"},
+        outputs=["model", "accuracy"],
+        handler="handler",
+    ).with_hyper_params({"lr": [0.1, 0.01, 0.001]}, selector="max.accuracy")
+    run = mlrun.RunObject.from_template(run)
+    run.status.results = {"accuracy": 0.9, "loss": 0.1}
+    run.status.artifacts = [{"key": f"artifact{index}"} for index in range(10)]
+    return run
+
+
+def _feature_set():
+    feature_set = fstore.FeatureSet(
+        "stocks", entities=[fstore.Entity("ticker")], timestamp_key="time"
+    )
+    for index in range(50):
+        feature_set.add_feature(fstore.Feature(name=f"feature{index}"))
+    feature_set.graph.to("storey.Extend", _fn="({'extra': 1})").to(
+        "storey.Filter", "filter", _fn="(event['bid'] > 50)"
+    )
+    feature_set.add_aggregation("bid", ["min", "max"], ["1h", "1d"], "10m")
+    return feature_set
+
+
+def _serving_function():
+    function = mlrun.new_function("serving", kind="serving", image="mlrun/mlrun")
+    graph = function.set_topology("flow")
+    step = graph.to(name="pre", handler="json.dumps")
+    for index in range(10):
+        step = step.to(name=f"step{index}", handler="json.dumps")
+    step.to("$queue", "q1", path="").to(name="post", handler="json.dumps")
+    return function
+
+
+@pytest.mark.parametrize(
+    "name, create_object",
+    [
+        ("run", _run_object),
+        ("feature-set", _feature_set),
+        ("serving-function", _serving_function),
+    ],
+)
+def test_model_obj_serialization(name, create_object):
+    obj = create_object()
+    struct = obj.to_dict()
+    assert obj.from_dict(struct).to_dict() == struct
+    assert obj.copy().to_dict() == struct
+
+    timings = {
+        "to_dict": timeit.timeit(obj.to_dict, number=iterations),
+        "from_dict": timeit.timeit(lambda: obj.from_dict(struct), number=iterations),
+        "copy": timeit.timeit(obj.copy, number=iterations),
+    }
+    logger.info(
+        "ModelObj serialization benchmark (microseconds per operation)",
+        object=name,
+        **{
+            operation: round(timing / iterations * 1e6, 1)
+            for operation, timing in timings.items()
+        },
+    )
@@ -1,12 +1,15 @@
 import unittest.mock
 
 import deepdiff
+import numpy as np
 import pandas as pd
 import pytest
 
 import mlrun
 import mlrun.feature_store as fs
 from mlrun.data_types import InferOptions
+from mlrun.data_types.infer import get_df_stats
+from mlrun.data_types.stats import StatsAccumulator
 from mlrun.datastore.targets import ParquetTarget
 from mlrun.feature_store import Entity
 from mlrun.feature_store.api import _infer_from_static_df
@@ -182,3 +185,68 @@ def test_check_timestamp_key_is_entity():
         fs.FeatureSet(
             "imp1", entities=[Entity("time_stamp")], timestamp_key="time_stamp"
         )
+
+
+def test_stats_accumulator():
+    df = pd.read_csv(this_dir + "testdata.csv", parse_dates=["timestamp"])
+    df.set_index("patient_id", inplace=True)
+    expected = get_df_stats(df, InferOptions.default())
+
+    # accumulate the chunks in two (e.g. per process) accumulators and merge them
+    stats = StatsAccumulator(InferOptions.default(), percentiles=[0.5])
+    other = stats.new()
+    for start in range(0, len(df), 7):
+        (stats if start % 2 else other).update(df.iloc[start : start + 7])
+    result = stats.merge(other).get_stats()
+
+    assert result.keys() == expected.keys()
+    for column, column_stats in expected.items():
+        hist = column_stats.pop("hist", None)
+        result_hist = result[column].pop("hist", None)
+        median = result[column].pop("50%", None)
+        assert result[column].keys() == column_stats.keys()
+        value_freq = column_stats.get("freq")
+        for stat, value in column_stats.items():
+            if stat == "top":
+                # any of the most frequent values (with the same freq)
+                values = df.reset_index()[column].astype(str)
+                assert (values == str(result[column][stat])).sum() == value_freq
+            elif isinstance(value, float):
+                assert result[column][stat] == pytest.approx(value), column
+            elif stat == "mean":
+                # the datetime mean is calculated in float (ns) precision
+                difference = pd.Timestamp(result[column][stat]) - pd.Timestamp(value)
+                assert abs(difference) < pd.Timedelta("1us")
+            else:
+                assert result[column][stat] == value, column
+        if hist:
+            assert result_hist[1] == pytest.approx(hist[1])
+            assert sum(result_hist[0]) == sum(hist[0])
+        if median is not None and column != "timestamp":
+            assert median == pytest.approx(df[column].median())
+
+
+def test_stats_accumulator_sketches():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(
+        {
+            "value": rng.normal(size=50000),
+            "id": rng.integers(0, 20000, size=50000).astype(str),
+        }
+    )
+    stats = StatsAccumulator(percentiles=[0.25, 0.75], max_top_values=1000)
+    for start in range(0, len(df), 4000):
+        stats.update(df.iloc[start : start + 4000])
+    result = stats.get_stats()
+
+    value_stats = result["value"]
+    for percentile in [0.25, 0.75]:
+        assert value_stats[f"{percentile * 100:g}%"] == pytest.approx(
+            df["value"].quantile(percentile), abs=0.05
+        )
+    expected_hist, _ = np.histogram(df["value"], bins=20)
+    assert np.abs(np.array(value_stats["hist"][0]) - expected_hist).max() < 0.01 * len(
+        df
+    )
+    assert result["id"]["count"] == len(df)
+    assert result["id"]["unique"] == pytest.approx(df["id"].nunique(), rel=0.05)
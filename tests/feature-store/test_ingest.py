@@ -1,11 +1,15 @@
 import unittest.mock
+from datetime import datetime
 
 import pandas as pd
 import pytest
+import storey
 
 import mlrun
 import mlrun.feature_store as fs
-from mlrun.datastore.targets import DFTarget
+from mlrun.data_types.data_types import InferOptions
+from mlrun.datastore.sources import CSVSource, ParquetSource, SQLSource
+from mlrun.datastore.targets import DFTarget, ParquetTarget
 
 
 def test_columns_with_illegal_characters(rundb_mock):
@@ -49,3 +53,316 @@ def test_columns_with_illegal_characters_error():
 
     with pytest.raises(mlrun.errors.MLRunInvalidArgumentError):
         fs.ingest(fset, df)
+
+
+def _double_amount(df):
+    df["amount"] = df["amount"] * 2
+    return df
+
+
+@pytest.mark.parametrize("processes", [1, 3])
+def test_ingest_chunks_in_processes(rundb_mock, monkeypatch, tmp_path, processes):
+    monkeypatch.setattr(mlrun.mlconf.feature_store, "ingestion_processes", processes)
+    df = pd.DataFrame({"key": range(100), "amount": range(100)})
+    df.to_csv(tmp_path / "source.csv", index=False)
+
+    fset = fs.FeatureSet("chunks", entities=[fs.Entity("key")], engine="pandas")
+    fset._run_db = rundb_mock
+    fset.reload = unittest.mock.Mock()
+    fset.save = unittest.mock.Mock()
+    fset.purge_targets = unittest.mock.Mock()
+    fset.graph.to(name="double", handler="_double_amount")
+
+    source = CSVSource(
+        "mycsv", path=str(tmp_path / "source.csv"), attributes={"chunksize": 30}
+    )
+    target = ParquetTarget(path=f"{tmp_path}/target/")
+    result_df = fs.ingest(
+        fset, source, targets=[target], infer_options=InferOptions.Null
+    )
+
+    # only the first chunk is returned
+    assert list(result_df["amount"]) == [value * 2 for value in range(30)]
+    # the chunks are written under the target run id directory
+    chunk_paths = sorted(
+        path for path in (tmp_path / "target").rglob("*") if path.is_file()
+    )
+    assert [path.name for path in chunk_paths] == ["0001", "0002", "0003", "0004"]
+    written_df = pd.concat([pd.read_parquet(path) for path in chunk_paths])
+    assert list(written_df.index) == list(range(100))
+    assert list(written_df["amount"]) == [value * 2 for value in range(100)]
+    assert fset.status.targets[target.name].size == sum(
+        path.stat().st_size for path in chunk_paths
+    )
+
+
+@pytest.mark.parametrize("processes", [1, 3])
+def test_ingest_chunked_source_stats(rundb_mock, monkeypatch, tmp_path, processes):
+    monkeypatch.setattr(mlrun.mlconf.feature_store, "ingestion_processes", processes)
+    df = pd.DataFrame({"key": range(100), "amount": range(100)})
+    df.to_csv(tmp_path / "source.csv", index=False)
+
+    fset = fs.FeatureSet("chunks", entities=[fs.Entity("key")], engine="pandas")
+    fset._run_db = rundb_mock
+    fset.reload = unittest.mock.Mock()
+    fset.save = unittest.mock.Mock()
+    fset.purge_targets = unittest.mock.Mock()
+    fset.graph.to(name="double", handler="_double_amount")
+
+    source = CSVSource(
+        "mycsv", path=str(tmp_path / "source.csv"), attributes={"chunksize": 30}
+    )
+    fs.ingest(fset, source, targets=[ParquetTarget(path=f"{tmp_path}/target/")])
+
+    # the stats cover all the chunks (not only the returned first chunk)
+    stats = fset.status.stats["amount"]
+    assert stats["count"] == 100
+    assert stats["min"] == 0 and stats["max"] == 198
+    assert stats["mean"] == pytest.approx(99)
+    assert sum(stats["hist"][0]) == 100
+
+
+def _write_partitioned_parquet(path):
+    df = pd.DataFrame(
+        {
+            "key": range(96),
+            "amount": range(96),
+            "time": pd.date_range("2021-01-01", periods=96, freq="H"),
+        }
+    )
+    df["year"] = df["time"].dt.year
+    df["month"] = df["time"].dt.month
+    df["day"] = df["time"].dt.day
+    df.to_parquet(path, partition_cols=["year", "month", "day"], index=False)
+    return df
+
+
+@pytest.mark.parametrize("chunksize", [None, 10])
+def test_parquet_source_time_filter(tmp_path, chunksize):
+    _write_partitioned_parquet(tmp_path / "source")
+    source = ParquetSource(
+        "myparquet",
+        path=str(tmp_path / "source"),
+        time_field="time",
+        start_time="2021-01-02 12:00:00",
+        end_time="2021-01-03 12:00:00",
+        attributes={"chunksize": chunksize} if chunksize else {},
+    )
+    assert source.is_iterator() == bool(chunksize)
+
+    if chunksize:
+        chunks = list(source.to_dataframe())
+        assert all(len(chunk) <= chunksize for chunk in chunks)
+        df = pd.concat(chunks)
+    else:
+        df = source.to_dataframe()
+    # the days outside the time range are pruned, the rows outside it are filtered (start_time < time <= end_time)
+    assert sorted(df["key"]) == list(range(37, 61))
+
+
+def test_parquet_source_chunks_reader_args(tmp_path):
+    _write_partitioned_parquet(tmp_path / "source")
+    source = ParquetSource(
+        "myparquet",
+        path=str(tmp_path / "source"),
+        attributes={
+            "chunksize": 30,
+            "reader_args": {
+                "columns": ["key", "amount"],
+                "filters": [("day", "in", [1, 4]), ("amount", "<", 80)],
+            },
+        },
+    )
+    df = pd.concat(source.to_dataframe())
+    assert list(df.columns) == ["key", "amount"]
+    assert sorted(df["key"]) == list(range(24)) + list(range(72, 80))
+
+    source = ParquetSource(
+        "myparquet", path=str(tmp_path / "source"), end_time="2021-01-02"
+    )
+    with pytest.raises(mlrun.errors.MLRunInvalidArgumentError):
+        source.to_dataframe()
+
+
+def test_ingest_chunked_parquet_source(rundb_mock, tmp_path):
+    _write_partitioned_parquet(tmp_path / "source")
+    fset = fs.FeatureSet("chunks", entities=[fs.Entity("key")], engine="pandas")
+    fset._run_db = rundb_mock
+    fset.reload = unittest.mock.Mock()
+    fset.save = unittest.mock.Mock()
+    fset.purge_targets = unittest.mock.Mock()
+    fset.graph.to(name="double", handler="_double_amount")
+
+    source = ParquetSource(
+        "myparquet",
+        path=str(tmp_path / "source"),
+        time_field="time",
+        start_time="2021-01-03",
+        attributes={"chunksize": 20},
+    )
+    target = ParquetTarget(path=f"{tmp_path}/target/")
+    fs.ingest(fset, source, targets=[target], infer_options=InferOptions.Null)
+
+    chunk_paths = sorted(
+        path for path in (tmp_path / "target").rglob("*") if path.is_file()
+    )
+    written_df = pd.concat([pd.read_parquet(path) for path in chunk_paths])
+    assert sorted(written_df["key"]) == list(range(49, 96))
+    assert sorted(written_df["amount"]) == [value * 2 for value in range(49, 96)]
+
+
+@pytest.fixture
+def sql_source_db(tmp_path):
+    import sqlalchemy
+
+    db_url = f"sqlite:///{tmp_path / 'source.db'}"
+    df = pd.DataFrame(
+        {
+            "key": range(100),
+            "amount": range(100),
+            "time": pd.date_range("2021-01-01", periods=100, freq="H"),
+        }
+    )
+    df.to_sql("transactions", sqlalchemy.create_engine(db_url), index=False)
+    return db_url
+
+
+@pytest.mark.parametrize("chunksize", [None, 15])
+@pytest.mark.parametrize("key_ranges", [None, 1, 3])
+def test_sql_source(sql_source_db, chunksize, key_ranges):
+    source = SQLSource(
+        "mysql",
+        table_name="transactions",
+        db_url=sql_source_db,
+        key_field="key",
+        time_field="time",
+        start_time="2021-01-01 09:00:00",
+        end_time=datetime(2021, 1, 3, 9),
+        chunksize=chunksize,
+        key_ranges=key_ranges,
+    )
+    assert source.is_iterator() == bool(chunksize)
+
+    if chunksize:
+        chunks = list(source.to_dataframe())
+        assert all(len(chunk) <= chunksize for chunk in chunks)
+        df = pd.concat(chunks)
+    else:
+        df = source.to_dataframe()
+    # the time range is pushed down to the query (start_time < time <= end_time), the key ranges chunks are
+    # returned as they are read
+    assert sorted(df["key"]) == list(range(10, 58))
+    assert sorted(df["amount"]) == list(range(10, 58))
+
+
+def test_sql_source_query(sql_source_db, monkeypatch):
+    monkeypatch.setenv("SQL_DB_URL", sql_source_db)
+    source = SQLSource(
+        "mysql",
+        query="SELECT key, amount * 2 AS amount FROM transactions WHERE amount < 30",
+        key_field="key",
+        chunksize=10,
+        key_ranges=2,
+        workers=1,
+    )
+    df = pd.concat(source.to_dataframe())
+    assert list(df.columns) == ["key", "amount"]
+    assert list(df["amount"]) == [value * 2 for value in range(30)]
+
+    source = SQLSource.from_dict(source.to_dict())
+    assert source.attributes["key_ranges"] == 2
+    assert len(source.to_dataframe().__next__()) == 10
+
+    with pytest.raises(mlrun.errors.MLRunInvalidArgumentError):
+        SQLSource("mysql", table_name="transactions", query="SELECT 1")
+    monkeypatch.delenv("SQL_DB_URL")
+    with pytest.raises(mlrun.errors.MLRunInvalidArgumentError):
+        SQLSource("mysql", table_name="transactions").to_dataframe()
+
+
+def test_sql_source_key_ranges_stop(sql_source_db):
+    source = SQLSource(
+        "mysql",
+        table_name="transactions",
+        db_url=sql_source_db,
+        key_field="key",
+        chunksize=2,
+        key_ranges=10,
+    )
+    read = unittest.mock.Mock(side_effect=source._read)
+    source._read = read
+    chunks = source.to_dataframe()
+    assert len(next(chunks)) == 2
+    # the readers (blocked on the bounded chunks queue) are stopped when the iteration stops, and the key ranges
+    # which weren't started are not read
+    chunks.close()
+    assert read.call_count <= SQLSource._default_workers
+
+    # a failed key range stops the reading of the other key ranges
+    read.reset_mock()
+    read.side_effect = RuntimeError("read failed")
+    source.attributes["workers"] = 1
+    with pytest.raises(RuntimeError):
+        list(source.to_dataframe())
+    assert read.call_count == 1
+    del source._read
+    del source.attributes["workers"]
+
+    source.attributes["chunksize"] = 200
+    chunks = list(source.to_dataframe())
+    assert len(chunks) == 10
+    assert sorted(pd.concat(chunks)["key"]) == list(range(100))
+
+
+def test_ingest_sql_source(rundb_mock, sql_source_db, tmp_path):
+    fset = fs.FeatureSet("sql", entities=[fs.Entity("key")], engine="pandas")
+    fset._run_db = rundb_mock
+    fset.reload = unittest.mock.Mock()
+    fset.save = unittest.mock.Mock()
+    fset.purge_targets = unittest.mock.Mock()
+    fset.graph.to(name="double", handler="_double_amount")
+
+    source = SQLSource(
+        "mysql",
+        table_name="transactions",
+        db_url=sql_source_db,
+        time_field="time",
+        start_time="2021-01-04",
+        chunksize=10,
+        key_ranges=2,
+        range_field="amount",
+    )
+    fs.ingest(
+        fset,
+        source,
+        targets=[ParquetTarget(path=f"{tmp_path}/target/")],
+        infer_options=InferOptions.Null,
+    )
+
+    chunk_paths = sorted(
+        path for path in (tmp_path / "target").rglob("*") if path.is_file()
+    )
+    written_df = pd.concat([pd.read_parquet(path) for path in chunk_paths])
+    assert sorted(written_df["key"]) == list(range(73, 100))
+    assert sorted(written_df["amount"]) == [value * 2 for value in range(73, 100)]
+
+
+def append(events, event):
+    events.append(event)
+    return events
+
+
+def test_sql_source_to_step(sql_source_db):
+    source = SQLSource(
+        "mysql",
+        table_name="transactions",
+        db_url=sql_source_db,
+        key_field="key",
+        time_field="time",
+        end_time="2021-01-01 04:00:00",
+        chunksize=2,
+    )
+    step = source.to_step()
+    step.to(storey.Reduce([], append))
+    events = step.run().await_termination()
+    assert [event["key"] for event in events] == list(range(5))
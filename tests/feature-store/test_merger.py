@@ -0,0 +1,368 @@
+import unittest.mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import mlrun
+import mlrun.feature_store as fs
+from mlrun.datastore.targets import CSVTarget, ParquetTarget
+from mlrun.model import DataTarget
+from mlrun.feature_store.retrieval.base import BaseMerger
+from mlrun.feature_store.retrieval.local_merger import LocalFeatureMerger
+
+
+def _featureset(name, entities, timestamp_key="time"):
+    return fs.FeatureSet(
+        name,
+        entities=[fs.Entity(entity) for entity in entities],
+        timestamp_key=timestamp_key,
+    )
+
+
+def _random_times(rng, size):
+    start = pd.Timestamp("2021-01-01").value
+    return pd.to_datetime(rng.integers(start, start + 10**12, size=size)).floor("us")
+
+
+def _merge_inputs(entity_index=None, users_index=None):
+    rng = np.random.default_rng(42)
+    entities = pd.DataFrame(
+        {
+            "user": rng.integers(0, 20, size=200),
+            "time": _random_times(rng, 200).astype(str),
+        }
+    )
+    if entity_index is not None:
+        entities.index = entity_index(entities)
+
+    # every user has a (first) city, so the cities can be joined by the city column
+    users = pd.DataFrame(
+        {
+            "user": np.concatenate([np.arange(20), rng.integers(0, 20, size=80)]),
+            "time": pd.to_datetime(["2020-01-01"] * 20).append(_random_times(rng, 80)),
+            "age": rng.integers(18, 80, size=100),
+            "city": rng.integers(0, 5, size=100),
+        }
+    )
+    users = users.set_index(users_index) if users_index is not None else users
+    cities = pd.DataFrame(
+        {
+            "city": rng.integers(0, 5, size=50),
+            "time": _random_times(rng, 50),
+            "population": rng.random(size=50),
+            "capital": rng.random(size=50) > 0.5,
+        }
+    )
+    purchases = pd.DataFrame(
+        {
+            "user": rng.integers(0, 25, size=300),
+            "time": _random_times(rng, 300),
+            "amount": rng.integers(0, 1000, size=300),
+        }
+    )
+
+    featuresets = [
+        _featureset("users", ["user"]),
+        _featureset("cities", ["city"]),
+        _featureset("purchases", ["user"]),
+    ]
+    return entities, featuresets, [users, cities, purchases]
+
+
+def _merge(merger_class, entities, featuresets, dfs):
+    merger = merger_class(vector=None)
+    merger.merge(entities, "time", list(featuresets), [df.copy() for df in dfs])
+    return merger._result_df
+
+
+@pytest.mark.parametrize(
+    "entity_index, users_index",
+    [
+        (None, "user"),
+        (lambda df: df.index + 7, "user"),
+        (lambda df: pd.Index(df.index, name="row"), "user"),
+        # unnamed (non range) feature set index
+        (None, np.arange(1000, 1100)),
+    ],
+)
+def test_single_pass_asof_merge(entity_index, users_index):
+    entities, featuresets, dfs = _merge_inputs(entity_index, users_index)
+    merger = LocalFeatureMerger(vector=None)
+    assert (
+        merger._single_pass_asof_merge(
+            entities, "time", list(featuresets), [df.copy() for df in dfs]
+        )
+        is not None
+    )
+
+    result = _merge(LocalFeatureMerger, entities, featuresets, dfs)
+    expected = _merge(
+        type("ChainedMerger", (LocalFeatureMerger,), {"merge": BaseMerger.merge}),
+        entities,
+        featuresets,
+        dfs,
+    )
+    sort_by = ["time", "user"] + (["row"] if "row" in expected.columns else [])
+    pd.testing.assert_frame_equal(
+        result.sort_values(sort_by).reset_index(drop=True),
+        expected.sort_values(sort_by).reset_index(drop=True),
+    )
+
+
+def test_single_pass_asof_merge_fallback():
+    entities, featuresets, dfs = _merge_inputs(users_index="user")
+    merger = LocalFeatureMerger(vector=None)
+
+    # overlapping feature columns are suffixed by the chained merge
+    overlapping = dfs[1].rename(columns={"population": "age"})
+    assert (
+        merger._single_pass_asof_merge(
+            entities, "time", featuresets[:2], [dfs[0], overlapping]
+        )
+        is None
+    )
+    # feature sets without a timestamp key are joined (not as-of joined)
+    no_timestamp = [featuresets[0], _featureset("cities", ["city"], timestamp_key=None)]
+    assert (
+        merger._single_pass_asof_merge(entities, "time", no_timestamp, dfs[:2]) is None
+    )
+
+
+def _offline_vector(tmp_path, kind):
+    entities, featuresets, dfs = _merge_inputs()
+    fields = {
+        "users": [("age", None), ("city", None)],
+        "cities": [("population", None), ("capital", "is_capital")],
+        "purchases": [("amount", None)],
+    }
+    for featureset, df in zip(featuresets, dfs):
+        path = str(tmp_path / f"{featureset.metadata.name}.{kind}")
+        df = df.set_index(list(featureset.spec.entities.keys()))
+        if kind == "parquet":
+            df.to_parquet(path)
+        else:
+            df.to_csv(path)
+        featureset.status.targets = [DataTarget(kind, name=kind, path=path)]
+
+    vector = fs.FeatureVector(features=[])
+    vector.parse_features = lambda **kwargs: (
+        {featureset.metadata.name: featureset for featureset in featuresets},
+        fields,
+    )
+    return vector, entities
+
+
+def _sorted(df):
+    df = df.reset_index()
+    df["time"] = pd.to_datetime(df["time"])
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+@pytest.mark.parametrize(
+    "chunk_by, featureset_kind, target_class",
+    [
+        ("time", "parquet", ParquetTarget),
+        ("time", "csv", CSVTarget),
+        ("key", "parquet", ParquetTarget),
+        ("key", "csv", CSVTarget),
+    ],
+)
+def test_chunked_offline_features(tmp_path, chunk_by, featureset_kind, target_class):
+    vector, entities = _offline_vector(tmp_path, featureset_kind)
+    expected = (
+        LocalFeatureMerger(vector)
+        .start(entities, "time", with_indexes=True)
+        .to_dataframe()
+    )
+
+    target = target_class(path=str(tmp_path / f"vector{target_class.suffix}"))
+    merger = LocalFeatureMerger(vector, chunk_size=30, chunk_by=chunk_by)
+    with unittest.mock.patch.object(
+        fs.FeatureSet,
+        "to_dataframe",
+        autospec=True,
+        side_effect=fs.FeatureSet.to_dataframe,
+    ) as to_dataframe:
+        result = merger.start(entities, "time", target=target, with_indexes=True)
+
+    assert len(merger._chunk_paths) > 3
+    if featureset_kind == "csv":
+        # the targets which can't be filtered while reading are read once (not per chunk)
+        assert to_dataframe.call_count == 3
+    assert all(
+        path.startswith(str(tmp_path / "vector")) for path in merger._chunk_paths
+    )
+    pd.testing.assert_frame_equal(
+        _sorted(result.to_dataframe()), _sorted(expected), check_dtype=False
+    )
+
+
+def test_chunked_offline_features_with_time_range(tmp_path):
+    vector, entities = _offline_vector(tmp_path, "parquet")
+    start_time, end_time = pd.Timestamp("2019-12-31"), pd.Timestamp("2021-01-09")
+    expected = (
+        LocalFeatureMerger(vector)
+        .start(
+            entities,
+            "time",
+            start_time=start_time,
+            end_time=end_time,
+            with_indexes=True,
+        )
+        .to_dataframe()
+    )
+
+    merger = LocalFeatureMerger(vector, chunk_size=50)
+    result = merger.start(
+        entities,
+        "time",
+        target=ParquetTarget(path=str(tmp_path / "vector.parquet")),
+        start_time=start_time,
+        end_time=end_time,
+        with_indexes=True,
+    )
+    pd.testing.assert_frame_equal(_sorted(result.to_dataframe()), _sorted(expected))
+
+
+def test_chunked_offline_features_validation(tmp_path):
+    vector, entities = _offline_vector(tmp_path, "parquet")
+    target = ParquetTarget(path=str(tmp_path / "vector.parquet"))
+    for engine_args, kwargs in [
+        ({"chunk_by": "day"}, {"target": target}),
+        ({}, {"target": None}),
+        ({}, {"target": ParquetTarget(path=str(tmp_path), partitioned=True)}),
+        ({}, {"target": target, "entity_rows": None}),
+    ]:
+        kwargs = {"entity_rows": entities, **kwargs}
+        merger = LocalFeatureMerger(vector, chunk_size=50, **engine_args)
+        with pytest.raises(mlrun.errors.MLRunInvalidArgumentError):
+            merger.start(entity_timestamp_column="time", **kwargs)
+
+
+@pytest.mark.parametrize("engine_args", [{"read_workers": 1}, {}, {"chunk_size": 50}])
+def test_offline_features_read_timings(tmp_path, engine_args):
+    vector, entities = _offline_vector(tmp_path, "parquet")
+    target = ParquetTarget(path=str(tmp_path / "vector.parquet"))
+    expected = (
+        LocalFeatureMerger(vector, read_workers=1)
+        .start(entities, "time", with_indexes=True)
+        .to_dataframe()
+    )
+
+    result = LocalFeatureMerger(vector, **engine_args).start(
+        entities, "time", target=target, with_indexes=True
+    )
+    assert set(result.read_timings.keys()) == {"users", "cities", "purchases"}
+    assert all(seconds > 0 for seconds in result.read_timings.values())
+    pd.testing.assert_frame_equal(_sorted(result.to_dataframe()), _sorted(expected))
+
+
+def _set_watermark(vector, watermark):
+    feature_set_objects, _ = vector.parse_features()
+    for featureset in feature_set_objects.values():
+        featureset.status.targets["parquet"].last_written = watermark
+
+
+def _read_chunks(path):
+    return pd.concat(
+        [pd.read_parquet(chunk) for chunk in sorted(path.glob("*.parquet"))],
+        ignore_index=True,
+    )
+
+
+@pytest.mark.parametrize("with_entity_rows", [True, False])
+def test_incremental_offline_features(tmp_path, with_entity_rows):
+    vector, entities = _offline_vector(tmp_path, "parquet")
+    vector.metadata.name = "vector"
+    vector.save = unittest.mock.Mock()
+    entity_rows = entities if with_entity_rows else None
+    watermarks = [
+        pd.Timestamp("2021-01-01 00:05:00"),
+        pd.Timestamp("2021-01-01 00:11:00"),
+    ]
+
+    for watermark in watermarks:
+        _set_watermark(vector, watermark.to_pydatetime())
+        result = LocalFeatureMerger(vector).start(
+            entity_rows,
+            "time" if with_entity_rows else None,
+            target=ParquetTarget(path=str(tmp_path / "vector.parquet")),
+            with_indexes=True,
+            incremental=True,
+        )
+        target_status = vector.status.targets["parquet"]
+        assert pd.Timestamp(target_status.last_written) == watermark
+        assert target_status.watermarks == {
+            "users": watermark.isoformat(),
+            "cities": watermark.isoformat(),
+            "purchases": watermark.isoformat(),
+        }
+    # the response holds the rows appended by the last run
+    appended = result.to_dataframe().reset_index()
+    assert (pd.to_datetime(appended["time"]) > watermarks[0]).all()
+    assert len(list((tmp_path / "vector").glob("*.parquet"))) == 2
+    assert len(list((tmp_path / "vector" / "_state").glob("*.parquet"))) == (
+        3 if with_entity_rows else 2
+    )
+
+    expected = (
+        LocalFeatureMerger(vector)
+        .start(entity_rows, "time" if with_entity_rows else None, with_indexes=True)
+        .to_dataframe()
+    )
+    expected = expected[pd.to_datetime(expected["time"]) <= watermarks[-1]]
+    pd.testing.assert_frame_equal(
+        _sorted(_read_chunks(tmp_path / "vector").set_index(["user", "city"])),
+        _sorted(expected),
+    )
+
+    # no new feature set data, nothing is appended
+    result = LocalFeatureMerger(vector).start(
+        entity_rows,
+        "time" if with_entity_rows else None,
+        target=ParquetTarget(path=str(tmp_path / "vector.parquet")),
+        with_indexes=True,
+        incremental=True,
+    )
+    assert result.to_dataframe().empty
+    assert len(list((tmp_path / "vector").glob("*.parquet"))) == 2
+
+
+def test_incremental_offline_features_rewrites_target(tmp_path):
+    vector, entities = _offline_vector(tmp_path, "parquet")
+    vector.metadata.name = "vector"
+    vector.save = unittest.mock.Mock()
+    watermark = pd.Timestamp("2021-01-01 00:05:00")
+    _set_watermark(vector, watermark.to_pydatetime())
+
+    # a non-incremental run writes a single file, its last_written is not a data watermark
+    LocalFeatureMerger(vector).start(
+        entities,
+        "time",
+        target=ParquetTarget(path=str(tmp_path / "vector.parquet")),
+        with_indexes=True,
+    )
+    vector.status.targets["parquet"].last_written = "2021-01-01T00:11:00"
+    assert (tmp_path / "vector.parquet").exists()
+
+    LocalFeatureMerger(vector).start(
+        entities,
+        "time",
+        target=ParquetTarget(path=str(tmp_path / "vector.parquet")),
+        with_indexes=True,
+        incremental=True,
+    )
+    # the target is rewritten (as chunks) up to the feature sets watermark
+    assert not (tmp_path / "vector.parquet").exists()
+    assert pd.Timestamp(vector.status.targets["parquet"].last_written) == watermark
+    expected = (
+        LocalFeatureMerger(vector)
+        .start(entities, "time", with_indexes=True)
+        .to_dataframe()
+    )
+    expected = expected[pd.to_datetime(expected["time"]) <= watermark]
+    pd.testing.assert_frame_equal(
+        _sorted(_read_chunks(tmp_path / "vector").set_index(["user", "city"])),
+        _sorted(expected),
+    )
@@ -0,0 +1,208 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+from storey import SyncEmitSource, Table
+from storey.drivers import NoopDriver
+
+import mlrun
+import mlrun.feature_store as fs
+from mlrun.datastore.store_resources import ResourceCache
+from mlrun.feature_store.retrieval.online import (
+    OnlineFeatureCache,
+    _build_feature_vector_graph,
+)
+from mlrun.features import Feature
+from mlrun.serving.server import create_graph_server
+
+stocks = {
+    "GOOG": {"price": 720.5, "volume": 10},
+    "MSFT": {"price": 51.95, "volume": math.nan},
+    "AAPL": {"price": math.inf, "volume": 5},
+}
+
+
+def _online_service(impute_policy=None, cache_size=None, cache_ttl=None):
+    fset = fs.FeatureSet("stocks", entities=[fs.Entity("ticker")])
+    vector = fs.FeatureVector("stocks-vec", ["stocks.*"])
+    for name in ["price", "volume"]:
+        vector.status.features[name] = Feature(name=name)
+    vector.status.stats = {
+        "price": {"mean": 100.0},
+        "volume": {"mean": 7.0},
+    }
+
+    feature_set_fields = {"stocks": [("price", None), ("volume", None)]}
+    graph = _build_feature_vector_graph(
+        vector,
+        feature_set_fields,
+        {"stocks": fset},
+        fs.FixedWindowType.LastClosedWindow,
+    )
+    graph.set_flow_source(SyncEmitSource())
+    server = create_graph_server(graph=graph, parameters={})
+
+    table = Table("", NoopDriver())
+    for key, values in stocks.items():
+        table[key] = values
+    cache = ResourceCache()
+    cache.cache_table(fset.uri, table)
+    server.init_states(context=None, namespace=None, resource_cache=cache)
+    server.init_object(None)
+
+    cache = None
+    if cache_size:
+        cache = OnlineFeatureCache(
+            {"stocks": fset}, feature_set_fields, cache_size, ttl=cache_ttl
+        )
+    service = fs.OnlineVectorService(
+        vector, graph, ["ticker"], impute_policy=impute_policy, cache=cache
+    )
+    service.initialize()
+    return service, table
+
+
+def test_get_batch():
+    service, _ = _online_service()
+    with service:
+        entities = [["GOOG"], ["MSFT"], ["NONE"], ["GOOG"]]
+        df = service.get_batch(entities)
+        rows = service.get(entities)
+
+    assert list(df.columns) == ["price", "volume"]
+    assert len(df) == 4
+    assert df.loc[0].to_dict() == rows[0]
+    assert df.loc[3].to_dict() == rows[3]
+    assert df.loc[1, "price"] == rows[1]["price"]
+    assert np.isnan(df.loc[1, "volume"])
+    assert rows[2] is None
+    assert df.loc[2].isna().all()
+
+
+def test_get_batch_dataframe_input_as_list():
+    service, _ = _online_service()
+    with service:
+        entities = pd.DataFrame({"ticker": ["MSFT", "GOOG", "MSFT"]})
+        result = service.get_batch(entities, as_list=True)
+
+    assert isinstance(result, np.ndarray)
+    assert result.shape == (3, 2)
+    assert result[1].tolist() == [720.5, 10]
+    assert result[0][0] == result[2][0] == 51.95
+
+
+def test_get_batch_impute():
+    policy = {"*": "$mean", "price": 0}
+    service, _ = _online_service(impute_policy=policy)
+    with service:
+        entities = [{"ticker": "MSFT"}, {"ticker": "AAPL"}, {"ticker": "NONE"}]
+        df = service.get_batch(entities)
+        rows = service.get(entities)
+
+    assert df.loc[0].to_dict() == rows[0] == {"price": 51.95, "volume": 7.0}
+    assert df.loc[1].to_dict() == rows[1] == {"price": 0, "volume": 5}
+    assert df.loc[2].isna().all()
+
+
+def test_get_batch_invalid_input():
+    service, _ = _online_service()
+    with service:
+        with pytest.raises(mlrun.errors.MLRunInvalidArgumentError):
+            service.get_batch([["GOOG", "extra"]])
+        with pytest.raises(mlrun.errors.MLRunInvalidArgumentError):
+            service.get_batch(pd.DataFrame({"ticker": []}))
+
+
+def test_online_cache():
+    service, table = _online_service(cache_size=10)
+    with service:
+        assert service.get([["GOOG"], ["MSFT"]])[0] == stocks["GOOG"]
+        assert service.get_cache_stats()["feature_sets"]["stocks"] == {
+            "hits": 0,
+            "misses": 2,
+        }
+
+        # cached entities are not read from the table again
+        table["GOOG"] = {"price": 800.0, "volume": 20}
+        assert service.get([["GOOG"]]) == [stocks["GOOG"]]
+        df = service.get_batch([["GOOG"], ["MSFT"], ["GOOG"]])
+        assert df["price"].tolist()[0] == df["price"].tolist()[2] == 720.5
+        stats = service.get_cache_stats()
+        assert stats["feature_sets"]["stocks"] == {"hits": 3, "misses": 2}
+        assert stats["size"] == 2
+
+        service.invalidate_cache("stocks", "GOOG")
+        assert service.get([["GOOG"]]) == [{"price": 800.0, "volume": 20}]
+        service.invalidate_cache()
+        assert service.get_cache_stats()["size"] == 0
+
+
+def test_online_cache_eviction_and_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(
+        mlrun.feature_store.retrieval.online.time, "monotonic", lambda: clock[0]
+    )
+    service, _ = _online_service(cache_size=2, cache_ttl={"stocks": 10})
+    with service:
+        service.get([["GOOG"], ["MSFT"]])
+        service.get([["GOOG"]])
+        service.get([["AAPL"]])
+        stats = service.get_cache_stats()
+        assert stats["size"] == 2
+        assert stats["evictions"] == 1
+
+        # MSFT was the least recently used entry
+        service.get([["MSFT"]])
+        assert service.get_cache_stats()["feature_sets"]["stocks"] == {
+            "hits": 1,
+            "misses": 4,
+        }
+
+        clock[0] += 11
+        service.get([["MSFT"]])
+        assert service.get_cache_stats()["feature_sets"]["stocks"]["misses"] == 5
+
+
+def test_online_cache_partial_miss():
+    feature_set_objects = {
+        "stocks": fs.FeatureSet("stocks", entities=[fs.Entity("ticker")]),
+        "quotes": fs.FeatureSet("quotes", entities=[fs.Entity("ticker")]),
+    }
+    feature_set_fields = {
+        "stocks": [("price", None)],
+        "quotes": [("bid", None), ("ask", "ask_price")],
+    }
+    cache = OnlineFeatureCache(feature_set_objects, feature_set_fields, 10)
+
+    # the entity is not (yet) in the quotes feature set, only the stocks features are cached
+    cache.update({"ticker": "GOOG"}, {"ticker": "GOOG", "price": 720.5})
+    assert cache.stats()["size"] == 1
+    assert cache.get({"ticker": "GOOG"}) is None
+    # the cached feature set is not counted as a hit when the row misses
+    assert cache.stats()["feature_sets"] == {
+        "stocks": {"hits": 0, "misses": 0},
+        "quotes": {"hits": 0, "misses": 1},
+    }
+
+    cache.update(
+        {"ticker": "GOOG"},
+        {"ticker": "GOOG", "price": 720.5, "bid": 720.0, "ask_price": 721.0},
+    )
+    assert cache.get({"ticker": "GOOG"}) == {
+        "ticker": "GOOG",
+        "price": 720.5,
+        "bid": 720.0,
+        "ask_price": 721.0,
+    }
+    assert cache.stats()["feature_sets"] == {
+        "stocks": {"hits": 1, "misses": 0},
+        "quotes": {"hits": 1, "misses": 1},
+    }
+
+
+def test_online_cache_disabled():
+    service, _ = _online_service()
+    with service:
+        with pytest.raises(mlrun.errors.MLRunInvalidArgumentError):
+            service.get_cache_stats()
@@ -0,0 +1,266 @@
+import json
+import unittest.mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import mlrun.api.crud
+import mlrun.api.schemas
+import mlrun.errors
+from mlrun.data_types.data_types import InferOptions
+from mlrun.data_types.infer import get_df_stats
+from mlrun.model_monitoring.model_monitoring_batch import (
+    BatchProcessor,
+    HellingerDistance,
+    KullbackLeiblerDivergence,
+    TotalVarianceDistance,
+    VirtualDrift,
+)
+from mlrun.model_monitoring.stores import LocalModelMonitoringStore
+from mlrun.utils.model_monitoring import (
+    HISTOGRAMS_KV_PREFIX,
+    EndpointType,
+    HistogramState,
+)
+
+
+def _stats(rng, features, zero_bins=False):
+    stats = {}
+    for feature in features:
+        counts = rng.integers(0, 100, size=20)
+        if zero_bins:
+            counts[:5] = 0
+        stats[feature] = {"hist": [counts.tolist(), list(range(21))]}
+    return stats
+
+
+@pytest.mark.parametrize(
+    "metric_class",
+    [TotalVarianceDistance, HellingerDistance, KullbackLeiblerDivergence],
+)
+def test_metrics_over_stacked_histograms(metric_class):
+    rng = np.random.default_rng(0)
+    distrib_t = rng.random((20, 30))
+    distrib_u = rng.random((20, 30))
+    distrib_t[:3, :10] = 0
+    distrib_u[3:6, 5:15] = 0
+    distrib_t, distrib_u = distrib_t / distrib_t.sum(0), distrib_u / distrib_u.sum(0)
+
+    values = metric_class(distrib_t, distrib_u).compute()
+    assert values.shape == (30,)
+    for column in range(30):
+        value = metric_class(distrib_t[:, column], distrib_u[:, column]).compute()
+        assert np.isscalar(value) or np.ndim(value) == 0
+        assert values[column] == pytest.approx(value)
+
+
+def test_compute_drift_from_histograms():
+    rng = np.random.default_rng(0)
+    features = [f"f{index}" for index in range(50)]
+    feature_stats = _stats(rng, features + ["label"], zero_bins=True)
+    current_stats = _stats(rng, features[5:] + ["label", "new_feature"])
+    virtual_drift = VirtualDrift(label_col="label")
+
+    drift_result = virtual_drift.compute_drift_from_histograms(
+        feature_stats, current_stats
+    )
+
+    base = virtual_drift.dict_to_histogram(feature_stats)
+    latest = virtual_drift.dict_to_histogram(current_stats)
+    for feature in features[5:]:
+        expected = TotalVarianceDistance(
+            base[feature].to_numpy(), latest[feature].to_numpy()
+        ).compute()
+        assert drift_result[feature]["tvd"] == pytest.approx(expected)
+        assert set(drift_result[feature].keys()) == {"tvd", "hellinger", "kld"}
+    assert features[0] not in drift_result
+    assert "new_feature" not in drift_result
+    assert drift_result["tvd_mean"] == pytest.approx(
+        np.mean([drift_result[feature]["tvd"] for feature in features[5:] + ["label"]])
+    )
+    assert drift_result["label"]["kld"] == pytest.approx(
+        KullbackLeiblerDivergence(
+            base["label"].to_numpy(), latest["label"].to_numpy()
+        ).compute()
+    )
+
+
+def test_histogram_state():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(1000, 2))
+    feature_stats = {
+        "f0": {"hist": list(np.histogram(values[:, 0], bins=20))},
+        "f1": {"hist": list(np.histogram(values[:, 1], bins=20))},
+        "no_hist": {"mean": 0.0},
+    }
+    # the states are merged from several workers, each one counting part of the events
+    states = [
+        HistogramState.from_stats(feature_stats, with_counts=False) for _ in range(3)
+    ]
+    for index, (f0, f1) in enumerate(values):
+        states[index % 3].update({"f0": f0, "f1": f1, "other": 1, "no_hist": 2})
+    merged = HistogramState({})
+    for state in states:
+        merged.merge(
+            HistogramState.from_stats(json.loads(json.dumps(state.to_stats())))
+        )
+
+    stats = merged.to_stats()
+    assert set(stats.keys()) == {"f0", "f1"}
+    for column, feature in enumerate(["f0", "f1"]):
+        counts, edges = feature_stats[feature]["hist"]
+        assert stats[feature]["hist"][0] == counts.tolist()
+        assert stats[feature]["hist"][1] == edges.tolist()
+        # the stats of the merged states are the (exact) stats of all the values
+        expected = get_df_stats(
+            pd.DataFrame({feature: values[:, column]}), InferOptions.Histogram
+        )[feature]
+        for key in ["count", "mean", "std", "min", "max"]:
+            assert stats[feature][key] == pytest.approx(expected[key])
+
+    # values out of the bin edges are counted in the edge bins, invalid values are ignored
+    edges = feature_stats["f0"]["hist"][1]
+    state = HistogramState.from_stats(feature_stats, with_counts=False)
+    for value in [edges[0] - 1, edges[-1] + 1, edges[-1], float("nan"), "a", None]:
+        state.update({"f0": value})
+    stats = state.to_stats()
+    assert set(stats.keys()) == {"f0"}
+    counts = stats["f0"]["hist"][0]
+    assert counts[0] == 1 and counts[-1] == 2 and sum(counts) == 3
+    assert stats["f0"]["count"] == 3
+    assert stats["f0"]["min"] == edges[0] - 1
+    assert stats["f0"]["max"] == edges[-1] + 1
+
+    other = HistogramState({"f0": [0, 1, 2]})
+    with pytest.raises(mlrun.errors.MLRunInvalidArgumentError):
+        state.merge(other)
+
+    # the stats of states without the count/mean/min/max are approximated from the histogram
+    stats = HistogramState.from_stats(
+        {"f0": {"hist": [[0, 2, 2], [0.0, 1.0, 2.0, 3.0]]}}
+    ).to_stats()
+    assert stats["f0"]["count"] == 4
+    assert stats["f0"]["mean"] == pytest.approx(2.0)
+    assert stats["f0"]["min"] == 1.0 and stats["f0"]["max"] == 3.0
+
+
+def _histogram_states(feature_stats, states):
+    """the endpoint attributes of the histogram states written by the stream processing workers"""
+    attributes = {}
+    for worker, (hour, timestamp, values) in states.items():
+        state = HistogramState.from_stats(feature_stats, with_counts=False)
+        for value in values:
+            state.update({"f0": value})
+        attributes[f"{HISTOGRAMS_KV_PREFIX}{worker}"] = json.dumps(
+            {"hour": hour, "timestamp": timestamp, "stats": state.to_stats()}
+        )
+    return attributes
+
+
+def test_get_streamed_stats(tmp_path):
+    feature_stats = {"f0": {"hist": [[1, 2], [0.0, 1.0, 2.0]]}}
+    latest_values = [0.5, 0.2, 0.9, 1.1, 1.5, 1.8, 2.0, 0.7]
+    states = {
+        "w1": ("2021-01-01 10", "2021-01-01 10:59:00.000000", latest_values[:7]),
+        "w2": ("2021-01-01 10", "2021-01-01 10:58:00.000000", latest_values[7:]),
+        "w3": ("2021-01-01 09", "2021-01-01 09:59:00.000000", [0.1] * 5 + [1.2] * 5),
+    }
+    attributes = _histogram_states(feature_stats, states)
+    attributes["feature_stats"] = json.dumps(feature_stats)
+    batch_processor = BatchProcessor.__new__(BatchProcessor)
+    batch_processor.store = LocalModelMonitoringStore(
+        "test", path=str(tmp_path / "store.db")
+    )
+    batch_processor.store.update_endpoint_record("endpoint-id", attributes)
+    batch_processor.store.update_endpoint_record("no-states", {"feature_stats": "{}"})
+
+    current_stats, timestamp = batch_processor.get_streamed_stats("endpoint-id")
+    assert current_stats == {
+        "f0": {
+            "count": 8.0,
+            "mean": pytest.approx(np.mean(latest_values)),
+            "std": pytest.approx(np.std(latest_values, ddof=1)),
+            "min": 0.2,
+            "max": 2.0,
+            "hist": [[4, 4], [0.0, 1.0, 2.0]],
+        }
+    }
+    assert timestamp == "2021-01-01 10:59:00.000000"
+    # the states of the previous hours are deleted
+    record = batch_processor.store.get_endpoint_record("endpoint-id")
+    assert sorted(key for key in record if key.startswith(HISTOGRAMS_KV_PREFIX)) == [
+        f"{HISTOGRAMS_KV_PREFIX}w1",
+        f"{HISTOGRAMS_KV_PREFIX}w2",
+    ]
+    assert record["feature_stats"] == json.dumps(feature_stats)
+
+    assert batch_processor.get_streamed_stats("no-states") == (None, None)
+    assert batch_processor.get_streamed_stats("no-record") == (None, None)
+
+
+def test_streamed_stats_feature_analysis(tmp_path):
+    mlrun.mlconf.model_endpoint_monitoring.store_kind = "local"
+    mlrun.mlconf.model_endpoint_monitoring.local_store_path = str(
+        tmp_path / "{project}.db"
+    )
+    rng = np.random.default_rng(0)
+    feature_stats = get_df_stats(
+        pd.DataFrame({"f0": rng.normal(size=100)}), InferOptions.Histogram
+    )
+    latest_values = rng.normal(size=50).tolist()
+    batch_processor = BatchProcessor(None, "test", "", "")
+    batch_processor.store.update_endpoint_record(
+        "endpoint-id",
+        {
+            "project": "test",
+            "model": "model",
+            "endpoint_type": json.dumps(EndpointType.NODE_EP),
+            "feature_names": json.dumps(["f0"]),
+            "feature_stats": json.dumps(feature_stats),
+            **_histogram_states(
+                feature_stats,
+                {
+                    "w1": (
+                        "2021-01-01 10",
+                        "2021-01-01 10:59:00.000000",
+                        latest_values[:30],
+                    ),
+                    "w2": (
+                        "2021-01-01 10",
+                        "2021-01-01 10:58:00.000000",
+                        latest_values[30:],
+                    ),
+                },
+            ),
+        },
+    )
+
+    # the API reads the endpoint record of the store (instead of the v3io KV)
+    v3io_client = unittest.mock.Mock()
+    v3io_client.kv.get.side_effect = lambda key, **kwargs: unittest.mock.Mock(
+        output=unittest.mock.Mock(item=batch_processor.store.get_endpoint_record(key))
+    )
+
+    def get_endpoint(**kwargs):
+        return mlrun.api.crud.ModelEndpoints().get_endpoint(
+            auth_info=mlrun.api.schemas.AuthInfo(data_session="key"), **kwargs
+        )
+
+    with unittest.mock.patch(
+        "mlrun.utils.v3io_clients.get_v3io_client", return_value=v3io_client
+    ):
+        assert batch_processor._process_endpoint("endpoint-id", {}, None, "")
+        endpoint = get_endpoint(
+            project="test", endpoint_id="endpoint-id", feature_analysis=True
+        )
+
+    (feature,) = endpoint.status.features
+    assert feature.name == "f0"
+    assert feature.expected.mean == pytest.approx(feature_stats["f0"]["mean"])
+    assert feature.actual.min == pytest.approx(min(latest_values))
+    assert feature.actual.mean == pytest.approx(np.mean(latest_values))
+    assert feature.actual.max == pytest.approx(max(latest_values))
+    assert sum(feature.actual.histogram.counts) == len(latest_values)
+    assert feature.actual.histogram.buckets == feature_stats["f0"]["hist"][1]
+    assert endpoint.status.drift_measures["f0"]["tvd"] >= 0
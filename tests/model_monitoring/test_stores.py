@@ -0,0 +1,184 @@
+import concurrent.futures
+import json
+import unittest.mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import mlrun
+import mlrun.api.schemas
+import mlrun.errors
+from mlrun.model_monitoring import stream_processing_fs
+from mlrun.model_monitoring.model_monitoring_batch import BatchProcessor
+from mlrun.model_monitoring.stores import (
+    LocalModelMonitoringStore,
+    V3IOModelMonitoringStore,
+    get_model_monitoring_store,
+)
+from mlrun.utils.model_monitoring import get_parquet_path
+
+
+@pytest.fixture
+def local_store_config(tmp_path):
+    mlrun.mlconf.model_endpoint_monitoring.store_kind = "local"
+    mlrun.mlconf.model_endpoint_monitoring.local_store_path = str(
+        tmp_path / "{project}.db"
+    )
+    mlrun.mlconf.model_endpoint_monitoring.store_prefixes.user_space = str(
+        tmp_path / "{project}" / "{kind}"
+    )
+
+
+def test_get_model_monitoring_store(local_store_config, tmp_path):
+    store = get_model_monitoring_store("test")
+    assert isinstance(store, LocalModelMonitoringStore)
+    assert store.path == str(tmp_path / "test.db")
+
+    store = get_model_monitoring_store("test", access_key="key", kind="v3io")
+    assert isinstance(store, V3IOModelMonitoringStore)
+    assert (store.kv_container, store.kv_path) == (
+        "users",
+        "pipelines/test/model-endpoints/endpoints/",
+    )
+
+    with pytest.raises(mlrun.errors.MLRunInvalidArgumentError):
+        get_model_monitoring_store("test", kind="redis")
+
+
+def test_local_store(local_store_config):
+    store = get_model_monitoring_store("test")
+    assert store.get_endpoint_record("endpoint-id") is None
+
+    # the endpoint record is updated concurrently (by the batch job threads), no update is lost
+    with concurrent.futures.ThreadPoolExecutor(8) as executor:
+        for index in range(40):
+            executor.submit(
+                store.update_endpoint_record, "endpoint-id", {f"a{index}": index}
+            )
+    store.update_endpoint_record("endpoint-id", {"a0": "updated"})
+    assert store.get_endpoint_record("endpoint-id") == {
+        **{f"a{index}": index for index in range(1, 40)},
+        "a0": "updated",
+    }
+
+    store.write_tsdb(
+        [
+            {
+                "timestamp": pd.Timestamp("2021-01-01 10:00:00"),
+                "endpoint_id": endpoint_id,
+                "record_type": "drift_measures",
+                "tvd_mean": value,
+            }
+            for endpoint_id, value in [("e1", 0.5), ("e2", 0.1)]
+        ]
+    )
+    df = store.read_tsdb(endpoint_id="e1")
+    assert df.to_dict(orient="records") == [
+        {
+            "timestamp": pd.Timestamp("2021-01-01 10:00:00"),
+            "endpoint_id": "e1",
+            "record_type": "drift_measures",
+            "tvd_mean": 0.5,
+        }
+    ]
+    assert len(store.read_tsdb(record_type="drift_measures")) == 2
+
+    store.create_stream()
+    store.put_stream_records([{"endpoint_id": "e1"}, {"endpoint_id": "e2"}])
+    assert store.read_stream_records() == [
+        {"endpoint_id": "e1"},
+        {"endpoint_id": "e2"},
+    ]
+    assert store.read_stream_records(start_id=1) == [{"endpoint_id": "e2"}]
+
+
+def test_local_monitoring_pipeline(local_store_config, tmp_path):
+    endpoint_id = "endpoint-id"
+    feature_stats = {
+        "f0": {"hist": [[5, 5], [0.0, 1.0, 2.0]]},
+        "f1": {"hist": [[5, 5], [0.0, 1.0, 2.0]]},
+    }
+    store = get_model_monitoring_store("test")
+    store.update_endpoint_record(
+        endpoint_id, {"active": True, "feature_stats": json.dumps(feature_stats)}
+    )
+    store.update_endpoint_record("inactive-endpoint-id", {"active": ""})
+
+    # the stream processing counts the events histograms in the local store
+    step = stream_processing_fs.UpdateHistograms(project="test", flush_after_events=5)
+    for index in range(10):
+        step.do(
+            {
+                stream_processing_fs.ENDPOINT_ID: endpoint_id,
+                stream_processing_fs.TIMESTAMP: f"2021-01-01 10:0{index}:00.000000",
+                stream_processing_fs.NAMED_FEATURES: {"f0": 0.5, "f1": index / 5},
+            }
+        )
+
+    # the batch job reads the endpoints records and the histograms from the local store (not through the API) and
+    # writes the drift results to it
+    for endpoint_dir in [endpoint_id, "inactive-endpoint-id"]:
+        (tmp_path / "test" / "parquet" / f"endpoint_id={endpoint_dir}").mkdir(
+            parents=True
+        )
+    batch_processor = BatchProcessor(
+        context=None,
+        project="test",
+        model_monitoring_access_key=None,
+        v3io_access_key=None,
+    )
+    batch_processor.db = unittest.mock.Mock()
+    batch_processor.post_init()
+    batch_processor.run()
+    assert batch_processor.exception is None
+    assert not batch_processor.db.method_calls
+    assert "current_stats" not in store.get_endpoint_record("inactive-endpoint-id")
+
+    record = store.get_endpoint_record(endpoint_id)
+    f1_values = [index / 5 for index in range(10)]
+    assert json.loads(record["current_stats"]) == {
+        "f0": {
+            "count": 10.0,
+            "mean": pytest.approx(0.5),
+            "std": pytest.approx(0.0),
+            "min": 0.5,
+            "max": 0.5,
+            "hist": [[10, 0], [0.0, 1.0, 2.0]],
+        },
+        "f1": {
+            "count": 10.0,
+            "mean": pytest.approx(np.mean(f1_values)),
+            "std": pytest.approx(np.std(f1_values, ddof=1)),
+            "min": 0.0,
+            "max": 1.8,
+            "hist": [[5, 5], [0.0, 1.0, 2.0]],
+        },
+    }
+    drift_measures = json.loads(record["drift_measures"])
+    assert drift_measures["f0"]["tvd"] == pytest.approx(0.5)
+    assert drift_measures["f1"]["tvd"] == pytest.approx(0.0)
+    assert drift_measures["tvd_mean"] == pytest.approx(0.25)
+    assert record["drift_status"] == "NO_DRIFT"
+
+    df = store.read_tsdb(endpoint_id=endpoint_id)
+    assert df["record_type"].tolist() == ["drift_measures"]
+    assert df["tvd_mean"].tolist() == [pytest.approx(0.25)]
+    assert df["timestamp"].tolist() == [pd.Timestamp("2021-01-01 10:09:00")]
+
+
+def test_local_parquet_path(tmp_path):
+    mlrun.mlconf.model_endpoint_monitoring.local_user_space = str(
+        tmp_path / "{project}" / "{kind}"
+    )
+    assert get_parquet_path("test", "v3io") == (
+        "v3io:///projects/test/model-endpoints/parquet"
+    )
+    # a local store doesn't use the v3io user space
+    assert get_parquet_path("test", "local") == str(tmp_path / "test" / "parquet")
+    mlrun.mlconf.model_endpoint_monitoring.store_prefixes.user_space = str(
+        tmp_path / "user-space" / "{project}" / "{kind}"
+    )
+    assert get_parquet_path("test", "local") == str(
+        tmp_path / "user-space" / "test" / "parquet"
+    )
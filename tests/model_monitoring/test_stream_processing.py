@@ -0,0 +1,141 @@
+import json
+import unittest.mock
+
+import numpy as np
+import pytest
+import storey
+
+import mlrun
+from mlrun.model_monitoring import stream_processing_fs
+from mlrun.model_monitoring.stores import get_model_monitoring_store
+
+
+def _event(timestamp, value):
+    return {
+        stream_processing_fs.ENDPOINT_ID: "endpoint-id",
+        stream_processing_fs.TIMESTAMP: timestamp,
+        stream_processing_fs.NAMED_FEATURES: {"f0": value, "f1": 1.5},
+    }
+
+
+def _expected_stats(values, counts):
+    values = np.asarray(values)
+    stats = {"count": float(len(values)), "mean": pytest.approx(values.mean())}
+    if len(values) > 1:
+        stats["std"] = pytest.approx(values.std(ddof=1))
+    stats["min"] = values.min()
+    stats["max"] = values.max()
+    stats["hist"] = [counts, [0.0, 1.0, 2.0]]
+    return stats
+
+
+def test_update_histograms(tmp_path):
+    mlrun.mlconf.model_endpoint_monitoring.store_kind = "local"
+    mlrun.mlconf.model_endpoint_monitoring.local_store_path = str(
+        tmp_path / "{project}.db"
+    )
+    store = get_model_monitoring_store("test")
+    feature_stats = {"f0": {"hist": [[1, 2], [0.0, 1.0, 2.0]]}}
+    store.update_endpoint_record(
+        "endpoint-id", {"feature_stats": json.dumps(feature_stats)}
+    )
+    step = stream_processing_fs.UpdateHistograms(project="test", flush_after_events=3)
+    states = []
+    step.store.update_endpoint_record = unittest.mock.Mock(
+        side_effect=lambda endpoint_id, attributes: states.extend(
+            json.loads(value) for value in attributes.values()
+        )
+    )
+
+    for timestamp, value in [
+        ("2021-01-01 10:01:00.000000", 0.5),
+        ("2021-01-01 10:02:00.000000", 1.5),
+        ("2021-01-01 10:03:00.000000", 1.7),
+        ("2021-01-01 10:04:00.000000", 0.2),
+        # a new hour flushes the histograms of the previous hour and starts over
+        ("2021-01-01 11:00:00.000000", 5.0),
+    ]:
+        event = _event(timestamp, value)
+        assert step.do(event) is event
+
+    assert states == [
+        {
+            "hour": "2021-01-01 10",
+            "timestamp": "2021-01-01 10:03:00.000000",
+            "stats": {"f0": _expected_stats([0.5, 1.5, 1.7], [1, 2])},
+        },
+        {
+            "hour": "2021-01-01 10",
+            "timestamp": "2021-01-01 10:04:00.000000",
+            "stats": {"f0": _expected_stats([0.5, 1.5, 1.7, 0.2], [2, 2])},
+        },
+    ]
+    assert step.histograms["endpoint-id"].to_stats() == {
+        "f0": _expected_stats([5.0], [0, 1])
+    }
+
+
+def test_update_histograms_feature_stats_miss(tmp_path):
+    mlrun.mlconf.model_endpoint_monitoring.store_kind = "local"
+    mlrun.mlconf.model_endpoint_monitoring.local_store_path = str(
+        tmp_path / "{project}.db"
+    )
+    step = stream_processing_fs.UpdateHistograms(
+        project="test", flush_after_events=1, feature_stats_retry_seconds=60
+    )
+    get_endpoint_record = unittest.mock.Mock(side_effect=step.store.get_endpoint_record)
+    step.store.get_endpoint_record = get_endpoint_record
+    with unittest.mock.patch.object(
+        stream_processing_fs.time, "monotonic", return_value=1000.0
+    ) as monotonic:
+        step.do(_event("2021-01-01 10:01:00.000000", 0.5))
+        assert "endpoint-id" not in step.feature_stats
+
+        # the miss is cached, the record is not read again until the retry interval passes
+        feature_stats = {"f0": {"hist": [[1, 2], [0.0, 1.0, 2.0]]}}
+        step.store.update_endpoint_record(
+            "endpoint-id", {"feature_stats": json.dumps(feature_stats)}
+        )
+        monotonic.return_value = 1059.0
+        step.do(_event("2021-01-01 10:02:00.000000", 0.5))
+        assert "endpoint-id" not in step.histograms
+        assert get_endpoint_record.call_count == 1
+
+        # the feature stats which were written later are used
+        monotonic.return_value = 1060.0
+        step.do(_event("2021-01-01 10:03:00.000000", 0.5))
+        step.do(_event("2021-01-01 10:04:00.000000", 1.5))
+    assert get_endpoint_record.call_count == 2
+    assert step.histograms["endpoint-id"].to_stats() == {
+        "f0": _expected_stats([0.5, 1.5], [1, 1])
+    }
+
+
+def test_write_to_tsdb_batches(tmp_path):
+    mlrun.mlconf.model_endpoint_monitoring.store_kind = "local"
+    mlrun.mlconf.model_endpoint_monitoring.local_store_path = str(
+        tmp_path / "{project}.db"
+    )
+    step = stream_processing_fs.WriteToTSDB(project="test")
+    write_tsdb = unittest.mock.Mock(side_effect=step.store.write_tsdb)
+    step.store.write_tsdb = write_tsdb
+
+    source = storey.SyncEmitSource()
+    source.to(storey.Batch(max_events=2, flush_after_seconds=60)).to(step)
+    controller = source.run()
+    for index in range(5):
+        controller.emit(
+            {
+                "timestamp": f"2021-01-01 10:0{index}:00",
+                "endpoint_id": "endpoint-id",
+                "record_type": "base_metrics",
+                "value": index,
+            }
+        )
+    controller.terminate()
+    controller.await_termination()
+
+    # a transaction per batch (the last batch is written on termination)
+    assert [len(call.args[0]) for call in write_tsdb.call_args_list] == [2, 2, 1]
+    df = step.store.read_tsdb(endpoint_id="endpoint-id")
+    assert df["value"].tolist() == [0, 1, 2, 3, 4]
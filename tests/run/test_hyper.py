@@ -1,6 +1,8 @@
 import pathlib
+import unittest.mock
 
 import pandas as pd
+import pytest
 
 import mlrun
 from mlrun import new_function, new_task
@@ -58,6 +60,82 @@ def test_hyper_grid():
     assert run.output("best_iteration") == 6, "wrong best iteration"
 
 
+def failing_hyper_func(context, p2, p3):
+    if p2 == 1:
+        raise ValueError("bad p2")
+    context.log_result("r1", p2 * p3)
+
+
+def test_hyper_bulk_store():
+    run_spec = tag_test(base_spec, "test_hyper_bulk_store")
+    run_spec.with_hyper_params(
+        {"p2": [2, 1, 3], "p3": [10, 20]},
+        selector="r1",
+        strategy="grid",
+        max_errors=2,
+    )
+    store_runs = mlrun.db.base.RunDBInterface.store_runs
+    store_artifacts = mlrun.db.base.RunDBInterface.store_artifacts
+    with unittest.mock.patch.object(
+        mlrun.db.base.RunDBInterface,
+        "store_runs",
+        autospec=True,
+        side_effect=store_runs,
+    ) as store_runs_mock, unittest.mock.patch.object(
+        mlrun.db.base.RunDBInterface,
+        "store_artifacts",
+        autospec=True,
+        side_effect=store_artifacts,
+    ) as store_artifacts_mock, pytest.raises(
+        mlrun.runtimes.utils.RunError, match="2 of 6 tasks failed"
+    ):
+        new_function().run(run_spec, handler=failing_hyper_func)
+
+    # the iterations initial records are stored in a single bulk call, and the failed iterations state updates
+    # in another one
+    assert store_runs_mock.call_count == 2
+    runs = store_runs_mock.call_args_list[0][0][1]
+    assert [run["metadata"]["iteration"] for run in runs] == [1, 2, 3, 4, 5, 6]
+    runs = store_runs_mock.call_args_list[1][0][1]
+    assert [run["status"]["state"] for run in runs] == ["error", "error"]
+    # the iteration results artifacts are stored in a single bulk call
+    assert store_artifacts_mock.call_count == 1
+    keys = [item["key"] for item in store_artifacts_mock.call_args[0][1]]
+    assert "test_hyper_bulk_store_iteration_results" in keys
+
+
+def interrupted_hyper_func(context, p2, p3):
+    if p2 == 1:
+        raise KeyboardInterrupt()
+    context.log_result("r1", p2 * p3)
+
+
+@pytest.mark.parametrize(
+    "handler,stop_condition", [(hyper_func, "r1 >= 20"), (interrupted_hyper_func, "")]
+)
+def test_hyper_bulk_store_stopped(handler, stop_condition):
+    name = f"test_hyper_bulk_store_stopped_{handler.__name__}"
+    run_spec = tag_test(base_spec, name)
+    run_spec.with_hyper_params(
+        {"p2": [2, 1, 3], "p3": [10, 20]},
+        selector="r1",
+        strategy="grid",
+        stop_condition=stop_condition,
+    )
+    function = new_function()
+    if stop_condition:
+        function.run(run_spec, handler=handler)
+    else:
+        with pytest.raises(KeyboardInterrupt):
+            function.run(run_spec, handler=handler)
+
+    # the iterations which didn't run (or were interrupted) don't stay in a running state
+    runs = mlrun.get_run_db().list_runs(name=name, iter=True)
+    states = {run["metadata"]["iteration"]: run["status"]["state"] for run in runs}
+    assert states[1] == "completed"
+    assert all(states[iteration] == "aborted" for iteration in range(2, 7))
+
+
 def test_hyper_grid_parallel():
     grid_params = '{"p2": [2,1,3], "p3": [10,20]}'
     mlrun.datastore.set_in_memory_item("params.json", grid_params)
@@ -73,6 +151,86 @@ def test_hyper_grid_parallel():
     assert len(run.status.iterations) == 1 + 2 * 3, "wrong number of iterations"
 
 
+@pytest.mark.parametrize("parallel_mode", ["process", "thread"])
+def test_hyper_parallel_modes(parallel_mode):
+    run_spec = tag_test(base_spec, "test_hyper_parallel_modes")
+    run_spec.with_hyper_params(
+        {"p2": [2, 1, 3], "p3": [10, 20]},
+        selector="r1",
+        strategy="grid",
+        parallel_runs=3,
+        parallel_mode=parallel_mode,
+    )
+    run = new_function().run(run_spec, handler=hyper_func)
+
+    verify_state(run)
+    assert len(run.status.iterations) == 1 + 2 * 3, "wrong number of iterations"
+    results = [line[5] for line in run.status.iterations[1:]]
+    assert results == [20, 10, 30, 40, 20, 60], "unexpected results"
+    assert run.output("best_iteration") == 6, "wrong best iteration"
+
+
+@pytest.mark.parametrize("parallel_mode", ["process", "thread"])
+def test_hyper_parallel_max_errors(parallel_mode):
+    run_spec = tag_test(base_spec, "test_hyper_parallel_max_errors")
+    run_spec.with_hyper_params(
+        {"p2": [1, 1, 1, 1, 2, 3], "p3": [10]},
+        strategy="grid",
+        parallel_runs=2,
+        parallel_mode=parallel_mode,
+        max_errors=1,
+    )
+    with pytest.raises(mlrun.runtimes.utils.RunError):
+        new_function().run(run_spec, handler=failing_hyper_func)
+
+
+def halving_func(context, p2, p3, epochs):
+    context.log_result("score", p2 * p3 + epochs / 100)
+
+
+@pytest.mark.parametrize("parallel_runs", [None, 2])
+def test_hyper_halving(parallel_runs):
+    run_spec = tag_test(base_spec, "test_hyper_halving")
+    run_spec.with_hyper_params(
+        {"p2": [1, 5, 3], "p3": [2, 1, 3]},
+        selector="max.score",
+        strategy="halving",
+        resource_param="epochs",
+        min_resource=1,
+        max_resource=9,
+        parallel_runs=parallel_runs,
+    )
+    run = new_function().run(run_spec, handler=halving_func)
+
+    verify_state(run)
+    # 9 runs with 1 epoch, the best 3 with 3 epochs and the best one with 9 epochs
+    assert len(run.status.iterations) == 1 + 9 + 3 + 1, "wrong number of iterations"
+    header = run.status.iterations[0]
+    rows = [dict(zip(header, line)) for line in run.status.iterations[1:]]
+    promoted = [
+        (row["param.p2"], row["param.p3"], row["param.epochs"]) for row in rows[9:]
+    ]
+    assert promoted == [(5, 3, 3), (5, 2, 3), (3, 3, 3), (5, 3, 9)]
+    assert run.output("best_iteration") == 13, "wrong best iteration"
+
+
+def test_hyper_halving_validation():
+    run_spec = mlrun.new_task()
+    with pytest.raises(mlrun.errors.MLRunInvalidArgumentError):
+        run_spec.with_hyper_params(
+            {"p2": [1, 2]}, selector="max.score", strategy="halving"
+        )
+    run_spec.with_hyper_params(
+        {"p2": [1, 2]},
+        strategy="halving",
+        resource_param="epochs",
+        min_resource=1,
+        max_resource=9,
+    )
+    with pytest.raises(mlrun.errors.MLRunInvalidArgumentError):
+        new_function().run(run_spec, handler=halving_func)
+
+
 def test_hyper_list():
     list_params = '{"p2": [2,3,1], "p3": [10,30,20]}'
     mlrun.datastore.set_in_memory_item("params.json", list_params)
@@ -175,3 +175,15 @@ def test_list_runs(db: RunDBInterface):
 
     runs = list(db.list_runs(uid=uid, iter=True))
     assert 5 == len(runs), "iter=True"
+
+
+def test_iter_runs(db: RunDBInterface):
+    count = 5
+    for index in range(count):
+        run = new_run("s1", {"l1": "v1"}, f"uid-{index}", x=index)
+        db.store_run(run, f"uid-{index}")
+
+    runs = list(db.iter_runs(page_size=2, fields=["metadata.uid", "x"]))
+    assert {run["x"] for run in runs} == set(range(count))
+    for run in runs:
+        assert run == {"metadata": {"uid": run["metadata"]["uid"]}, "x": run["x"]}
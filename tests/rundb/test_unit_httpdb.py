@@ -1,6 +1,7 @@
 # test_httpdb.py actually holds integration tests (that should be migrated to tests/integration/sdk_api/httpdb)
 # currently we are running it in the integration tests CI step so adding this file for unit tests for the httpdb
 import enum
+import json
 import unittest.mock
 
 import mlrun.db.httpdb
@@ -27,3 +28,123 @@ def test_api_call_enum_conversion():
     for dict_key in ["headers", "params"]:
         for value in db.session.request.call_args_list[1][1][dict_key].values():
             assert type(value) == str
+
+
+def test_watch_log_stream(capsys):
+    db = mlrun.db.httpdb.HTTPRunDB("fake-url")
+    db.get_log = unittest.mock.Mock(
+        side_effect=[
+            ("running", b"first "),
+            # after the first stream ended (timed out) the run is still running
+            ("running", b""),
+            ("completed", b"last"),
+        ]
+    )
+    streamed_chunks = [[b"line \xe2", b"\x82\xac\n"], [b"second\n"]]
+    db.api_call = unittest.mock.Mock(
+        side_effect=[
+            unittest.mock.Mock(iter_content=unittest.mock.Mock(return_value=chunks))
+            for chunks in streamed_chunks
+        ]
+    )
+
+    assert db.watch_log("uid", "project") == "completed"
+    # the stream is reconnected from the updated offset, a multi byte character split between chunks is decoded
+    assert [call[1]["params"] for call in db.api_call.call_args_list] == [
+        {"offset": 6},
+        {"offset": 15},
+    ]
+    assert db.get_log.call_args_list[-1][1]["offset"] == 22
+    assert capsys.readouterr().out == "first \nline €\nsecond\nlast"
+
+
+def test_watch_log_stream_not_supported():
+    db = mlrun.db.httpdb.HTTPRunDB("fake-url")
+    db.get_log = unittest.mock.Mock(
+        side_effect=[("running", b"first"), ("completed", b" last")]
+    )
+    db.api_call = unittest.mock.Mock(
+        side_effect=mlrun.errors.MLRunNotFoundError("not found")
+    )
+    with unittest.mock.patch("time.sleep"):
+        assert db.watch_log("uid", "project") == "completed"
+    assert db.get_log.call_args_list[-1][1]["offset"] == 5
+
+
+def test_metadata_cache():
+    db = mlrun.db.httpdb.HTTPRunDB("fake-url")
+    db.session = unittest.mock.Mock()
+    function = {"func": {"kind": "job", "metadata": {"name": "func"}}}
+
+    def _request(method, url, headers=None, **kwargs):
+        if method != "GET":
+            return unittest.mock.Mock(ok=True)
+        if headers.get("If-None-Match") == '"etag"':
+            return unittest.mock.Mock(
+                ok=True, status_code=304, content=b"", headers={"ETag": '"etag"'}
+            )
+        return unittest.mock.Mock(
+            ok=True,
+            status_code=200,
+            content=json.dumps(function).encode(),
+            headers={"ETag": '"etag"'},
+        )
+
+    db.session.request.side_effect = _request
+    assert db.get_function("func", "project") == function["func"]
+
+    # the cached function is validated by its etag
+    assert db.get_function("func", "project") == function["func"]
+    assert db.session.request.call_count == 2
+    assert db.session.request.call_args[1]["headers"]["If-None-Match"] == '"etag"'
+
+    # the cached function is used without validating it during the ttl
+    mlrun.mlconf.httpdb.metadata_cache.ttl = 60
+    returned_function = db.get_function("func", "project")
+    assert returned_function == function["func"]
+    assert db.session.request.call_count == 2
+
+    # the returned objects don't share the cached content
+    returned_function["kind"] = "changed"
+    assert db.get_function("func", "project") == function["func"]
+
+    # the function is stored by the client, the cache of the project functions is invalidated
+    db.store_function(function["func"], "func", "project")
+    db.get_function("func", "project")
+    assert db.session.request.call_count == 4
+    assert "If-None-Match" not in db.session.request.call_args[1]["headers"]
+
+    mlrun.mlconf.httpdb.metadata_cache.max_entries = 0
+    db._metadata_cache.clear()
+    db.get_function("func", "project")
+    db.get_function("func", "project")
+    assert db.session.request.call_count == 6
+    assert not db._metadata_cache
+
+
+def test_get_feature_sets():
+    db = mlrun.db.httpdb.HTTPRunDB("fake-url")
+    db.api_call = unittest.mock.Mock(
+        return_value=unittest.mock.Mock(
+            status_code=200,
+            content=json.dumps(
+                {
+                    "feature_sets": [
+                        {"metadata": {"name": "fs1", "tag": "v1"}},
+                        {"metadata": {"name": "fs2"}},
+                    ]
+                }
+            ).encode(),
+            headers={},
+        )
+    )
+    feature_sets = db.get_feature_sets(["fs1:v1", "fs2"], "project")
+    assert [feature_set.metadata.name for feature_set in feature_sets] == [
+        "fs1",
+        "fs2",
+    ]
+    assert db.api_call.call_args[0][1] == "projects/project/feature-sets/batch"
+    assert db.api_call.call_args[1]["params"] == {
+        "name": ["fs1:v1", "fs2"],
+        "tag": None,
+    }
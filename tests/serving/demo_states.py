@@ -1,3 +1,4 @@
+import time
 from copy import copy
 
 from mlrun.serving import V2ModelServer
@@ -92,3 +93,9 @@ class ModelClassList(V2ModelServer):
         print("predict:", request)
         resp = request["inputs"][0][0] * self.get_param("multiplier", 1)
         return [resp]
+
+
+class SlowModelClassList(ModelClassList):
+    def predict(self, request):
+        time.sleep(1)
+        return super().predict(request)
@@ -71,6 +71,29 @@ def test_async_nested():
     assert resp["outputs"] == 5 * 2 * 200, f"wrong health response {resp}"
 
 
+def test_async_ensemble():
+    function = mlrun.new_function("tests", kind="serving")
+    graph = function.set_topology("flow", engine="async")
+    graph.to(name="s1", class_name="Echo").to(
+        "*mlrun.serving.routers.VotingEnsemble",
+        name="ensemble",
+        vote_type="regression",
+        executor_type="asyncio",
+        model_timeout={"m3": 0.2},
+    ).to(name="final", class_name="Echo").respond()
+    function.add_model("m1", class_name="ModelClassList", model_path=".", multiplier=10)
+    function.add_model("m2", class_name="ModelClassList", model_path=".", multiplier=20)
+    function.add_model(
+        "m3", class_name="SlowModelClassList", model_path=".", multiplier=1000
+    )
+    server = function.to_mock_server()
+
+    resp = server.test("/v2/models/infer", body={"inputs": [[5]]})
+    server.wait_for_completion()
+    # m3 times out, expect avg of (5*10) and (5*20) = 75
+    assert resp["outputs"] == [75], "wrong output"
+
+
 def test_on_error():
     function = mlrun.new_function("tests", kind="serving")
     graph = function.set_topology("flow", engine="async")
@@ -1,3 +1,5 @@
+import concurrent.futures
+import inspect
 import json
 import os
 import pathlib
@@ -134,6 +136,24 @@ class EnsembleModelTestingClass(ModelTestingClass):
         return resp
 
 
+class SlowEnsembleModelTestingClass(EnsembleModelTestingClass):
+    def predict(self, request):
+        time.sleep(self.get_param("delay"))
+        return super().predict(request)
+
+
+class BatchModelTestingClass(V2ModelServer):
+    def load(self):
+        self.batch_sizes = []
+
+    def predict(self, request):
+        time.sleep(0.1)
+        self.batch_sizes.append(len(request["inputs"]))
+        if any(value < 0 for value in request["inputs"]):
+            raise ValueError("negative input")
+        return [value * 2 for value in request["inputs"]]
+
+
 class RaiserTestingClass(V2ModelServer):
     def load(self):
         print("loading..")
@@ -212,6 +232,124 @@ def test_ensemble_infer():
     run_model("", 1250.0)
 
 
+def _slow_ensemble_server(**ensemble_args):
+    fn = mlrun.new_function("tests", kind="serving")
+    graph = fn.set_topology(
+        "router",
+        mlrun.serving.routers.VotingEnsemble(
+            vote_type="regression", prediction_col_name="predictions", **ensemble_args
+        ),
+    )
+    graph.routes = generate_test_routes("EnsembleModelTestingClass")
+    graph.add_route(
+        "slow",
+        class_name="SlowEnsembleModelTestingClass",
+        model_path="",
+        multiplier=1000,
+        delay=1,
+    )
+    return fn.to_mock_server()
+
+
+@pytest.mark.parametrize("executor_type", ["thread", "array"])
+def test_ensemble_infer_all_models(executor_type):
+    server = _slow_ensemble_server(executor_type=executor_type)
+    resp = server.test("/v2/models/infer", testdata)
+    # mean of 500, 1000, 1500, 2000 and 5000
+    assert resp["outputs"] == {"predictions": [2000.0]}
+
+
+def test_ensemble_model_timeout():
+    server = _slow_ensemble_server(model_timeout={"slow": 0.2})
+    ensemble = server.graph._object
+    # record the per request metrics (models latency)
+    collected_metrics = []
+    collect_results = ensemble._collect_results
+
+    def _collect_results(outcomes):
+        results, metrics = collect_results(outcomes)
+        collected_metrics.append(metrics)
+        return results, metrics
+
+    ensemble._collect_results = _collect_results
+    for _ in range(2):
+        start = time.monotonic()
+        resp = server.test("/v2/models/infer", testdata)
+        assert time.monotonic() - start < 1
+        # the slow model is left out of the vote
+        assert resp["outputs"] == {"predictions": [1250.0]}
+        assert set(collected_metrics[-1].keys()) == {
+            "m1_microsec",
+            "m2_microsec",
+            "m3:v1_microsec",
+            "m3:v2_microsec",
+        }
+    # the thread pool is reused by the requests
+    assert ensemble._pool is not None
+
+    server = _slow_ensemble_server(model_timeout=0.2, quorum=5)
+    with pytest.raises(RuntimeError, match="at least 5 responses"):
+        server.test("/v2/models/infer", testdata)
+
+
+def test_enrichment_ensemble_positional_args():
+    # the voting parameters are added after the enrichment ones, keep positional callers intact
+    params = list(
+        inspect.signature(mlrun.serving.routers.EnrichmentVotingEnsemble).parameters
+    )
+    assert params[8:13] == [
+        "prediction_col_name",
+        "feature_vector_uri",
+        "impute_policy",
+        "cache_size",
+        "cache_ttl",
+    ]
+
+
+@pytest.mark.parametrize("with_router", [True, False])
+def test_v2_micro_batching(with_router):
+    fn = mlrun.new_function("tests", kind="serving")
+    graph = fn.set_topology("flow", engine="async")
+    model_args = dict(
+        class_name="BatchModelTestingClass",
+        model_path=".",
+        max_batch_size=4,
+        max_wait_ms=50,
+    )
+    if with_router:
+        graph.to("*", "router").respond()
+        fn.add_model("m1", **model_args)
+        path = "/v2/models/m1/infer"
+    else:
+        graph.to(name="m1", **model_args).respond()
+        path = "/"
+    server = fn.to_mock_server()
+    step = graph["router"].routes["m1"] if with_router else graph["m1"]
+    model = step._object
+
+    def infer(value):
+        try:
+            return server.test(path, {"inputs": [value, value]})
+        except RuntimeError as exc:
+            return exc
+
+    # the async flow handles the concurrent requests together
+    inputs = [1, 2, 3, -4, 5, 6, 7, 8, 9]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(inputs)) as pool:
+        responses = list(pool.map(infer, inputs))
+    server.wait_for_completion()
+
+    for value, response in zip(inputs, responses):
+        if value < 0:
+            # only the failing request returns an error
+            assert isinstance(response, RuntimeError)
+            assert "negative input" in str(response)
+        else:
+            assert response["outputs"] == [value * 2, value * 2]
+    # the concurrent requests are predicted in batches of up to 4 requests (8 inputs)
+    assert 2 < max(model.batch_sizes) <= 8
+
+
 def test_v2_infer():
     def run_model(url, expected):
         event = MockEvent(testdata, path=f"/v2/models/{url}/infer")
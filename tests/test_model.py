@@ -1,4 +1,5 @@
 import mlrun.api.schemas
+import mlrun.model
 import mlrun.runtimes
 
 
@@ -6,3 +7,73 @@ def test_enum_yaml_dump():
     function = mlrun.new_function("function-name", kind="job")
     function.status.state = mlrun.api.schemas.FunctionState.ready
     print(function.to_yaml())
+
+
+class SomeModelObj(mlrun.model.ModelObj):
+    def __init__(self, name=None, params=None, child=None):
+        self.name = name
+        self.params = params or {}
+        self.child = child
+
+
+class SomeModelObjWithMoreFields(SomeModelObj):
+    def __init__(self, name=None, params=None, child=None, extra=None):
+        super().__init__(name, params, child)
+        self.extra = extra
+
+
+def test_to_dict_init_fields():
+    obj = SomeModelObjWithMoreFields(
+        "name", {"p": 1}, SomeModelObj("child", {}), extra=False
+    )
+    struct = obj.to_dict()
+    assert struct == {
+        "name": "name",
+        "params": {"p": 1},
+        "child": {"name": "child"},
+        "extra": False,
+    }
+    # the fields are computed once per class
+    assert SomeModelObj._init_fields == ["name", "params", "child"]
+    assert SomeModelObjWithMoreFields._init_fields == [
+        "name",
+        "params",
+        "child",
+        "extra",
+    ]
+    assert SomeModelObj().to_dict(exclude=["params"]) == {}
+
+    new_obj = SomeModelObjWithMoreFields.from_dict(struct)
+    assert new_obj.to_dict() == struct
+    assert new_obj.child == {"name": "child"}
+
+
+def test_copy():
+    shared_params = {"values": [1, 2]}
+    obj = SomeModelObj("name", shared_params, SomeModelObj("child", shared_params))
+    new_obj = obj.copy()
+    assert new_obj.to_dict() == obj.to_dict()
+    assert isinstance(new_obj.child, SomeModelObj)
+
+    # the copy is independent, and keeps the shared references
+    new_obj.params["values"].append(3)
+    assert obj.params == {"values": [1, 2]}
+    assert new_obj.child.params is new_obj.params
+
+    run = mlrun.new_task(params={"p1": [1, 2]}, inputs={"in": "path"})
+    new_run = run.copy()
+    new_run.spec.parameters["p1"].append(3)
+    assert run.spec.parameters == {"p1": [1, 2]}
+    assert new_run.to_dict() != run.to_dict()
+
+
+def test_copy_graph():
+    function = mlrun.new_function("function-name", kind="serving")
+    graph = function.set_topology("flow")
+    graph.to(name="s1", handler="json.dumps").to(name="s2", handler="json.dumps")
+    new_function = function.copy()
+    new_graph = new_function.spec.graph
+    assert new_graph.to_dict() == graph.to_dict()
+    # the steps back references (to the graph) point to the copied graph
+    assert new_graph["s1"] is not graph["s1"]
+    assert new_graph["s1"]._parent is new_graph